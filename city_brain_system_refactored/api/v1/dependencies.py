@@ -20,7 +20,19 @@ from domain.services.enterprise_service_refactored import EnterpriseServiceRefac
 from domain.services.data_enhancement_service import DataEnhancementService
 from domain.services.analysis_service import AnalysisService
 from domain.services.search_service import SearchService
+from domain.services.batch_job_service import BatchJobService, DEFAULT_BATCH_QUEUE_PATH
+from domain.services.refresh_scheduler import RefreshScheduler
+from domain.services.company_identity_service import CompanyIdentityService
+from domain.services.company_360_service import Company360Service, default_360_sources
 from infrastructure.database.repositories.customer_repository import CustomerRepository
+from infrastructure.database.repositories.batch_job_repository import BatchJobRepository
+from infrastructure.database.repositories.cache_repository import CompanyCacheRepository
+from infrastructure.database.repositories.company_alias_repository import CompanyAliasRepository
+from infrastructure.database.repositories.company_identity_repository import CompanyIdentityRepository
+from infrastructure.database.repositories.crm_sync_repository import CRMSyncRepository
+from infrastructure.database.repositories.enterprise_qd_repository import EnterpriseQDRepository
+from infrastructure.database.repositories.opportunities_repository import OpportunitiesRepository
+from infrastructure.database.repositories.work_order_repository import WorkOrderRepository
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -55,6 +67,43 @@ class Container(containers.DeclarativeContainer):
         customer_repository=customer_repository
     )
 
+    # 批量补全任务（本地持久化队列 + 后台工作协程，单例）
+    batch_job_repository = providers.Singleton(BatchJobRepository, db_path=DEFAULT_BATCH_QUEUE_PATH)
+    batch_job_service = providers.Singleton(
+        BatchJobService,
+        repository=batch_job_repository,
+        enterprise_service_factory=enterprise_service.provider
+    )
+
+    # 缓存增量刷新调度（按字段陈旧度 × 热度，受每小时API预算约束，单例）
+    cache_repository = providers.Singleton(CompanyCacheRepository)
+    refresh_scheduler = providers.Singleton(RefreshScheduler, cache_repository=cache_repository)
+
+    # 跨系统企业身份解析（名称 -> 规范企业ID -> 各系统名称原值，单例）
+    company_alias_repository = providers.Singleton(CompanyAliasRepository)
+    company_identity_repository = providers.Singleton(CompanyIdentityRepository)
+    company_identity_service = providers.Singleton(
+        CompanyIdentityService,
+        alias_repository=company_alias_repository,
+        identity_repository=company_identity_repository
+    )
+
+    # 企业360视图（身份解析一次，各数据源并发查询并独立超时，单例）
+    company360_sources = providers.Callable(
+        default_360_sources,
+        customer_repository=customer_repository,
+        enterprise_qd_repository=providers.Singleton(EnterpriseQDRepository),
+        crm_sync_repository=providers.Singleton(CRMSyncRepository),
+        opportunities_repository=providers.Singleton(OpportunitiesRepository),
+        work_order_repository=providers.Singleton(WorkOrderRepository),
+        cache_repository=cache_repository
+    )
+    company_360_service = providers.Singleton(
+        Company360Service,
+        identity_service=company_identity_service,
+        sources=company360_sources
+    )
+
     # 领域服务层 - 重构后的企业服务（工厂模式）
     enterprise_service_refactored = providers.Factory(
         EnterpriseServiceRefactored,
@@ -99,6 +148,26 @@ def get_search_service() -> SearchService:
     return _container.search_service()
 
 
+def get_batch_job_service() -> BatchJobService:
+    """获取批量补全任务服务依赖"""
+    return _container.batch_job_service()
+
+
+def get_refresh_scheduler() -> RefreshScheduler:
+    """获取缓存增量刷新调度器依赖"""
+    return _container.refresh_scheduler()
+
+
+def get_company_identity_service() -> CompanyIdentityService:
+    """获取跨系统企业身份服务依赖"""
+    return _container.company_identity_service()
+
+
+def get_company_360_service() -> Company360Service:
+    """获取企业360视图服务依赖"""
+    return _container.company_360_service()
+
+
 def get_customer_repository() -> CustomerRepository:
     """获取客户Repository依赖"""
     return _container.customer_repository()
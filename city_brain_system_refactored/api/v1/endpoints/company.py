@@ -4,33 +4,43 @@
 """
 
 from infrastructure.utils.datetime_utils import now_utc
+from infrastructure.utils.stage_timer import get_stage_timer
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 from infrastructure.database.repositories.cache_repository import CompanyCacheRepository
 
 
 
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, BackgroundTasks, Query, Request
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from api.v1.schemas.company import (
     CompanyRequest,
     CompanyResponse,
     ProgressiveCompanyRequest,
     ProgressiveStageData,
+    AnalysisStreamRequest,
     UpdateCompanyRequest,
     UpdateCompanyResponse,
     ChainLeaderUpdateRequest,
     ChainLeaderUpdateResponse,
+    BatchJobRequest,
     ErrorResponse
 )
 from api.v1.dependencies import (
     get_enterprise_service,
+    get_analysis_service,
+    get_batch_job_service,
+    get_company_360_service,
     get_request_context
 )
 from domain.services.enterprise_service import EnterpriseService
+from domain.services.analysis_service import AnalysisService
+from domain.services.batch_job_service import BatchJobService, parse_batch_csv
+from domain.services.company_360_service import Company360Service
+from domain.services.company_field_cache import CompanyFieldCache
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -130,7 +140,9 @@ async def process_company_info(
         logger.info(f"[{request_id}] 开始处理企业信息查询: {request.input_text[:50]}...")
 
         # 调用企业服务处理查询
+        stage_timer = get_stage_timer(request_context["request"])
         result = enterprise_service.process_company_info(request.input_text)
+        stage_timer.mark("process")
 
         if result.get("status") == "error":
             logger.error(f"[{request_id}] 企业信息处理失败: {result.get('message')}")
@@ -202,7 +214,9 @@ async def process_company_progressive(
             "timestamp": now_utc()
         }
 
+        stage_timer = get_stage_timer(request_context["request"])
         name_extraction_result = enterprise_service.search_service.extract_company_name_from_input(request.input_text)
+        stage_timer.mark("extract")
 
         if name_extraction_result['status'] == 'error':
             stage_data["status"] = "error"
@@ -216,24 +230,31 @@ async def process_company_progressive(
         stage_data["message"] = f"成功提取公司名称: {company_name}"
         stage_data["timestamp"] = now_utc()
 
-        # 阶段1.5：缓存命中检查（三个月内有效，缓存键标准化）；支持禁用
+        # 阶段1.5：缓存命中检查（缓存键标准化）；支持禁用
+        # 字段级缓存：所需字段都新鲜时直接拼装返回，否则后续只重新计算缺失/过期字段
+        fresh_fields: Dict[str, Any] = {}
         if not getattr(request, "disable_cache", False):
             try:
                 from infrastructure.utils.text_processor import company_name_extractor
                 cache_repo = CompanyCacheRepository()
+                field_cache = CompanyFieldCache(cache_repo)
                 cache_key = company_name_extractor.normalize_company_name(company_name or "")
                 cache_row = cache_repo.get_valid_cache(cache_key)
-                if cache_row and cache_row.get("payload"):
-                    cached_final = json.loads(cache_row["payload"])
+                fresh_fields = field_cache.load(cache_key, cache_row)
+                if cache_row and cache_row.get("payload") and field_cache.is_complete(fresh_fields):
+                    cached_final = field_cache.apply(json.loads(cache_row["payload"]), fresh_fields, overwrite=True)
                     stage_data["stage"] = 4
                     stage_data["status"] = "completed"
                     stage_data["message"] = "命中缓存，直接返回结果"
                     stage_data["data"]["final_result"] = cached_final
                     stage_data["timestamp"] = now_utc()
+                    # 命中计数用于后台按热度刷新，放到响应之后写入
+                    background_tasks.add_task(cache_repo.record_hit, cache_key)
                     background_tasks.add_task(request_logger.log_request_end, 200)
                     return ProgressiveStageData(**stage_data)
             except Exception as e:
                 logger.error(f"缓存查询失败: {e}")
+            stage_timer.mark("cache")
 
         # 阶段2: 搜索本地数据库
         stage_data["stage"] = 2
@@ -243,6 +264,7 @@ async def process_company_progressive(
 
         local_search_result = enterprise_service.search_local_database(company_name)
         stage_data["data"]["local_result"] = local_search_result
+        stage_timer.mark("local")
 
         if local_search_result['found']:
             stage_data["message"] = f"在本地数据库中找到企业信息"
@@ -349,11 +371,11 @@ async def process_company_progressive(
                     try:
                         if final_data["details"].get("address") and not final_data["details"].get("district_name"):
                             addr = final_data["details"]["address"]
-                            # 简单中文地址解析：仅提取“市”
-                            import re
-                            m_city = re.search(r'([\u4e00-\u9fa5]{2,10})市', addr)
-                            if m_city:
-                                final_data["details"]["district_name"] = m_city.group(0)
+                            # 基于本地地名库解析地级市
+                            from infrastructure.utils.address_processor import address_processor
+                            city = address_processor.extractor.resolve_region(addr)["city"]
+                            if city:
+                                final_data["details"]["district_name"] = city
                     except Exception:
                         pass
                     # 数据源标记
@@ -370,107 +392,139 @@ async def process_company_progressive(
             except Exception as e:
                 logger.error(f"融合本地数据失败: {e}")
 
+            # 记录本次计算的字段来源；本地数据库优先，其余空缺用新鲜的字段缓存填充
+            field_sources: Dict[str, Any] = {}
+            if final_data["details"].get("data_source") == "local_db":
+                for field_name, present in CompanyFieldCache.filled(final_data, ("address", "industry", "region")).items():
+                    if present:
+                        field_sources[field_name] = ("local_db", 1.0)
+            if fresh_fields:
+                CompanyFieldCache.apply(final_data, fresh_fields)
+            stage_timer.mark("merge")
+
+            # 外部服务熔断时跳过联网补全，直接返回本地/快速路径结果
+            network_degraded = False
+            try:
+                from infrastructure.external.circuit_breaker import is_provider_available
+                from infrastructure.external.bocha_client import BOCHA_CIRCUIT_NAME
+                network_degraded = not is_provider_available(BOCHA_CIRCUIT_NAME)
+                if network_degraded and getattr(request, "enable_network", True):
+                    logger.warning(f"[{request_id}] 博查AI服务熔断中，跳过联网补全")
+                    stage_data["data"]["network_result"] = {"status": "degraded", "data": {}}
+            except Exception as e:
+                logger.error(f"熔断状态检查失败: {e}")
+
             # 联网搜索补全：在启用联网测试时，尽量填充缺失字段
             try:
-                if getattr(request, "enable_network", True):
+                if getattr(request, "enable_network", True) and not network_degraded:
                     from infrastructure.utils.text_processor import search_result_processor, company_name_extractor
                     norm = company_name_extractor.normalize_company_name(final_data["details"].get("name", ""))
-                    ns = enterprise_service.search_service.search_company_info(norm)
-                    if ns.get("status") == "success":
-                        data = ns.get("data", {}) or {}
-                        parsed = search_result_processor.extract_company_info_from_search_results({"data": data})
-                        # 地址
-                        addr = (parsed.get("address") or parsed.get("details", {}).get("address") or "").strip()
-                        if addr and not final_data["details"].get("address"):
-                            final_data["details"]["address"] = addr
-                        # 行业
-                        ind = (parsed.get("industry") or parsed.get("details", {}).get("industry") or "").strip()
-                        if ind and not final_data["details"].get("industry"):
-                            final_data["details"]["industry"] = ind
-                        # 区域
-                        reg = (parsed.get("region") or parsed.get("details", {}).get("region") or "").strip()
-                        if reg and not final_data["details"].get("district_name"):
-                            final_data["details"]["district_name"] = reg
-                        # 若仍未有区域，但有地址，尝试从地址仅提取“市”
-                        try:
-                            if final_data["details"].get("address") and not final_data["details"].get("district_name"):
-                                a = final_data["details"]["address"]
-                                m_city = re.search(r'([\u4e00-\u9fa5]{2,10})市', a)
-                                if m_city:
-                                    final_data["details"]["district_name"] = m_city.group(0)
-                        except Exception:
-                            pass
-                        # 若仍未有区域，尝试从描述中仅提取“市”
-                        try:
-                            if not final_data["details"].get("district_name"):
-                                desc = (data.get("description") or "").strip()
-                                if desc:
-                                    m_city = re.search(r'([\u4e00-\u9fa5]{2,10})市', desc)
-                                    if m_city:
-                                        final_data["details"]["district_name"] = m_city.group(0)
-                        except Exception:
-                            pass
-                        stage_data["data"]["network_result"] = {"status": "success", "data": data}
-                        # 近三年营收与企业地位（联网获取）
-                        try:
-                            from infrastructure.external.revenue_service import get_company_revenue_info
-                            rev = get_company_revenue_info(final_data["details"].get("name", ""))
-                            if rev:
-                                final_data["details"]["revenue_info"] = rev or final_data["details"].get("revenue_info") or ""
-                        except Exception as _:
-                            # 保持降级，不阻塞流程
-                            pass
-                        try:
-                            from infrastructure.external.ranking_service import get_company_ranking_status
-                            rank = get_company_ranking_status(final_data["details"].get("name", ""), final_data["details"].get("industry", ""))
-                            if rank:
-                                final_data["details"]["company_status"] = rank or final_data["details"].get("company_status") or ""
-                        except Exception as _:
-                            pass
+                    # 基础信息（地址/行业/区域）均已有值时不再搜索
+                    filled_before = CompanyFieldCache.filled(final_data, ("address", "industry", "region"))
+                    search_ok = all(filled_before.values())
+                    if not search_ok:
+                        ns = enterprise_service.search_service.search_company_info(norm)
+                        if ns.get("status") == "success":
+                            search_ok = True
+                            data = ns.get("data", {}) or {}
+                            parsed = search_result_processor.extract_company_info_from_search_results({"data": data})
+                            # 地址
+                            addr = (parsed.get("address") or parsed.get("details", {}).get("address") or "").strip()
+                            if addr and not final_data["details"].get("address"):
+                                final_data["details"]["address"] = addr
+                            # 行业
+                            ind = (parsed.get("industry") or parsed.get("details", {}).get("industry") or "").strip()
+                            if ind and not final_data["details"].get("industry"):
+                                final_data["details"]["industry"] = ind
+                            # 区域
+                            reg = (parsed.get("region") or parsed.get("details", {}).get("region") or "").strip()
+                            if reg and not final_data["details"].get("district_name"):
+                                final_data["details"]["district_name"] = reg
+                            # 若仍未有区域，依次从地址、描述中解析地级市（本地地名库）
+                            try:
+                                from infrastructure.utils.address_processor import address_processor
+                                for source_text in (final_data["details"].get("address"), data.get("description")):
+                                    if final_data["details"].get("district_name") or not source_text:
+                                        continue
+                                    city = address_processor.extractor.resolve_region(str(source_text))["city"]
+                                    if city:
+                                        final_data["details"]["district_name"] = city
+                            except Exception:
+                                pass
+                            stage_data["data"]["network_result"] = {"status": "success", "data": data}
+                            # 本次搜索过的字段都记录来源；仍为空的由 store() 按短TTL负缓存，避免每次请求重复搜索
+                            for field_name, present in CompanyFieldCache.filled(final_data, filled_before).items():
+                                if not filled_before[field_name]:
+                                    field_sources[field_name] = ("web_search", 0.6 if present else None)
+                    # 营收/地位/资讯只重新获取缺失或过期的字段
+                    if search_ok:
+                        # 近三年营收（联网获取）
+                        if CompanyFieldCache.needs(fresh_fields, "revenue"):
+                            try:
+                                from infrastructure.external.revenue_service import get_company_revenue_info
+                                rev = get_company_revenue_info(final_data["details"].get("name", ""))
+                                field_sources["revenue"] = ("revenue_service", None)
+                                if rev:
+                                    final_data["details"]["revenue_info"] = rev or final_data["details"].get("revenue_info") or ""
+                            except Exception as _:
+                                # 保持降级，不阻塞流程
+                                pass
+                        if CompanyFieldCache.needs(fresh_fields, "ranking"):
+                            try:
+                                from infrastructure.external.ranking_service import get_company_ranking_status
+                                rank = get_company_ranking_status(final_data["details"].get("name", ""), final_data["details"].get("industry", ""))
+                                field_sources["ranking"] = ("ranking_service", None)
+                                if rank:
+                                    final_data["details"]["company_status"] = rank or final_data["details"].get("company_status") or ""
+                            except Exception as _:
+                                pass
                         # 企业商业资讯（联网获取）：填充 news.summary 与 news.references
-                        try:
-                            from domain.services.analysis_service import AnalysisService
-                            _as = AnalysisService()
-                            _news = _as.get_company_news(final_data["details"].get("name", ""))
-                            final_data["news"] = {
-                                "summary": (_news or {}).get("summary", "暂无最新商业资讯"),
-                                "references": (_news or {}).get("references", [])
-                            }
-                            # 兜底：若没有新闻或仅占位，则直接用搜索结果构建参考资料
+                        if CompanyFieldCache.needs(fresh_fields, "news"):
                             try:
-                                needs_fallback = False
-                                if not final_data["news"]["references"]:
-                                    needs_fallback = True
-                                if (final_data["news"]["summary"] or "").strip() in ("", "暂无最新商业资讯"):
-                                    needs_fallback = True
-                                if needs_fallback:
-                                    from infrastructure.external.bocha_client import search_web
-                                    q = f"{final_data['details'].get('name','')} 最新 动态 新闻 资讯 公告"
-                                    sr = search_web(q, count=6, summary=False) or {}
-                                    items = (sr.get('results') or sr.get('data') or [])
-                                    refs = []
-                                    for it in items:
-                                        title = (it.get('title') or it.get('name') or '').strip()
-                                        url = (it.get('url') or it.get('link') or '').strip()
-                                        snippet = (it.get('snippet') or it.get('summary') or '').strip()
-                                        if url:
-                                            refs.append({
-                                                "title": title or url,
-                                                "url": url,
-                                                "source": it.get('source') or it.get('site') or '',
-                                                "snippet": snippet
-                                            })
-                                    if refs:
-                                        final_data["news"]["references"] = refs
-                                        final_data["news"]["summary"] = f"为您找到 {len(refs)} 条相关新闻，详见下方参考资料。"
+                                from domain.services.analysis_service import AnalysisService
+                                _as = AnalysisService()
+                                _news = _as.get_company_news(final_data["details"].get("name", ""))
+                                final_data["news"] = {
+                                    "summary": (_news or {}).get("summary", "暂无最新商业资讯"),
+                                    "references": (_news or {}).get("references", [])
+                                }
+                                field_sources["news"] = ("news_service", None)
+                                # 兜底：若没有新闻或仅占位，则直接用搜索结果构建参考资料
+                                try:
+                                    needs_fallback = False
+                                    if not final_data["news"]["references"]:
+                                        needs_fallback = True
+                                    if (final_data["news"]["summary"] or "").strip() in ("", "暂无最新商业资讯"):
+                                        needs_fallback = True
+                                    if needs_fallback:
+                                        from infrastructure.external.bocha_client import search_web
+                                        q = f"{final_data['details'].get('name','')} 最新 动态 新闻 资讯 公告"
+                                        sr = search_web(q, count=6, summary=False) or {}
+                                        items = (sr.get('results') or sr.get('data') or [])
+                                        refs = []
+                                        for it in items:
+                                            title = (it.get('title') or it.get('name') or '').strip()
+                                            url = (it.get('url') or it.get('link') or '').strip()
+                                            snippet = (it.get('snippet') or it.get('summary') or '').strip()
+                                            if url:
+                                                refs.append({
+                                                    "title": title or url,
+                                                    "url": url,
+                                                    "source": it.get('source') or it.get('site') or '',
+                                                    "snippet": snippet
+                                                })
+                                        if refs:
+                                            final_data["news"]["references"] = refs
+                                            final_data["news"]["summary"] = f"为您找到 {len(refs)} 条相关新闻，详见下方参考资料。"
+                                except Exception:
+                                    # 搜索兜底失败亦不阻塞
+                                    pass
                             except Exception:
-                                # 搜索兜底失败亦不阻塞
+                                # 保持降级，不阻塞流程
                                 pass
-                        except Exception:
-                            # 保持降级，不阻塞流程
-                            pass
             except Exception as e:
                 logger.error(f"联网搜索补全失败: {e}")
+            stage_timer.mark("network")
 
             # 轻量行业推断：若行业仍为空，基于名称与地址进行推断
             try:
@@ -479,17 +533,20 @@ async def process_company_progressive(
                     inferred = get_company_industry(final_data["details"].get("name", ""), final_data["details"].get("address", ""))
                     if inferred:
                         final_data["details"]["industry"] = inferred
+                    field_sources["industry"] = ("industry_inference", None)
             except Exception as e:
                 logger.error(f"行业推断失败: {e}")
+            stage_timer.mark("industry")
 
-            # 写入缓存（TTL=90天，缓存键标准化 + schema_version）；支持禁用
-            if not getattr(request, "disable_cache", False):
+            # 写入缓存（TTL=90天，缓存键标准化 + schema_version）；支持禁用；熔断降级结果不缓存
+            if not getattr(request, "disable_cache", False) and not network_degraded:
                 try:
                     from infrastructure.utils.text_processor import company_name_extractor
                     cache_repo = CompanyCacheRepository()
                     cache_key = company_name_extractor.normalize_company_name(final_data.get("company_name", ""))
                     final_data.setdefault("schema_version", "v1")
                     cache_repo.upsert_cache(cache_key, json.dumps(final_data), ttl_days=90)
+                    CompanyFieldCache(cache_repo).store(cache_key, final_data, field_sources)
                 except Exception as e:
                     logger.error(f"写入缓存失败: {e}")
 
@@ -535,6 +592,8 @@ async def process_company_progressive(
             except Exception:
                 pass
 
+            stage_timer.mark("finalize")
+
             # 最终阶段
             stage_data["stage"] = 4
             stage_data["status"] = "completed"
@@ -570,6 +629,56 @@ async def process_company_progressive(
         )
 
 
+def _sse_event(payload: Dict[str, Any], event: str = None) -> str:
+    """格式化一条Server-Sent Events消息"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+@router.post("/analysis/stream")
+async def stream_company_analysis(
+    request: AnalysisStreamRequest,
+    analysis_service: AnalysisService = Depends(get_analysis_service),
+    request_context: Dict[str, Any] = Depends(get_request_context)
+):
+    """
+    流式生成企业综合分析报告
+
+    以Server-Sent Events逐段返回LLM生成的分析内容：
+    meta（企业名称）→ 多条 delta（增量文本）→ done（完成）/ error（异常）
+    """
+    request_logger = request_context["request_logger"]
+    request_id = request_context["request_id"]
+    logger.info(f"[{request_id}] 开始流式企业分析: {request.company_name}")
+
+    enhanced_data = analysis_service.build_enhanced_data_from_details(request.company_name, request.details)
+    news_data = {
+        "summary": (request.news or {}).get("summary") or "暂无最新商业资讯",
+        "references": (request.news or {}).get("references") or []
+    }
+
+    def event_stream():
+        yield _sse_event({"company_name": enhanced_data["customer_name"]}, event="meta")
+        status_code = 200
+        try:
+            for delta in analysis_service.stream_comprehensive_company_analysis(enhanced_data, news_data):
+                yield _sse_event({"delta": delta})
+            yield _sse_event({"status": "completed"}, event="done")
+        except Exception as e:
+            status_code = 500
+            logger.error(f"[{request_id}] 流式企业分析异常: {str(e)}", exc_info=True)
+            yield _sse_event({"status": "error", "message": "服务器内部错误"}, event="error")
+        finally:
+            request_logger.log_request_end(status_code)
+
+    # 同步生成器由Starlette在线程池中迭代，不阻塞事件循环
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/update", response_model=UpdateCompanyResponse)
 async def update_company_info(
     request: UpdateCompanyRequest,
@@ -775,3 +884,153 @@ async def search_company(
             status_code=500,
             content=jsonable_encoder(error_payload)
         )
+
+
+# ==================== 批量补全任务 ====================
+
+def _batch_error(status_code: int, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content=jsonable_encoder({"status": "error", "message": message, "timestamp": now_utc()})
+    )
+
+
+async def _read_batch_inputs(request: Request):
+    """
+    从请求中读取企业名单
+
+    支持三种格式：JSON {"companies": [...]}、multipart 上传的CSV文件（字段名 file）、text/csv 请求体
+
+    Returns:
+        (企业名单, 来源)
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            raise ValueError("请通过 file 字段上传CSV文件")
+        raw = await upload.read()
+        return parse_batch_csv(raw.decode("utf-8-sig", errors="replace")), "csv"
+    if content_type.startswith("text/csv") or content_type.startswith("text/plain"):
+        raw = await request.body()
+        return parse_batch_csv(raw.decode("utf-8-sig", errors="replace")), "csv"
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise ValueError("请求体不是合法的JSON")
+    return BatchJobRequest.model_validate(payload).companies, "json"
+
+
+@router.post("/batch")
+async def create_batch_job(
+    request: Request,
+    batch_service: BatchJobService = Depends(get_batch_job_service)
+):
+    """
+    提交批量企业信息补全任务
+
+    名单写入本地持久化队列后立即返回任务信息（202），由后台工作协程按并发上限逐条处理；
+    通过 /company/batch/{job_id} 查询进度
+    """
+    try:
+        companies, source = await _read_batch_inputs(request)
+        job = batch_service.submit(companies, source=source)
+    except ValueError as e:
+        # pydantic.ValidationError 同为 ValueError 子类
+        return _batch_error(400, str(e))
+    except Exception as e:
+        logger.error(f"创建批量任务异常: {e}", exc_info=True)
+        return _batch_error(500, "服务器内部错误")
+
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder({"status": "success", "message": "批量任务已创建", "data": job, "timestamp": now_utc()})
+    )
+
+
+@router.get("/batch/{job_id}")
+async def get_batch_job(
+    job_id: str,
+    batch_service: BatchJobService = Depends(get_batch_job_service)
+):
+    """查询批量任务进度（各状态条目数、完成比例）"""
+    job = batch_service.get_job(job_id)
+    if job is None:
+        return _batch_error(404, "批量任务不存在")
+    return {"status": "success", "data": job, "timestamp": now_utc()}
+
+
+@router.get("/batch/{job_id}/results")
+async def list_batch_results(
+    job_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    status: str = None,
+    batch_service: BatchJobService = Depends(get_batch_job_service)
+):
+    """分页获取批量任务条目（任务未完成时返回已处理条目的部分结果）"""
+    if batch_service.get_job(job_id) is None:
+        return _batch_error(404, "批量任务不存在")
+    items = batch_service.list_results(job_id, offset=max(0, offset), limit=min(max(1, limit), 1000), status=status)
+    return jsonable_encoder({"status": "success", "data": {"job_id": job_id, "offset": offset, "items": items},
+                             "timestamp": now_utc()})
+
+
+@router.post("/batch/{job_id}/cancel")
+async def cancel_batch_job(
+    job_id: str,
+    batch_service: BatchJobService = Depends(get_batch_job_service)
+):
+    """取消批量任务：未开始的条目不再处理，已完成条目的结果保留"""
+    job = batch_service.get_job(job_id)
+    if job is None:
+        return _batch_error(404, "批量任务不存在")
+    if not batch_service.cancel(job_id):
+        return _batch_error(409, f"任务已结束（{job['status']}），无法取消")
+    return {"status": "success", "message": "批量任务已取消", "data": batch_service.get_job(job_id),
+            "timestamp": now_utc()}
+
+
+@router.get("/batch/{job_id}/download")
+async def download_batch_results(
+    job_id: str,
+    format: str = "ndjson",
+    batch_service: BatchJobService = Depends(get_batch_job_service)
+):
+    """
+    下载批量任务结果
+
+    format=ndjson（默认，每行一个条目）或 csv（常用字段展开）；结果分页读取并流式输出
+    """
+    if batch_service.get_job(job_id) is None:
+        return _batch_error(404, "批量任务不存在")
+    if format == "csv":
+        body, media_type, filename = batch_service.export_csv(job_id), "text/csv; charset=utf-8", f"{job_id}.csv"
+    elif format == "ndjson":
+        body, media_type, filename = batch_service.export_ndjson(job_id), "application/x-ndjson", f"{job_id}.ndjson"
+    else:
+        return _batch_error(400, "format 仅支持 ndjson 或 csv")
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/{name}/360")
+async def get_company_360(
+    name: str,
+    limit: int = Query(10, ge=1, le=50, description="商机、工单等列表型数据源每个返回的条数"),
+    sources: Optional[str] = Query(None, description="只查询这些数据源（逗号分隔），默认全部"),
+    company_360_service: Company360Service = Depends(get_company_360_service)
+):
+    """
+    企业360视图
+
+    解析一次企业身份后并发查询本地客户/链主、enterprise_QD、CRM、AS、IPG、工单与补全缓存，
+    每个数据源独立超时；单个数据源超时或失败只影响该数据源，返回中带各数据源状态与耗时
+    """
+    include = [s.strip() for s in sources.split(",") if s.strip()] if sources else None
+    document = await company_360_service.build(name, limit=limit, include=include)
+    return JSONResponse(content=jsonable_encoder({"status": "success", "data": document, "timestamp": now_utc()}))
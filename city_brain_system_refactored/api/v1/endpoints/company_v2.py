@@ -21,6 +21,7 @@ from api.v1.dependencies import (
 )
 from domain.services.enterprise_service_refactored import EnterpriseServiceRefactored
 from infrastructure.utils.datetime_utils import now_utc
+from infrastructure.utils.stage_timer import get_stage_timer
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -57,7 +58,9 @@ async def process_company_v2(
         )
 
         # 调用重构后的服务
+        stage_timer = get_stage_timer(context['request'])
         result = service.process_company_info(request.input_text)
+        stage_timer.mark("process")
 
         # 记录请求日志
         context.get('request_logger').log_request_end(
@@ -6,6 +6,7 @@ from typing import Dict, Any
 import logging
 
 from infrastructure.database.repositories.crm_sync_repository import CRMSyncRepository
+from api.v1.dependencies import get_company_identity_service
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +55,13 @@ async def get_customer_by_name(name: str) -> Dict[str, Any]:
     """
     try:
         repo = get_crm_sync_repo()
-        result = repo.find_customer_by_name(name)
+        # 先按名称等值查询，再通过企业身份表等值查该企业在本系统中的其他写法，最后才模糊匹配
+        result = repo.find_customer_by_name(name, fuzzy=False)
+        if not result:
+            identity = get_company_identity_service().resolve(name)
+            result = repo.find_customer_by_names(identity.keys_for("crm")) if identity else None
+        if not result:
+            result = repo.find_customer_by_name(name)
 
         if not result:
             raise HTTPException(status_code=404, detail=f"未找到客户: {name}")
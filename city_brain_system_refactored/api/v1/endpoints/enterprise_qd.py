@@ -7,6 +7,7 @@ from typing import List, Dict, Any, Optional
 import logging
 
 from infrastructure.database.repositories.enterprise_qd_repository import EnterpriseQDRepository
+from api.v1.dependencies import get_company_identity_service
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +54,13 @@ async def get_enterprise_by_name(name: str) -> Dict[str, Any]:
     """
     try:
         repo = get_enterprise_qd_repo()
-        result = repo.find_by_name(name)
+        # 先按名称等值查询，再通过企业身份表等值查该企业在本系统中的其他写法，最后才模糊匹配
+        result = repo.find_by_name(name, fuzzy=False)
+        if not result:
+            identity = get_company_identity_service().resolve(name)
+            result = repo.find_by_names(identity.keys_for("enterprise_qd")) if identity else None
+        if not result:
+            result = repo.find_by_name(name)
 
         if not result:
             raise HTTPException(status_code=404, detail=f"未找到企业: {name}")
@@ -19,6 +19,7 @@ from infrastructure.utils.datetime_utils import now_utc
 from api.v1.schemas.company import HealthResponse
 from api.v1.dependencies import get_container, get_request_context
 from infrastructure.external.service_manager import ServiceManager
+from infrastructure.external.circuit_breaker import get_all_circuit_breaker_status
 from infrastructure.database.connection import get_database_connection
 
 # 配置日志
@@ -96,6 +97,36 @@ def check_external_services_health() -> Dict[str, Any]:
         }
 
 
+def check_circuit_breakers() -> Dict[str, Any]:
+    """检查外部服务熔断器状态"""
+    try:
+        breakers = get_all_circuit_breaker_status()
+        open_breakers = [
+            name for name, status in breakers.items()
+            if status.get("state") != "closed"
+        ]
+
+        if open_breakers:
+            return {
+                "status": "degraded",
+                "message": f"外部服务熔断中: {', '.join(open_breakers)}",
+                "breakers": breakers
+            }
+        return {
+            "status": "healthy",
+            "message": "所有熔断器处于关闭状态",
+            "breakers": breakers
+        }
+
+    except Exception as e:
+        logger.error(f"熔断器状态检查失败: {str(e)}")
+        return {
+            "status": "error",
+            "message": f"熔断器状态检查异常: {str(e)}",
+            "breakers": {}
+        }
+
+
 def check_system_resources() -> Dict[str, Any]:
     """检查系统资源使用情况"""
     try:
@@ -210,12 +241,14 @@ async def detailed_health_check(
         # 并行检查各个组件
         db_health = check_database_health()
         external_health = check_external_services_health()
+        circuit_health = check_circuit_breakers()
         system_health = check_system_resources()
 
         # 综合判断整体状态
         all_statuses = [
             db_health["status"],
             external_health["status"],
+            circuit_health["status"],
             system_health["status"]
         ]
 
@@ -238,6 +271,7 @@ async def detailed_health_check(
                 "api": "healthy",
                 "database": db_health,
                 "external_services": external_health,
+                "circuit_breakers": circuit_health,
                 "system_resources": system_health
             }
         }
@@ -76,6 +76,31 @@ class ProgressiveStageData(BaseModel):
     timestamp: datetime = Field(default_factory=now_utc, description="阶段时间")
 
 
+class AnalysisStreamRequest(BaseModel):
+    """流式综合分析请求模型"""
+    company_name: str = Field(..., description="企业名称", min_length=1, max_length=200)
+    details: Dict[str, Any] = Field(default_factory=dict, description="企业详细信息（同渐进式结果的details）")
+    news: Dict[str, Any] = Field(default_factory=dict, description="新闻资讯（summary/references）")
+    
+    @field_validator('company_name', mode='before')
+    def validate_company_name(cls, v):
+        if not isinstance(v, str) or not v.strip():
+            raise ValueError('企业名称不能为空')
+        return v.strip()
+
+
+class BatchJobRequest(BaseModel):
+    """批量企业信息补全请求模型"""
+    companies: List[str] = Field(..., description="企业名称/查询文本列表", min_length=1)
+
+    @field_validator('companies')
+    def validate_companies(cls, v):
+        cleaned = [item.strip() for item in v if isinstance(item, str) and item.strip()]
+        if not cleaned:
+            raise ValueError('企业名单不能为空')
+        return cleaned
+
+
 class UpdateCompanyRequest(BaseModel):
     """企业信息更新请求模型"""
     customer_id: int = Field(..., description="客户ID", gt=0)
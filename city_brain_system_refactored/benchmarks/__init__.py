@@ -0,0 +1,4 @@
+"""
+性能基准与离线压测工具
+包含博查AI/LLM离线替身服务、接口压测与热点路径微基准
+"""
@@ -0,0 +1,499 @@
+"""
+博查AI与LLM离线替身服务
+提供与线上接口兼容的 /v1/web-search 与 /v1/chat/completions，
+支持可配置的延迟分布、错误率与429限流率，语料取自 data/processed 下的企业名单。
+
+使用方式：
+    python -m benchmarks.fake_services --latency-median 0.3 --latency-p99 1.5 --error-rate 0.01
+
+    export BOCHA_BASE_URL=http://127.0.0.1:18801/v1/web-search
+    export LLM_BASE_URL=http://127.0.0.1:18802
+"""
+import argparse
+import asyncio
+import csv
+import glob
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from infrastructure.utils.prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                'data', 'processed')
+DEFAULT_BOCHA_PORT = 18801
+DEFAULT_LLM_PORT = 18802
+
+# 语料缺失时使用的内置企业
+_BUILTIN_COMPANIES = [
+    {'name': '青岛啤酒股份有限公司', 'region': '青岛', 'industry': '食品饮料制造业', 'address': '山东省青岛市市北区登州路56号'},
+    {'name': '海尔智家股份有限公司', 'region': '青岛', 'industry': '家用电器制造业', 'address': '山东省青岛市崂山区海尔路1号'},
+    {'name': '潍柴动力股份有限公司', 'region': '潍坊', 'industry': '装备制造业', 'address': '山东省潍坊市高新区福寿东街197号'},
+]
+
+
+@dataclass
+class LatencyProfile:
+    """
+    延迟分布配置
+
+    distribution 取值：
+        fixed     固定为 median
+        uniform   在 [min_seconds, p99] 间均匀分布
+        lognormal 对数正态分布，由中位数与P99确定形状（默认，接近线上长尾）
+    """
+    distribution: str = 'lognormal'
+    median: float = 0.3
+    p99: float = 1.5
+    min_seconds: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """采样一次延迟（秒）"""
+        if self.median <= 0:
+            return 0.0
+        if self.distribution == 'fixed':
+            value = self.median
+        elif self.distribution == 'uniform':
+            value = rng.uniform(self.min_seconds, max(self.min_seconds, self.p99))
+        else:
+            # P99 对应标准正态分位 2.326
+            sigma = math.log(max(self.p99, self.median) / self.median) / 2.326
+            value = self.median * math.exp(sigma * rng.gauss(0.0, 1.0))
+        return max(self.min_seconds, value)
+
+
+@dataclass
+class FaultProfile:
+    """故障注入配置"""
+    error_rate: float = 0.0         # 返回500的比例
+    rate_limit_rate: float = 0.0    # 返回429的比例
+    retry_after: int = 1            # 429响应的 Retry-After 秒数
+
+
+@dataclass
+class FakeServiceConfig:
+    """替身服务配置"""
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    faults: FaultProfile = field(default_factory=FaultProfile)
+    stream_chunk_interval: float = 0.02   # 流式输出每个片段的间隔
+    seed: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
+
+    def update(self, values: Dict[str, Any]):
+        """按字典局部更新配置"""
+        for key, value in (values.get('latency') or {}).items():
+            if hasattr(self.latency, key):
+                setattr(self.latency, key, value)
+        for key, value in (values.get('faults') or {}).items():
+            if hasattr(self.faults, key):
+                setattr(self.faults, key, value)
+        if 'stream_chunk_interval' in values:
+            self.stream_chunk_interval = float(values['stream_chunk_interval'])
+
+
+def _stable_hash(text: str) -> int:
+    """跨进程稳定的字符串哈希"""
+    return zlib.crc32(text.encode('utf-8'))
+
+
+class FakeCorpus:
+    """由 data/processed 企业名单构建的替身语料"""
+
+    # 各CSV中的字段映射：企业名称、地区、行业、地址
+    _COLUMN_CANDIDATES = {
+        'name': ('customer_name',),
+        'region': ('region', 'customer_location'),
+        'industry': ('industry', 'industry_major'),
+        'address': ('address',),
+    }
+
+    def __init__(self, companies: List[Dict[str, str]]):
+        self.companies = companies or list(_BUILTIN_COMPANIES)
+        # 名称按长度降序，匹配时优先最长的企业名
+        self._names = sorted((c['name'] for c in self.companies), key=len, reverse=True)
+        self._by_name = {c['name']: c for c in self.companies}
+
+    @classmethod
+    def from_data_dir(cls, data_dir: str = DEFAULT_DATA_DIR) -> 'FakeCorpus':
+        """
+        从处理后的CSV目录加载语料
+
+        Args:
+            data_dir: CSV目录
+
+        Returns:
+            语料实例；目录不存在时使用内置企业
+        """
+        merged: Dict[str, Dict[str, str]] = {}
+        for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    reader = csv.DictReader(f)
+                    if 'customer_name' not in (reader.fieldnames or []):
+                        continue
+                    for row in reader:
+                        name = (row.get('customer_name') or '').strip()
+                        if len(name) < 4:
+                            continue
+                        entry = merged.setdefault(name, {'name': name, 'region': '', 'industry': '', 'address': ''})
+                        for key in ('region', 'industry', 'address'):
+                            if entry[key]:
+                                continue
+                            for column in cls._COLUMN_CANDIDATES[key]:
+                                value = (row.get(column) or '').split(',')[0].strip()
+                                if value:
+                                    entry[key] = value
+                                    break
+            except (OSError, csv.Error) as e:
+                logger.warning(f"读取语料文件失败: {path}: {e}")
+        logger.info(f"替身服务语料加载完成: {len(merged)} 家企业")
+        return cls(list(merged.values()))
+
+    def lookup(self, text: str) -> Dict[str, str]:
+        """
+        查找文本中提到的企业；未命中时按哈希稳定选择一家
+
+        Args:
+            text: 查询或提示词
+
+        Returns:
+            企业信息
+        """
+        for name in self._names:
+            if name in text:
+                return self._by_name[name]
+        return self.companies[_stable_hash(text) % len(self.companies)]
+
+
+class _Stats:
+    """请求计数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0}
+
+    def incr(self, key: str):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+async def _inject(config: FakeServiceConfig, rng: random.Random, stats: _Stats) -> Optional[JSONResponse]:
+    """等待采样延迟并按配置注入故障；返回非空时直接作为响应"""
+    stats.incr('requests')
+    delay = config.latency.sample(rng)
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    roll = rng.random()
+    if roll < config.faults.rate_limit_rate:
+        stats.incr('rate_limited')
+        return JSONResponse(status_code=429, content={'code': 429, 'msg': 'Too Many Requests'},
+                            headers={'Retry-After': str(config.faults.retry_after)})
+    if roll < config.faults.rate_limit_rate + config.faults.error_rate:
+        stats.incr('errors')
+        return JSONResponse(status_code=500, content={'code': 500, 'msg': 'Injected server error'})
+    stats.incr('ok')
+    return None
+
+
+def _add_admin_routes(app: FastAPI, config: FakeServiceConfig, stats: _Stats):
+    """注册查看/修改配置与统计的管理接口"""
+
+    @app.get('/_fake/stats')
+    async def fake_stats():
+        return stats.snapshot()
+
+    @app.get('/_fake/config')
+    async def get_fake_config():
+        return config.to_dict()
+
+    @app.put('/_fake/config')
+    async def update_fake_config(request: Request):
+        config.update(await request.json())
+        return config.to_dict()
+
+
+def build_search_payload(query: str, count: int, corpus: FakeCorpus) -> Dict[str, Any]:
+    """
+    生成与博查AI格式一致的搜索响应
+
+    Args:
+        query: 查询词
+        count: 结果条数
+        corpus: 语料
+
+    Returns:
+        响应体
+    """
+    company = corpus.lookup(query)
+    name = company['name']
+    region = company['region'] or '山东'
+    industry = company['industry'] or '制造业'
+    address = company['address'] or f"{region}市高新技术产业开发区"
+    rng = random.Random(_stable_hash(query))
+    revenue = rng.randint(5, 500)
+
+    templates = [
+        (f"{name} - 企业工商信息", f"{name}成立于{rng.randint(1990, 2020)}年，注册地址位于{address}，所属行业为{industry}。"),
+        (f"{name}发布{rng.randint(2021, 2024)}年年度报告", f"{name}全年实现营业收入{revenue}.{rng.randint(0, 99):02d}亿元，同比增长{rng.randint(-10, 30)}%。"),
+        (f"{name}签约重大订单", f"近日，{name}与多家合作伙伴签署战略合作协议，合同金额约{rng.randint(1, 50)}亿元。"),
+        (f"{region}市{industry}产业链链主企业名单", f"{name}入选{region}市重点产业链链主企业，带动上下游企业协同发展。"),
+        (f"{name}推出新产品", f"{name}发布新一代产品，持续加大研发投入，推进数字化转型。"),
+        (f"{name}投资建设新项目", f"{name}在{region}投资建设新生产基地，预计年产值{rng.randint(10, 100)}亿元。"),
+    ]
+
+    pages = []
+    for i in range(max(1, count)):
+        title, snippet = templates[i % len(templates)]
+        site = f"news{(_stable_hash(name) + i) % 20}.example.com"
+        pages.append({
+            'id': f"https://api.bochaai.com/v1/#WebPages.{i}",
+            'name': title,
+            'url': f"https://{site}/{_stable_hash(name + str(i)) % 10 ** 8}.html",
+            'displayUrl': f"https://{site}/",
+            'snippet': snippet,
+            'summary': snippet * 2,
+            'siteName': site,
+            'siteIcon': f"https://{site}/favicon.ico",
+            'dateLastCrawled': '2024-06-01T08:00:00Z'
+        })
+
+    return {
+        'code': 200,
+        'log_id': uuid.uuid4().hex[:16],
+        'msg': None,
+        'data': {
+            '_type': 'SearchResponse',
+            'queryContext': {'originalQuery': query},
+            'webPages': {
+                'webSearchUrl': f"https://bochaai.com/search?q={query}",
+                'totalEstimatedMatches': 1000 + rng.randint(0, 9000),
+                'value': pages,
+                'someResultsRemoved': False
+            },
+            'images': {'value': []},
+            'videos': None
+        }
+    }
+
+
+def create_fake_bocha_app(config: Optional[FakeServiceConfig] = None,
+                          corpus: Optional[FakeCorpus] = None) -> FastAPI:
+    """
+    创建博查AI替身服务
+
+    Args:
+        config: 服务配置
+        corpus: 语料
+
+    Returns:
+        FastAPI应用
+    """
+    config = config or FakeServiceConfig()
+    corpus = corpus or FakeCorpus.from_data_dir()
+    rng = random.Random(config.seed)
+    stats = _Stats()
+    app = FastAPI(title='Fake Bocha Web Search')
+    app.state.config = config
+    app.state.stats = stats
+
+    @app.post('/v1/web-search')
+    async def web_search(request: Request):
+        body = await request.json()
+        fault = await _inject(config, rng, stats)
+        if fault is not None:
+            return fault
+        query = str(body.get('query') or '')
+        count = min(int(body.get('count') or 10), 50)
+        return build_search_payload(query, count, corpus)
+
+    _add_admin_routes(app, config, stats)
+    return app
+
+
+def build_completion_text(prompt: str, corpus: FakeCorpus) -> str:
+    """
+    根据提示词类型生成确定性的模拟回答
+
+    Args:
+        prompt: 最后一条用户消息
+        corpus: 语料
+
+    Returns:
+        回答文本
+    """
+    company = corpus.lookup(prompt)
+    name = company['name']
+    industry = company['industry'] or '制造业'
+    if '所属行业' in prompt:
+        return industry
+    if '营收' in prompt:
+        revenue = _stable_hash(name) % 400 + 10
+        return f"{name}近三年营收总体稳定增长，最近一年营业收入约{revenue}亿元。"
+    if '商业新闻' in prompt or '新闻摘要' in prompt:
+        return (f"## 最新商业动态\n\n### 重要订单与合作\n- {name}签署战略合作协议【1】\n\n"
+                f"### 产品与技术创新\n- {name}发布新一代产品【2】\n\n"
+                f"## 参考来源\n【1】企业动态 - https://news.example.com/1\n【2】产品发布 - https://news.example.com/2")
+    return (f"{name}是{company['region'] or '山东'}地区{industry}领域的重要企业，"
+            f"经营状况良好，在产业链中具有一定影响力，建议持续关注其订单与研发投入情况。")
+
+
+def create_fake_llm_app(config: Optional[FakeServiceConfig] = None,
+                        corpus: Optional[FakeCorpus] = None) -> FastAPI:
+    """
+    创建OpenAI兼容的LLM替身服务
+
+    Args:
+        config: 服务配置（延迟为首字节延迟）
+        corpus: 语料
+
+    Returns:
+        FastAPI应用
+    """
+    config = config or FakeServiceConfig()
+    corpus = corpus or FakeCorpus.from_data_dir()
+    rng = random.Random(config.seed)
+    stats = _Stats()
+    app = FastAPI(title='Fake OpenAI-compatible Chat Completions')
+    app.state.config = config
+    app.state.stats = stats
+
+    @app.post('/v1/chat/completions')
+    async def chat_completions(request: Request):
+        body = await request.json()
+        fault = await _inject(config, rng, stats)
+        if fault is not None:
+            return fault
+
+        messages = body.get('messages') or []
+        prompt = next((m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'), '')
+        model = body.get('model') or 'deepseek-chat'
+        content = build_completion_text(prompt, corpus)
+        prompt_tokens = sum(estimate_tokens(m.get('content', '')) for m in messages)
+        completion_tokens = estimate_tokens(content)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get('stream'):
+            async def event_stream():
+                head = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model}
+                yield f"data: {json.dumps({**head, 'choices': [{'index': 0, 'delta': {'role': 'assistant'}}]}, ensure_ascii=False)}\n\n"
+                for i in range(0, len(content), 8):
+                    if config.stream_chunk_interval > 0:
+                        await asyncio.sleep(config.stream_chunk_interval)
+                    chunk = {**head, 'choices': [{'index': 0, 'delta': {'content': content[i:i + 8]}}]}
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                yield f"data: {json.dumps({**head, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(event_stream(), media_type='text/event-stream')
+
+        return {
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }
+
+    _add_admin_routes(app, config, stats)
+    return app
+
+
+def run_in_background(app: FastAPI, host: str = '127.0.0.1', port: int = 0, timeout: float = 10.0):
+    """
+    在后台线程中启动服务（供压测与测试使用）
+
+    Args:
+        app: FastAPI应用
+        host: 监听地址
+        port: 监听端口，0表示随机端口
+        timeout: 等待启动的最长秒数
+
+    Returns:
+        (server, base_url)；调用 server.should_exit = True 停止服务
+    """
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level='warning', access_log=False))
+    thread = threading.Thread(target=server.run, name=f"fake-{app.title}", daemon=True)
+    thread.start()
+
+    deadline = time.time() + timeout
+    while not server.started:
+        if time.time() > deadline or not thread.is_alive():
+            raise RuntimeError(f"替身服务启动失败: {app.title}")
+        time.sleep(0.02)
+
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    return server, f"http://{host}:{bound_port}"
+
+
+def main():
+    """命令行入口：同时启动博查AI与LLM替身服务"""
+    parser = argparse.ArgumentParser(description='博查AI / LLM 离线替身服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--bocha-port', type=int, default=DEFAULT_BOCHA_PORT)
+    parser.add_argument('--llm-port', type=int, default=DEFAULT_LLM_PORT)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='企业名单CSV目录')
+    parser.add_argument('--distribution', default='lognormal', choices=['lognormal', 'uniform', 'fixed'])
+    parser.add_argument('--latency-median', type=float, default=0.3, help='博查延迟中位数（秒）')
+    parser.add_argument('--latency-p99', type=float, default=1.5, help='博查延迟P99（秒）')
+    parser.add_argument('--llm-latency-median', type=float, default=1.0, help='LLM首字节延迟中位数（秒）')
+    parser.add_argument('--llm-latency-p99', type=float, default=5.0, help='LLM首字节延迟P99（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500错误比例')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='429限流比例')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    corpus = FakeCorpus.from_data_dir(args.data_dir)
+    faults = dict(error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+    bocha_config = FakeServiceConfig(
+        latency=LatencyProfile(args.distribution, args.latency_median, args.latency_p99),
+        faults=FaultProfile(**faults), seed=args.seed)
+    llm_config = FakeServiceConfig(
+        latency=LatencyProfile(args.distribution, args.llm_latency_median, args.llm_latency_p99),
+        faults=FaultProfile(**faults), seed=args.seed)
+
+    bocha_server, bocha_url = run_in_background(create_fake_bocha_app(bocha_config, corpus), args.host, args.bocha_port)
+    llm_server, llm_url = run_in_background(create_fake_llm_app(llm_config, corpus), args.host, args.llm_port)
+    print(f"export BOCHA_BASE_URL={bocha_url}/v1/web-search")
+    print(f"export LLM_BASE_URL={llm_url}")
+    print("按 Ctrl+C 停止")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        bocha_server.should_exit = True
+        llm_server.should_exit = True
+
+
+if __name__ == '__main__':
+    main()
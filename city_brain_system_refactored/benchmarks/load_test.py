@@ -0,0 +1,391 @@
+"""
+企业处理链路接口压测
+按可配置并发驱动 /company/process、/company/process/progressive、/v2/company/process
+以及CRM/商机查询接口，统计P50/P95/P99延迟、RPS、错误率与各阶段耗时（Server-Timing），
+结果保存为JSON，便于不同提交之间做回归对比。
+
+典型用法（离线，替身服务 + 本地MySQL）：
+    # 1. 准备MySQL数据：参见 scripts/README_DATABASE_SETUP.md 与 scripts/load_processed_data.py
+    # 2. 启动替身服务与应用并压测
+    python -m benchmarks.load_test --start-fakes --start-app --concurrency 16 --requests 500
+
+    # 与历史结果对比，P95退化超过20%时返回非零退出码
+    python -m benchmarks.load_test --base-url http://127.0.0.1:9003 --compare benchmarks/results/base.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_services import DEFAULT_BOCHA_PORT, DEFAULT_LLM_PORT, FakeCorpus
+from infrastructure.utils.stage_timer import parse_server_timing
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_DIR, 'benchmarks', 'results')
+DEFAULT_APP_PORT = 18800
+
+
+@dataclass
+class Scenario:
+    """压测场景：HTTP方法、路径与按企业名生成请求参数的函数"""
+    method: str
+    path: str
+    build: Callable[[str], Dict[str, Any]]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    'process': Scenario('POST', '/api/v1/company/process',
+                        lambda name: {'json': {'input_text': name}}),
+    'progressive': Scenario('POST', '/api/v1/company/process/progressive',
+                            lambda name: {'json': {'input_text': name, 'disable_cache': True}}),
+    'progressive_cached': Scenario('POST', '/api/v1/company/process/progressive',
+                                   lambda name: {'json': {'input_text': name}}),
+    'v2_process': Scenario('POST', '/api/v1/v2/company/process',
+                           lambda name: {'json': {'input_text': name}}),
+    'crm_opportunities': Scenario('GET', '/api/v1/crm/opportunities',
+                                  lambda name: {'params': {'company_name': name, 'page_size': 20}}),
+    'crm_customers': Scenario('GET', '/api/v1/crm-sync/customers/search',
+                              lambda name: {'params': {'keyword': name, 'limit': 10}}),
+    'opportunities_search': Scenario('GET', '/api/v1/opportunities/search',
+                                     lambda name: {'params': {'company_name': name, 'limit_per_source': 10}}),
+}
+
+DEFAULT_SCENARIOS = ['process', 'progressive', 'v2_process', 'crm_opportunities', 'opportunities_search']
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """线性插值分位数"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _round(value: Optional[float], digits: int = 2) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+def summarize(samples: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """
+    汇总单个场景的压测样本
+
+    Args:
+        samples: 每个请求的 {latency_ms, status, ok, stages}
+        wall_seconds: 压测墙钟时间
+
+    Returns:
+        统计结果
+    """
+    latencies = [s['latency_ms'] for s in samples]
+    errors = sum(1 for s in samples if not s['ok'])
+    stage_values: Dict[str, List[float]] = defaultdict(list)
+    for s in samples:
+        for stage, duration in (s.get('stages') or {}).items():
+            stage_values[stage].append(duration)
+
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'rps': round(len(samples) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        'latency_ms': {
+            'min': _round(min(latencies) if latencies else None),
+            'mean': _round(sum(latencies) / len(latencies) if latencies else None),
+            'p50': _round(percentile(latencies, 50)),
+            'p95': _round(percentile(latencies, 95)),
+            'p99': _round(percentile(latencies, 99)),
+            'max': _round(max(latencies) if latencies else None),
+        },
+        'status_codes': dict(Counter(str(s['status']) for s in samples)),
+        'stages_ms': {
+            stage: {
+                'count': len(values),
+                'p50': _round(percentile(values, 50)),
+                'p95': _round(percentile(values, 95)),
+                'p99': _round(percentile(values, 99)),
+            }
+            for stage, values in sorted(stage_values.items())
+        },
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient,
+                       scenario: Scenario,
+                       names: List[str],
+                       concurrency: int,
+                       total_requests: int,
+                       warmup: int = 0,
+                       seed: int = 0) -> Dict[str, Any]:
+    """
+    以固定并发执行一个场景
+
+    Args:
+        client: HTTP客户端
+        scenario: 场景
+        names: 企业名称语料
+        concurrency: 并发数
+        total_requests: 计入统计的请求数
+        warmup: 预热请求数（不计入统计）
+        seed: 选取企业名称的随机种子
+
+    Returns:
+        统计结果
+    """
+    rng = random.Random(seed)
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total_requests):
+        queue.put_nowait(rng.choice(names))
+
+    # 预热请求串行执行且不计入统计，避免冷启动（连接池、缓存加载）干扰结果
+    for _ in range(warmup):
+        try:
+            await client.request(scenario.method, scenario.path, **scenario.build(rng.choice(names)))
+        except httpx.HTTPError:
+            pass
+
+    samples: List[Dict[str, Any]] = []
+
+    async def worker():
+        while True:
+            try:
+                name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path, **scenario.build(name))
+                status = response.status_code
+                ok = status < 400
+                stages = parse_server_timing(response.headers.get('server-timing', ''))
+            except httpx.HTTPError as e:
+                status, ok, stages = type(e).__name__, False, {}
+            samples.append({
+                'latency_ms': (time.perf_counter() - start) * 1000,
+                'status': status,
+                'ok': ok,
+                'stages': stages
+            })
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def _git_commit() -> Optional[str]:
+    """当前提交号（用于结果归档）"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def _wait_http(url: str, timeout: float) -> bool:
+    """轮询直到URL可访问"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return True
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    return False
+
+
+def start_fakes(args) -> subprocess.Popen:
+    """以子进程启动博查AI/LLM替身服务"""
+    cmd = [sys.executable, '-m', 'benchmarks.fake_services',
+           '--bocha-port', str(args.bocha_port), '--llm-port', str(args.llm_port),
+           '--latency-median', str(args.fake_latency_median), '--latency-p99', str(args.fake_latency_p99),
+           '--llm-latency-median', str(args.fake_llm_latency_median),
+           '--llm-latency-p99', str(args.fake_llm_latency_p99),
+           '--error-rate', str(args.fake_error_rate), '--rate-limit-rate', str(args.fake_rate_limit_rate),
+           '--seed', str(args.seed)]
+    proc = subprocess.Popen(cmd, cwd=PROJECT_DIR, stdout=subprocess.DEVNULL)
+    if not _wait_http(f"http://127.0.0.1:{args.llm_port}/_fake/stats", 30):
+        proc.terminate()
+        raise RuntimeError('替身服务启动失败')
+    return proc
+
+
+def start_app(args) -> subprocess.Popen:
+    """以子进程启动应用，外部服务指向替身服务"""
+    env = dict(os.environ)
+    if args.start_fakes:
+        env['BOCHA_BASE_URL'] = f"http://127.0.0.1:{args.bocha_port}/v1/web-search"
+        env['LLM_BASE_URL'] = f"http://127.0.0.1:{args.llm_port}"
+        env.setdefault('BOCHA_API_KEY', 'fake-key')
+        env.setdefault('LLM_API_KEY', 'fake-key')
+    cmd = [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(args.app_port),
+           '--workers', str(args.app_workers), '--log-level', 'warning', '--no-access-log']
+    proc = subprocess.Popen(cmd, cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL)
+    if not _wait_http(f"http://127.0.0.1:{args.app_port}/api/v1/health/live", 60):
+        proc.terminate()
+        raise RuntimeError('应用启动失败')
+    return proc
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    对比两次压测结果
+
+    Args:
+        current: 本次结果
+        baseline: 基线结果
+        threshold: P95退化阈值（比例）
+
+    Returns:
+        退化描述列表；为空表示未退化
+    """
+    regressions = []
+    print(f"\n{'场景':<22}{'P95基线':>10}{'P95本次':>10}{'变化':>9}{'RPS基线':>10}{'RPS本次':>10}")
+    for name, result in current.get('scenarios', {}).items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            continue
+        old_p95 = base['latency_ms']['p95'] or 0
+        new_p95 = result['latency_ms']['p95'] or 0
+        change = (new_p95 - old_p95) / old_p95 if old_p95 else 0.0
+        print(f"{name:<22}{old_p95:>10.1f}{new_p95:>10.1f}{change:>+9.1%}{base['rps']:>10.1f}{result['rps']:>10.1f}")
+        if change > threshold:
+            regressions.append(f"{name}: P95 {old_p95:.1f}ms -> {new_p95:.1f}ms ({change:+.1%})")
+        if result['error_rate'] > base['error_rate'] + 0.01:
+            regressions.append(f"{name}: 错误率 {base['error_rate']:.2%} -> {result['error_rate']:.2%}")
+    return regressions
+
+
+def print_summary(name: str, result: Dict[str, Any]):
+    """打印单个场景的统计"""
+    lat = result['latency_ms']
+    print(f"📊 {name}: 请求={result['requests']} RPS={result['rps']} 错误率={result['error_rate']:.2%} "
+          f"P50={lat['p50']}ms P95={lat['p95']}ms P99={lat['p99']}ms")
+    for stage, stats in result['stages_ms'].items():
+        print(f"    - {stage:<10} P50={stats['p50']}ms P95={stats['p95']}ms")
+
+
+async def run(args) -> Dict[str, Any]:
+    """按参数执行所有场景"""
+    corpus = FakeCorpus.from_data_dir(args.data_dir) if args.data_dir else FakeCorpus.from_data_dir()
+    names = [c['name'] for c in corpus.companies]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    results = {}
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        for index, name in enumerate(args.scenarios):
+            result = await run_scenario(client, SCENARIOS[name], names, args.concurrency,
+                                        args.requests, args.warmup, seed=args.seed + index)
+            print_summary(name, result)
+            results[name] = result
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'base_url': args.base_url,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'fake_services': bool(args.start_fakes),
+            'fake_latency': {
+                'bocha_median': args.fake_latency_median, 'bocha_p99': args.fake_latency_p99,
+                'llm_median': args.fake_llm_latency_median, 'llm_p99': args.fake_llm_latency_p99,
+                'error_rate': args.fake_error_rate, 'rate_limit_rate': args.fake_rate_limit_rate,
+            } if args.start_fakes else None,
+        },
+        'scenarios': results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='企业处理链路接口压测')
+    parser.add_argument('--base-url', default=None, help='被测服务地址；与 --start-app 二选一')
+    parser.add_argument('--scenarios', nargs='+', default=DEFAULT_SCENARIOS, choices=sorted(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='每个场景计入统计的请求数')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=None, help='企业名单CSV目录（默认 data/processed）')
+    parser.add_argument('--output', default=None, help='结果JSON路径（默认 benchmarks/results/<时间>-<提交>.json）')
+    parser.add_argument('--compare', default=None, help='基线结果JSON，用于回归对比')
+    parser.add_argument('--regression-threshold', type=float, default=0.2, help='P95退化阈值（比例）')
+
+    parser.add_argument('--start-fakes', action='store_true', help='启动博查AI/LLM替身服务')
+    parser.add_argument('--bocha-port', type=int, default=DEFAULT_BOCHA_PORT)
+    parser.add_argument('--llm-port', type=int, default=DEFAULT_LLM_PORT)
+    parser.add_argument('--fake-latency-median', type=float, default=0.3)
+    parser.add_argument('--fake-latency-p99', type=float, default=1.5)
+    parser.add_argument('--fake-llm-latency-median', type=float, default=1.0)
+    parser.add_argument('--fake-llm-latency-p99', type=float, default=5.0)
+    parser.add_argument('--fake-error-rate', type=float, default=0.0)
+    parser.add_argument('--fake-rate-limit-rate', type=float, default=0.0)
+
+    parser.add_argument('--start-app', action='store_true', help='以子进程启动被测应用')
+    parser.add_argument('--app-port', type=int, default=DEFAULT_APP_PORT)
+    parser.add_argument('--app-workers', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.start_app:
+        args.base_url = f"http://127.0.0.1:{args.app_port}"
+    if not args.base_url:
+        parser.error('需要指定 --base-url 或 --start-app')
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    processes: List[subprocess.Popen] = []
+    try:
+        if args.start_fakes:
+            processes.append(start_fakes(args))
+        if args.start_app:
+            processes.append(start_app(args))
+
+        report = asyncio.run(run(args))
+    finally:
+        for proc in reversed(processes):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{report['meta']['git_commit'] or 'nogit'}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 结果已保存: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.regression_threshold)
+        if regressions:
+            print("\n❌ 性能退化:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ 未发现性能退化")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
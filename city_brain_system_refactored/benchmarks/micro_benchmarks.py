@@ -0,0 +1,280 @@
+"""
+文本、地址与搜索结果解析热点路径微基准
+覆盖每个请求和批量任务都会执行的正则密集函数，统计 ops/sec 与单次调用的内存分配，
+结果保存为JSON，便于部署前发现性能退化。
+
+语料：data/processed/*.csv 中的企业名称与地址；搜索结果默认由替身服务生成，
+也可通过 --payload-dir 指定录制的博查AI响应（*.json）。
+
+用法：
+    python -m benchmarks.micro_benchmarks
+    python -m benchmarks.micro_benchmarks --only extract_company_name --compare benchmarks/results/micro-base.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_services import FakeCorpus, build_search_payload
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_DIR, 'benchmarks', 'results')
+
+# 用户输入模板（模拟 /company/process 的 input_text）
+INPUT_TEMPLATES = ['查询{name}的信息', '{name}', '帮我分析一下{name}', '{name}的营收情况怎么样？']
+
+
+@dataclass
+class MicroBenchmark:
+    """单个微基准：被测函数与输入集合"""
+    name: str
+    func: Callable[[Any], Any]
+    inputs: Sequence[Any]
+
+
+@dataclass
+class BenchmarkCorpus:
+    """微基准语料"""
+    names: List[str]
+    texts: List[str]
+    addresses: List[str]
+    payloads: List[Dict[str, Any]]
+    content_payloads: List[Dict[str, Any]]
+
+
+def load_corpus(data_dir: Optional[str] = None,
+                payload_dir: Optional[str] = None,
+                limit: int = 500) -> BenchmarkCorpus:
+    """
+    构建微基准语料
+
+    Args:
+        data_dir: 企业名单CSV目录
+        payload_dir: 录制的搜索结果JSON目录（可选）
+        limit: 每类语料的最大条数
+
+    Returns:
+        语料
+    """
+    corpus = FakeCorpus.from_data_dir(data_dir) if data_dir else FakeCorpus.from_data_dir()
+    companies = corpus.companies[:limit]
+    names = [c['name'] for c in companies]
+    texts = [INPUT_TEMPLATES[i % len(INPUT_TEMPLATES)].format(name=n) for i, n in enumerate(names)]
+    addresses = [c['address'] for c in corpus.companies if c.get('address')][:limit]
+
+    payloads: List[Dict[str, Any]] = []
+    if payload_dir:
+        for path in sorted(glob.glob(os.path.join(payload_dir, '*.json')))[:limit]:
+            with open(path, encoding='utf-8') as f:
+                payloads.append(json.load(f))
+    if not payloads:
+        payloads = [build_search_payload(f"{n} 营收 行业 地址", 10, corpus) for n in names[:min(limit, 100)]]
+
+    # 纯文本格式（data.content），覆盖行业/地址正则提取分支
+    content_payloads = []
+    for payload in payloads:
+        pages = ((payload.get('data') or {}).get('webPages') or {}).get('value') or []
+        content = ' '.join(f"{p.get('name', '')} {p.get('summary') or p.get('snippet', '')}" for p in pages)
+        content_payloads.append({'data': {'content': content}})
+
+    return BenchmarkCorpus(names=names, texts=texts, addresses=addresses,
+                           payloads=payloads, content_payloads=content_payloads)
+
+
+def build_benchmarks(corpus: BenchmarkCorpus) -> List[MicroBenchmark]:
+    """组装待测热点函数"""
+    from infrastructure.utils.text_processor import company_name_extractor, search_result_processor
+    from infrastructure.utils.address_processor import AddressExtractor
+    from infrastructure.external.ranking_service import _extract_search_contents
+
+    address_extractor = AddressExtractor()
+    ranking_inputs = [(p, corpus.names[i % len(corpus.names)]) for i, p in enumerate(corpus.payloads)]
+
+    return [
+        MicroBenchmark('extract_company_name', company_name_extractor.extract_company_name, corpus.texts),
+        MicroBenchmark('normalize_company_name', company_name_extractor.normalize_company_name, corpus.names),
+        MicroBenchmark('extract_company_info_from_search_results',
+                       search_result_processor.extract_company_info_from_search_results, corpus.payloads),
+        MicroBenchmark('extract_company_info_from_content',
+                       search_result_processor.extract_company_info_from_search_results, corpus.content_payloads),
+        MicroBenchmark('parse_address_components', address_extractor.parse_address_components, corpus.addresses),
+        MicroBenchmark('ranking_extract_search_contents',
+                       lambda args: _extract_search_contents(*args), ranking_inputs),
+    ]
+
+
+def measure(bench: MicroBenchmark, min_time: float = 0.5, repeat: int = 3) -> Dict[str, Any]:
+    """
+    测量单个微基准
+
+    先按 min_time 确定迭代轮数，重复 repeat 次取最优吞吐；
+    再在 tracemalloc 下跑一轮，统计单次调用的平均临时分配量与最大值。
+
+    Args:
+        bench: 微基准
+        min_time: 每次测量的最短时长（秒）
+        repeat: 重复次数
+
+    Returns:
+        统计结果
+    """
+    inputs = list(bench.inputs)
+    if not inputs:
+        return {'calls': 0, 'ops_per_sec': None, 'us_per_op': None, 'alloc_bytes_per_op': None, 'alloc_peak_kb': None}
+    func = bench.func
+
+    # 预热并估算所需轮数
+    start = time.perf_counter()
+    for item in inputs:
+        func(item)
+    one_pass = max(time.perf_counter() - start, 1e-9)
+    rounds = max(1, int(min_time / one_pass))
+
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for item in inputs:
+                func(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    calls = rounds * len(inputs)
+
+    # 逐次记录调用期间的峰值增量，近似单次调用的临时内存分配
+    tracemalloc.start()
+    peaks = []
+    for item in inputs:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func(item)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(max(0, peak - current))
+    tracemalloc.stop()
+
+    return {
+        'calls': calls,
+        'ops_per_sec': round(calls / best, 1),
+        'us_per_op': round(best / calls * 1e6, 3),
+        'alloc_bytes_per_op': round(sum(peaks) / len(peaks), 1),
+        'alloc_peak_kb': round(max(peaks) / 1024, 2),
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    对比两次微基准结果
+
+    Args:
+        current: 本次结果
+        baseline: 基线结果
+        threshold: 吞吐下降阈值（比例）
+
+    Returns:
+        退化描述列表
+    """
+    regressions = []
+    print(f"\n{'基准':<42}{'基线ops/s':>12}{'本次ops/s':>12}{'变化':>9}")
+    for name, result in current.get('benchmarks', {}).items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if not base or not base.get('ops_per_sec') or not result.get('ops_per_sec'):
+            continue
+        change = result['ops_per_sec'] / base['ops_per_sec'] - 1
+        print(f"{name:<42}{base['ops_per_sec']:>12.0f}{result['ops_per_sec']:>12.0f}{change:>+9.1%}")
+        if change < -threshold:
+            regressions.append(f"{name}: {base['ops_per_sec']:.0f} -> {result['ops_per_sec']:.0f} ops/s ({change:+.1%})")
+    return regressions
+
+
+def run(only: Optional[Sequence[str]] = None,
+        data_dir: Optional[str] = None,
+        payload_dir: Optional[str] = None,
+        limit: int = 500,
+        min_time: float = 0.5,
+        repeat: int = 3) -> Dict[str, Any]:
+    """
+    执行微基准
+
+    Args:
+        only: 仅执行指定名称的基准
+        data_dir: 企业名单CSV目录
+        payload_dir: 录制搜索结果目录
+        limit: 每类语料最大条数
+        min_time: 每次测量最短时长
+        repeat: 重复次数
+
+    Returns:
+        结果报告
+    """
+    corpus = load_corpus(data_dir, payload_dir, limit)
+    results = {}
+    for bench in build_benchmarks(corpus):
+        if only and bench.name not in only:
+            continue
+        result = measure(bench, min_time=min_time, repeat=repeat)
+        results[bench.name] = {'inputs': len(bench.inputs), **result}
+        print(f"⏱️  {bench.name:<42} {result['ops_per_sec']:>12} ops/s  "
+              f"{result['us_per_op']:>9} µs/op  {result['alloc_bytes_per_op']:>9} B/op")
+
+    from benchmarks.load_test import _git_commit
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'min_time': min_time,
+            'repeat': repeat,
+            'corpus': {'names': len(corpus.names), 'addresses': len(corpus.addresses),
+                       'payloads': len(corpus.payloads), 'recorded_payloads': bool(payload_dir)},
+        },
+        'benchmarks': results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='热点路径微基准')
+    parser.add_argument('--only', nargs='+', default=None, help='仅执行指定基准')
+    parser.add_argument('--data-dir', default=None, help='企业名单CSV目录（默认 data/processed）')
+    parser.add_argument('--payload-dir', default=None, help='录制的博查AI响应JSON目录')
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--min-time', type=float, default=0.5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help='结果JSON路径')
+    parser.add_argument('--compare', default=None, help='基线结果JSON')
+    parser.add_argument('--regression-threshold', type=float, default=0.15, help='吞吐下降阈值（比例）')
+    args = parser.parse_args(argv)
+
+    report = run(args.only, args.data_dir, args.payload_dir, args.limit, args.min_time, args.repeat)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"micro-{stamp}-{report['meta']['git_commit'] or 'nogit'}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 结果已保存: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.regression_threshold)
+        if regressions:
+            print("\n❌ 性能退化:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ 未发现性能退化")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
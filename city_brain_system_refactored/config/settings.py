@@ -47,6 +47,12 @@ class BochaAPISettings(BaseSettings):
     timeout: int = Field(default=int(os.getenv("BOCHA_TIMEOUT", 30)), description="请求超时时间")
     max_retries: int = Field(default=int(os.getenv("BOCHA_MAX_RETRIES", 3)), description="最大重试次数")
     retry_delay: float = Field(default=float(os.getenv("BOCHA_RETRY_DELAY", 1.0)), description="重试延迟秒数")
+    circuit_failure_threshold: int = Field(default=int(os.getenv("BOCHA_CIRCUIT_FAILURE_THRESHOLD", 5)), description="熔断失败阈值")
+    circuit_recovery_timeout: float = Field(default=float(os.getenv("BOCHA_CIRCUIT_RECOVERY_TIMEOUT", 30.0)), description="熔断恢复秒数")
+    hedge_enabled: bool = Field(default=(os.getenv("BOCHA_HEDGE_ENABLED", "false").lower() == "true"), description="是否启用对冲请求")
+    hedge_percentile: float = Field(default=float(os.getenv("BOCHA_HEDGE_PERCENTILE", 95.0)), description="触发对冲的延迟分位")
+    hedge_budget_ratio: float = Field(default=float(os.getenv("BOCHA_HEDGE_BUDGET_RATIO", 0.05)), description="对冲请求占比上限")
+    hedge_min_samples: int = Field(default=int(os.getenv("BOCHA_HEDGE_MIN_SAMPLES", 20)), description="启用对冲前的最少延迟样本数")
 
 
 class LLMAPISettings(BaseSettings):
@@ -58,9 +64,12 @@ class LLMAPISettings(BaseSettings):
     timeout: int = Field(default=int(os.getenv("LLM_TIMEOUT", 60)), description="请求超时时间")
     max_retries: int = Field(default=int(os.getenv("LLM_MAX_RETRIES", 3)), description="最大重试次数")
     retry_delay: float = Field(default=float(os.getenv("LLM_RETRY_DELAY", 2.0)), description="重试延迟")
+    circuit_failure_threshold: int = Field(default=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", 5)), description="熔断失败阈值")
+    circuit_recovery_timeout: float = Field(default=float(os.getenv("LLM_CIRCUIT_RECOVERY_TIMEOUT", 30.0)), description="熔断恢复秒数")
 
     temperature: float = Field(default=float(os.getenv("LLM_TEMPERATURE", 0.7)), description="采样温度")
     max_tokens: int = Field(default=int(os.getenv("LLM_MAX_TOKENS", 2000)), description="最大token数")
+    prompt_evidence_token_budget: int = Field(default=int(os.getenv("LLM_PROMPT_EVIDENCE_TOKEN_BUDGET", 1500)), description="提示词中搜索证据的token预算")
 
 
 class AppSettings(BaseSettings):
@@ -76,6 +85,25 @@ class AppSettings(BaseSettings):
     log_level: str = Field(default="INFO", description="日志级别")
     log_file: Optional[str] = Field(default=None, description="日志文件路径")
 
+    industry_model_path: str = Field(default=os.getenv("INDUSTRY_MODEL_PATH", "data/industry_classifier.npz"), description="本地行业分类模型路径")
+    industry_target_accuracy: float = Field(default=float(os.getenv("INDUSTRY_TARGET_ACCURACY", 0.95)), description="本地行业分类须在留出集上达到的准确率，训练时据此标定置信度阈值，达不到则不启用本地判定")
+    industry_label_map_path: str = Field(default=os.getenv("INDUSTRY_LABEL_MAP_PATH", "data/industry_label_map.csv"), description="外部行业标注到QD_industry行业名称的映射表（CSV）")
+
+    batch_queue_path: str = Field(default=os.getenv("BATCH_QUEUE_PATH", "data/batch_jobs.sqlite3"), description="批量补全任务队列（SQLite）路径")
+    batch_concurrency: int = Field(default=int(os.getenv("BATCH_CONCURRENCY", 3)), description="批量补全并发处理数")
+    batch_lease_seconds: float = Field(default=float(os.getenv("BATCH_LEASE_SECONDS", 120)), description="批量条目处理租约（秒），心跳超过该时长未更新的处理中条目重新入队")
+
+    reenrich_concurrency: int = Field(default=int(os.getenv("REENRICH_CONCURRENCY", 4)), description="全量重新补全并发处理数")
+    reenrich_rate_limit: float = Field(default=float(os.getenv("REENRICH_RATE_LIMIT", 2.0)), description="全量重新补全速率上限（家/秒，0表示不限）")
+
+    refresh_hourly_budget: int = Field(default=int(os.getenv("REFRESH_HOURLY_BUDGET", 0)), description="后台增量刷新每小时外部API调用预算（按进程计算，多worker部署时总量为worker数×预算），0表示关闭（默认）")
+    refresh_interval_seconds: int = Field(default=int(os.getenv("REFRESH_INTERVAL_SECONDS", 300)), description="后台增量刷新调度间隔（秒）")
+    refresh_revenue_max_age_days: int = Field(default=int(os.getenv("REFRESH_REVENUE_MAX_AGE_DAYS", 90)), description="营收信息最长保鲜天数")
+    refresh_ranking_max_age_days: int = Field(default=int(os.getenv("REFRESH_RANKING_MAX_AGE_DAYS", 30)), description="排名信息最长保鲜天数")
+    refresh_news_max_age_days: int = Field(default=int(os.getenv("REFRESH_NEWS_MAX_AGE_DAYS", 3)), description="新闻资讯最长保鲜天数")
+
+    company360_source_timeout: float = Field(default=float(os.getenv("COMPANY360_SOURCE_TIMEOUT", 3.0)), description="企业360视图单个数据源查询超时（秒）")
+
 
 class CRMDatabaseSettings(BaseSettings):
     """CRM数据库配置"""
@@ -46,6 +46,12 @@ class BochaAPISettings:
         self.timeout = int(os.getenv('BOCHA_TIMEOUT', 30))
         self.max_retries = int(os.getenv('BOCHA_MAX_RETRIES', 3))
         self.retry_delay = float(os.getenv('BOCHA_RETRY_DELAY', 1.0))
+        self.circuit_failure_threshold = int(os.getenv('BOCHA_CIRCUIT_FAILURE_THRESHOLD', 5))
+        self.circuit_recovery_timeout = float(os.getenv('BOCHA_CIRCUIT_RECOVERY_TIMEOUT', 30.0))
+        self.hedge_enabled = os.getenv('BOCHA_HEDGE_ENABLED', 'false').lower() == 'true'
+        self.hedge_percentile = float(os.getenv('BOCHA_HEDGE_PERCENTILE', 95.0))
+        self.hedge_budget_ratio = float(os.getenv('BOCHA_HEDGE_BUDGET_RATIO', 0.05))
+        self.hedge_min_samples = int(os.getenv('BOCHA_HEDGE_MIN_SAMPLES', 20))
 
 
 class LLMAPISettings:
@@ -57,10 +63,13 @@ class LLMAPISettings:
         self.timeout = int(os.getenv('LLM_TIMEOUT', 60))
         self.max_retries = int(os.getenv('LLM_MAX_RETRIES', 3))
         self.retry_delay = float(os.getenv('LLM_RETRY_DELAY', 2.0))
+        self.circuit_failure_threshold = int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', 5))
+        self.circuit_recovery_timeout = float(os.getenv('LLM_CIRCUIT_RECOVERY_TIMEOUT', 30.0))
         
         # 模型参数
         self.temperature = float(os.getenv('LLM_TEMPERATURE', 0.7))
         self.max_tokens = int(os.getenv('LLM_MAX_TOKENS', 2000))
+        self.prompt_evidence_token_budget = int(os.getenv('LLM_PROMPT_EVIDENCE_TOKEN_BUDGET', 1500))
 
 
 class AppSettings:
@@ -77,6 +86,30 @@ class AppSettings:
         # 日志配置
         self.log_level = os.getenv('APP_LOG_LEVEL', "INFO")
         self.log_file = os.getenv('APP_LOG_FILE', None)
+        
+        # 本地行业分类
+        self.industry_model_path = os.getenv('INDUSTRY_MODEL_PATH', "data/industry_classifier.npz")
+        self.industry_target_accuracy = float(os.getenv('INDUSTRY_TARGET_ACCURACY', 0.95))
+        self.industry_label_map_path = os.getenv('INDUSTRY_LABEL_MAP_PATH', "data/industry_label_map.csv")
+        
+        # 批量补全任务
+        self.batch_queue_path = os.getenv('BATCH_QUEUE_PATH', "data/batch_jobs.sqlite3")
+        self.batch_concurrency = int(os.getenv('BATCH_CONCURRENCY', 3))
+        self.batch_lease_seconds = float(os.getenv('BATCH_LEASE_SECONDS', 120))
+
+        # 全量重新补全（离线CLI）
+        self.reenrich_concurrency = int(os.getenv('REENRICH_CONCURRENCY', 4))
+        self.reenrich_rate_limit = float(os.getenv('REENRICH_RATE_LIMIT', 2.0))
+
+        # 后台增量刷新
+        self.refresh_hourly_budget = int(os.getenv('REFRESH_HOURLY_BUDGET', 0))  # 按进程计算，默认关闭
+        self.refresh_interval_seconds = int(os.getenv('REFRESH_INTERVAL_SECONDS', 300))
+        self.refresh_revenue_max_age_days = int(os.getenv('REFRESH_REVENUE_MAX_AGE_DAYS', 90))
+        self.refresh_ranking_max_age_days = int(os.getenv('REFRESH_RANKING_MAX_AGE_DAYS', 30))
+        self.refresh_news_max_age_days = int(os.getenv('REFRESH_NEWS_MAX_AGE_DAYS', 3))
+
+        # 企业360视图
+        self.company360_source_timeout = float(os.getenv('COMPANY360_SOURCE_TIMEOUT', 3.0))
 
 
 class Settings:
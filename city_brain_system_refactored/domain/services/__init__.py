@@ -12,6 +12,7 @@ from .enterprise_analyzer import EnterpriseAnalyzer
 from .data_enhancement_service import DataEnhancementService
 from .analysis_service import AnalysisService
 from .search_service import SearchService
+from .batch_job_service import BatchJobService
 
 __all__ = [
     'EnterpriseService',
@@ -21,5 +22,6 @@ __all__ = [
     'EnterpriseAnalyzer',
     'DataEnhancementService',
     'AnalysisService',
-    'SearchService'
+    'SearchService',
+    'BatchJobService'
 ]
\ No newline at end of file
@@ -70,6 +70,59 @@ class AnalysisService:
             # 如果LLM调用失败，返回基础的结构化信息
             return self.generate_fallback_analysis(enhanced_data, news_data)
     
+    def stream_comprehensive_company_analysis(self, enhanced_data, news_data):
+        """
+        流式生成企业综合分析报告，逐段返回LLM输出
+        
+        Args:
+            enhanced_data (dict): 增强后的企业数据
+            news_data (dict): 企业新闻数据
+            
+        Yields:
+            str: 分析报告的增量文本；LLM在输出前失败时返回完整的备用分析
+
+        Raises:
+            Exception: LLM在已输出部分内容后失败，由调用方告知客户端报告不完整
+        """
+        analysis_prompt = self._build_analysis_prompt(enhanced_data, news_data)
+        produced = False
+        
+        try:
+            from infrastructure.external.llm_client import LLMClient, ChatMessage
+            llm = LLMClient()
+            for delta in llm.stream_chat([ChatMessage.user(analysis_prompt)]):
+                produced = True
+                yield delta
+        except Exception as e:
+            print(f"流式生成企业分析报告失败: {e}")
+            if produced:
+                raise
+            yield self.generate_fallback_analysis(enhanced_data, news_data)
+    
+    def build_enhanced_data_from_details(self, company_name, details):
+        """
+        将接口返回的企业详情（details）转换为分析所需的增强数据格式
+        
+        Args:
+            company_name (str): 企业名称
+            details (dict): 企业详情，字段同 format_analysis_result 的 details
+            
+        Returns:
+            dict: 增强后的企业数据
+        """
+        details = details or {}
+        return {
+            'customer_name': company_name or details.get('name', ''),
+            'district_name': details.get('region') or details.get('district_name', ''),
+            'address': details.get('address', ''),
+            'industry_name': details.get('industry', ''),
+            'brain_name': details.get('industry_brain', ''),
+            'chain_status': details.get('chain_status', ''),
+            'revenue_info': details.get('revenue_info') or '暂无营收数据',
+            'company_status': details.get('company_status') or '暂无排名信息',
+            'data_source': details.get('data_source', '')
+        }
+    
     def _build_analysis_prompt(self, enhanced_data, news_data):
         """
         构建分析提示词
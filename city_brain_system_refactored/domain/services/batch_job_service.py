@@ -0,0 +1,305 @@
+"""
+批量企业信息补全服务
+将企业名单写入持久化本地队列，由有界并发的后台工作协程逐条调用企业信息处理流程，
+支持进度查询、部分结果、取消以及 NDJSON/CSV 导出
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from infrastructure.database.repositories.batch_job_repository import (
+    BatchJobRepository,
+    ITEM_ERROR,
+    ITEM_SUCCESS,
+)
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入配置，优先使用 settings，失败再回退到 simple_settings，最后默认
+try:
+    from config.settings import get_settings
+    _app = get_settings().app
+    DEFAULT_BATCH_QUEUE_PATH = _app.batch_queue_path
+    DEFAULT_BATCH_CONCURRENCY = _app.batch_concurrency
+    DEFAULT_BATCH_LEASE_SECONDS = _app.batch_lease_seconds
+except Exception:
+    try:
+        from config.simple_settings import get_simple_config
+        _app = get_simple_config().app
+        DEFAULT_BATCH_QUEUE_PATH = _app.batch_queue_path
+        DEFAULT_BATCH_CONCURRENCY = _app.batch_concurrency
+        DEFAULT_BATCH_LEASE_SECONDS = _app.batch_lease_seconds
+    except Exception:
+        DEFAULT_BATCH_QUEUE_PATH = 'data/batch_jobs.sqlite3'
+        DEFAULT_BATCH_CONCURRENCY = 3
+        DEFAULT_BATCH_LEASE_SECONDS = 120.0
+
+MAX_BATCH_SIZE = 5000
+
+# CSV导出列：(列名, 取值路径)
+CSV_EXPORT_COLUMNS = (
+    ('idx', ('idx',)),
+    ('input_text', ('input_text',)),
+    ('status', ('status',)),
+    ('company_name', ('result', 'company_name')),
+    ('region', ('result', 'details', 'region')),
+    ('address', ('result', 'details', 'address')),
+    ('industry', ('result', 'details', 'industry')),
+    ('industry_brain', ('result', 'details', 'industry_brain')),
+    ('chain_status', ('result', 'details', 'chain_status')),
+    ('revenue_info', ('result', 'details', 'revenue_info')),
+    ('company_status', ('result', 'details', 'company_status')),
+    ('data_source', ('result', 'details', 'data_source')),
+    ('summary', ('result', 'summary')),
+    ('error', ('error',)),
+)
+
+# 可识别为企业名称列的CSV表头
+CSV_NAME_HEADERS = ('company_name', 'customer_name', 'enterprise_name', 'name', 'input_text',
+                    '企业名称', '公司名称', '客户名称', '名称')
+
+
+def parse_batch_csv(content: str) -> List[str]:
+    """
+    从CSV文本中读取企业名称
+
+    优先使用可识别的表头列（company_name/企业名称等），否则取第一列；
+    无表头的单列文件整列视为企业名称
+
+    Args:
+        content: CSV文本
+
+    Returns:
+        企业名称列表（保持原顺序）
+    """
+    rows = [row for row in csv.reader(io.StringIO(content.lstrip('\ufeff'))) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    header = [cell.strip() for cell in rows[0]]
+    column = next((header.index(h) for h in CSV_NAME_HEADERS if h in header), None)
+    if column is None:
+        column, data_rows = 0, rows
+    else:
+        data_rows = rows[1:]
+    return [row[column].strip() for row in data_rows if len(row) > column and row[column].strip()]
+
+
+def _dig(data: Dict[str, Any], path: Iterable[str]) -> Any:
+    value: Any = data
+    for key in path:
+        if not isinstance(value, dict):
+            return ''
+        value = value.get(key)
+    return '' if value is None else value
+
+
+class BatchJobService:
+    """批量企业信息补全服务"""
+
+    def __init__(self, repository: BatchJobRepository,
+                 enterprise_service_factory: Callable[[], Any],
+                 concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                 poll_interval: float = 1.0,
+                 lease_seconds: float = DEFAULT_BATCH_LEASE_SECONDS):
+        """
+        初始化服务
+
+        Args:
+            repository: 批量任务仓储
+            enterprise_service_factory: 企业服务工厂，每个条目创建一个实例调用 process_company_info
+            concurrency: 并发处理数（工作协程数）
+            poll_interval: 队列空闲时的轮询间隔（秒）
+            lease_seconds: 条目处理租约（秒）；处理中每 1/4 租约续期一次，
+                过期未续期的条目视为处理进程已退出，由空闲的工作协程重新入队
+        """
+        self.repository = repository
+        self.enterprise_service_factory = enterprise_service_factory
+        self.concurrency = max(1, int(concurrency))
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._next_requeue_at = 0.0
+
+    # ==================== 任务管理 ====================
+
+    def submit(self, inputs: Iterable[str], source: str = 'json') -> Dict[str, Any]:
+        """
+        创建批量任务
+
+        Args:
+            inputs: 企业名称/查询文本
+            source: 输入来源（json/csv）
+
+        Returns:
+            任务信息
+
+        Raises:
+            ValueError: 名单为空或超过上限
+        """
+        cleaned = [text.strip() for text in inputs if isinstance(text, str) and text.strip()]
+        if not cleaned:
+            raise ValueError('企业名单不能为空')
+        if len(cleaned) > MAX_BATCH_SIZE:
+            raise ValueError(f'单个任务最多 {MAX_BATCH_SIZE} 家企业，当前 {len(cleaned)}')
+        job_id = self.repository.create_job(cleaned, source=source)
+        logger.info(f"批量任务已创建: {job_id}，共 {len(cleaned)} 家企业")
+        self.ensure_started()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询任务进度
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            任务信息（含各状态计数与完成比例）或None
+        """
+        job = self.repository.get_job(job_id)
+        if job is None:
+            return None
+        counts = job['counts']
+        finished = counts['success'] + counts['error'] + counts['cancelled']
+        job['processed'] = counts['success'] + counts['error']
+        job['progress'] = round(finished / job['total'], 4) if job['total'] else 1.0
+        return job
+
+    def list_results(self, job_id: str, offset: int = 0, limit: int = 100,
+                     status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """分页获取任务条目（含已完成条目的部分结果）"""
+        return self.repository.list_items(job_id, offset=offset, limit=limit, status=status)
+
+    def cancel(self, job_id: str) -> bool:
+        """取消任务，未开始的条目不再处理"""
+        cancelled = self.repository.cancel_job(job_id)
+        if cancelled:
+            logger.info(f"批量任务已取消: {job_id}")
+        return cancelled
+
+    # ==================== 导出 ====================
+
+    def export_ndjson(self, job_id: str) -> Iterator[str]:
+        """
+        逐行导出任务结果（NDJSON）
+
+        Args:
+            job_id: 任务ID
+
+        Yields:
+            每个条目一行JSON
+        """
+        for item in self.repository.iter_items(job_id):
+            record = {key: item.get(key) for key in ('idx', 'input_text', 'status', 'result', 'error')}
+            yield json.dumps(record, ensure_ascii=False, default=str) + '\n'
+
+    def export_csv(self, job_id: str) -> Iterator[str]:
+        """
+        逐行导出任务结果（CSV，带BOM便于Excel打开）
+
+        Args:
+            job_id: 任务ID
+
+        Yields:
+            CSV文本片段
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([name for name, _ in CSV_EXPORT_COLUMNS])
+        yield '\ufeff' + buffer.getvalue()
+        for item in self.repository.iter_items(job_id):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow([_dig(item, path) for _, path in CSV_EXPORT_COLUMNS])
+            yield buffer.getvalue()
+
+    # ==================== 后台处理 ====================
+
+    def ensure_started(self) -> None:
+        """
+        在当前事件循环中启动工作协程（已运行则跳过）
+
+        启动时将租约已过期的处理中条目（上次异常退出遗留）重新入队；
+        其他进程仍在续期的条目不受影响
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is loop and any(not task.done() for task in self._workers):
+            return
+        self._loop = loop
+        self._next_requeue_at = 0.0
+        self._requeue_expired()
+        self._wakeup = asyncio.Event()
+        self._workers = [loop.create_task(self._worker(i)) for i in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """停止工作协程（处理中的条目立即放回队列）"""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._workers = []
+
+    def _requeue_expired(self) -> None:
+        """将租约过期的条目重新入队（每半个租约最多检查一次）"""
+        now = self._loop.time()
+        if now < self._next_requeue_at:
+            return
+        self._next_requeue_at = now + self.lease_seconds / 2
+        requeued = self.repository.requeue_expired_items(self.lease_seconds)
+        if requeued:
+            logger.info(f"批量任务恢复: {requeued} 个租约过期的条目重新入队")
+
+    async def _heartbeat(self, job_id: str, idx: int) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 4)
+            self.repository.heartbeat_item(job_id, idx)
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            item = self.repository.claim_next_item()
+            if item is None:
+                self._requeue_expired()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process_item(item)
+
+    async def _process_item(self, item: Dict[str, Any]) -> None:
+        job_id, idx, text = item['job_id'], item['idx'], item['input_text']
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, idx))
+        try:
+            result = await asyncio.to_thread(self._run_enterprise_service, text)
+        except asyncio.CancelledError:
+            self.repository.release_item(job_id, idx)
+            raise
+        except Exception as e:
+            logger.error(f"批量任务 {job_id} 第 {idx} 条处理异常: {e}")
+            self.repository.finish_item(job_id, idx, ITEM_ERROR, error=str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        if isinstance(result, dict) and result.get('status') == 'success':
+            self.repository.finish_item(job_id, idx, ITEM_SUCCESS, result=result.get('data'))
+        else:
+            message = result.get('message') if isinstance(result, dict) else '处理失败'
+            self.repository.finish_item(job_id, idx, ITEM_ERROR, error=message or '处理失败')
+
+    def _run_enterprise_service(self, text: str) -> Dict[str, Any]:
+        return self.enterprise_service_factory().process_company_info(text)
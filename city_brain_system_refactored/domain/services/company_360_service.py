@@ -0,0 +1,202 @@
+"""
+企业360视图服务
+一次解析企业身份，再并发查询本地客户/链主、enterprise_QD、CRM、AS、IPG、工单与补全缓存，
+每个数据源独立超时，返回合并文档及各数据源耗时，替代前端对各接口的多次往返
+"""
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from domain.services.company_identity_service import CompanyIdentity
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入配置，优先使用 settings，失败再回退到 simple_settings，最后默认
+try:
+    from config.settings import get_settings
+    DEFAULT_SOURCE_TIMEOUT = get_settings().app.company360_source_timeout
+except Exception:
+    try:
+        from config.simple_settings import get_simple_config
+        DEFAULT_SOURCE_TIMEOUT = get_simple_config().app.company360_source_timeout
+    except Exception:
+        DEFAULT_SOURCE_TIMEOUT = 3.0
+
+
+@dataclass(frozen=True)
+class Company360Source:
+    """360视图中的一个数据源"""
+    name: str
+    # (查询名称, 企业身份或None, 每个数据源的条数上限) -> 可JSON序列化的结果，无数据时返回 None 或空列表
+    fetch: Callable[[str, Optional[CompanyIdentity], int], Any]
+    timeout: Optional[float] = None  # 为空时使用服务默认超时
+
+
+class Company360Service:
+    """企业360视图聚合"""
+
+    def __init__(self, identity_service: Any, sources: List[Company360Source],
+                 source_timeout: float = DEFAULT_SOURCE_TIMEOUT, max_workers: Optional[int] = None):
+        """
+        初始化服务
+
+        Args:
+            identity_service: 提供 resolve(name) 的企业身份服务
+            sources: 数据源定义
+            source_timeout: 单个数据源默认超时（秒），身份解析同样受此限制
+            max_workers: 数据源查询线程数；独立线程池避免超时未返回的查询占满默认执行器
+        """
+        self.identity_service = identity_service
+        self.sources = {source.name: source for source in sources}
+        self.source_timeout = source_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or 4 * max(1, len(sources)),
+                                            thread_name_prefix='company360')
+
+    async def _call(self, timeout: float, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(self._executor, func, *args), timeout)
+
+    async def _run_source(self, source: Company360Source, name: str,
+                          identity: Optional[CompanyIdentity], limit: int) -> Dict[str, Any]:
+        timeout = source.timeout or self.source_timeout
+        started = time.perf_counter()
+        entry: Dict[str, Any] = {'status': 'ok', 'latency_ms': 0.0, 'count': 0, 'data': None}
+        try:
+            data = await self._call(timeout, source.fetch, name, identity, limit)
+            entry['data'] = data
+            entry['count'] = len(data) if isinstance(data, list) else int(data is not None)
+            if not entry['count']:
+                entry['status'] = 'empty'
+        except asyncio.TimeoutError:
+            entry.update(status='timeout', error=f'超过 {timeout:g} 秒未返回')
+            logger.warning(f"360视图数据源超时 {source.name}: {name}")
+        except Exception as e:
+            entry.update(status='error', error=str(e))
+            logger.warning(f"360视图数据源失败 {source.name}: {e}")
+        entry['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return entry
+
+    async def build(self, name: str, limit: int = 10, include: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        构建企业360视图
+
+        Args:
+            name: 企业名称
+            limit: 列表型数据源（商机、工单）每个返回的条数上限
+            include: 只查询这些数据源，默认全部
+
+        Returns:
+            {'query', 'identity', 'sources': {名称: {status, latency_ms, count, data[, error]}}, 'summary', 'latency_ms'}
+        """
+        started = time.perf_counter()
+        identity_started = time.perf_counter()
+        identity: Optional[CompanyIdentity] = None
+        identity_status = 'ok'
+        try:
+            identity = await self._call(self.source_timeout, self.identity_service.resolve, name)
+            if identity is None:
+                identity_status = 'unresolved'
+        except asyncio.TimeoutError:
+            identity_status = 'timeout'
+        except Exception as e:
+            logger.warning(f"360视图身份解析失败 {name}: {e}")
+            identity_status = 'error'
+        identity_ms = round((time.perf_counter() - identity_started) * 1000, 1)
+
+        selected = [self.sources[s] for s in include if s in self.sources] if include else list(self.sources.values())
+        entries = await asyncio.gather(*(self._run_source(source, name, identity, limit) for source in selected))
+        sources = {source.name: entry for source, entry in zip(selected, entries)}
+
+        return {
+            'query': name,
+            'identity': {
+                'status': identity_status,
+                'latency_ms': identity_ms,
+                'canonical_id': identity.canonical_id if identity else None,
+                'canonical_name': identity.canonical_name if identity else None,
+                'source_keys': identity.source_keys if identity else {},
+            },
+            'sources': sources,
+            'summary': {
+                'found': [n for n, e in sources.items() if e['status'] == 'ok'],
+                'failed': [n for n, e in sources.items() if e['status'] in ('timeout', 'error')],
+                'total_count': sum(e['count'] for e in sources.values()),
+            },
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def _keys(identity: Optional[CompanyIdentity], source: str) -> List[str]:
+    return identity.keys_for(source) if identity else []
+
+
+def _to_dict(item: Any) -> Any:
+    return item.to_dict() if item is not None else None
+
+
+def default_360_sources(customer_repository: Any, enterprise_qd_repository: Any, crm_sync_repository: Any,
+                        opportunities_repository: Any, work_order_repository: Any,
+                        cache_repository: Any) -> List[Company360Source]:
+    """
+    默认数据源：先按查询名称等值查询，再按已登记身份在各系统中的名称原值等值查询，
+    都查不到才回退到各仓储原有的名称查询（含 LIKE 模糊匹配）
+
+    Returns:
+        数据源定义列表
+    """
+
+    def local(name, identity, limit):
+        # 先查用户输入的名称，查不到再用规范名，避免名称映射有误时展示其他企业的记录
+        return _to_dict(customer_repository.find_by_name(name)
+                        or (customer_repository.find_by_name(identity.canonical_name)
+                            if identity and identity.canonical_name != name else None))
+
+    # 名称等值查询 -> 身份键等值查询 -> LIKE 模糊匹配，索引可用的查询在前
+    def enterprise_qd(name, identity, limit):
+        return _to_dict(enterprise_qd_repository.find_by_name(name, fuzzy=False)
+                        or enterprise_qd_repository.find_by_names(_keys(identity, 'enterprise_qd'))
+                        or enterprise_qd_repository.find_by_name(name))
+
+    def crm(name, identity, limit):
+        return _to_dict(crm_sync_repository.find_customer_by_name(name, fuzzy=False)
+                        or crm_sync_repository.find_customer_by_names(_keys(identity, 'crm'))
+                        or crm_sync_repository.find_customer_by_name(name))
+
+    def as_opportunities(name, identity, limit):
+        rows = (opportunities_repository.find_as_opportunities_by_customers(_keys(identity, 'as'), limit)
+                or opportunities_repository.find_as_opportunities_by_customer(name, limit))
+        return [row.to_dict() for row in rows]
+
+    def ipg_clients(name, identity, limit):
+        rows = (opportunities_repository.find_ipg_clients_by_names(_keys(identity, 'ipg'), limit)
+                or opportunities_repository.find_ipg_clients_by_name(name, limit))
+        return [row.to_dict() for row in rows]
+
+    def work_orders(name, identity, limit):
+        rows = (work_order_repository.search_by_company_names(_keys(identity, 'work_order'), limit)
+                or work_order_repository.search_by_company_name(name, limit))
+        return [row.to_dict() for row in rows]
+
+    def profile(name, identity, limit):
+        # 只读补全缓存，不触发联网/LLM补全（由 /company/process 系列接口负责）
+        from infrastructure.utils.text_processor import company_name_extractor
+        candidates = [identity.canonical_name] if identity else []
+        for candidate in dict.fromkeys([name] + candidates):
+            row = cache_repository.get_valid_cache(company_name_extractor.normalize_company_name(candidate))
+            if row and row.get('payload'):
+                return {'cached_at': row.get('cached_at'), 'result': json.loads(row['payload'])}
+        return None
+
+    return [
+        Company360Source('local', local),
+        Company360Source('enterprise_qd', enterprise_qd),
+        Company360Source('crm', crm),
+        Company360Source('as_opportunities', as_opportunities),
+        Company360Source('ipg_clients', ipg_clients),
+        Company360Source('work_orders', work_orders),
+        Company360Source('profile', profile),
+    ]
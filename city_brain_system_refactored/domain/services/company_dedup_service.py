@@ -0,0 +1,165 @@
+"""
+企业名称去重服务
+汇总链主企业表、客户表及已有映射中的企业名称，匹配键相同或经人工确认的名称归为同一簇，
+为每个簇分配稳定的规范企业ID并增量写入 QD_company_alias；字面相似但匹配键不同的名称对
+只登记到 QD_company_alias_review 待确认，不自动合并。
+数据导入与运行时查询都通过该映射按等值匹配定位同一企业
+
+用法:
+    python -m domain.services.company_dedup_service --threshold 0.88
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from infrastructure.utils.company_dedup import (
+    DEFAULT_DEDUP_THRESHOLD, dedupe_names, find_review_pairs, normalize_company_key,
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 名称来源，靠前的优先作为规范名
+SOURCES = ('chain_leader', 'customer')
+
+
+def iter_paged_names(repository: Any, page_size: int = 1000) -> Iterator[str]:
+    """按 find_names_after(after_id, page_size) 键集分页读取仓储中的全部企业名称"""
+    after_id = 0
+    while True:
+        rows = repository.find_names_after(after_id, page_size)
+        if not rows:
+            return
+        for row in rows:
+            if row.get('name'):
+                yield row['name']
+        after_id = rows[-1]['id']
+
+
+class CompanyDedupService:
+    """企业名称去重与规范ID分配"""
+
+    def __init__(self, alias_repository: Any, name_sources: Dict[str, Any],
+                 threshold: float = DEFAULT_DEDUP_THRESHOLD, page_size: int = 1000):
+        """
+        初始化服务
+
+        Args:
+            alias_repository: 提供 iter_aliases / upsert_aliases / find_by_match_key /
+                add_review_pairs / find_approved_pairs 的映射仓储
+            name_sources: 数据源 -> 提供 find_names_after(after_id, page_size) 的仓储，按优先级排列
+            threshold: 待确认名称对的相似度阈值
+            page_size: 读取名称的分页大小
+        """
+        self.alias_repository = alias_repository
+        self.name_sources = name_sources
+        self.threshold = threshold
+        self.page_size = page_size
+
+    def run(self) -> Dict[str, int]:
+        """
+        执行一次去重并增量写入映射
+
+        已有名称保留原规范ID；多个已有簇合并时取最小ID，新簇分配新ID。
+        只写入新增或规范ID/规范名/匹配键发生变化的名称；跨簇的相似名称对登记待确认
+
+        Returns:
+            统计：names / clusters / new_clusters / written / review
+        """
+        existing = {row['alias_name']: row for row in self.alias_repository.iter_aliases()}
+        # 已有规范名排在最前，保证重复运行时规范名不漂移
+        ordered = sorted(existing.values(), key=lambda row: row['canonical_id'])
+        name_source: Dict[str, Optional[str]] = {}
+        for row in ordered:
+            if row['alias_name'] == row['canonical_name']:
+                name_source.setdefault(row['alias_name'], row.get('source'))
+        for source, repository in self.name_sources.items():
+            for name in iter_paged_names(repository, self.page_size):
+                name_source.setdefault(name.strip(), source)
+        for row in ordered:
+            name_source.setdefault(row['alias_name'], row.get('source'))
+
+        matches = dedupe_names(name_source, merges=self.alias_repository.find_approved_pairs())
+        clusters: Dict[str, List[Any]] = {}
+        canonical_of: Dict[str, str] = {}
+        for match in matches:
+            clusters.setdefault(match.canonical_name, []).append(match)
+            canonical_of[match.alias_name] = match.canonical_name
+
+        next_id = max((row['canonical_id'] for row in existing.values()), default=0) + 1
+        used_ids = set()
+        entries: List[Tuple[str, str, int, str, float, Optional[str]]] = []
+        new_clusters = 0
+        for canonical_name, members in clusters.items():
+            known_ids = sorted({existing[m.alias_name]['canonical_id'] for m in members
+                                if m.alias_name in existing} - used_ids)
+            if known_ids:
+                canonical_id = known_ids[0]
+            else:
+                canonical_id, next_id = next_id, next_id + 1
+                new_clusters += 1
+            used_ids.add(canonical_id)
+            for match in members:
+                previous = existing.get(match.alias_name)
+                if previous and (previous['canonical_id'], previous['canonical_name'], previous['match_key']) == \
+                        (canonical_id, canonical_name, match.match_key):
+                    continue
+                entries.append((match.alias_name, match.match_key, canonical_id, canonical_name,
+                                match.score, name_source.get(match.alias_name)))
+
+        written = self.alias_repository.upsert_aliases(entries) if entries else 0
+        review = [(pair.left_name, pair.right_name, pair.score)
+                  for pair in find_review_pairs(name_source, threshold=self.threshold)
+                  if canonical_of[pair.left_name] != canonical_of[pair.right_name]]
+        if review:
+            self.alias_repository.add_review_pairs(review)
+        stats = {'names': len(matches), 'clusters': len(clusters), 'new_clusters': new_clusters,
+                 'written': written, 'review': len(review)}
+        logger.info(f"企业名称去重: {stats}")
+        return stats
+
+    def resolve(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        查询名称对应的规范企业
+
+        Args:
+            name: 企业名称（任意写法）
+
+        Returns:
+            {'canonical_id', 'canonical_name'} 或 None
+        """
+        return self.alias_repository.find_by_match_key(normalize_company_key(name))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='企业名称去重并刷新规范企业ID映射表')
+    parser.add_argument('--source', nargs='+', choices=SOURCES, default=list(SOURCES), help='名称数据源')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_DEDUP_THRESHOLD, help='待确认名称对的相似度阈值')
+    parser.add_argument('--page-size', type=int, default=1000, help='每页读取名称数')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    from infrastructure.database.repositories.company_alias_repository import CompanyAliasRepository
+    from infrastructure.database.repositories.customer_repository import CustomerRepository
+    from infrastructure.database.repositories.enterprise_repository import EnterpriseRepository
+
+    repositories = {'chain_leader': EnterpriseRepository(), 'customer': CustomerRepository()}
+    service = CompanyDedupService(
+        alias_repository=CompanyAliasRepository(),
+        name_sources={source: repositories[source] for source in SOURCES if source in args.source},
+        threshold=args.threshold,
+        page_size=args.page_size,
+    )
+    stats = service.run()
+    print(f"名称 {stats['names']}，企业 {stats['clusters']}（新增 {stats['new_clusters']}），写入 {stats['written']}，"
+          f"待确认名称对 {stats['review']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, PROJECT_DIR)
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+企业结果字段级缓存
+将企业查询结果按字段（行业、地址、地区、营收、排名、新闻、摘要）分别缓存，
+每个字段有独立TTL并记录来源与置信度；处理流程只重新计算缺失或过期的字段，再用缓存部分拼装结果
+"""
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入配置，优先使用 settings，失败再回退到 simple_settings，最后默认
+try:
+    from config.settings import get_settings
+    _app = get_settings().app
+    DEFAULT_FIELD_MAX_AGE_DAYS = {
+        'revenue': _app.refresh_revenue_max_age_days,
+        'ranking': _app.refresh_ranking_max_age_days,
+        'news': _app.refresh_news_max_age_days,
+    }
+except Exception:
+    try:
+        from config.simple_settings import get_simple_config
+        _app = get_simple_config().app
+        DEFAULT_FIELD_MAX_AGE_DAYS = {
+            'revenue': _app.refresh_revenue_max_age_days,
+            'ranking': _app.refresh_ranking_max_age_days,
+            'news': _app.refresh_news_max_age_days,
+        }
+    except Exception:
+        DEFAULT_FIELD_MAX_AGE_DAYS = {'revenue': 90, 'ranking': 30, 'news': 3}
+
+# 已查询但无结果的字段（“暂无…”）按短TTL缓存，避免每次请求重复联网
+NEGATIVE_TTL_DAYS = 1
+
+# 快速路径摘要的标记
+QUICK_PATH_MARKER = '当前为快速路径结果'
+
+
+@dataclass(frozen=True)
+class CachedField:
+    """可缓存字段"""
+    name: str
+    path: Tuple[str, ...]  # 在 final_result 中的位置
+    ttl_days: int
+
+
+CACHED_FIELDS: Tuple[CachedField, ...] = (
+    CachedField('industry', ('details', 'industry'), 180),
+    CachedField('address', ('details', 'address'), 365),
+    CachedField('region', ('details', 'district_name'), 365),
+    CachedField('revenue', ('details', 'revenue_info'), DEFAULT_FIELD_MAX_AGE_DAYS['revenue']),
+    CachedField('ranking', ('details', 'company_status'), DEFAULT_FIELD_MAX_AGE_DAYS['ranking']),
+    CachedField('news', ('news',), DEFAULT_FIELD_MAX_AGE_DAYS['news']),
+    CachedField('summary', ('summary',), 30),
+)
+
+# 全部新鲜时可直接用缓存拼装结果的字段（摘要在快速路径中不计算，不作要求）
+COMPLETE_FIELDS = ('industry', 'address', 'region', 'revenue', 'ranking', 'news')
+
+FIELDS_BY_NAME: Dict[str, CachedField] = {field.name: field for field in CACHED_FIELDS}
+
+
+def is_placeholder_value(value: Any) -> bool:
+    """
+    是否为占位值（空、“暂无…”、快速路径摘要、无参考资料的占位新闻）
+
+    Args:
+        value: 字段值
+
+    Returns:
+        是否为占位值
+    """
+    if isinstance(value, dict):
+        return is_placeholder_value(value.get('summary')) and not value.get('references')
+    if value is None:
+        return True
+    if isinstance(value, str):
+        text = value.strip()
+        return not text or text.startswith('暂无') or QUICK_PATH_MARKER in text
+    return False
+
+
+def get_path(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    value: Any = data
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def set_path(data: Dict[str, Any], path: Tuple[str, ...], value: Any) -> None:
+    target = data
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+    target[path[-1]] = value
+
+
+class CompanyFieldCache:
+    """字段级缓存服务"""
+
+    def __init__(self, repository: Any, clock=datetime.now):
+        """
+        初始化服务
+
+        Args:
+            repository: 提供 get_cache_fields / upsert_cache_fields 的缓存仓储
+            clock: 当前时间（与数据库 DATETIME 同为本地时间）
+        """
+        self.repository = repository
+        self._clock = clock
+
+    def load(self, company_name: str, cache_row: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        读取仍然新鲜的字段
+
+        没有字段记录的旧版整体缓存按 cached_at + 字段TTL 判断，非占位值视为新鲜
+
+        Args:
+            company_name: 标准化公司名
+            cache_row: 整体缓存记录（get_valid_cache 的结果），可选
+
+        Returns:
+            {field_name: {'value', 'source', 'confidence'}}；value 为 None 表示近期已查询但无结果
+        """
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for name, row in self.repository.get_cache_fields(company_name).items():
+            if name not in FIELDS_BY_NAME or not row.get('fresh'):
+                continue
+            value = None
+            if row.get('value') is not None:
+                try:
+                    value = json.loads(row['value'])
+                except ValueError:
+                    continue
+            fresh[name] = {'value': value, 'source': row.get('source'), 'confidence': row.get('confidence')}
+
+        if cache_row and cache_row.get('payload') and cache_row.get('cached_at'):
+            try:
+                payload = json.loads(cache_row['payload'])
+            except ValueError:
+                payload = {}
+            now = self._clock()
+            for field in CACHED_FIELDS:
+                if field.name in fresh or cache_row['cached_at'] + timedelta(days=field.ttl_days) <= now:
+                    continue
+                value = get_path(payload, field.path)
+                if not is_placeholder_value(value):
+                    fresh[field.name] = {'value': value, 'source': 'legacy_cache', 'confidence': None}
+        return fresh
+
+    @staticmethod
+    def is_complete(fresh: Dict[str, Dict[str, Any]]) -> bool:
+        """结果所需字段是否都新鲜（含近期确认无结果的字段）"""
+        return all(name in fresh for name in COMPLETE_FIELDS)
+
+    @staticmethod
+    def needs(fresh: Dict[str, Dict[str, Any]], *names: str) -> bool:
+        """给定字段中是否有缺失或过期、需要重新计算的"""
+        return any(name not in fresh for name in names)
+
+    @staticmethod
+    def apply(final_data: Dict[str, Any], fresh: Dict[str, Dict[str, Any]], overwrite: bool = False) -> Dict[str, Any]:
+        """
+        将新鲜字段填入结果
+
+        Args:
+            final_data: 结果
+            fresh: load 的结果
+            overwrite: 是否覆盖已有的非占位值（默认只填充空值/占位值，本地数据库优先）
+
+        Returns:
+            final_data
+        """
+        for name, entry in fresh.items():
+            value = entry.get('value')
+            if is_placeholder_value(value):
+                continue
+            field = FIELDS_BY_NAME[name]
+            if overwrite or is_placeholder_value(get_path(final_data, field.path)):
+                set_path(final_data, field.path, value)
+        return final_data
+
+    def store(self, company_name: str, final_data: Dict[str, Any],
+              sources: Dict[str, Tuple[str, Optional[float]]]) -> int:
+        """
+        写入本次计算出的字段（未计算的字段不写，避免延长旧值的有效期）
+
+        Args:
+            company_name: 标准化公司名
+            final_data: 结果
+            sources: {field_name: (来源, 置信度)}，仅包含本次计算过的字段
+
+        Returns:
+            写入条数
+        """
+        entries = []
+        for name, (source, confidence) in sources.items():
+            field = FIELDS_BY_NAME.get(name)
+            if field is None:
+                continue
+            value = get_path(final_data, field.path)
+            if is_placeholder_value(value):
+                entries.append((name, None, source, None, NEGATIVE_TTL_DAYS))
+            else:
+                entries.append((name, json.dumps(value, ensure_ascii=False, default=str),
+                                source, confidence, field.ttl_days))
+        return self.repository.upsert_cache_fields(company_name, entries)
+
+    @staticmethod
+    def filled(final_data: Dict[str, Any], names: Iterable[str]) -> Dict[str, bool]:
+        """记录给定字段当前是否已有非占位值（用于判断后续步骤新填充了哪些字段）"""
+        return {name: not is_placeholder_value(get_path(final_data, FIELDS_BY_NAME[name].path)) for name in names}
@@ -0,0 +1,234 @@
+"""
+跨系统企业身份服务
+把各系统中的企业名称原值（QD客户/链主、enterprise_QD、CRM客户、IPG、AS、工单）映射到规范企业ID，
+写入 QD_company_identity；跨系统查询先解析一次身份，再按各系统的名称原值等值查询，替代 LIKE '%名称%'
+
+增量刷新：已登记的名称只在规范ID变化（去重服务合并了簇）时更新，新名称先按名称映射/匹配键归入已有企业，
+其余按匹配键归簇后分配新ID，与已有企业字面相似的登记为待确认名称对；数据源中已消失的名称删除
+
+用法:
+    python -m domain.services.company_identity_service --source ipg as work_order
+"""
+import argparse
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from domain.services.company_dedup_service import iter_paged_names
+from infrastructure.utils.company_dedup import (
+    DEFAULT_DEDUP_THRESHOLD, dedupe_names, find_review_pairs, normalize_company_key,
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 数据源，靠前的优先作为新企业的规范名
+IDENTITY_SOURCES = ('chain_leader', 'customer', 'enterprise_qd', 'crm', 'ipg', 'as', 'work_order')
+
+
+@dataclass(frozen=True)
+class CompanyIdentity:
+    """规范企业及其在各数据源中的名称原值"""
+    canonical_id: int
+    canonical_name: str
+    source_keys: Dict[str, List[str]] = field(default_factory=dict)
+
+    def keys_for(self, source: str) -> List[str]:
+        return self.source_keys.get(source, [])
+
+
+class CompanyIdentityService:
+    """跨系统企业身份表的构建与解析"""
+
+    def __init__(self, alias_repository: Any, identity_repository: Any,
+                 name_sources: Optional[Dict[str, Callable[[], Iterable[str]]]] = None,
+                 threshold: float = DEFAULT_DEDUP_THRESHOLD):
+        """
+        初始化服务
+
+        Args:
+            alias_repository: 提供 iter_aliases / upsert_aliases / find_by_match_key / add_review_pairs 的名称映射仓储
+            identity_repository: 提供 iter_identities / upsert_identities / delete_identities / find_source_keys 的身份仓储
+            name_sources: 数据源 -> 返回该数据源全部企业名称的函数（仅刷新时需要）
+            threshold: 新名称与已有企业登记为待确认名称对的相似度阈值
+        """
+        self.alias_repository = alias_repository
+        self.identity_repository = identity_repository
+        self.name_sources = name_sources or {}
+        self.threshold = threshold
+
+    def refresh(self, sources: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        增量刷新身份表
+
+        读取失败的数据源跳过（不删除其已有记录），其余数据源照常刷新
+
+        Args:
+            sources: 要刷新的数据源，默认全部
+
+        Returns:
+            {source: {'scanned', 'added', 'updated', 'removed'}}
+        """
+        selected = [s for s in (sources or self.name_sources) if s in self.name_sources]
+        aliases = list(self.alias_repository.iter_aliases())
+        alias_ids = {row['alias_name']: row['canonical_id'] for row in aliases}
+        key_ids: Dict[str, int] = {}
+        canonical_names: Dict[int, str] = {}
+        for row in sorted(aliases, key=lambda r: -(r.get('score') or 0)):
+            key_ids.setdefault(row['match_key'], row['canonical_id'])
+            canonical_names.setdefault(row['canonical_id'], row['canonical_name'])
+
+        existing: Dict[str, Dict[str, int]] = {}
+        for row in self.identity_repository.iter_identities():
+            existing.setdefault(row['source'], {})[row['source_key']] = row['canonical_id']
+
+        report: Dict[str, Dict[str, int]] = {}
+        identities: List[Tuple[str, str, int]] = []
+        removed: Dict[str, List[str]] = {}
+        # 去除首尾空白后的名称 -> [(数据源, 名称原值), ...]
+        pending: Dict[str, List[Tuple[str, str]]] = {}
+        for source in selected:
+            try:
+                names = {name for name in self.name_sources[source]() if name and name.strip()}
+            except Exception as e:
+                logger.warning(f"读取数据源 {source} 的企业名称失败，本轮跳过: {e}")
+                continue
+            stored = existing.get(source, {})
+            stats = report[source] = {'scanned': len(names), 'added': 0, 'updated': 0, 'removed': 0}
+            for name in names:
+                canonical_id = alias_ids.get(name.strip()) or key_ids.get(normalize_company_key(name))
+                if canonical_id is None:
+                    pending.setdefault(name.strip(), []).append((source, name))
+                elif stored.get(name) != canonical_id:
+                    stats['updated' if name in stored else 'added'] += 1
+                    identities.append((source, name, canonical_id))
+            removed[source] = [name for name in stored if name not in names]
+            stats['removed'] = len(removed[source])
+
+        alias_entries = self._assign_new_companies(pending, canonical_names, identities, report)
+        if alias_entries:
+            self.alias_repository.upsert_aliases(alias_entries)
+        if identities:
+            self.identity_repository.upsert_identities(identities)
+        for source, names in removed.items():
+            if names:
+                self.identity_repository.delete_identities(source, names)
+        logger.info(f"企业身份表刷新: {report}")
+        return report
+
+    def _assign_new_companies(self, pending: Dict[str, List[Tuple[str, str]]], canonical_names: Dict[int, str],
+                              identities: List[Tuple[str, str, int]],
+                              report: Dict[str, Dict[str, int]]) -> List[Tuple[str, str, int, str, float, Optional[str]]]:
+        """未能直接匹配的名称按匹配键归簇后分配新ID，与已有规范名字面相似的登记待确认"""
+        if not pending:
+            return []
+        seed_ids = {name: canonical_id for canonical_id, name in sorted(canonical_names.items())}
+        next_id = max(canonical_names, default=0) + 1
+        clusters: Dict[str, List[Any]] = {}
+        for match in dedupe_names(list(seed_ids) + list(pending)):
+            clusters.setdefault(match.canonical_name, []).append(match)
+
+        alias_entries = []
+        for cluster_name, members in clusters.items():
+            known_ids = sorted(seed_ids[m.alias_name] for m in members if m.alias_name in seed_ids)
+            if known_ids:
+                canonical_id = known_ids[0]
+                canonical_name = canonical_names[canonical_id]
+            else:
+                canonical_id, next_id = next_id, next_id + 1
+                canonical_name = cluster_name
+            for match in members:
+                occurrences = pending.get(match.alias_name)
+                if not occurrences:
+                    continue
+                alias_entries.append((match.alias_name, match.match_key, canonical_id, canonical_name,
+                                      match.score, occurrences[0][0]))
+                for source, name in occurrences:
+                    identities.append((source, name, canonical_id))
+                    report[source]['added'] += 1
+
+        review = [(pair.left_name, pair.right_name, pair.score)
+                  for pair in find_review_pairs(list(seed_ids) + list(pending), threshold=self.threshold)
+                  if pair.left_name in pending or pair.right_name in pending]
+        if review:
+            self.alias_repository.add_review_pairs(review)
+        return alias_entries
+
+    def resolve(self, name: str) -> Optional[CompanyIdentity]:
+        """
+        解析企业身份（一次匹配键查询 + 一次规范ID等值查询）
+
+        Args:
+            name: 企业名称（任意写法）
+
+        Returns:
+            企业身份；未登记或身份表不可用时为 None，调用方回退到原有模糊查询
+        """
+        match_key = normalize_company_key(name)
+        if not match_key:
+            return None
+        try:
+            row = self.alias_repository.find_by_match_key(match_key)
+            if not row:
+                return None
+            source_keys = self.identity_repository.find_source_keys(row['canonical_id'])
+        except Exception as e:
+            logger.warning(f"解析企业身份失败 {name}: {e}")
+            return None
+        return CompanyIdentity(row['canonical_id'], row['canonical_name'], source_keys)
+
+
+def build_name_sources(page_size: int = 1000) -> Dict[str, Callable[[], Iterable[str]]]:
+    """各数据源的企业名称读取函数（连接各自的数据库）"""
+    from infrastructure.database.repositories.crm_sync_repository import CRMSyncRepository
+    from infrastructure.database.repositories.customer_repository import CustomerRepository
+    from infrastructure.database.repositories.enterprise_qd_repository import EnterpriseQDRepository
+    from infrastructure.database.repositories.enterprise_repository import EnterpriseRepository
+    from infrastructure.database.repositories.opportunities_repository import OpportunitiesRepository
+    from infrastructure.database.repositories.work_order_repository import WorkOrderRepository
+
+    customer_repository = CustomerRepository()
+    enterprise_repository = EnterpriseRepository()
+    opportunities_repository = OpportunitiesRepository()
+    return {
+        'chain_leader': lambda: iter_paged_names(enterprise_repository, page_size),
+        'customer': lambda: iter_paged_names(customer_repository, page_size),
+        'enterprise_qd': EnterpriseQDRepository().iter_company_names,
+        'crm': CRMSyncRepository().iter_customer_names,
+        'ipg': opportunities_repository.iter_ipg_client_names,
+        'as': opportunities_repository.iter_as_customer_names,
+        'work_order': WorkOrderRepository().iter_company_names,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='增量刷新跨系统企业身份表')
+    parser.add_argument('--source', nargs='+', choices=IDENTITY_SOURCES, default=list(IDENTITY_SOURCES),
+                        help='数据源')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_DEDUP_THRESHOLD, help='新名称登记为待确认名称对的相似度阈值')
+    parser.add_argument('--page-size', type=int, default=1000, help='QD表每页读取名称数')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    from infrastructure.database.repositories.company_alias_repository import CompanyAliasRepository
+    from infrastructure.database.repositories.company_identity_repository import CompanyIdentityRepository
+
+    service = CompanyIdentityService(
+        alias_repository=CompanyAliasRepository(),
+        identity_repository=CompanyIdentityRepository(),
+        name_sources=build_name_sources(args.page_size),
+        threshold=args.threshold,
+    )
+    report = service.refresh(args.source)
+    for source, stats in report.items():
+        print(f"{source}: 扫描 {stats['scanned']}，新增 {stats['added']}，更新 {stats['updated']}，删除 {stats['removed']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, PROJECT_DIR)
+    sys.exit(main())
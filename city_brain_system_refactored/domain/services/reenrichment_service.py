@@ -0,0 +1,341 @@
+"""
+全量重新补全服务
+离线遍历 QD_customer / QD_enterprise_chain_leader，跳过缓存仍新鲜的企业，
+以有界并发和速率上限调用企业信息处理流程，结果批量写回缓存表，并按页记录断点以便中断后续跑
+
+用法:
+    python -m domain.services.reenrichment_service --source customer chain_leader --stop-at 06:00
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 尝试导入配置，优先使用 settings，失败再回退到 simple_settings，最后默认
+try:
+    from config.settings import get_settings
+    _app = get_settings().app
+    DEFAULT_REENRICH_CONCURRENCY = _app.reenrich_concurrency
+    DEFAULT_REENRICH_RATE_LIMIT = _app.reenrich_rate_limit
+except Exception:
+    try:
+        from config.simple_settings import get_simple_config
+        _app = get_simple_config().app
+        DEFAULT_REENRICH_CONCURRENCY = _app.reenrich_concurrency
+        DEFAULT_REENRICH_RATE_LIMIT = _app.reenrich_rate_limit
+    except Exception:
+        DEFAULT_REENRICH_CONCURRENCY = 4
+        DEFAULT_REENRICH_RATE_LIMIT = 2.0
+
+DEFAULT_CHECKPOINT_PATH = 'data/reenrich_checkpoint.json'
+CACHE_TTL_DAYS = 90
+SCHEMA_VERSION = 'v1'
+
+# 可重新补全的数据源
+SOURCES = ('customer', 'chain_leader')
+
+
+class ReenrichmentCheckpoint:
+    """断点文件：记录每个数据源已完成的最大主键及累计统计"""
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH):
+        """
+        初始化断点
+
+        Args:
+            path: 断点文件路径，相对路径按项目目录解析
+        """
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_DIR, path)
+        self.state: Dict[str, Any] = {'sources': {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+                self.state.setdefault('sources', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"断点文件读取失败，将从头开始: {e}")
+
+    def last_id(self, source: str) -> int:
+        return int(self.state['sources'].get(source, {}).get('last_id', 0))
+
+    def is_finished(self, source: str) -> bool:
+        return bool(self.state['sources'].get(source, {}).get('finished'))
+
+    def update(self, source: str, last_id: Optional[int] = None, finished: bool = False,
+               stats: Optional[Dict[str, int]] = None) -> None:
+        """
+        更新并落盘断点（先写临时文件再替换，避免中途崩溃留下半个文件）
+
+        Args:
+            source: 数据源
+            last_id: 已完成的最大主键
+            finished: 该数据源是否已遍历完成
+            stats: 本轮统计
+        """
+        entry = self.state['sources'].setdefault(source, {})
+        if last_id is not None:
+            entry['last_id'] = last_id
+        entry['finished'] = finished
+        if stats:
+            entry['stats'] = dict(stats)
+        entry['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def reset(self) -> None:
+        self.state = {'sources': {}}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _RateLimiter:
+    """按固定间隔放行的异步限速器（rate<=0 表示不限速）"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class ReenrichmentService:
+    """全量重新补全服务"""
+
+    def __init__(self, repositories: Dict[str, Any], cache_repository: Any,
+                 enterprise_service_factory: Callable[[], Any],
+                 checkpoint: ReenrichmentCheckpoint,
+                 concurrency: int = DEFAULT_REENRICH_CONCURRENCY,
+                 rate_limit: float = DEFAULT_REENRICH_RATE_LIMIT,
+                 page_size: int = 200, flush_size: int = 50,
+                 fresh_days: int = 30, ttl_days: int = CACHE_TTL_DAYS,
+                 normalize_name: Optional[Callable[[str], str]] = None):
+        """
+        初始化服务
+
+        Args:
+            repositories: 数据源 -> 提供 find_names_after(after_id, page_size) 的仓储
+            cache_repository: 提供 find_fresh_names / bulk_upsert_cache 的缓存仓储
+            enterprise_service_factory: 企业服务工厂，调用 process_company_info
+            checkpoint: 断点
+            concurrency: 并发处理数
+            rate_limit: 每秒最多发起的企业数（0 不限速）
+            page_size: 每页读取行数（每页完成后写一次断点）
+            flush_size: 结果累计到多少条时批量写入缓存
+            fresh_days: 缓存写入不足该天数视为新鲜，跳过
+            ttl_days: 写入缓存的有效期（天）
+            normalize_name: 缓存键标准化函数，默认使用 company_name_extractor
+        """
+        self.repositories = repositories
+        self.cache_repository = cache_repository
+        self.enterprise_service_factory = enterprise_service_factory
+        self.checkpoint = checkpoint
+        self.concurrency = max(1, int(concurrency))
+        self.rate_limit = rate_limit
+        self.page_size = page_size
+        self.flush_size = max(1, flush_size)
+        self.fresh_days = fresh_days
+        self.ttl_days = ttl_days
+        if normalize_name is None:
+            from infrastructure.utils.text_processor import company_name_extractor
+            normalize_name = company_name_extractor.normalize_company_name
+        self.normalize_name = normalize_name
+        self._buffer: List[Tuple[str, str]] = []
+
+    async def run(self, sources: Iterable[str] = SOURCES, force: bool = False,
+                  limit: Optional[int] = None, deadline: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """
+        依次处理各数据源，从断点处继续
+
+        Args:
+            sources: 数据源列表
+            force: 忽略缓存新鲜度，全部重新补全
+            limit: 本轮最多处理的企业数（不含跳过的）
+            deadline: 到达该时间后在当前页结束时停止（断点保留）
+
+        Returns:
+            各数据源统计
+        """
+        limiter = _RateLimiter(self.rate_limit)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        budget = {'remaining': limit}
+        report: Dict[str, Dict[str, int]] = {}
+        for source in sources:
+            if self.checkpoint.is_finished(source):
+                logger.info(f"[{source}] 上轮已完成，跳过（使用 --reset 重新开始）")
+                continue
+            report[source] = await self._run_source(source, force, limiter, semaphore, budget, deadline)
+            if self._should_stop(budget, deadline):
+                break
+        return report
+
+    async def _run_source(self, source: str, force: bool, limiter: _RateLimiter,
+                          semaphore: asyncio.Semaphore, budget: Dict[str, Optional[int]],
+                          deadline: Optional[datetime]) -> Dict[str, int]:
+        repository = self.repositories[source]
+        stats = {'scanned': 0, 'skipped_fresh': 0, 'enriched': 0, 'failed': 0, 'written': 0}
+        after_id = self.checkpoint.last_id(source)
+        logger.info(f"[{source}] 从主键 {after_id} 之后开始")
+
+        while True:
+            if self._should_stop(budget, deadline):
+                logger.info(f"[{source}] 到达停止条件，断点停在主键 {after_id}")
+                self.checkpoint.update(source, after_id, stats=stats)
+                return stats
+
+            rows = await asyncio.to_thread(repository.find_names_after, after_id, self.page_size)
+            if not rows:
+                self.checkpoint.update(source, after_id, finished=True, stats=stats)
+                logger.info(f"[{source}] 遍历完成: {stats}")
+                return stats
+
+            # 同页内按缓存键去重，只保留首次出现
+            keyed: Dict[str, str] = {}
+            for row in rows:
+                name = (row.get('name') or '').strip()
+                key = self.normalize_name(name) if name else ''
+                if key and key not in keyed:
+                    keyed[key] = name
+            stats['scanned'] += len(rows)
+
+            fresh = set() if force else await asyncio.to_thread(
+                self.cache_repository.find_fresh_names, list(keyed), self.ttl_days - self.fresh_days
+            )
+            stats['skipped_fresh'] += len(fresh)
+            pending = [(key, name) for key, name in keyed.items() if key not in fresh]
+            if budget['remaining'] is not None:
+                pending = pending[:budget['remaining']]
+                budget['remaining'] -= len(pending)
+
+            results = await asyncio.gather(*(self._enrich(name, limiter, semaphore) for _, name in pending))
+            for (key, name), data in zip(pending, results):
+                if data is None:
+                    stats['failed'] += 1
+                    continue
+                stats['enriched'] += 1
+                data.setdefault('schema_version', SCHEMA_VERSION)
+                self._buffer.append((key, json.dumps(data, ensure_ascii=False, default=str)))
+                if len(self._buffer) >= self.flush_size:
+                    stats['written'] += await self._flush()
+
+            # 结果落库后才推进断点，崩溃时最多重做一页
+            stats['written'] += await self._flush()
+            after_id = rows[-1]['id']
+            self.checkpoint.update(source, after_id, stats=stats)
+            logger.info(f"[{source}] 进度: 主键 {after_id}，{stats}")
+
+    async def _enrich(self, name: str, limiter: _RateLimiter,
+                      semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                result = await asyncio.to_thread(self.enterprise_service_factory().process_company_info, name)
+            except Exception as e:
+                logger.error(f"补全失败 {name}: {e}")
+                return None
+        if isinstance(result, dict) and result.get('status') == 'success' and isinstance(result.get('data'), dict):
+            return result['data']
+        logger.warning(f"补全失败 {name}: {result.get('message') if isinstance(result, dict) else result}")
+        return None
+
+    async def _flush(self) -> int:
+        if not self._buffer:
+            return 0
+        entries, self._buffer = self._buffer, []
+        await asyncio.to_thread(self.cache_repository.bulk_upsert_cache, entries, self.ttl_days)
+        return len(entries)
+
+    @staticmethod
+    def _should_stop(budget: Dict[str, Optional[int]], deadline: Optional[datetime]) -> bool:
+        if budget['remaining'] is not None and budget['remaining'] <= 0:
+            return True
+        return deadline is not None and datetime.now() >= deadline
+
+
+def parse_stop_at(value: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    解析 HH:MM 形式的停止时间；早于当前时间则视为次日
+
+    Args:
+        value: 停止时间，如 "06:00"
+        now: 当前时间（测试用）
+
+    Returns:
+        停止时刻或None
+    """
+    if not value:
+        return None
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in value.split(':', 1))
+    stop = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return stop if stop > now else stop + timedelta(days=1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='全量重新补全客户/链主企业信息（可断点续跑）')
+    parser.add_argument('--source', nargs='+', choices=SOURCES, default=list(SOURCES), help='数据源')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_REENRICH_CONCURRENCY, help='并发处理数')
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_REENRICH_RATE_LIMIT, help='每秒最多处理的企业数，0不限速')
+    parser.add_argument('--page-size', type=int, default=200, help='每页读取行数（断点粒度）')
+    parser.add_argument('--flush-size', type=int, default=50, help='批量写入缓存的条数')
+    parser.add_argument('--fresh-days', type=int, default=30, help='缓存写入不足该天数的企业跳过')
+    parser.add_argument('--force', action='store_true', help='忽略缓存新鲜度全部重新补全')
+    parser.add_argument('--limit', type=int, default=None, help='本轮最多补全的企业数')
+    parser.add_argument('--stop-at', default=None, help='到达该时间（HH:MM）后停止，如 06:00')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT_PATH, help='断点文件路径')
+    parser.add_argument('--reset', action='store_true', help='清除断点从头开始')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    from api.v1.dependencies import get_enterprise_service
+    from infrastructure.database.repositories.cache_repository import CompanyCacheRepository
+    from infrastructure.database.repositories.customer_repository import CustomerRepository
+    from infrastructure.database.repositories.enterprise_repository import EnterpriseRepository
+
+    checkpoint = ReenrichmentCheckpoint(args.checkpoint)
+    if args.reset:
+        checkpoint.reset()
+
+    service = ReenrichmentService(
+        repositories={'customer': CustomerRepository(), 'chain_leader': EnterpriseRepository()},
+        cache_repository=CompanyCacheRepository(),
+        enterprise_service_factory=get_enterprise_service,
+        checkpoint=checkpoint,
+        concurrency=args.concurrency,
+        rate_limit=args.rate_limit,
+        page_size=args.page_size,
+        flush_size=args.flush_size,
+        fresh_days=args.fresh_days,
+    )
+    report = asyncio.run(service.run(args.source, force=args.force, limit=args.limit,
+                                     deadline=parse_stop_at(args.stop_at)))
+    for source, stats in report.items():
+        print(f"{source}: 扫描 {stats['scanned']}，跳过 {stats['skipped_fresh']}，"
+              f"补全 {stats['enriched']}，失败 {stats['failed']}，写入 {stats['written']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, PROJECT_DIR)
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+缓存增量刷新调度服务
+按字段跟踪缓存企业的新鲜度（营收、排名、新闻老化速度不同），
+以“陈旧度 × 热度（缓存命中次数）”排序，在每小时外部API调用预算内逐字段刷新
+"""
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from domain.services.company_field_cache import DEFAULT_FIELD_MAX_AGE_DAYS, is_placeholder_value
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入配置，优先使用 settings，失败再回退到 simple_settings，最后默认
+try:
+    from config.settings import get_settings
+    _app = get_settings().app
+    DEFAULT_REFRESH_HOURLY_BUDGET = _app.refresh_hourly_budget
+    DEFAULT_REFRESH_INTERVAL = _app.refresh_interval_seconds
+except Exception:
+    try:
+        from config.simple_settings import get_simple_config
+        _app = get_simple_config().app
+        DEFAULT_REFRESH_HOURLY_BUDGET = _app.refresh_hourly_budget
+        DEFAULT_REFRESH_INTERVAL = _app.refresh_interval_seconds
+    except Exception:
+        DEFAULT_REFRESH_HOURLY_BUDGET = 0
+        DEFAULT_REFRESH_INTERVAL = 300
+
+
+@dataclass(frozen=True)
+class RefreshField:
+    """可独立刷新的缓存字段"""
+    name: str
+    path: Tuple[str, ...]                      # 在缓存 payload 中的位置
+    max_age: timedelta                         # 超过该时长视为完全陈旧
+    cost: int                                  # 一次刷新消耗的外部API调用数（搜索 + LLM）
+    fetch: Callable[[str, Dict[str, Any]], Any]  # (公司名, 当前payload) -> 新值
+
+
+def _fetch_revenue(company_name: str, payload: Dict[str, Any]) -> Any:
+    from infrastructure.external import get_company_revenue_info
+    return get_company_revenue_info(company_name)
+
+
+def _fetch_ranking(company_name: str, payload: Dict[str, Any]) -> Any:
+    from infrastructure.external import get_company_ranking_status
+    industry = (payload.get('details') or {}).get('industry') or None
+    return get_company_ranking_status(company_name, industry)
+
+
+def _fetch_news(company_name: str, payload: Dict[str, Any]) -> Any:
+    from infrastructure.external import get_company_business_news
+    news = get_company_business_news(company_name) or {}
+    return {
+        'summary': news.get('content') or '暂无最新商业资讯',
+        'references': news.get('sources') or [],
+    }
+
+
+def default_refresh_fields(max_age_days: Optional[Dict[str, int]] = None) -> List[RefreshField]:
+    """
+    默认可刷新字段：营收、排名、新闻
+
+    Args:
+        max_age_days: 各字段最长保鲜天数，默认取配置
+
+    Returns:
+        字段定义列表
+    """
+    days = dict(DEFAULT_FIELD_MAX_AGE_DAYS, **(max_age_days or {}))
+    return [
+        RefreshField('revenue', ('details', 'revenue_info'), timedelta(days=days['revenue']), 2, _fetch_revenue),
+        # 五百强 + 行业排名各一轮搜索与LLM，按上限计
+        RefreshField('ranking', ('details', 'company_status'), timedelta(days=days['ranking']), 4, _fetch_ranking),
+        RefreshField('news', ('news',), timedelta(days=days['news']), 2, _fetch_news),
+    ]
+
+
+class HourlyBudget:
+    """滑动一小时窗口内的外部API调用预算"""
+
+    def __init__(self, per_hour: int, clock: Callable[[], float] = time.monotonic):
+        self.per_hour = max(0, int(per_hour))
+        self._clock = clock
+        self._spent: Deque[Tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._spent and now - self._spent[0][0] >= 3600:
+            self._spent.popleft()
+
+    def remaining(self) -> int:
+        with self._lock:
+            self._expire(self._clock())
+            return self.per_hour - sum(cost for _, cost in self._spent)
+
+    def try_consume(self, cost: int) -> bool:
+        """预算足够时扣减并返回True"""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            if sum(c for _, c in self._spent) + cost > self.per_hour:
+                return False
+            self._spent.append((now, cost))
+            return True
+
+
+class RefreshScheduler:
+    """缓存增量刷新调度器"""
+
+    def __init__(self, cache_repository: Any,
+                 fields: Optional[List[RefreshField]] = None,
+                 hourly_budget: int = DEFAULT_REFRESH_HOURLY_BUDGET,
+                 interval: float = DEFAULT_REFRESH_INTERVAL,
+                 candidate_limit: int = 500,
+                 min_staleness: float = 1.0,
+                 clock: Callable[[], datetime] = datetime.now):
+        """
+        初始化调度器
+
+        Args:
+            cache_repository: 提供 find_refresh_candidates / get_valid_cache / update_cache_field 的缓存仓储
+            fields: 可刷新字段，默认营收/排名/新闻
+            hourly_budget: 每小时外部API调用预算，0 表示关闭；预算在进程内计数，
+                多个 uvicorn worker 各自启用时实际总量为 worker 数 × 预算，应只在一个进程中开启
+            interval: 后台调度间隔（秒）
+            candidate_limit: 每轮按热度取的候选企业数
+            min_staleness: 陈旧度（已过时长/保鲜时长）达到该值才刷新
+            clock: 当前时间（与数据库 DATETIME 同为本地时间）
+        """
+        self.cache_repository = cache_repository
+        self.fields = fields if fields is not None else default_refresh_fields()
+        self.budget = HourlyBudget(hourly_budget)
+        self.interval = interval
+        self.candidate_limit = candidate_limit
+        self.min_staleness = min_staleness
+        self._clock = clock
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget.per_hour > 0 and bool(self.fields)
+
+    def plan(self, candidates: List[Dict[str, Any]]) -> List[Tuple[float, str, RefreshField]]:
+        """
+        计算各企业各字段的刷新优先级
+
+        字段最近刷新时间取字段记录与整体缓存时间中较新者；
+        优先级 = 陈旧度 × log2(2 + 命中次数)，从未命中的企业仍会按陈旧度排队
+
+        Args:
+            candidates: find_refresh_candidates 的结果
+
+        Returns:
+            [(优先级, 公司名, 字段), ...]，按优先级降序
+        """
+        now = self._clock()
+        plan = []
+        for candidate in candidates:
+            popularity = math.log2(2 + (candidate.get('hit_count') or 0))
+            cached_at = candidate.get('cached_at')
+            for field in self.fields:
+                refreshed = [t for t in (cached_at, candidate.get('fields', {}).get(field.name)) if t]
+                if not refreshed:
+                    continue
+                staleness = (now - max(refreshed)) / field.max_age
+                if staleness >= self.min_staleness:
+                    plan.append((staleness * popularity, candidate['company_name'], field))
+        plan.sort(key=lambda item: item[0], reverse=True)
+        return plan
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        执行一轮调度：按优先级刷新，预算不足的字段留到下一轮
+
+        Returns:
+            本轮统计
+        """
+        stats = {'candidates': 0, 'planned': 0, 'refreshed': 0, 'failed': 0, 'deferred': 0}
+        if not self.enabled:
+            return stats
+        candidates = self.cache_repository.find_refresh_candidates(self.candidate_limit)
+        plan = self.plan(candidates)
+        stats['candidates'], stats['planned'] = len(candidates), len(plan)
+
+        payloads: Dict[str, Optional[Dict[str, Any]]] = {}
+        for _, company_name, field in plan:
+            if not self.budget.try_consume(field.cost):
+                # 较便宜的字段可能仍在预算内，继续尝试
+                stats['deferred'] += 1
+                continue
+            if company_name not in payloads:
+                payloads[company_name] = self._load_payload(company_name)
+            payload = payloads[company_name]
+            if payload is None:
+                stats['failed'] += 1
+                continue
+            if self._refresh_field(company_name, field, payload):
+                stats['refreshed'] += 1
+            else:
+                stats['failed'] += 1
+        if plan:
+            logger.info(f"缓存增量刷新: {stats}，剩余预算 {self.budget.remaining()}/{self.budget.per_hour}")
+        return stats
+
+    def _load_payload(self, company_name: str) -> Optional[Dict[str, Any]]:
+        row = self.cache_repository.get_valid_cache(company_name)
+        if not row or not row.get('payload'):
+            return None
+        try:
+            return json.loads(row['payload'])
+        except ValueError:
+            return None
+
+    def _refresh_field(self, company_name: str, field: RefreshField, payload: Dict[str, Any]) -> bool:
+        try:
+            value = field.fetch(company_name, payload)
+        except Exception as e:
+            logger.warning(f"刷新字段失败 {company_name}.{field.name}: {e}")
+            return False
+        if value in (None, ''):
+            return False
+        target = payload
+        for key in field.path[:-1]:
+            target = target.setdefault(key, {})
+        # 外部服务失败时返回“暂无…”占位，不覆盖已有的有效值，但仍记录刷新时间避免反复消耗预算
+        if not (is_placeholder_value(value) and not is_placeholder_value(target.get(field.path[-1]))):
+            target[field.path[-1]] = value
+        value = target.get(field.path[-1])
+        return self.cache_repository.update_cache_field(
+            company_name, field.name, json.dumps(payload, ensure_ascii=False, default=str),
+            value_json=None if is_placeholder_value(value) else json.dumps(value, ensure_ascii=False, default=str),
+            source='refresh_scheduler', ttl_days=field.max_age.days)
+
+    # ==================== 后台运行 ====================
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台调度（预算为0时不启动）"""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.warning(f"缓存增量刷新异常: {e}")
+            await asyncio.sleep(self.interval)
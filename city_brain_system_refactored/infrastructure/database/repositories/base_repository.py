@@ -3,7 +3,7 @@
 重构自原有的 database/repositories/base_repository.py，增强错误处理和连接管理
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, Iterator, List, Union
 from contextlib import contextmanager
 import logging
 
@@ -82,6 +82,38 @@ class BaseRepository(ABC):
             finally:
                 cursor.close()
     
+    def _stream_query(self, query: str, params: tuple = None, fetch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        以非缓冲（服务端）游标流式读取查询结果，避免一次性加载到内存
+
+        迭代期间占用一个连接，调用方应尽快消费完或关闭生成器
+
+        Args:
+            query: SQL查询语句
+            params: 查询参数
+            fetch_size: 每次从服务端拉取的行数
+
+        Yields:
+            单行结果
+        """
+        with self._get_connection() as connection:
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            try:
+                cursor.execute(query, params or ())
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                try:
+                    # 未读完的结果集需先丢弃，连接才能归还连接池复用
+                    while cursor.fetchmany(fetch_size):
+                        pass
+                except Exception:
+                    pass
+                cursor.close()
+
     def _execute_update(self, query: str, params: tuple = None) -> bool:
         """
         执行更新操作
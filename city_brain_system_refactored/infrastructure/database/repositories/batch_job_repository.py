@@ -0,0 +1,342 @@
+"""
+批量补全任务仓储
+基于本地SQLite持久化批量任务及其条目，进程重启后未完成的条目可继续处理
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from infrastructure.utils.datetime_utils import now_utc
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# 任务状态
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_CANCELLED = 'cancelled'
+
+# 条目状态
+ITEM_PENDING = 'pending'
+ITEM_RUNNING = 'running'
+ITEM_SUCCESS = 'success'
+ITEM_ERROR = 'error'
+ITEM_CANCELLED = 'cancelled'
+
+ITEM_STATUSES = (ITEM_PENDING, ITEM_RUNNING, ITEM_SUCCESS, ITEM_ERROR, ITEM_CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    source TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS batch_items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    input_text TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started_at TEXT,
+    heartbeat_at TEXT,
+    finished_at TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_batch_items_status ON batch_items (status, job_id, idx);
+"""
+
+
+class BatchJobRepository:
+    """批量任务仓储（SQLite）"""
+
+    def __init__(self, db_path: str):
+        """
+        初始化仓储
+
+        Args:
+            db_path: SQLite文件路径，相对路径按项目目录解析；":memory:" 表示内存库
+        """
+        if db_path != ':memory:' and not os.path.isabs(db_path):
+            db_path = os.path.join(PROJECT_DIR, db_path)
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(batch_items)')}
+        if 'heartbeat_at' not in columns:
+            self._conn.execute('ALTER TABLE batch_items ADD COLUMN heartbeat_at TEXT')
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """串行化的写事务"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def create_job(self, inputs: Sequence[str], source: str = 'json') -> str:
+        """
+        创建任务并写入全部条目
+
+        Args:
+            inputs: 企业名称/查询文本列表
+            source: 输入来源（json/csv）
+
+        Returns:
+            任务ID
+        """
+        job_id = uuid.uuid4().hex
+        now = now_utc().isoformat()
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT INTO batch_jobs (job_id, status, total, source, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, JOB_QUEUED, len(inputs), source, now, now),
+            )
+            conn.executemany(
+                'INSERT INTO batch_items (job_id, idx, input_text, status) VALUES (?, ?, ?, ?)',
+                [(job_id, i, text, ITEM_PENDING) for i, text in enumerate(inputs)],
+            )
+        return job_id
+
+    def claim_next_item(self) -> Optional[Dict[str, Any]]:
+        """
+        按创建顺序领取一个待处理条目并标记为处理中
+
+        Returns:
+            条目（job_id、idx、input_text）或None
+        """
+        now = now_utc().isoformat()
+        with self._transaction() as conn:
+            row = conn.execute(
+                """
+                SELECT i.job_id, i.idx, i.input_text
+                FROM batch_items i JOIN batch_jobs j ON i.job_id = j.job_id
+                WHERE i.status = ? AND j.status IN (?, ?)
+                ORDER BY j.created_at, i.job_id, i.idx
+                LIMIT 1
+                """,
+                (ITEM_PENDING, JOB_QUEUED, JOB_RUNNING),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE batch_items SET status = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 '
+                'WHERE job_id = ? AND idx = ?',
+                (ITEM_RUNNING, now, now, row['job_id'], row['idx']),
+            )
+            conn.execute(
+                'UPDATE batch_jobs SET status = ?, updated_at = ? WHERE job_id = ? AND status = ?',
+                (JOB_RUNNING, now, row['job_id'], JOB_QUEUED),
+            )
+        return dict(row)
+
+    def finish_item(self, job_id: str, idx: int, status: str,
+                    result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """
+        记录条目处理结果；任务内无待处理条目时将任务标记为完成
+
+        Args:
+            job_id: 任务ID
+            idx: 条目序号
+            status: success / error
+            result: 处理结果
+            error: 错误信息
+        """
+        now = now_utc().isoformat()
+        payload = json.dumps(result, ensure_ascii=False, default=str) if result is not None else None
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE batch_items SET status = ?, result = ?, error = ?, finished_at = ? WHERE job_id = ? AND idx = ?',
+                (status, payload, error, now, job_id, idx),
+            )
+            remaining = conn.execute(
+                'SELECT COUNT(*) FROM batch_items WHERE job_id = ? AND status IN (?, ?)',
+                (job_id, ITEM_PENDING, ITEM_RUNNING),
+            ).fetchone()[0]
+            if remaining:
+                conn.execute('UPDATE batch_jobs SET updated_at = ? WHERE job_id = ?', (now, job_id))
+            else:
+                conn.execute(
+                    'UPDATE batch_jobs SET status = ?, updated_at = ?, finished_at = ? WHERE job_id = ? AND status = ?',
+                    (JOB_COMPLETED, now, now, job_id, JOB_RUNNING),
+                )
+
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        取消任务：未开始的条目标记为已取消，处理中的条目完成后保留结果
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            任务是否存在且此前未结束
+        """
+        now = now_utc().isoformat()
+        with self._transaction() as conn:
+            updated = conn.execute(
+                'UPDATE batch_jobs SET status = ?, updated_at = ?, finished_at = ? WHERE job_id = ? AND status IN (?, ?)',
+                (JOB_CANCELLED, now, now, job_id, JOB_QUEUED, JOB_RUNNING),
+            ).rowcount
+            if updated:
+                conn.execute(
+                    'UPDATE batch_items SET status = ?, finished_at = ? WHERE job_id = ? AND status = ?',
+                    (ITEM_CANCELLED, now, job_id, ITEM_PENDING),
+                )
+        return bool(updated)
+
+    def heartbeat_item(self, job_id: str, idx: int) -> None:
+        """
+        续期处理中条目的租约
+
+        Args:
+            job_id: 任务ID
+            idx: 条目序号
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE batch_items SET heartbeat_at = ? WHERE job_id = ? AND idx = ? AND status = ?',
+                (now_utc().isoformat(), job_id, idx, ITEM_RUNNING),
+            )
+
+    def release_item(self, job_id: str, idx: int) -> None:
+        """
+        将本进程放弃处理的条目立即放回队列（停止工作协程时调用）
+
+        Args:
+            job_id: 任务ID
+            idx: 条目序号
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE batch_items SET status = ?, started_at = NULL, heartbeat_at = NULL '
+                'WHERE job_id = ? AND idx = ? AND status = ?',
+                (ITEM_PENDING, job_id, idx, ITEM_RUNNING),
+            )
+
+    def requeue_expired_items(self, lease_seconds: float) -> int:
+        """
+        将租约已过期的处理中条目重新放回队列
+
+        多个工作进程共享同一队列，只有心跳超过租约时长未更新的条目（处理它的进程已退出）
+        才会重新入队，其他进程仍在处理的条目保持不变
+
+        Args:
+            lease_seconds: 租约时长（秒）
+
+        Returns:
+            重新入队的条目数
+        """
+        expired_before = (now_utc() - timedelta(seconds=lease_seconds)).isoformat()
+        with self._transaction() as conn:
+            return conn.execute(
+                'UPDATE batch_items SET status = ?, started_at = NULL, heartbeat_at = NULL '
+                'WHERE status = ? AND COALESCE(heartbeat_at, started_at, ?) < ?',
+                (ITEM_PENDING, ITEM_RUNNING, '', expired_before),
+            ).rowcount
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询任务及各状态条目数
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            任务信息或None
+        """
+        with self._lock:
+            job = self._conn.execute('SELECT * FROM batch_jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = dict(self._conn.execute(
+                'SELECT status, COUNT(*) FROM batch_items WHERE job_id = ? GROUP BY status', (job_id,)
+            ).fetchall())
+        info = dict(job)
+        info['counts'] = {status: counts.get(status, 0) for status in ITEM_STATUSES}
+        return info
+
+    def list_items(self, job_id: str, offset: int = 0, limit: int = 100,
+                   status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        分页查询任务条目
+
+        Args:
+            job_id: 任务ID
+            offset: 偏移
+            limit: 数量
+            status: 仅返回指定状态
+
+        Returns:
+            条目列表（result 已反序列化）
+        """
+        query = 'SELECT * FROM batch_items WHERE job_id = ?'
+        params: List[Any] = [job_id]
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+        query += ' ORDER BY idx LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._item_from_row(row) for row in rows]
+
+    def iter_items(self, job_id: str, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        分页遍历任务全部条目（用于导出，避免一次性加载）
+
+        Args:
+            job_id: 任务ID
+            page_size: 每页条数
+
+        Yields:
+            条目
+        """
+        last_idx = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT * FROM batch_items WHERE job_id = ? AND idx > ? ORDER BY idx LIMIT ?',
+                    (job_id, last_idx, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._item_from_row(row)
+            last_idx = rows[-1]['idx']
+
+    @staticmethod
+    def _item_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        if item.get('result'):
+            try:
+                item['result'] = json.loads(item['result'])
+            except ValueError:
+                pass
+        return item
@@ -6,17 +6,42 @@
 - payload TEXT (JSON字符串, 存 final_result)
 - cached_at DATETIME
 - expires_at DATETIME
+- hit_count INT (缓存命中次数，用于刷新优先级)
+- last_hit_at DATETIME
+表: QD_company_cache_fields（字段级缓存）
+- company_name VARCHAR(255)
+- field_name VARCHAR(64)
+- value TEXT (JSON; NULL 表示已查询但无结果)
+- source VARCHAR(64) (数据来源)
+- confidence FLOAT
+- refreshed_at DATETIME
+- expires_at DATETIME (字段级TTL)
 """
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
 from .base_repository import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# 旧表补充的列（ALTER 失败视为已存在）
+_CACHE_EXTRA_COLUMNS = (
+    "ALTER TABLE QD_company_cache ADD COLUMN hit_count INT NOT NULL DEFAULT 0",
+    "ALTER TABLE QD_company_cache ADD COLUMN last_hit_at DATETIME NULL",
+    "ALTER TABLE QD_company_cache_fields ADD COLUMN value TEXT NULL",
+    "ALTER TABLE QD_company_cache_fields ADD COLUMN source VARCHAR(64) NULL",
+    "ALTER TABLE QD_company_cache_fields ADD COLUMN confidence FLOAT NULL",
+    "ALTER TABLE QD_company_cache_fields ADD COLUMN expires_at DATETIME NULL",
+)
+
+
 class CompanyCacheRepository(BaseRepository):
+    # 建表/补列在进程内只需成功执行一次
+    _schema_ready = False
+
     def __init__(self):
         super().__init__()
-        self._ensure_table()
+        if not CompanyCacheRepository._schema_ready:
+            self._ensure_table()
 
     def _ensure_table(self):
         # 建表（如不存在）
@@ -26,13 +51,36 @@ class CompanyCacheRepository(BaseRepository):
             company_name VARCHAR(255) NOT NULL UNIQUE,
             payload TEXT NOT NULL,
             cached_at DATETIME NOT NULL,
-            expires_at DATETIME NOT NULL
+            expires_at DATETIME NOT NULL,
+            hit_count INT NOT NULL DEFAULT 0,
+            last_hit_at DATETIME NULL
+        ) CHARACTER SET utf8mb4
+        """
+        fields_query = """
+        CREATE TABLE IF NOT EXISTS QD_company_cache_fields (
+            company_name VARCHAR(255) NOT NULL,
+            field_name VARCHAR(64) NOT NULL,
+            value TEXT NULL,
+            source VARCHAR(64) NULL,
+            confidence FLOAT NULL,
+            refreshed_at DATETIME NOT NULL,
+            expires_at DATETIME NULL,
+            PRIMARY KEY (company_name, field_name)
         ) CHARACTER SET utf8mb4
         """
         try:
             self._execute_update(query)
+            self._execute_update(fields_query)
         except Exception as e:
             logger.error(f"创建缓存表失败: {e}")
+            return
+        for alter in _CACHE_EXTRA_COLUMNS:
+            try:
+                self._execute_update(alter)
+            except Exception:
+                # 列已存在（Duplicate column）
+                pass
+        CompanyCacheRepository._schema_ready = True
 
     def get_valid_cache(self, company_name: str) -> Optional[Dict[str, Any]]:
         """查询未过期的缓存记录"""
@@ -60,6 +108,191 @@ class CompanyCacheRepository(BaseRepository):
             logger.error(f"写入缓存失败: {e}")
             return False
 
+    def find_fresh_names(self, company_names: Iterable[str], min_valid_days: int = 0) -> Set[str]:
+        """
+        批量查询缓存仍然新鲜的公司名（剩余有效期超过 min_valid_days 天）
+
+        Args:
+            company_names: 标准化公司名
+            min_valid_days: 剩余有效期下限（天）
+
+        Returns:
+            缓存新鲜的公司名集合
+        """
+        names = list(dict.fromkeys(n for n in company_names if n))
+        if not names:
+            return set()
+        placeholders = ", ".join(["%s"] * len(names))
+        query = f"""
+        SELECT company_name
+        FROM QD_company_cache
+        WHERE company_name IN ({placeholders})
+          AND expires_at > DATE_ADD(NOW(), INTERVAL %s DAY)
+        """
+        rows = self._execute_query(query, tuple(names) + (min_valid_days,))
+        return {row["company_name"] for row in rows}
+
+    def bulk_upsert_cache(self, entries: List[Tuple[str, str]], ttl_days: int = 90) -> int:
+        """
+        批量写入或更新缓存（单次 executemany 提交）
+
+        Args:
+            entries: [(company_name, payload_json), ...]
+            ttl_days: 有效期（天）
+
+        Returns:
+            影响行数
+        """
+        if not entries:
+            return 0
+        query = """
+        INSERT INTO QD_company_cache (company_name, payload, cached_at, expires_at)
+        VALUES (%s, %s, NOW(), DATE_ADD(NOW(), INTERVAL %s DAY))
+        ON DUPLICATE KEY UPDATE
+            payload = VALUES(payload),
+            cached_at = VALUES(cached_at),
+            expires_at = VALUES(expires_at)
+        """
+        return self._execute_batch_insert(query, [(name, payload, ttl_days) for name, payload in entries])
+
+    def record_hit(self, company_name: str) -> bool:
+        """缓存命中计数 +1（用于按热度安排刷新）"""
+        query = """
+        UPDATE QD_company_cache
+        SET hit_count = hit_count + 1, last_hit_at = NOW()
+        WHERE company_name = %s
+        """
+        try:
+            return self._execute_update(query, (company_name,))
+        except Exception as e:
+            logger.error(f"记录缓存命中失败: {e}")
+            return False
+
+    def find_refresh_candidates(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        查询待评估刷新的缓存企业（未过期、按命中次数降序）及各字段最近刷新时间
+
+        Args:
+            limit: 最多返回的企业数
+
+        Returns:
+            [{'company_name', 'cached_at', 'hit_count', 'fields': {field_name: refreshed_at}}, ...]
+        """
+        query = """
+        SELECT c.company_name, c.cached_at, c.hit_count, f.field_name, f.refreshed_at
+        FROM (
+            SELECT company_name, cached_at, hit_count
+            FROM QD_company_cache
+            WHERE expires_at > NOW()
+            ORDER BY hit_count DESC, cached_at
+            LIMIT %s
+        ) c
+        LEFT JOIN QD_company_cache_fields f ON f.company_name = c.company_name
+        """
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for row in self._execute_query(query, (limit,)):
+            entry = candidates.setdefault(row['company_name'], {
+                'company_name': row['company_name'],
+                'cached_at': row['cached_at'],
+                'hit_count': row['hit_count'] or 0,
+                'fields': {},
+            })
+            if row.get('field_name'):
+                entry['fields'][row['field_name']] = row['refreshed_at']
+        return list(candidates.values())
+
+    def get_cache_fields(self, company_name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        查询公司的字段级缓存
+
+        Args:
+            company_name: 标准化公司名
+
+        Returns:
+            {field_name: {'value', 'source', 'confidence', 'refreshed_at', 'expires_at', 'fresh'}}
+        """
+        query = """
+        SELECT field_name, value, source, confidence, refreshed_at, expires_at,
+               (expires_at IS NOT NULL AND expires_at > NOW()) AS fresh
+        FROM QD_company_cache_fields
+        WHERE company_name = %s
+        """
+        try:
+            rows = self._execute_query(query, (company_name,))
+        except Exception as e:
+            logger.error(f"查询字段缓存失败: {e}")
+            return {}
+        return {row['field_name']: dict(row, fresh=bool(row['fresh'])) for row in rows}
+
+    def upsert_cache_fields(self, company_name: str,
+                            entries: List[Tuple[str, Optional[str], Optional[str], Optional[float], int]]) -> int:
+        """
+        批量写入字段级缓存
+
+        Args:
+            company_name: 标准化公司名
+            entries: [(field_name, value_json, source, confidence, ttl_days), ...]
+
+        Returns:
+            影响行数
+        """
+        if not entries:
+            return 0
+        query = """
+        INSERT INTO QD_company_cache_fields
+            (company_name, field_name, value, source, confidence, refreshed_at, expires_at)
+        VALUES (%s, %s, %s, %s, %s, NOW(), DATE_ADD(NOW(), INTERVAL %s DAY))
+        ON DUPLICATE KEY UPDATE
+            value = VALUES(value),
+            source = VALUES(source),
+            confidence = VALUES(confidence),
+            refreshed_at = VALUES(refreshed_at),
+            expires_at = VALUES(expires_at)
+        """
+        try:
+            return self._execute_batch_insert(query, [(company_name,) + tuple(entry) for entry in entries])
+        except Exception as e:
+            logger.error(f"写入字段缓存失败: {e}")
+            return 0
+
+    def update_cache_field(self, company_name: str, field_name: str, payload_json: str,
+                           value_json: Optional[str] = None, source: Optional[str] = None,
+                           confidence: Optional[float] = None, ttl_days: int = 90) -> bool:
+        """
+        写回刷新了单个字段后的缓存内容，并更新该字段的字段级缓存（不改变整体过期时间）
+
+        Args:
+            company_name: 标准化公司名
+            field_name: 字段名
+            payload_json: 更新后的完整缓存JSON
+            value_json: 字段值JSON
+            source: 数据来源
+            confidence: 置信度
+            ttl_days: 字段有效期（天）
+
+        Returns:
+            是否成功
+        """
+        try:
+            return self._execute_transaction([
+                {'query': "UPDATE QD_company_cache SET payload = %s WHERE company_name = %s",
+                 'params': (payload_json, company_name)},
+                {'query': """
+                    INSERT INTO QD_company_cache_fields
+                        (company_name, field_name, value, source, confidence, refreshed_at, expires_at)
+                    VALUES (%s, %s, %s, %s, %s, NOW(), DATE_ADD(NOW(), INTERVAL %s DAY))
+                    ON DUPLICATE KEY UPDATE
+                        value = VALUES(value),
+                        source = VALUES(source),
+                        confidence = VALUES(confidence),
+                        refreshed_at = VALUES(refreshed_at),
+                        expires_at = VALUES(expires_at)
+                 """, 'params': (company_name, field_name, value_json, source, confidence, ttl_days)},
+            ])
+        except Exception as e:
+            logger.error(f"写回缓存字段失败: {e}")
+            return False
+
     def purge_cache(self, company_name: str) -> bool:
         """按标准化公司名删除缓存记录"""
         query = """
@@ -67,7 +300,9 @@ class CompanyCacheRepository(BaseRepository):
         WHERE company_name = %s
         """
         try:
-            return self._execute_update(query, (company_name,))
+            deleted = self._execute_update(query, (company_name,))
+            self._execute_update("DELETE FROM QD_company_cache_fields WHERE company_name = %s", (company_name,))
+            return deleted
         except Exception as e:
             logger.error(f"删除缓存失败: {e}")
             return False
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+企业名称规范ID映射仓储
+表: QD_company_alias
+- alias_name VARCHAR(255) PRIMARY KEY (各数据源中出现过的名称)
+- match_key VARCHAR(255) (标准化匹配键，索引)
+- canonical_id BIGINT (规范企业ID，同一企业的所有名称相同，索引)
+- canonical_name VARCHAR(255) (规范名)
+- score FLOAT (与规范名的相似度)
+- source VARCHAR(32) (名称首次出现的数据源)
+- updated_at DATETIME
+
+表: QD_company_alias_review（字面相似但匹配键不同的名称对，人工确认后才合并）
+- left_name / right_name VARCHAR(255) (联合主键，left_name < right_name)
+- score FLOAT (相似度)
+- status VARCHAR(16) (pending 待确认 / approved 同一企业 / rejected 不同企业)
+- created_at / reviewed_at DATETIME
+"""
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CompanyAliasRepository(BaseRepository):
+    # 建表在进程内只需成功执行一次
+    _schema_ready = False
+
+    def __init__(self):
+        super().__init__()
+        if not CompanyAliasRepository._schema_ready:
+            self._ensure_table()
+
+    def _ensure_table(self):
+        query = """
+        CREATE TABLE IF NOT EXISTS QD_company_alias (
+            alias_name VARCHAR(255) NOT NULL PRIMARY KEY,
+            match_key VARCHAR(255) NOT NULL,
+            canonical_id BIGINT NOT NULL,
+            canonical_name VARCHAR(255) NOT NULL,
+            score FLOAT NOT NULL DEFAULT 1,
+            source VARCHAR(32) NULL,
+            updated_at DATETIME NOT NULL,
+            INDEX idx_company_alias_key (match_key),
+            INDEX idx_company_alias_canonical (canonical_id)
+        ) CHARACTER SET utf8mb4
+        """
+        review_query = """
+        CREATE TABLE IF NOT EXISTS QD_company_alias_review (
+            left_name VARCHAR(255) NOT NULL,
+            right_name VARCHAR(255) NOT NULL,
+            score FLOAT NOT NULL,
+            status VARCHAR(16) NOT NULL DEFAULT 'pending',
+            created_at DATETIME NOT NULL,
+            reviewed_at DATETIME NULL,
+            PRIMARY KEY (left_name, right_name),
+            INDEX idx_company_alias_review_status (status)
+        ) CHARACTER SET utf8mb4
+        """
+        try:
+            self._execute_update(query)
+            self._execute_update(review_query)
+        except Exception as e:
+            logger.error(f"创建企业名称映射表失败: {e}")
+            return
+        CompanyAliasRepository._schema_ready = True
+
+    def iter_aliases(self, fetch_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """流式读取全部映射（alias_name, match_key, canonical_id, canonical_name, score, source）"""
+        query = """
+        SELECT alias_name, match_key, canonical_id, canonical_name, score, source
+        FROM QD_company_alias
+        """
+        return self._stream_query(query, fetch_size=fetch_size)
+
+    def upsert_aliases(self, entries: List[Tuple[str, str, int, str, float, Optional[str]]],
+                       batch_size: int = 1000) -> int:
+        """
+        批量写入或更新映射
+
+        Args:
+            entries: [(alias_name, match_key, canonical_id, canonical_name, score, source), ...]
+            batch_size: 每批 executemany 的条数
+
+        Returns:
+            写入条数
+        """
+        query = """
+        INSERT INTO QD_company_alias
+            (alias_name, match_key, canonical_id, canonical_name, score, source, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, NOW())
+        ON DUPLICATE KEY UPDATE
+            match_key = VALUES(match_key),
+            canonical_id = VALUES(canonical_id),
+            canonical_name = VALUES(canonical_name),
+            score = VALUES(score),
+            updated_at = VALUES(updated_at)
+        """
+        written = 0
+        for start in range(0, len(entries), batch_size):
+            batch = entries[start:start + batch_size]
+            self._execute_batch_insert(query, batch)
+            written += len(batch)
+        return written
+
+    def find_by_match_key(self, match_key: str) -> Optional[Dict[str, Any]]:
+        """按匹配键查规范企业（canonical_id, canonical_name）"""
+        if not match_key:
+            return None
+        query = """
+        SELECT canonical_id, canonical_name
+        FROM QD_company_alias
+        WHERE match_key = %s
+        ORDER BY score DESC
+        LIMIT 1
+        """
+        return self._execute_single_query(query, (match_key,))
+
+    def find_alias_names(self, canonical_id: int) -> List[str]:
+        """规范企业的全部名称"""
+        query = "SELECT alias_name FROM QD_company_alias WHERE canonical_id = %s"
+        return [row['alias_name'] for row in self._execute_query(query, (canonical_id,))]
+
+    def add_review_pairs(self, pairs: Iterable[Tuple[str, str, float]], batch_size: int = 1000) -> int:
+        """
+        登记待人工确认的名称对，已登记（含已确认/已驳回）的名称对保持原状态
+
+        Args:
+            pairs: [(名称A, 名称B, 相似度), ...]
+            batch_size: 每批 executemany 的条数
+
+        Returns:
+            提交条数
+        """
+        query = """
+        INSERT IGNORE INTO QD_company_alias_review (left_name, right_name, score, status, created_at)
+        VALUES (%s, %s, %s, 'pending', NOW())
+        """
+        rows = [tuple(sorted((left, right))) + (score,) for left, right, score in pairs]
+        for start in range(0, len(rows), batch_size):
+            self._execute_batch_insert(query, rows[start:start + batch_size])
+        return len(rows)
+
+    def find_approved_pairs(self) -> List[Tuple[str, str]]:
+        """人工确认为同一企业的名称对"""
+        query = "SELECT left_name, right_name FROM QD_company_alias_review WHERE status = 'approved'"
+        return [(row['left_name'], row['right_name']) for row in self._execute_query(query)]
@@ -0,0 +1,94 @@
+"""
+跨系统企业身份仓储
+表: QD_company_identity
+- source VARCHAR(32) (数据源: customer / chain_leader / enterprise_qd / crm / ipg / as / work_order)
+- source_key VARCHAR(255) (该数据源中的企业名称原值)
+- canonical_id BIGINT (规范企业ID，与 QD_company_alias 一致)
+- updated_at DATETIME
+主键 (source, source_key)，索引 (canonical_id, source)
+"""
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CompanyIdentityRepository(BaseRepository):
+    # 建表在进程内只需成功执行一次
+    _schema_ready = False
+
+    def __init__(self):
+        super().__init__()
+        if not CompanyIdentityRepository._schema_ready:
+            self._ensure_table()
+
+    def _ensure_table(self):
+        query = """
+        CREATE TABLE IF NOT EXISTS QD_company_identity (
+            source VARCHAR(32) NOT NULL,
+            source_key VARCHAR(255) NOT NULL,
+            canonical_id BIGINT NOT NULL,
+            updated_at DATETIME NOT NULL,
+            PRIMARY KEY (source, source_key),
+            INDEX idx_company_identity_canonical (canonical_id, source)
+        ) CHARACTER SET utf8mb4
+        """
+        try:
+            self._execute_update(query)
+        except Exception as e:
+            logger.error(f"创建企业身份表失败: {e}")
+            return
+        CompanyIdentityRepository._schema_ready = True
+
+    def iter_identities(self, fetch_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """流式读取全部身份记录（source, source_key, canonical_id）"""
+        query = "SELECT source, source_key, canonical_id FROM QD_company_identity"
+        return self._stream_query(query, fetch_size=fetch_size)
+
+    def upsert_identities(self, entries: List[Tuple[str, str, int]], batch_size: int = 1000) -> int:
+        """
+        批量写入或更新身份记录
+
+        Args:
+            entries: [(source, source_key, canonical_id), ...]
+            batch_size: 每批 executemany 的条数
+
+        Returns:
+            写入条数
+        """
+        query = """
+        INSERT INTO QD_company_identity (source, source_key, canonical_id, updated_at)
+        VALUES (%s, %s, %s, NOW())
+        ON DUPLICATE KEY UPDATE
+            canonical_id = VALUES(canonical_id),
+            updated_at = VALUES(updated_at)
+        """
+        written = 0
+        for start in range(0, len(entries), batch_size):
+            batch = entries[start:start + batch_size]
+            self._execute_batch_insert(query, batch)
+            written += len(batch)
+        return written
+
+    def delete_identities(self, source: str, source_keys: Iterable[str], batch_size: int = 1000) -> int:
+        """删除数据源中已不存在的企业名称"""
+        keys = list(source_keys)
+        query = "DELETE FROM QD_company_identity WHERE source = %s AND source_key = %s"
+        for start in range(0, len(keys), batch_size):
+            self._execute_batch_insert(query, [(source, key) for key in keys[start:start + batch_size]])
+        return len(keys)
+
+    def find_source_keys(self, canonical_id: int) -> Dict[str, List[str]]:
+        """
+        规范企业在各数据源中的名称
+
+        Returns:
+            {source: [source_key, ...]}
+        """
+        query = "SELECT source, source_key FROM QD_company_identity WHERE canonical_id = %s"
+        keys: Dict[str, List[str]] = {}
+        for row in self._execute_query(query, (canonical_id,)):
+            keys.setdefault(row['source'], []).append(row['source_key'])
+        return keys
@@ -4,7 +4,7 @@ CRM_sync_new数据库的客户和商机仓储
 """
 import logging
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any
 from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import pooling
@@ -69,12 +69,13 @@ class CRMSyncRepository:
 
     # ==================== 客户相关方法 ====================
 
-    def find_customer_by_name(self, name: str) -> Optional[CRMCustomer]:
+    def find_customer_by_name(self, name: str, fuzzy: bool = True) -> Optional[CRMCustomer]:
         """
         根据客户名称查找（支持模糊匹配）
 
         Args:
             name: 客户名称
+            fuzzy: 精确匹配失败时是否回退到 LIKE 模糊匹配（全表扫描）
 
         Returns:
             客户对象或None
@@ -93,7 +94,7 @@ class CRMSyncRepository:
                 result = cursor.fetchone()
 
                 # 如果精确匹配失败，尝试模糊匹配
-                if not result:
+                if not result and fuzzy:
                     query = """
                     SELECT * FROM customers
                     WHERE name LIKE %s AND (is_deleted = 0 OR is_deleted IS NULL)
@@ -113,6 +114,58 @@ class CRMSyncRepository:
             logger.error(f"查询客户失败: {e}")
             return None
 
+    def find_customer_by_names(self, names: List[str]) -> Optional[CRMCustomer]:
+        """
+        按企业身份表给出的客户名称原值等值查找
+
+        Args:
+            names: 同一企业在CRM中的全部客户名称
+
+        Returns:
+            客户对象或None（多条时取最近出现者）
+        """
+        if not names:
+            return None
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+
+                placeholders = ', '.join(['%s'] * len(names))
+                query = f"""
+                SELECT * FROM customers
+                WHERE name IN ({placeholders}) AND (is_deleted = 0 OR is_deleted IS NULL)
+                ORDER BY last_seen_at DESC
+                LIMIT 1
+                """
+                cursor.execute(query, tuple(names))
+                result = cursor.fetchone()
+                cursor.close()
+
+                if result:
+                    return CRMCustomer.from_db_row(result)
+                return None
+
+        except Exception as e:
+            logger.error(f"查询客户失败: {e}")
+            return None
+
+    def iter_customer_names(self, fetch_size: int = 2000) -> Iterator[str]:
+        """流式读取未删除的全部客户名称（去重），供构建企业身份表"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT name FROM customers
+            WHERE name IS NOT NULL AND name <> ''
+              AND (is_deleted = 0 OR is_deleted IS NULL)
+            """)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+            cursor.close()
+
     def search_customers(self, keyword: str, limit: int = 10) -> List[CRMCustomer]:
         """
         根据关键词搜索客户
@@ -182,6 +235,35 @@ class CRMSyncRepository:
             logger.error(f"按行业查询客户失败: {e}")
             return []
 
+    def find_industry_labels(self, limit: int = 200000) -> List[Dict[str, Any]]:
+        """
+        查询已填写行业的客户名称，用作行业分类训练样本
+
+        Args:
+            limit: 返回结果数量限制
+
+        Returns:
+            [{'name': 客户名称, 'industry': 行业}, ...]
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+
+                query = """
+                SELECT name, industry FROM customers
+                WHERE industry IS NOT NULL AND industry <> ''
+                AND (is_deleted = 0 OR is_deleted IS NULL)
+                LIMIT %s
+                """
+                cursor.execute(query, (limit,))
+                results = cursor.fetchall()
+                cursor.close()
+                return results
+
+        except Exception as e:
+            logger.error(f"查询客户行业标注失败: {e}")
+            return []
+
     def get_customers_by_owner(self, owner_name: str, limit: int = 20) -> List[CRMCustomer]:
         """
         根据负责人获取客户列表
@@ -12,6 +12,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
 
 from domain.repositories.customer_repository_interface import ICustomerRepository
+from infrastructure.utils.company_dedup import normalize_company_key
 from .base_repository import BaseRepository
 from ..models.customer import Customer, create_customer_from_db_row
 
@@ -21,6 +22,9 @@ logger = logging.getLogger(__name__)
 class CustomerRepository(BaseRepository, ICustomerRepository):
     """客户数据访问仓储类"""
     
+    # QD_company_alias 不存在时置为 False，避免每次查询都报错
+    _alias_lookup_enabled = True
+    
     def find_by_name(self, customer_name: str) -> Optional[Customer]:
         """
         根据企业名称查询客户信息，支持精确匹配和模糊匹配
@@ -41,6 +45,10 @@ class CustomerRepository(BaseRepository, ICustomerRepository):
         if not result:
             result = self._find_in_chain_leader_table_exact(customer_name)
         
+        # 再按规范企业ID映射查找同一企业的其他写法
+        if not result:
+            result = self._find_by_alias(customer_name)
+        
         # 如果精确匹配都没有结果，尝试模糊匹配
         if not result:
             result = self._find_with_fuzzy_matching(customer_name)
@@ -93,6 +101,63 @@ class CustomerRepository(BaseRepository, ICustomerRepository):
         """
         return self._execute_single_query(query, (customer_name,))
     
+    def _find_by_alias(self, customer_name: str) -> Optional[Dict[str, Any]]:
+        """通过 QD_company_alias 映射等值查找同一规范企业下的客户或链主企业"""
+        if not CustomerRepository._alias_lookup_enabled:
+            return None
+        match_key = normalize_company_key(customer_name)
+        if not match_key:
+            return None
+        customer_query = """
+        SELECT c.*, 
+               i.industry_name,
+               b.brain_name,
+               e.enterprise_name as chain_leader_name,
+               a.district_name,
+               'customer' as source_table
+        FROM QD_company_alias k
+        JOIN QD_company_alias m ON m.canonical_id = k.canonical_id
+        JOIN QD_customer c ON c.customer_name = m.alias_name
+        LEFT JOIN QD_industry i ON c.industry_id = i.industry_id
+        LEFT JOIN QD_industry_brain b ON c.brain_id = b.brain_id
+        LEFT JOIN QD_enterprise_chain_leader e ON c.chain_leader_id = e.enterprise_id
+        LEFT JOIN QD_area a ON b.area_id = a.area_id
+        WHERE k.match_key = %s
+        ORDER BY m.score DESC
+        LIMIT 1
+        """
+        chain_leader_query = """
+        SELECT e.enterprise_id as customer_id,
+               e.enterprise_name as customer_name,
+               NULL as data_source,
+               NULL as address,
+               1 as tag_result,
+               e.industry_id,
+               NULL as brain_id,
+               e.enterprise_id as chain_leader_id,
+               i.industry_name,
+               NULL as brain_name,
+               e.enterprise_name as chain_leader_name,
+               a.district_name,
+               'chain_leader' as source_table
+        FROM QD_company_alias k
+        JOIN QD_company_alias m ON m.canonical_id = k.canonical_id
+        JOIN QD_enterprise_chain_leader e ON e.enterprise_name = m.alias_name
+        LEFT JOIN QD_industry i ON e.industry_id = i.industry_id
+        LEFT JOIN QD_area a ON e.area_id = a.area_id
+        WHERE k.match_key = %s
+        ORDER BY m.score DESC
+        LIMIT 1
+        """
+        try:
+            return (self._execute_single_query(customer_query, (match_key,))
+                    or self._execute_single_query(chain_leader_query, (match_key,)))
+        except Exception as e:
+            # 映射表尚未生成（未运行去重服务）时关闭该步骤，直接走模糊匹配
+            logger.warning(f"企业名称映射查询不可用，已跳过: {e}")
+            CustomerRepository._alias_lookup_enabled = False
+            return None
+    
     def _find_with_fuzzy_matching(self, customer_name: str) -> Optional[Dict[str, Any]]:
         """使用模糊匹配查找"""
         # 移除常见的企业后缀进行模糊匹配
@@ -303,6 +368,26 @@ class CustomerRepository(BaseRepository, ICustomerRepository):
         results = self._execute_query(query, (limit, offset))
         return [create_customer_from_db_row(result) for result in results]
     
+    def find_names_after(self, after_id: int = 0, page_size: int = 500) -> List[Dict[str, Any]]:
+        """
+        按主键顺序读取一页客户名称（键集分页，供批量补全断点续跑）
+
+        Args:
+            after_id: 上一页最后一个 customer_id
+            page_size: 每页记录数
+
+        Returns:
+            [{'id': customer_id, 'name': customer_name}, ...]
+        """
+        query = """
+        SELECT customer_id AS id, customer_name AS name
+        FROM QD_customer
+        WHERE customer_id > %s
+        ORDER BY customer_id
+        LIMIT %s
+        """
+        return self._execute_query(query, (after_id, page_size))
+
     def count_all(self) -> int:
         """
         统计客户总数
@@ -4,7 +4,7 @@ enterprise_QD数据库的企业档案仓储
 """
 import logging
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any
 from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import pooling
@@ -67,12 +67,13 @@ class EnterpriseQDRepository:
             if connection and connection.is_connected():
                 connection.close()
 
-    def find_by_name(self, name: str) -> Optional[EnterpriseQDProfile]:
+    def find_by_name(self, name: str, fuzzy: bool = True) -> Optional[EnterpriseQDProfile]:
         """
         根据企业名称查找（支持模糊匹配）
 
         Args:
             name: 企业名称
+            fuzzy: 精确匹配失败时是否回退到 LIKE 模糊匹配（全表扫描）
 
         Returns:
             企业档案对象或None
@@ -91,7 +92,7 @@ class EnterpriseQDRepository:
                 result = cursor.fetchone()
 
                 # 如果精确匹配失败，尝试模糊匹配
-                if not result:
+                if not result and fuzzy:
                     query = """
                     SELECT * FROM enterprise_profiles
                     WHERE name LIKE %s OR normalized_name LIKE %s
@@ -111,6 +112,57 @@ class EnterpriseQDRepository:
             logger.error(f"查询企业失败: {e}")
             return None
 
+    def find_by_names(self, names: List[str]) -> Optional[EnterpriseQDProfile]:
+        """
+        按企业身份表给出的名称原值等值查找
+
+        Args:
+            names: 同一企业在enterprise_QD中的全部名称
+
+        Returns:
+            企业档案对象或None（多条时取信息最完整者）
+        """
+        if not names:
+            return None
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+
+                placeholders = ', '.join(['%s'] * len(names))
+                query = f"""
+                SELECT * FROM enterprise_profiles
+                WHERE name IN ({placeholders})
+                ORDER BY is_complete DESC, confidence_score DESC
+                LIMIT 1
+                """
+                cursor.execute(query, tuple(names))
+                result = cursor.fetchone()
+                cursor.close()
+
+                if result:
+                    return EnterpriseQDProfile.from_db_row(result)
+                return None
+
+        except Exception as e:
+            logger.error(f"查询企业失败: {e}")
+            return None
+
+    def iter_company_names(self, fetch_size: int = 2000) -> Iterator[str]:
+        """流式读取全部企业名称（去重），供构建企业身份表"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT name FROM enterprise_profiles
+            WHERE name IS NOT NULL AND name <> ''
+            """)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+            cursor.close()
+
     def search_by_keyword(self, keyword: str, limit: int = 10) -> List[EnterpriseQDProfile]:
         """
         根据关键词搜索企业
@@ -146,6 +198,33 @@ class EnterpriseQDRepository:
             logger.error(f"搜索企业失败: {e}")
             return []
 
+    def find_industry_labels(self, limit: int = 200000) -> List[Dict[str, Any]]:
+        """
+        查询已标注行业的企业名称，用作行业分类训练样本
+
+        Args:
+            limit: 返回结果数量限制
+
+        Returns:
+            [{'name': 企业名称, 'industry': 行业}, ...]
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+                query = """
+                SELECT name, industry FROM enterprise_profiles
+                WHERE industry IS NOT NULL AND industry <> ''
+                LIMIT %s
+                """
+                cursor.execute(query, (limit,))
+                results = cursor.fetchall()
+                cursor.close()
+                return results
+
+        except Exception as e:
+            logger.error(f"查询企业行业标注失败: {e}")
+            return []
+
     def get_by_industry(self, industry: str, limit: int = 20) -> List[EnterpriseQDProfile]:
         """
         根据行业获取企业列表
@@ -215,6 +215,26 @@ class EnterpriseRepository(BaseRepository):
             enterprise_data.get('enterprise_remark')
         ))
     
+    def find_names_after(self, after_id: int = 0, page_size: int = 500) -> List[Dict[str, Any]]:
+        """
+        按主键顺序读取一页链主企业名称（键集分页，供批量补全断点续跑）
+
+        Args:
+            after_id: 上一页最后一个 enterprise_id
+            page_size: 每页记录数
+
+        Returns:
+            [{'id': enterprise_id, 'name': enterprise_name}, ...]
+        """
+        query = """
+        SELECT enterprise_id AS id, enterprise_name AS name
+        FROM QD_enterprise_chain_leader
+        WHERE enterprise_id > %s
+        ORDER BY enterprise_id
+        LIMIT %s
+        """
+        return self._execute_query(query, (after_id, page_size))
+
     def count_all(self) -> int:
         """
         统计企业总数
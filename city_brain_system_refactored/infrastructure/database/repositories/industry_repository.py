@@ -84,6 +84,24 @@ class IndustryRepository(BaseRepository):
         results = self._execute_query(query, (industry_type,))
         return [create_industry(result) for result in results]
 
+    def find_labelled_enterprises(self) -> List[Dict[str, Any]]:
+        """
+        查询已标注行业的企业名称（链主企业与客户企业），用作行业分类训练样本
+        
+        Returns:
+            [{'name': 企业名称, 'industry': 行业名称}, ...]
+        """
+        query = """
+        SELECT e.enterprise_name AS name, i.industry_name AS industry
+        FROM QD_enterprise_chain_leader e
+        JOIN QD_industry i ON e.industry_id = i.industry_id
+        UNION ALL
+        SELECT c.customer_name AS name, i.industry_name AS industry
+        FROM QD_customer c
+        JOIN QD_industry i ON c.industry_id = i.industry_id
+        """
+        return self._execute_query(query)
+
 
 class IndustryBrainRepository(BaseRepository):
     """产业大脑数据访问仓储类"""
@@ -4,7 +4,7 @@ AS和IPG商机仓储
 """
 import logging
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any
 from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import pooling
@@ -112,6 +112,55 @@ class OpportunitiesRepository:
             logger.error(f"查询AS商机失败: {e}")
             return []
 
+    def find_as_opportunities_by_customers(self, customer_names: List[str], limit: int = 20) -> List[ASOpportunity]:
+        """
+        按企业身份表给出的客户名称原值等值查找AS商机
+
+        Args:
+            customer_names: 同一企业在AS系统中的全部客户名称
+            limit: 返回结果数量限制
+
+        Returns:
+            AS商机列表
+        """
+        if not customer_names:
+            return []
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+
+                placeholders = ', '.join(['%s'] * len(customer_names))
+                query = f"""
+                SELECT * FROM as_opportunities
+                WHERE customer_name IN ({placeholders})
+                ORDER BY create_time DESC
+                LIMIT %s
+                """
+                cursor.execute(query, (*customer_names, limit))
+                results = cursor.fetchall()
+                cursor.close()
+                return [ASOpportunity.from_db_row(row) for row in results]
+
+        except Exception as e:
+            logger.error(f"查询AS商机失败: {e}")
+            return []
+
+    def iter_as_customer_names(self, fetch_size: int = 2000) -> Iterator[str]:
+        """流式读取AS商机中出现过的全部客户名称（去重），供构建企业身份表"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT customer_name FROM as_opportunities
+            WHERE customer_name IS NOT NULL AND customer_name <> ''
+            """)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+            cursor.close()
+
     def search_as_opportunities(self, keyword: str, limit: int = 20) -> List[ASOpportunity]:
         """
         搜索AS商机（支持客户名称、产品名称、行业、合作伙伴）
@@ -256,6 +305,56 @@ class OpportunitiesRepository:
             logger.error(f"查询IPG商机失败: {e}")
             return []
 
+    def find_ipg_clients_by_names(self, client_names: List[str], limit: int = 20) -> List[IPGClient]:
+        """
+        按企业身份表给出的客户名称原值等值查找IPG商机
+
+        Args:
+            client_names: 同一企业在IPG系统中的全部客户名称
+            limit: 返回结果数量限制
+
+        Returns:
+            IPG商机列表
+        """
+        if not client_names:
+            return []
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+
+                placeholders = ', '.join(['%s'] * len(client_names))
+                query = f"""
+                SELECT * FROM ipg_clients
+                WHERE client_name IN ({placeholders}) AND (is_deleted = 0 OR is_deleted IS NULL)
+                ORDER BY create_time DESC
+                LIMIT %s
+                """
+                cursor.execute(query, (*client_names, limit))
+                results = cursor.fetchall()
+                cursor.close()
+                return [IPGClient.from_db_row(row) for row in results]
+
+        except Exception as e:
+            logger.error(f"查询IPG商机失败: {e}")
+            return []
+
+    def iter_ipg_client_names(self, fetch_size: int = 2000) -> Iterator[str]:
+        """流式读取IPG中未删除的全部客户名称（去重），供构建企业身份表"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT client_name FROM ipg_clients
+            WHERE client_name IS NOT NULL AND client_name <> ''
+              AND (is_deleted = 0 OR is_deleted IS NULL)
+            """)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+            cursor.close()
+
     def search_ipg_clients(self, keyword: str, limit: int = 20) -> List[IPGClient]:
         """
         搜索IPG商机（支持客户名称、产品、行业、代理商）
@@ -356,6 +455,34 @@ class OpportunitiesRepository:
             logger.error(f"按省份查询IPG商机失败: {e}")
             return []
 
+    def find_ipg_trade_labels(self, limit: int = 200000) -> List[Dict[str, Any]]:
+        """
+        查询已填写行业（trade）的IPG客户名称，用作行业分类训练样本
+
+        Args:
+            limit: 返回结果数量限制
+
+        Returns:
+            [{'name': 客户名称, 'industry': 行业}, ...]
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+
+                query = """
+                SELECT client_name AS name, trade AS industry FROM ipg_clients
+                WHERE trade IS NOT NULL AND trade <> ''
+                LIMIT %s
+                """
+                cursor.execute(query, (limit,))
+                results = cursor.fetchall()
+                cursor.close()
+                return results
+
+        except Exception as e:
+            logger.error(f"查询IPG客户行业标注失败: {e}")
+            return []
+
     # ==================== 统计方法 ====================
 
     def get_as_statistics(self) -> Dict[str, Any]:
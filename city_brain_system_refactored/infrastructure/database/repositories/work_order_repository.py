@@ -4,7 +4,7 @@
 """
 import logging
 import os
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
 from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import pooling
@@ -104,6 +104,69 @@ class WorkOrderRepository:
             logger.error(f"根据公司名称搜索工单失败: {e}")
             raise
 
+    def search_by_company_names(self, company_names: List[str], limit: int = 20) -> List[WorkOrder]:
+        """
+        按企业身份表给出的客户公司名称原值等值查找工单
+
+        Args:
+            company_names: 同一企业在工单系统中的全部客户公司名称
+            limit: 返回结果数量限制
+
+        Returns:
+            工单列表
+        """
+        if not company_names:
+            return []
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+
+                placeholders = ', '.join(['%s'] * len(company_names))
+                query = f"""
+                SELECT
+                    record_id, source_id, application_no, application_link, status,
+                    priority, workflow_name, customer_company, customer_contact,
+                    customer_phone_secondary, work_content, work_mode, work_type,
+                    engineer_identity, has_channel, channel_name, channel_contact,
+                    channel_phone_secondary, initiator_department, initiated_at,
+                    initiator_primary_id, initiator_primary_name, initiator_primary_email,
+                    completed_at, service_start_date, service_start_datetime,
+                    service_start_period, service_end_date, service_end_datetime,
+                    service_end_period, after_sales_engineer_primary_id,
+                    after_sales_engineer_primary_name, after_sales_engineer_primary_email,
+                    fetched_at, created_at, updated_at
+                FROM task_service_records
+                WHERE customer_company IN ({placeholders})
+                ORDER BY service_start_date DESC
+                LIMIT %s
+                """
+
+                cursor.execute(query, (*company_names, limit))
+                rows = cursor.fetchall()
+                cursor.close()
+
+                return [WorkOrder.from_db_row(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"根据公司名称查询工单失败: {e}")
+            raise
+
+    def iter_company_names(self, fetch_size: int = 2000) -> Iterator[str]:
+        """流式读取工单中出现过的全部客户公司名称（去重），供构建企业身份表"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT customer_company FROM task_service_records
+            WHERE customer_company IS NOT NULL AND customer_company <> ''
+            """)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+            cursor.close()
+
     def get_by_application_no(self, application_no: str) -> WorkOrder:
         """
         根据申请单号获取工单
@@ -2,6 +2,15 @@
 外部服务模块
 提供统一的外部API访问接口
 """
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    get_circuit_breaker,
+    get_all_circuit_breaker_status,
+    is_provider_available
+)
+from .hedging import HedgePolicy, get_hedge_policy
 from .bocha_client import BochaAIClient, get_bocha_client, search_web
 from .llm_client import LLMClient, get_llm_client, generate_summary, analyze_text
 from .revenue_service import get_company_revenue_info
@@ -9,6 +18,14 @@ from .ranking_service import get_company_ranking_status
 from .news_service import get_company_business_news, get_company_latest_news
 
 __all__ = [
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'CircuitState',
+    'get_circuit_breaker',
+    'get_all_circuit_breaker_status',
+    'is_provider_available',
+    'HedgePolicy',
+    'get_hedge_policy',
     'BochaAIClient',
     'get_bocha_client', 
     'search_web',
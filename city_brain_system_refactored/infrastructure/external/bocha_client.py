@@ -3,12 +3,19 @@
 提供网络搜索功能，支持错误处理、重试机制和配置管理
 """
 import requests
+import socket
+import threading
 import time
 import logging
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from .hedging import HedgePolicy, get_hedge_policy, run_hedged
 
 # 尝试导入配置，优先使用 settings（会从 .env 加载密钥），失败再回退到 simple_settings，最后默认
 try:
@@ -16,15 +23,36 @@ try:
     _cfg = get_settings()
     DEFAULT_BASE_URL = _cfg.bocha_api.base_url
     DEFAULT_API_KEY = _cfg.bocha_api.api_key
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD = _cfg.bocha_api.circuit_failure_threshold
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = _cfg.bocha_api.circuit_recovery_timeout
+    DEFAULT_HEDGE_ENABLED = _cfg.bocha_api.hedge_enabled
+    DEFAULT_HEDGE_PERCENTILE = _cfg.bocha_api.hedge_percentile
+    DEFAULT_HEDGE_BUDGET_RATIO = _cfg.bocha_api.hedge_budget_ratio
+    DEFAULT_HEDGE_MIN_SAMPLES = _cfg.bocha_api.hedge_min_samples
 except Exception:
     try:
         from config.simple_settings import get_simple_config
         _cfg = get_simple_config()
         DEFAULT_BASE_URL = _cfg.bocha_api.base_url
         DEFAULT_API_KEY = _cfg.bocha_api.api_key
+        DEFAULT_CIRCUIT_FAILURE_THRESHOLD = _cfg.bocha_api.circuit_failure_threshold
+        DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = _cfg.bocha_api.circuit_recovery_timeout
+        DEFAULT_HEDGE_ENABLED = _cfg.bocha_api.hedge_enabled
+        DEFAULT_HEDGE_PERCENTILE = _cfg.bocha_api.hedge_percentile
+        DEFAULT_HEDGE_BUDGET_RATIO = _cfg.bocha_api.hedge_budget_ratio
+        DEFAULT_HEDGE_MIN_SAMPLES = _cfg.bocha_api.hedge_min_samples
     except Exception:
         DEFAULT_BASE_URL = 'https://api.bochaai.com/v1/web-search'
         DEFAULT_API_KEY = ''
+        DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+        DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = 30.0
+        DEFAULT_HEDGE_ENABLED = False
+        DEFAULT_HEDGE_PERCENTILE = 95.0
+        DEFAULT_HEDGE_BUDGET_RATIO = 0.05
+        DEFAULT_HEDGE_MIN_SAMPLES = 20
+
+# 博查AI熔断器名称（所有调用方共享）
+BOCHA_CIRCUIT_NAME = 'bocha_ai'
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +122,83 @@ class BochaAPIError(Exception):
         self.response_text = response_text
 
 
+# 当前线程所在的连接取消范围（仅对冲执行期间设置）
+_active_scope = threading.local()
+
+
+class _ConnectionScope:
+    """
+    对冲请求的取消范围
+    记录范围内本线程从连接池取用的连接；abort() 关闭其套接字，使阻塞中的读取立即失败，
+    未胜出的请求不必等到超时才释放线程与连接
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections = []
+        self.aborted = False
+
+    def __enter__(self):
+        _active_scope.scope = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_scope.scope = None
+        return False
+
+    def track(self, connection) -> bool:
+        """记录连接；已中止时返回False"""
+        with self._lock:
+            if self.aborted:
+                return False
+            self._connections.append(connection)
+            return True
+
+    def abort(self):
+        """中止范围内的请求"""
+        with self._lock:
+            self.aborted = True
+            connections = list(self._connections)
+        for connection in connections:
+            sock = getattr(connection, 'sock', None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class _TrackedPoolMixin:
+    """取用连接时登记到当前线程的取消范围"""
+
+    def _get_conn(self, timeout=None):
+        connection = super()._get_conn(timeout)
+        scope = getattr(_active_scope, 'scope', None)
+        if scope is not None and not scope.track(connection):
+            connection.close()
+            raise ConnectionAbortedError("对冲请求已取消")
+        return connection
+
+
+class _TrackedHTTPConnectionPool(_TrackedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackedHTTPSConnectionPool(_TrackedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _TrackedAdapter(HTTPAdapter):
+    """使用可中止连接池的适配器"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TrackedHTTPConnectionPool,
+            'https': _TrackedHTTPSConnectionPool,
+        }
+
+
 class BochaAIClient:
     """博查AI搜索客户端"""
     
@@ -102,7 +207,10 @@ class BochaAIClient:
                  base_url: Optional[str] = None,
                  timeout: int = 30,
                  max_retries: int = 3,
-                 retry_delay: float = 1.0):
+                 retry_delay: float = 1.0,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 hedging_enabled: Optional[bool] = None,
+                 hedge_policy: Optional[HedgePolicy] = None):
         """
         初始化博查AI客户端
         
@@ -112,19 +220,36 @@ class BochaAIClient:
             timeout: 请求超时时间（秒）
             max_retries: 最大重试次数
             retry_delay: 重试延迟时间（秒）
+            circuit_breaker: 熔断器（默认使用全局共享的博查AI熔断器）
+            hedging_enabled: 是否启用对冲请求（默认读取配置）
+            hedge_policy: 对冲策略（默认使用全局共享的博查AI对冲策略）
         """
         self.api_key = api_key or DEFAULT_API_KEY
         self.base_url = base_url or DEFAULT_BASE_URL
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(
+            BOCHA_CIRCUIT_NAME,
+            failure_threshold=DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=DEFAULT_CIRCUIT_RECOVERY_TIMEOUT
+        )
+        self.hedging_enabled = DEFAULT_HEDGE_ENABLED if hedging_enabled is None else hedging_enabled
+        self.hedge_policy = hedge_policy or get_hedge_policy(
+            BOCHA_CIRCUIT_NAME,
+            percentile=DEFAULT_HEDGE_PERCENTILE,
+            budget_ratio=DEFAULT_HEDGE_BUDGET_RATIO,
+            min_samples=DEFAULT_HEDGE_MIN_SAMPLES
+        )
         
         # 验证配置
         if not self.api_key:
             logger.warning("博查AI API密钥未配置，可能导致请求失败")
         
-        # 设置请求会话
+        # 设置请求会话（对冲时未胜出的请求可中止其连接）
         self.session = requests.Session()
+        self.session.mount('http://', _TrackedAdapter())
+        self.session.mount('https://', _TrackedAdapter())
         self.session.headers.update({
             'Content-Type': 'application/json',
             'User-Agent': 'CityBrain/1.0'
@@ -190,6 +315,10 @@ class BochaAIClient:
             
             return SearchResult.success_result(response_data, response_time)
             
+        except CircuitOpenError as e:
+            response_time = time.time() - start_time
+            logger.warning(f"博查AI搜索快速失败: {e}")
+            return SearchResult.error_result(f"博查AI搜索失败: {str(e)}", status_code=503, response_time=response_time)
         except Exception as e:
             response_time = time.time() - start_time
             error_msg = f"博查AI搜索失败: {str(e)}"
@@ -276,25 +405,26 @@ class BochaAIClient:
             
         Raises:
             BochaAPIError: API请求失败
+            CircuitOpenError: 熔断器打开，未发起请求
         """
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
+            # 熔断器打开时不再等待超时与重试，直接失败
+            probe = self.circuit_breaker.before_call()
             try:
                 if attempt > 0:
                     delay = self.retry_delay * (2 ** (attempt - 1))  # 指数退避
                     logger.info(f"重试博查AI请求 (第{attempt}次), 延迟{delay:.1f}秒")
                     time.sleep(delay)
                 
-                response = self.session.post(
-                    self.base_url,
-                    json=payload,
-                    timeout=self.timeout
-                )
+                response = self._post(payload)
                 
                 # 检查HTTP状态码
                 if response.status_code == 200:
-                    return response.json()
+                    data = response.json()
+                    self.circuit_breaker.record_success()
+                    return data
                 elif response.status_code == 401:
                     raise BochaAPIError("API密钥无效或已过期", response.status_code, response.text)
                 elif response.status_code == 429:
@@ -306,22 +436,33 @@ class BochaAIClient:
                     
             except requests.exceptions.Timeout as e:
                 last_exception = BochaAPIError(f"请求超时: {e}")
+                self.circuit_breaker.record_failure()
                 logger.warning(f"博查AI请求超时 (第{attempt + 1}次尝试): {e}")
             except requests.exceptions.ConnectionError as e:
                 last_exception = BochaAPIError(f"连接错误: {e}")
+                self.circuit_breaker.record_failure()
                 logger.warning(f"博查AI连接错误 (第{attempt + 1}次尝试): {e}")
             except requests.exceptions.RequestException as e:
                 last_exception = BochaAPIError(f"请求异常: {e}")
+                self.circuit_breaker.record_failure()
                 logger.warning(f"博查AI请求异常 (第{attempt + 1}次尝试): {e}")
             except json.JSONDecodeError as e:
                 last_exception = BochaAPIError(f"响应解析失败: {e}")
+                self.circuit_breaker.record_failure()
                 logger.error(f"博查AI响应解析失败: {e}")
                 break  # JSON解析错误不需要重试
             except BochaAPIError as e:
+                # 限流和服务端错误计入熔断；其他状态码说明服务商可达
+                if e.status_code == 429 or (e.status_code or 0) >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
                 if e.status_code in [401, 403]:  # 认证错误不需要重试
                     raise e
                 last_exception = e
                 logger.warning(f"博查AI API错误 (第{attempt + 1}次尝试): {e}")
+            finally:
+                self.circuit_breaker.release_probe(probe)
         
         # 所有重试都失败了
         if last_exception:
@@ -329,6 +470,24 @@ class BochaAIClient:
         else:
             raise BochaAPIError("未知错误")
     
+    def _post(self, payload: Dict[str, Any]) -> requests.Response:
+        """
+        发送单次HTTP请求；启用对冲时慢请求会触发一次重复请求
+        
+        Args:
+            payload: 请求负载
+            
+        Returns:
+            HTTP响应
+        """
+        def call() -> requests.Response:
+            return self.session.post(self.base_url, json=payload, timeout=self.timeout)
+        
+        if not self.hedging_enabled:
+            return call()
+        return run_hedged(call, self.hedge_policy, time.time,
+                          cancel_scope=_ConnectionScope, discard=lambda response: response.close())
+    
     def health_check(self) -> bool:
         """
         健康检查
@@ -356,7 +515,10 @@ class BochaAIClient:
             'timeout': self.timeout,
             'max_retries': self.max_retries,
             'retry_delay': self.retry_delay,
-            'has_api_key': bool(self.api_key)
+            'has_api_key': bool(self.api_key),
+            'circuit_breaker': self.circuit_breaker.get_status(),
+            'hedging_enabled': self.hedging_enabled,
+            'hedging': self.hedge_policy.get_stats()
         }
     
     def close(self):
@@ -0,0 +1,259 @@
+"""
+外部服务熔断器
+为博查AI、LLM等外部依赖提供按服务商共享的熔断保护（closed/open/half-open），
+服务商故障期间直接快速失败，避免每次请求都等待 timeout × (max_retries+1)
+"""
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+DEFAULT_HALF_OPEN_MAX_CALLS = 1
+
+
+class CircuitState(Enum):
+    """熔断器状态枚举"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """熔断器打开时的快速失败异常"""
+    def __init__(self, name: str, retry_after: float = 0.0):
+        super().__init__(f"{name} 服务熔断中，{retry_after:.1f}秒后允许探测请求")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """线程安全的熔断器"""
+
+    def __init__(self,
+                 name: str,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+                 half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS):
+        """
+        初始化熔断器
+
+        Args:
+            name: 服务名称
+            failure_threshold: 连续失败多少次后打开熔断
+            recovery_timeout: 打开后多少秒进入半开状态
+            half_open_max_calls: 半开状态下允许同时进行的探测请求数
+        """
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_timeout = max(0.0, float(recovery_timeout))
+        self.half_open_max_calls = max(1, int(half_open_max_calls))
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+        # 统计信息
+        self._total_failures = 0
+        self._total_rejected = 0
+        self._last_failure_time: Optional[float] = None
+        self._last_state_change = time.time()
+
+    def _set_state(self, state: CircuitState):
+        """切换状态（调用方需持有锁）"""
+        if state != self._state:
+            logger.warning(f"熔断器状态变更: {self.name} {self._state.value} -> {state.value}")
+            self._state = state
+            self._last_state_change = time.time()
+
+    def _refresh_state(self):
+        """打开超时后进入半开状态（调用方需持有锁）"""
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._set_state(CircuitState.HALF_OPEN)
+            self._half_open_calls = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """当前状态"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def is_open(self) -> bool:
+        """熔断器是否处于打开状态（不占用半开探测名额）"""
+        return self.state == CircuitState.OPEN
+
+    def _acquire(self) -> Optional[bool]:
+        """
+        申请一次请求（调用方需持有锁）
+
+        Returns:
+            不允许时返回None；允许时返回是否占用了半开探测名额
+        """
+        self._refresh_state()
+
+        if self._state == CircuitState.CLOSED:
+            return False
+
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+
+        self._total_rejected += 1
+        return None
+
+    def allow_request(self) -> bool:
+        """
+        判断是否允许发起请求
+
+        Returns:
+            是否允许；半开状态下会占用一个探测名额
+        """
+        with self._lock:
+            return self._acquire() is not None
+
+    def before_call(self) -> bool:
+        """
+        请求前检查
+
+        Returns:
+            是否占用了半开探测名额；调用方须在 finally 中传给 release_probe
+
+        Raises:
+            CircuitOpenError: 熔断器打开时直接抛出
+        """
+        with self._lock:
+            probe = self._acquire()
+        if probe is None:
+            raise CircuitOpenError(self.name, self.retry_after())
+        return probe
+
+    def release_probe(self, probe: bool):
+        """
+        请求结束后归还半开探测名额
+
+        已记录结果时状态已切换，无需归还；探测请求在 record_success/record_failure 之前
+        抛出意外异常时，名额不会一直被占用而使熔断器停在半开状态拒绝所有请求
+
+        Args:
+            probe: before_call 的返回值
+        """
+        if not probe:
+            return
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def retry_after(self) -> float:
+        """距离允许探测请求的剩余秒数"""
+        with self._lock:
+            if self._state != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        """记录一次成功调用"""
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_calls = 0
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self):
+        """记录一次失败调用"""
+        with self._lock:
+            self._consecutive_failures += 1
+            self._total_failures += 1
+            self._last_failure_time = time.time()
+
+            if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+                self._set_state(CircuitState.OPEN)
+
+    def reset(self):
+        """重置为关闭状态"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+            self._set_state(CircuitState.CLOSED)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取熔断器状态
+
+        Returns:
+            状态信息字典
+        """
+        state = self.state
+        with self._lock:
+            return {
+                'name': self.name,
+                'state': state.value,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_timeout': self.recovery_timeout,
+                'retry_after': round(max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)), 2)
+                if state == CircuitState.OPEN else 0.0,
+                'total_failures': self._total_failures,
+                'total_rejected': self._total_rejected,
+                'last_failure_time': self._last_failure_time,
+                'last_state_change': self._last_state_change
+            }
+
+
+# 全局熔断器注册表（按服务商共享）
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str,
+                        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+                        half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS) -> CircuitBreaker:
+    """
+    获取指定服务商的熔断器（同名共享同一实例）
+
+    Args:
+        name: 服务名称
+        failure_threshold: 首次创建时使用的失败阈值
+        recovery_timeout: 首次创建时使用的恢复时间
+        half_open_max_calls: 首次创建时使用的半开探测数
+
+    Returns:
+        熔断器实例
+    """
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, failure_threshold, recovery_timeout, half_open_max_calls)
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_all_circuit_breaker_status() -> Dict[str, Dict[str, Any]]:
+    """获取所有已注册熔断器的状态"""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.get_status() for breaker in breakers}
+
+
+def is_provider_available(name: str) -> bool:
+    """
+    判断服务商当前是否可用（熔断器未打开）
+
+    Args:
+        name: 服务名称
+
+    Returns:
+        未注册或未打开时返回True
+    """
+    with _registry_lock:
+        breaker = _breakers.get(name)
+    return breaker is None or not breaker.is_open()
@@ -0,0 +1,267 @@
+"""
+对冲请求策略
+记录近期请求延迟，当单次请求超过指定分位延迟仍未返回时发起一次重复请求，
+取先返回者；对冲次数受全局令牌桶预算约束，保证额外负载不超过设定比例
+
+主请求在调用方线程执行，只有对冲请求进入共享线程池；
+未胜出的请求通过调用方提供的取消范围中止，已返回的结果交给 discard 释放
+"""
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, ContextManager, Deque, Dict, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_BUDGET_RATIO = 0.05
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_WINDOW_SIZE = 200
+DEFAULT_HEDGE_MAX_TOKENS = 10.0
+
+
+class HedgePolicy:
+    """对冲策略：延迟分位统计 + 对冲预算"""
+
+    def __init__(self,
+                 name: str,
+                 percentile: float = DEFAULT_HEDGE_PERCENTILE,
+                 budget_ratio: float = DEFAULT_HEDGE_BUDGET_RATIO,
+                 min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+                 window_size: int = DEFAULT_HEDGE_WINDOW_SIZE,
+                 max_tokens: float = DEFAULT_HEDGE_MAX_TOKENS):
+        """
+        初始化对冲策略
+
+        Args:
+            name: 服务名称
+            percentile: 触发对冲的延迟分位（0-100）
+            budget_ratio: 对冲请求占总请求的最大比例
+            min_samples: 样本数不足时不触发对冲
+            window_size: 延迟统计窗口大小
+            max_tokens: 预算令牌上限，限制突发对冲数量
+        """
+        self.name = name
+        self.percentile = min(100.0, max(0.0, float(percentile)))
+        self.budget_ratio = max(0.0, float(budget_ratio))
+        self.min_samples = max(1, int(min_samples))
+        self.max_tokens = max(1.0, float(max_tokens))
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=max(1, int(window_size)))
+        self._tokens = 0.0
+
+        # 统计信息
+        self._total_requests = 0
+        self._total_hedges = 0
+        self._hedge_wins = 0
+        self._budget_denied = 0
+
+    def record_latency(self, seconds: float):
+        """记录一次成功请求的延迟"""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        计算触发对冲的等待时间
+
+        Returns:
+            分位延迟（秒）；样本不足时返回None
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(self.percentile / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def record_request(self):
+        """记录一次主请求，并按比例积累对冲预算"""
+        with self._lock:
+            self._total_requests += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.budget_ratio)
+
+    def try_acquire_hedge(self) -> bool:
+        """
+        尝试占用一次对冲预算
+
+        Returns:
+            是否允许发起对冲
+        """
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self._total_hedges += 1
+                return True
+            self._budget_denied += 1
+            return False
+
+    def record_hedge_win(self):
+        """记录对冲请求先于主请求返回"""
+        with self._lock:
+            self._hedge_wins += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取对冲统计信息"""
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                'name': self.name,
+                'percentile': self.percentile,
+                'budget_ratio': self.budget_ratio,
+                'hedge_delay': round(delay, 3) if delay is not None else None,
+                'samples': len(self._latencies),
+                'total_requests': self._total_requests,
+                'total_hedges': self._total_hedges,
+                'hedge_wins': self._hedge_wins,
+                'budget_denied': self._budget_denied,
+                'hedge_ratio': round(self._total_hedges / self._total_requests, 4) if self._total_requests else 0.0
+            }
+
+
+# 对冲请求共享线程池（仅执行对冲请求，主请求在调用方线程执行）
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+# 全局对冲策略注册表（按服务商共享预算）
+_policies: Dict[str, HedgePolicy] = {}
+_registry_lock = threading.Lock()
+
+
+def get_hedge_policy(name: str, **kwargs) -> HedgePolicy:
+    """
+    获取指定服务商的对冲策略（同名共享同一实例）
+
+    Args:
+        name: 服务名称
+        **kwargs: 首次创建时使用的策略参数
+
+    Returns:
+        对冲策略实例
+    """
+    with _registry_lock:
+        policy = _policies.get(name)
+        if policy is None:
+            policy = HedgePolicy(name, **kwargs)
+            _policies[name] = policy
+        return policy
+
+
+class _NoCancel:
+    """不支持取消时的空取消范围"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def abort(self):
+        pass
+
+
+def run_hedged(call: Callable[[], T], policy: HedgePolicy, clock: Callable[[], float],
+               cancel_scope: Optional[Callable[[], ContextManager]] = None,
+               discard: Optional[Callable[[T], None]] = None) -> T:
+    """
+    以对冲方式执行调用
+
+    主请求在调用方线程执行，不经过线程池排队；超过分位延迟仍未返回时才把对冲请求提交到线程池。
+    一方先成功后中止另一方（cancel_scope.abort()），未胜出但已返回的结果交给 discard 释放
+
+    Args:
+        call: 无参调用（需可安全地重复执行）
+        policy: 对冲策略
+        clock: 计时函数（如 time.time）
+        cancel_scope: 取消范围工厂；范围内执行的调用在 abort() 后应尽快以异常结束
+            （如关闭其连接）。为空时未胜出的请求在后台自然结束
+        discard: 释放未胜出请求的结果（如关闭HTTP响应）
+
+    Returns:
+        最先成功返回的结果
+
+    Raises:
+        Exception: 所有已发出的请求均失败时抛出主请求的异常
+    """
+    policy.record_request()
+    delay = policy.hedge_delay()
+    start = clock()
+
+    if delay is None:
+        # 样本不足不会对冲
+        result = call()
+        policy.record_latency(clock() - start)
+        return result
+
+    new_scope = cancel_scope or _NoCancel
+    primary_scope = new_scope()
+    lock = threading.Lock()
+    state: Dict[str, Any] = {'done': False, 'winner': None, 'hedge': None, 'hedge_scope': None}
+
+    def run_hedge() -> Tuple[T, float]:
+        began = clock()
+        with state['hedge_scope']:
+            result = call()
+        return result, clock() - began
+
+    def on_hedge_done(future: Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with lock:
+            won = state['winner'] is None
+            if won:
+                state['winner'] = 'hedge'
+        if won:
+            primary_scope.abort()
+        elif discard is not None:
+            discard(future.result()[0])
+
+    def launch_hedge():
+        with lock:
+            if state['done'] or not policy.try_acquire_hedge():
+                return
+            logger.info(f"{policy.name} 请求超过P{policy.percentile:g}延迟({delay:.2f}秒)，发起对冲请求")
+            state['hedge_scope'] = new_scope()
+            state['hedge'] = _hedge_executor.submit(run_hedge)
+        state['hedge'].add_done_callback(on_hedge_done)
+
+    timer = threading.Timer(delay, launch_hedge)
+    timer.daemon = True
+    timer.start()
+
+    result, error = None, None
+    try:
+        with primary_scope:
+            result = call()
+    except Exception as e:
+        error = e
+    finally:
+        timer.cancel()
+
+    with lock:
+        state['done'] = True
+        if error is None and state['winner'] is None:
+            state['winner'] = 'primary'
+        winner, hedge = state['winner'], state['hedge']
+
+    if winner == 'primary':
+        if hedge is not None and not hedge.cancel():
+            state['hedge_scope'].abort()
+        policy.record_latency(clock() - start)
+        return result
+
+    if winner == 'hedge' and error is None and discard is not None:
+        # 主请求在被中止前已返回，结果未被采用
+        discard(result)
+    if hedge is not None:
+        try:
+            hedge_result, elapsed = hedge.result()
+        except Exception:
+            raise error
+        policy.record_latency(elapsed)
+        policy.record_hedge_win()
+        return hedge_result
+    raise error
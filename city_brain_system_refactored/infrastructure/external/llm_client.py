@@ -2,14 +2,17 @@
 大语言模型客户端
 支持DeepSeek API，提供文本生成、总结和分析功能
 """
+import asyncio
 import requests
 import time
 import logging
 import json
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Iterator, AsyncIterator
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+
 # 尝试导入配置，优先使用 settings（会从 .env 加载密钥），失败再回退到 simple_settings，最后默认
 try:
     from config.settings import get_settings
@@ -17,6 +20,8 @@ try:
     DEFAULT_BASE_URL = _cfg.llm_api.base_url
     DEFAULT_API_KEY = _cfg.llm_api.api_key
     DEFAULT_MODEL = _cfg.llm_api.model
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD = _cfg.llm_api.circuit_failure_threshold
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = _cfg.llm_api.circuit_recovery_timeout
 except Exception:
     try:
         from config.simple_settings import get_simple_config
@@ -24,10 +29,17 @@ except Exception:
         DEFAULT_BASE_URL = _cfg.llm_api.base_url
         DEFAULT_API_KEY = _cfg.llm_api.api_key
         DEFAULT_MODEL = _cfg.llm_api.model
+        DEFAULT_CIRCUIT_FAILURE_THRESHOLD = _cfg.llm_api.circuit_failure_threshold
+        DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = _cfg.llm_api.circuit_recovery_timeout
     except Exception:
         DEFAULT_BASE_URL = 'https://api.deepseek.com'
         DEFAULT_API_KEY = ''
         DEFAULT_MODEL = 'deepseek-chat'
+        DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+        DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = 30.0
+
+# LLM熔断器名称（所有调用方共享）
+LLM_CIRCUIT_NAME = 'llm'
 
 logger = logging.getLogger(__name__)
 
@@ -161,7 +173,8 @@ class LLMClient:
                  model: Optional[str] = None,
                  timeout: int = 60,
                  max_retries: int = 3,
-                 retry_delay: float = 1.0):
+                 retry_delay: float = 1.0,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         """
         初始化LLM客户端
         
@@ -172,6 +185,7 @@ class LLMClient:
             timeout: 请求超时时间（秒）
             max_retries: 最大重试次数
             retry_delay: 重试延迟时间（秒）
+            circuit_breaker: 熔断器（默认使用全局共享的LLM熔断器）
         """
         self.api_key = api_key or DEFAULT_API_KEY
         self.base_url = base_url or DEFAULT_BASE_URL
@@ -179,6 +193,11 @@ class LLMClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(
+            LLM_CIRCUIT_NAME,
+            failure_threshold=DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=DEFAULT_CIRCUIT_RECOVERY_TIMEOUT
+        )
         
         # 验证配置
         if not self.api_key:
@@ -215,7 +234,26 @@ class LLMClient:
         Returns:
             聊天响应
         """
-        # 兼容多种消息输入类型，统一转为 ChatMessage
+        request = ChatRequest(
+            messages=self._normalize_messages(messages),
+            model=model or self.model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        
+        return self.chat_with_request(request)
+    
+    def _normalize_messages(self, messages: List[Union[ChatMessage, Dict[str, Any], str]]) -> List[ChatMessage]:
+        """
+        兼容多种消息输入类型，统一转为 ChatMessage
+        
+        Args:
+            messages: 消息列表（支持 ChatMessage、dict 或 str）
+            
+        Returns:
+            ChatMessage列表
+        """
         normalized_messages: List[ChatMessage] = []
         for msg in messages or []:
             try:
@@ -242,16 +280,7 @@ class LLMClient:
                     logging.getLogger(__name__).warning(f"不支持的消息类型，已跳过: {type(msg)}")
             except Exception as _e:
                 logging.getLogger(__name__).warning(f"消息规范化失败，已跳过: {msg}")
-        
-        request = ChatRequest(
-            messages=normalized_messages,
-            model=model or self.model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs
-        )
-        
-        return self.chat_with_request(request)
+        return normalized_messages
     
     def chat_with_request(self, request: ChatRequest) -> ChatResponse:
         """
@@ -277,12 +306,120 @@ class LLMClient:
             logger.info(f"LLM请求完成: 耗时={response_time:.2f}秒, 成功={result.success}")
             return result
             
+        except CircuitOpenError as e:
+            logger.warning(f"LLM请求快速失败: {e}")
+            return ChatResponse.error_response(f"LLM请求失败: {str(e)}")
         except Exception as e:
             response_time = time.time() - start_time
             error_msg = f"LLM请求失败: {str(e)}"
             logger.error(f"{error_msg}, 耗时={response_time:.2f}秒")
             return ChatResponse.error_response(error_msg)
     
+    def stream_chat(self,
+                    messages: List[ChatMessage],
+                    model: Optional[str] = None,
+                    temperature: float = 0.7,
+                    max_tokens: Optional[int] = None,
+                    **kwargs) -> Iterator[str]:
+        """
+        流式聊天对话，逐段返回模型生成的增量文本
+        
+        Args:
+            messages: 消息列表（支持 ChatMessage、dict 或 str）
+            model: 模型名称
+            temperature: 温度参数
+            max_tokens: 最大token数
+            **kwargs: 其他参数
+            
+        Yields:
+            增量文本片段
+            
+        Raises:
+            LLMAPIError: 建立流式连接失败
+            CircuitOpenError: 熔断器打开
+        """
+        kwargs.pop('stream', None)
+        request = ChatRequest(
+            messages=self._normalize_messages(messages),
+            model=model or self.model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **kwargs
+        )
+        
+        return self.stream_chat_with_request(request)
+    
+    def stream_chat_with_request(self, request: ChatRequest) -> Iterator[str]:
+        """
+        使用请求对象执行流式聊天（Server-Sent Events）
+        
+        Args:
+            request: 聊天请求对象（强制 stream=True）
+            
+        Yields:
+            增量文本片段
+        """
+        request.stream = True
+        start_time = time.time()
+        logger.info(f"开始LLM流式请求: 模型={request.model}, 消息数={len(request.messages)}")
+        
+        response = self._open_stream_with_retry('/v1/chat/completions', request.to_dict())
+        first_token_time = None
+        try:
+            for raw_line in response.iter_lines():
+                if not raw_line:
+                    continue
+                line = raw_line.decode('utf-8') if isinstance(raw_line, bytes) else raw_line
+                if not line.startswith('data:'):
+                    continue  # 忽略注释行与其他SSE字段
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    break
+                
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    logger.warning(f"LLM流式片段解析失败，已跳过: {data[:100]}")
+                    continue
+                
+                choices = chunk.get('choices') or []
+                if not choices:
+                    continue
+                delta = (choices[0].get('delta') or {}).get('content')
+                if delta:
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                        logger.info(f"LLM流式首个片段: 耗时={first_token_time:.2f}秒")
+                    yield delta
+        finally:
+            response.close()
+            logger.info(f"LLM流式请求完成: 耗时={time.time() - start_time:.2f}秒")
+    
+    async def astream_chat(self,
+                           messages: List[ChatMessage],
+                           **kwargs) -> AsyncIterator[str]:
+        """
+        异步流式聊天，在线程池中读取流，不阻塞事件循环
+        
+        Args:
+            messages: 消息列表
+            **kwargs: 与 stream_chat 相同的参数
+            
+        Yields:
+            增量文本片段
+        """
+        iterator = self.stream_chat(messages, **kwargs)
+        sentinel = object()
+        try:
+            while True:
+                delta = await asyncio.to_thread(next, iterator, sentinel)
+                if delta is sentinel:
+                    break
+                yield delta
+        finally:
+            iterator.close()
+    
     def simple_chat(self, user_message: str, system_message: Optional[str] = None, **kwargs) -> ChatResponse:
         """
         简单聊天接口
@@ -332,6 +469,9 @@ class LLMClient:
             logger.info(f"简单LLM请求完成: 耗时={response_time:.2f}秒, 成功={result.success}")
             return result
             
+        except CircuitOpenError as e:
+            logger.warning(f"简单LLM请求快速失败: {e}")
+            return ChatResponse.error_response(f"简单LLM请求失败: {str(e)}")
         except Exception as e:
             response_time = time.time() - start_time
             error_msg = f"简单LLM请求失败: {str(e)}"
@@ -471,11 +611,14 @@ class LLMClient:
             
         Raises:
             LLMAPIError: API请求失败
+            CircuitOpenError: 熔断器打开，未发起请求
         """
         url = f"{self.base_url.rstrip('/')}{endpoint}"
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
+            # 熔断器打开时不再等待超时与重试，直接失败
+            probe = self.circuit_breaker.before_call()
             try:
                 if attempt > 0:
                     delay = self.retry_delay * (2 ** (attempt - 1))  # 指数退避
@@ -490,7 +633,9 @@ class LLMClient:
                 
                 # 检查HTTP状态码
                 if response.status_code == 200:
-                    return response.json()
+                    data = response.json()
+                    self.circuit_breaker.record_success()
+                    return data
                 elif response.status_code == 401:
                     raise LLMAPIError("API密钥无效或已过期", response.status_code, response.text)
                 elif response.status_code == 429:
@@ -502,22 +647,33 @@ class LLMClient:
                     
             except requests.exceptions.Timeout as e:
                 last_exception = LLMAPIError(f"请求超时: {e}")
+                self.circuit_breaker.record_failure()
                 logger.warning(f"LLM请求超时 (第{attempt + 1}次尝试): {e}")
             except requests.exceptions.ConnectionError as e:
                 last_exception = LLMAPIError(f"连接错误: {e}")
+                self.circuit_breaker.record_failure()
                 logger.warning(f"LLM连接错误 (第{attempt + 1}次尝试): {e}")
             except requests.exceptions.RequestException as e:
                 last_exception = LLMAPIError(f"请求异常: {e}")
+                self.circuit_breaker.record_failure()
                 logger.warning(f"LLM请求异常 (第{attempt + 1}次尝试): {e}")
             except json.JSONDecodeError as e:
                 last_exception = LLMAPIError(f"响应解析失败: {e}")
+                self.circuit_breaker.record_failure()
                 logger.error(f"LLM响应解析失败: {e}")
                 break  # JSON解析错误不需要重试
             except LLMAPIError as e:
+                # 限流和服务端错误计入熔断；其他状态码说明服务商可达
+                if e.status_code == 429 or (e.status_code or 0) >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
                 if e.status_code in [401, 403]:  # 认证错误不需要重试
                     raise e
                 last_exception = e
                 logger.warning(f"LLM API错误 (第{attempt + 1}次尝试): {e}")
+            finally:
+                self.circuit_breaker.release_probe(probe)
         
         # 所有重试都失败了
         if last_exception:
@@ -525,6 +681,64 @@ class LLMClient:
         else:
             raise LLMAPIError("未知错误")
     
+    def _open_stream_with_retry(self, endpoint: str, payload: Dict[str, Any]) -> requests.Response:
+        """
+        建立流式HTTP连接（仅在收到首字节前重试）
+        
+        Args:
+            endpoint: API端点
+            payload: 请求负载
+            
+        Returns:
+            状态码为200的流式响应
+            
+        Raises:
+            LLMAPIError: API请求失败
+            CircuitOpenError: 熔断器打开，未发起请求
+        """
+        url = f"{self.base_url.rstrip('/')}{endpoint}"
+        last_exception = None
+        
+        for attempt in range(self.max_retries + 1):
+            probe = self.circuit_breaker.before_call()
+            try:
+                if attempt > 0:
+                    delay = self.retry_delay * (2 ** (attempt - 1))  # 指数退避
+                    logger.info(f"重试LLM流式请求 (第{attempt}次), 延迟{delay:.1f}秒")
+                    time.sleep(delay)
+                
+                response = self.session.post(
+                    url,
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=True
+                )
+                
+                if response.status_code == 200:
+                    self.circuit_breaker.record_success()
+                    return response
+                
+                status_code = response.status_code
+                response_text = response.text
+                response.close()
+                if status_code == 429 or status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                if status_code in [401, 403]:  # 认证错误不需要重试
+                    raise LLMAPIError("API密钥无效或已过期", status_code, response_text)
+                last_exception = LLMAPIError(f"流式请求失败: {status_code}", status_code, response_text)
+                logger.warning(f"LLM流式API错误 (第{attempt + 1}次尝试): {status_code}")
+                
+            except requests.exceptions.RequestException as e:
+                last_exception = LLMAPIError(f"流式请求异常: {e}")
+                self.circuit_breaker.record_failure()
+                logger.warning(f"LLM流式请求异常 (第{attempt + 1}次尝试): {e}")
+            finally:
+                self.circuit_breaker.release_probe(probe)
+        
+        raise last_exception or LLMAPIError("未知错误")
+    
     def health_check(self) -> bool:
         """
         健康检查
@@ -552,7 +766,8 @@ class LLMClient:
             'timeout': self.timeout,
             'max_retries': self.max_retries,
             'retry_delay': self.retry_delay,
-            'has_api_key': bool(self.api_key)
+            'has_api_key': bool(self.api_key),
+            'circuit_breaker': self.circuit_breaker.get_status()
         }
     
     def close(self):
@@ -7,8 +7,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from . import search_web, generate_summary
+from infrastructure.utils.prompt_builder import build_evidence_text
 import re
 
+# 新闻证据优先关键词
+NEWS_KEYWORDS = ['订单', '合作', '签约', '发布', '投资', '产品', '项目', '中标']
+
 
 def get_company_business_news(company_name):
     """
@@ -26,6 +30,9 @@ def get_company_business_news(company_name):
         search_results = search_web(search_query)
         
         if search_results and search_results.get('data'):
+            # 仅保留去重后的标题/摘要/链接，并按token预算截断
+            evidence_text = build_evidence_text(search_results['data'], keywords=NEWS_KEYWORDS)
+            
             # 使用LLM处理新闻信息并生成带引用的描述
             prompt = f"""
             请基于以下搜索结果，为{company_name}生成最近的商业新闻摘要。
@@ -36,7 +43,8 @@ def get_company_business_news(company_name):
             3. 业务扩展或投资动态
             4. 其他重要商业动态
             
-            搜索结果：{search_results['data']}
+            搜索结果：
+            {evidence_text}
             
             请按以下格式输出：
             ## 最新商业动态
@@ -178,12 +186,15 @@ def get_company_latest_news(company_name, news_type="all"):
                 "all": "请全面分析各类商业动态"
             }
             
+            evidence_text = build_evidence_text(search_results['data'])
+            
             prompt = f"""
             请基于以下搜索结果，为{company_name}生成{news_type}类型的新闻摘要。
             
             分析重点：{type_prompts.get(news_type, type_prompts["all"])}
             
-            搜索结果：{search_results['data']}
+            搜索结果：
+            {evidence_text}
             
             请提供简洁明了的新闻摘要，如果没有找到相关新闻，请返回"暂无相关资讯"。
             """
@@ -17,6 +17,8 @@ from typing import Optional, Dict, Any, List
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from . import search_web, generate_summary
+from .bocha_client import BOCHA_CIRCUIT_NAME
+from .circuit_breaker import is_provider_available
 
 logger = logging.getLogger(__name__)
 
@@ -289,6 +291,11 @@ def _search_with_retry(query: str, max_retries: int = MAX_RETRIES) -> Optional[D
         搜索结果或None
     """
     for attempt in range(max_retries):
+        # 博查AI熔断时直接放弃，避免重试等待
+        if not is_provider_available(BOCHA_CIRCUIT_NAME):
+            logger.warning(f"博查AI服务熔断中，跳过搜索: {query}")
+            return None
+
         try:
             logger.debug(f"搜索尝试 {attempt + 1}/{max_retries}: {query}")
 
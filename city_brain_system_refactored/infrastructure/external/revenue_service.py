@@ -7,6 +7,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from . import search_web, generate_summary
+from infrastructure.utils.prompt_builder import Evidence, PromptEvidenceBuilder
+
+# 营收证据优先关键词
+REVENUE_KEYWORDS = ['营收', '营业收入', '亿元', '万元', '净利润']
 
 
 def get_company_revenue_info(company_name):
@@ -74,11 +78,14 @@ def analyze_revenue_data(revenue_data, company_name):
         str: 营收分析结果
     """
     try:
-        # 构建分析提示
-        data_text = ""
-        for i, data in enumerate(revenue_data[:5], 1):
-            data_text += f"{i}. 标题: {data['title']}\n"
-            data_text += f"   内容: {data['snippet']}\n\n"
+        # 构建分析提示：多个查询的结果常有重复，去重后按token预算截断
+        builder = PromptEvidenceBuilder(max_items=5)
+        evidence = builder.select(
+            [Evidence(title=d.get('title', ''), snippet=d.get('snippet', ''), url=d.get('url', ''))
+             for d in revenue_data],
+            keywords=REVENUE_KEYWORDS
+        )
+        data_text = builder.render(evidence)
         
         prompt = f"""
         请基于以下搜索结果，分析和总结"{company_name}"近三年（2021-2023年）的营收情况：
@@ -2,13 +2,15 @@
 外部服务管理器
 统一管理和编排外部API服务
 """
+import asyncio
 import logging
+import threading
 import time
 import uuid
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Iterable, Iterator, AsyncIterator, Tuple
+from dataclasses import dataclass, field, asdict
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 
 from infrastructure.utils.datetime_utils import now_utc
 from .bocha_client import BochaAIClient, get_bocha_client
@@ -81,6 +83,131 @@ class EnterpriseInfo:
     raw_data: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class BatchSearchStats:
+    """批量搜索统计"""
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    total_response_time: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed + self.timed_out
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('started_at')
+        data.pop('finished_at')
+        data['total_response_time'] = round(self.total_response_time, 3)
+        data['completed'] = self.completed
+        data['elapsed'] = round(self.elapsed, 3)
+        data['avg_response_time'] = round(self.total_response_time / self.completed, 3) if self.completed else 0.0
+        return data
+
+
+class _BatchSearchWindow:
+    """
+    批量搜索的有界提交窗口
+
+    按需从名称迭代器取数提交，在途任务（含已超时但线程仍在运行的任务）不超过窗口大小，
+    每个条目从实际开始执行起计算超时
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, enterprise_names: Iterable[str], window: int, item_timeout: float,
+                 stats: BatchSearchStats):
+        self._names = iter(enterprise_names)
+        self._exhausted = False
+        self.window = max(1, window)
+        self.item_timeout = item_timeout
+        self.stats = stats
+        self.pending: Dict[Any, Tuple[str, Dict[str, Optional[float]]]] = {}
+        self._abandoned: set = set()
+
+    def fill(self, submit) -> None:
+        """补足窗口：submit(name, slot) 返回 future"""
+        self._abandoned = {f for f in self._abandoned if not f.done()}
+        while not self._exhausted and len(self.pending) + len(self._abandoned) < self.window:
+            try:
+                name = next(self._names)
+            except StopIteration:
+                self._exhausted = True
+                break
+            slot: Dict[str, Optional[float]] = {'started': None}
+            self.pending[submit(name, slot)] = (name, slot)
+            self.stats.submitted += 1
+
+    @property
+    def active(self) -> bool:
+        """仍有在途条目或名称未读完（窗口可能暂时被已超时的线程占满）"""
+        return bool(self.pending) or not self._exhausted
+
+    def waitables(self) -> List[Any]:
+        """本轮等待的 future：在途条目；只剩已放弃的线程占满窗口时等待它们结束以腾出名额"""
+        return list(self.pending) or list(self._abandoned)
+
+    def next_timeout(self) -> Optional[float]:
+        """
+        下一次等待的时长：距最近一个条目超时的秒数；
+        有条目仍在线程池排队或有已放弃的线程未结束时短轮询，以便及时计时和补充窗口
+        """
+        now = time.monotonic()
+        deadlines = [slot['started'] + self.item_timeout for _, slot in self.pending.values() if slot['started']]
+        timeout = max(0.0, min(deadlines) - now) if deadlines else None
+        if self._abandoned or len(deadlines) < len(self.pending):
+            timeout = self.POLL_INTERVAL if timeout is None else min(timeout, self.POLL_INTERVAL)
+        return timeout
+
+    def complete(self, future) -> Tuple[str, ServiceResult]:
+        name, _ = self.pending.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.exception(f"企业搜索异常: {name}, 错误={e}")
+            result = ServiceResult.error_result(ServiceType.SEARCH, str(e))
+        if result.success:
+            self.stats.succeeded += 1
+        else:
+            self.stats.failed += 1
+        self.stats.total_response_time += result.response_time
+        return name, result
+
+    def expire(self) -> List[Tuple[str, ServiceResult]]:
+        """将超过单条时限的条目标记为超时"""
+        now = time.monotonic()
+        expired = []
+        for future, (name, slot) in list(self.pending.items()):
+            if slot['started'] and now - slot['started'] >= self.item_timeout and not future.done():
+                # 运行中的线程无法中断，放弃等待其结果，但在结束前仍占用窗口名额
+                del self.pending[future]
+                self._abandoned.add(future)
+                self.stats.timed_out += 1
+                self.stats.total_response_time += now - slot['started']
+                logger.warning(f"企业搜索超时: {name}, 时限={self.item_timeout}s")
+                expired.append((name, ServiceResult.error_result(
+                    ServiceType.SEARCH, f"搜索超时（{self.item_timeout}s）", now - slot['started'])))
+        return expired
+
+    def cancel_pending(self) -> None:
+        """取消尚未返回的条目，并停止读取后续名称"""
+        for future in self.pending:
+            future.cancel()
+        self.stats.cancelled += len(self.pending)
+        self.pending.clear()
+        self._exhausted = True
+        self.stats.finished_at = time.monotonic()
+
+
 class ExternalServiceManager:
     """外部服务管理器"""
     
@@ -173,46 +300,110 @@ class ExternalServiceManager:
     def batch_search_enterprises(self, enterprise_names: List[str], **search_options) -> Dict[str, ServiceResult]:
         """
         批量搜索企业信息
-        
+
         Args:
             enterprise_names: 企业名称列表
             **search_options: 搜索选项
-            
+
         Returns:
             搜索结果字典
         """
-        logger.info(f"开始批量搜索企业信息: {len(enterprise_names)}家企业")
-        
-        results = {}
-        futures = {}
-        
-        # 提交搜索任务
-        for name in enterprise_names:
+        return dict(self.iter_batch_search_enterprises(enterprise_names, **search_options))
+
+    def iter_batch_search_enterprises(self, enterprise_names: Iterable[str],
+                                      window: Optional[int] = None,
+                                      item_timeout: Optional[float] = None,
+                                      stats: Optional[BatchSearchStats] = None,
+                                      cancel_event: Optional[threading.Event] = None,
+                                      **search_options) -> Iterator[Tuple[str, ServiceResult]]:
+        """
+        流式批量搜索企业信息：按完成顺序逐个产出结果
+
+        名称按需读取，在途任务不超过 window；单个条目超过 item_timeout 即产出超时结果；
+        提前关闭生成器或设置 cancel_event 时取消尚未开始的任务
+
+        Args:
+            enterprise_names: 企业名称（可为惰性迭代器）
+            window: 提交窗口大小，默认等于 max_workers
+            item_timeout: 单条超时（秒），默认 default_timeout
+            stats: 统计对象（原地更新，便于调用方实时查看）
+            cancel_event: 外部取消信号
+            **search_options: 搜索选项
+
+        Yields:
+            (企业名称, 搜索结果)
+        """
+        stats = stats if stats is not None else BatchSearchStats()
+        batch = _BatchSearchWindow(enterprise_names, window or self.max_workers,
+                                   item_timeout or self.default_timeout, stats)
+
+        def submit(name: str, slot: Dict[str, Optional[float]]) -> Future:
             request = EnterpriseSearchRequest(enterprise_name=name, **search_options)
-            future = self.executor.submit(self.search_enterprise_info, request)
-            futures[future] = name
-        
-        # 收集结果
+            return self.executor.submit(self._run_batch_item, request, slot)
+
+        logger.info(f"开始流式批量搜索: 窗口={batch.window}, 单条时限={batch.item_timeout}s")
         try:
-            for future in as_completed(futures, timeout=self.default_timeout * len(enterprise_names)):
-                name = futures[future]
-                try:
-                    result = future.result()
-                    results[name] = result
-                    logger.info(f"企业搜索完成: {name}, 成功={result.success}")
-                except Exception as e:
-                    logger.exception(f"企业搜索异常: {name}, 错误={e}")
-                    results[name] = ServiceResult.error_result(ServiceType.SEARCH, str(e))
-        except TimeoutError:
-            logger.exception(f"批量搜索超时: 超时阈值={self.default_timeout}s * {len(enterprise_names)}")
-            # 标记未完成的任务为超时
-            for future, name in futures.items():
-                if name not in results:
-                    results[name] = ServiceResult.error_result(ServiceType.SEARCH, "批量搜索超时")
-        
-        logger.info(f"批量搜索完成: 成功={sum(1 for r in results.values() if r.success)}/{len(enterprise_names)}")
-        return results
-    
+            batch.fill(submit)
+            while batch.active:
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info("批量搜索已取消")
+                    break
+                timeout = batch.next_timeout()
+                if cancel_event is not None:
+                    timeout = batch.POLL_INTERVAL if timeout is None else min(timeout, batch.POLL_INTERVAL)
+                done, _ = wait(batch.waitables(), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in batch.pending:
+                        yield batch.complete(future)
+                yield from batch.expire()
+                batch.fill(submit)
+        finally:
+            batch.cancel_pending()
+            logger.info(f"批量搜索结束: {stats.to_dict()}")
+
+    async def aiter_batch_search_enterprises(self, enterprise_names: Iterable[str],
+                                             window: Optional[int] = None,
+                                             item_timeout: Optional[float] = None,
+                                             stats: Optional[BatchSearchStats] = None,
+                                             **search_options) -> AsyncIterator[Tuple[str, ServiceResult]]:
+        """
+        流式批量搜索的异步版本，语义同 iter_batch_search_enterprises
+
+        搜索仍在线程池中执行，事件循环只负责等待；迭代被取消或提前关闭时取消尚未开始的任务
+
+        Yields:
+            (企业名称, 搜索结果)
+        """
+        loop = asyncio.get_running_loop()
+        stats = stats if stats is not None else BatchSearchStats()
+        batch = _BatchSearchWindow(enterprise_names, window or self.max_workers,
+                                   item_timeout or self.default_timeout, stats)
+
+        def submit(name: str, slot: Dict[str, Optional[float]]) -> asyncio.Future:
+            request = EnterpriseSearchRequest(enterprise_name=name, **search_options)
+            return loop.run_in_executor(self.executor, self._run_batch_item, request, slot)
+
+        logger.info(f"开始流式批量搜索(异步): 窗口={batch.window}, 单条时限={batch.item_timeout}s")
+        try:
+            batch.fill(submit)
+            while batch.active:
+                done, _ = await asyncio.wait(batch.waitables(), timeout=batch.next_timeout(),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future in batch.pending:
+                        yield batch.complete(future)
+                for item in batch.expire():
+                    yield item
+                batch.fill(submit)
+        finally:
+            batch.cancel_pending()
+            logger.info(f"批量搜索结束: {stats.to_dict()}")
+
+    def _run_batch_item(self, request: EnterpriseSearchRequest, slot: Dict[str, Optional[float]]) -> ServiceResult:
+        """在工作线程中执行单条搜索，并记录实际开始时间用于单条超时"""
+        slot['started'] = time.monotonic()
+        return self.search_enterprise_info(request)
+
     def analyze_enterprise_data(self, enterprise_data: Dict[str, Any], analysis_type: str = "comprehensive") -> ServiceResult:
         """
         分析企业数据
@@ -8,6 +8,7 @@ from typing import Optional, Dict, Any, List
 import logging
 
 from .logger import get_logger
+from .gazetteer import Gazetteer, get_gazetteer
 from ..database.repositories.customer_repository import CustomerRepository
 from ..database.repositories.enterprise_repository import EnterpriseRepository
 
@@ -17,9 +18,16 @@ logger = get_logger()
 class AddressExtractor:
     """地址提取器"""
     
-    def __init__(self):
-        """初始化地址提取器"""
-        # 常见的市级城市模式
+    def __init__(self, gazetteer: Optional[Gazetteer] = None):
+        """
+        初始化地址提取器
+
+        Args:
+            gazetteer: 行政区划地名库，默认使用内置全局实例
+        """
+        self.gazetteer = gazetteer or get_gazetteer()
+
+        # 地名库未命中时的兜底模式：常见的市级城市模式
         self.city_patterns = [
             # 直辖市模式：北京市、上海市、天津市、重庆市
             r'(北京市|上海市|天津市|重庆市)',
@@ -35,6 +43,21 @@ class AddressExtractor:
             '投资', '控股', '实业', '贸易', '建设', '工程', '服务'
         ]
     
+    def resolve_region(self, text: str) -> Dict[str, Optional[str]]:
+        """
+        基于地名库解析省、市、区县（区县 -> 市 -> 省 逐级补全）
+        适用于完整地址，也适用于“黄岛区”“青岛海尔”等名称片段，纯本地计算
+        
+        Args:
+            text: 地址或名称片段
+            
+        Returns:
+            包含 province、city、district 的字典，未识别的层级为None
+        """
+        if not text or not isinstance(text, str):
+            return {'province': None, 'city': None, 'district': None}
+        return self.gazetteer.resolve(text)
+    
     def extract_city_from_address(self, address: str) -> Optional[str]:
         """
         从企业地址中提取市级城市名称
@@ -48,6 +71,10 @@ class AddressExtractor:
         if not address or not isinstance(address, str):
             return None
         
+        city = self.gazetteer.resolve(address)['city']
+        if city:
+            return city
+        
         for pattern in self.city_patterns:
             match = re.search(pattern, address)
             if match:
@@ -71,6 +98,10 @@ class AddressExtractor:
         if not address or not isinstance(address, str):
             return None
         
+        province = self.gazetteer.resolve(address)['province']
+        if province:
+            return province
+        
         province_patterns = [
             r'([\u4e00-\u9fa5]{2,6}省)',
             r'([\u4e00-\u9fa5]{2,10}自治区)',
@@ -98,6 +129,15 @@ class AddressExtractor:
         if not address or not isinstance(address, str):
             return None
         
+        district = self.gazetteer.resolve(address)['district']
+        if district:
+            return district
+        
+        # 地名库未收录该区县时，从已识别的省/市之后开始匹配，避免把“XX省XX市”并入区县名
+        matches = self.gazetteer.find_all(address)
+        if matches:
+            address = address[matches[-1].end:]
+        
         district_patterns = [
             r'([\u4e00-\u9fa5]{2,6}区)',
             r'([\u4e00-\u9fa5]{2,6}县)',
@@ -123,10 +163,11 @@ class AddressExtractor:
         Returns:
             包含省份、城市、区县等信息的字典
         """
+        region = self.resolve_region(address)
         return {
-            'province': self.extract_province_from_address(address),
-            'city': self.extract_city_from_address(address),
-            'district': self.extract_district_from_address(address),
+            'province': region['province'] or self.extract_province_from_address(address),
+            'city': region['city'] or self.extract_city_from_address(address),
+            'district': region['district'] or self.extract_district_from_address(address),
             'full_address': address
         }
 
@@ -397,7 +438,7 @@ class AddressProcessor:
     def get_company_city(self, company_data: Dict[str, Any], company_name: str) -> Optional[str]:
         """
         获取企业所在城市信息
-        优先从地址提取，其次联网搜索
+        优先从地址提取，其次从企业名称中的地名解析（均为本地地名库），最后联网搜索
         
         Args:
             company_data: 企业数据
@@ -416,7 +457,16 @@ class AddressProcessor:
                 )
                 return city
         
-        # 2. 如果地址不存在或提取失败，联网搜索
+        # 2. 企业名称中常含地名（如“青岛XX有限公司”），本地解析即可确定城市
+        if company_name:
+            city = self.extractor.resolve_region(company_name)['city']
+            if city:
+                logger.log_company_query(
+                    company_name, "城市提取", f"从企业名称解析城市: {company_name} -> {city}"
+                )
+                return city
+        
+        # 3. 本地均无法确定时，联网搜索
         if company_name:
             city = self.searcher.search_city_by_company_name(company_name)
             if city:
@@ -0,0 +1,290 @@
+"""
+企业名称去重
+名称先标准化为匹配键（全角转半角、去标点空白、去公司组织形式后缀），匹配键相同的名称直接合并为同一簇；
+模糊相似的名称只作为待人工确认的候选对：按键前缀和字符二元组 MinHash-LSH 分桶，只在桶内两两打分，
+避免 O(n²) 全量比较，差异落在地名、序号或机构类别上的名称对直接排除
+"""
+import random
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 候选对（待人工确认）的相似度阈值
+DEFAULT_DEDUP_THRESHOLD = 0.88
+
+# 组织形式后缀，按长度从长到短依次剥离（“分公司”表示不同主体，不剥离）
+LEGAL_SUFFIXES = (
+    '集团股份有限公司', '集团有限公司', '股份有限公司', '有限责任公司', '控股有限公司',
+    '有限公司', '股份公司', '集团公司', '总公司', '公司', '集团', '控股', '股份', '有限',
+)
+BRANCH_SUFFIX = '分公司'
+# 带这些后缀的视为完整工商名称，优先作为规范名
+FULL_NAME_SUFFIXES = tuple(suffix for suffix in LEGAL_SUFFIXES if suffix.endswith('公司'))
+
+_NON_WORD_PATTERN = re.compile(r'[\W_]+', re.UNICODE)
+# 阿拉伯数字与中文数字序号（“第2码头”“第十六中学”“第四人民医院”）
+_ORDINAL_PATTERN = re.compile(r'\d+|[〇零一二三四五六七八九十百千]+')
+
+# 行政区划通名：差异字本身或其后两字内出现这些字时视为不同地区（“单县/冠县”“青州市/德州市”“市北区/市南区”）
+ADMIN_DIVISION_CHARS = frozenset('省市区县州旗盟镇乡村')
+# 山东各地市名，两名称所含地市不同时视为不同企业（“济宁/济南”）
+PLACE_NAMES = (
+    '济南', '青岛', '淄博', '枣庄', '东营', '烟台', '潍坊', '济宁', '泰安',
+    '威海', '日照', '临沂', '德州', '聊城', '滨州', '菏泽', '莱芜',
+)
+# 机构类别名词，两名称所含类别不同时视为不同机构（“法院/医院”“学院/医学院”）
+INSTITUTION_NOUNS = (
+    '法院', '中级法院', '高级法院', '检察院', '医院', '医学院', '学院', '大学', '中学', '小学', '学校', '幼儿园',
+    '研究所', '研究院', '设计院', '保健院', '血站', '银行', '分行', '支行', '税务局', '公安局', '卷烟厂',
+)
+
+# MinHash 参数：BANDS 组 × ROWS 行；两名称的二元组 Jaccard 为 s 时落入同一桶的概率约 1-(1-s^ROWS)^BANDS
+LSH_BANDS = 8
+LSH_ROWS = 2
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(LSH_BANDS * LSH_ROWS)]
+
+
+@dataclass(frozen=True)
+class AliasMatch:
+    """名称与其所属簇规范名的对应关系"""
+    alias_name: str
+    match_key: str
+    canonical_name: str
+    score: float  # 与规范名的相似度，规范名自身为1.0
+
+
+@dataclass(frozen=True)
+class ReviewPair:
+    """匹配键不同但字面相似、需人工确认是否为同一企业的名称对"""
+    left_name: str
+    right_name: str
+    score: float
+
+
+def normalize_company_key(name: str) -> str:
+    """
+    企业名称匹配键
+
+    “青岛XX有限公司”“青岛ＸＸ股份有限公司”“青岛XX（有限公司）”得到相同的键
+
+    Args:
+        name: 企业名称
+
+    Returns:
+        匹配键，无有效字符时为空串
+    """
+    if not name:
+        return ''
+    key = _NON_WORD_PATTERN.sub('', unicodedata.normalize('NFKC', name)).lower()
+    stripped = True
+    while stripped and not key.endswith(BRANCH_SUFFIX):
+        stripped = False
+        for suffix in LEGAL_SUFFIXES:
+            if key.endswith(suffix) and len(key) - len(suffix) >= 2:
+                key = key[:-len(suffix)]
+                stripped = True
+                break
+    return key
+
+
+def _grams(key: str) -> Set[str]:
+    if len(key) < 2:
+        return {key}
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+def minhash_bands(key: str) -> List[int]:
+    """匹配键的 LSH 分组签名（每组一个整数）"""
+    hashes = [zlib.crc32(gram.encode('utf-8')) for gram in _grams(key)]
+    signature = [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+    return [hash(tuple(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])) for band in range(LSH_BANDS)]
+
+
+def blocking_keys(key: str, prefix_length: int = 4) -> List[Tuple]:
+    """候选分桶键：完整匹配键、键前缀、各组 MinHash 签名"""
+    keys: List[Tuple] = [('key', key), ('prefix', key[:prefix_length])]
+    keys.extend(('lsh', band, value) for band, value in enumerate(minhash_bands(key)))
+    return keys
+
+
+def similarity(left: str, right: str) -> float:
+    """两个匹配键的相似度（0~1）"""
+    if left == right:
+        return 1.0
+    return SequenceMatcher(None, left, right, autojunk=False).ratio()
+
+
+def _tokens(key: str, vocabulary: Tuple[str, ...]) -> Set[str]:
+    return {token for token in vocabulary if token in key}
+
+
+def _admin_division_differs(left: str, right: str) -> bool:
+    """差异片段含非通名字符，且片段或其后两字内有行政区划通名（只多出“市”“县”等通名不算）"""
+    matcher = SequenceMatcher(None, left, right, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        for text, start, end in ((left, i1, i2), (right, j1, j2)):
+            segment = text[start:end]
+            if segment and all(char in ADMIN_DIVISION_CHARS for char in segment):
+                break
+        else:
+            for text, start, end in ((left, i1, i2), (right, j1, j2)):
+                if any(char in ADMIN_DIVISION_CHARS for char in text[start:end + 2]):
+                    return True
+    return False
+
+
+def is_distinct_entity(left: str, right: str) -> bool:
+    """
+    两个匹配键是否明确指向不同主体
+
+    差异落在地名/行政区划（“单县/冠县”“济宁/济南”）、序号（“第2/第3”“第十六/第六十六”）
+    或机构类别（“法院/医院”“学院/医学院”）上时，字面再相似也不是同一企业
+    """
+    if left == right:
+        return False
+    if _ORDINAL_PATTERN.findall(left) != _ORDINAL_PATTERN.findall(right):
+        return True
+    if _tokens(left, INSTITUTION_NOUNS) != _tokens(right, INSTITUTION_NOUNS):
+        return True
+    left_places, right_places = _tokens(left, PLACE_NAMES), _tokens(right, PLACE_NAMES)
+    if left_places and right_places and left_places != right_places:
+        return True
+    return _admin_division_differs(left, right)
+
+
+def is_similar(left: str, right: str, threshold: float = DEFAULT_DEDUP_THRESHOLD) -> bool:
+    """相似度是否达到阈值（先用长度与字符计数上界快速排除；明确指向不同主体的名称对不算相似）"""
+    if left == right:
+        return True
+    if 2 * min(len(left), len(right)) < threshold * (len(left) + len(right)):
+        return False
+    matcher = SequenceMatcher(None, left, right, autojunk=False)
+    if not (matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold
+            and matcher.ratio() >= threshold):
+        return False
+    return not is_distinct_entity(left, right)
+
+
+def _is_full_name(name: str) -> bool:
+    text = name.strip()
+    return text.endswith(FULL_NAME_SUFFIXES) and not text.endswith(BRANCH_SUFFIX)
+
+
+def _unique_names(names: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+
+
+def dedupe_names(names: Iterable[str],
+                 merges: Optional[Iterable[Tuple[str, str]]] = None) -> List[AliasMatch]:
+    """
+    按匹配键去重
+
+    只有匹配键相同（仅全半角、标点、组织形式后缀不同）的名称自动合并；
+    模糊相似的名称由 find_review_pairs 产出候选，人工确认后通过 merges 传入
+
+    Args:
+        names: 企业名称，靠前的优先作为规范名（调用方按数据源优先级排序）
+        merges: 已确认为同一企业的名称对
+
+    Returns:
+        每个名称一条对应关系（按输入顺序，重复名称只保留首次）
+    """
+    ordered = _unique_names(names)
+    keys = [normalize_company_key(name) for name in ordered]
+    positions = {name: index for index, name in enumerate(ordered)}
+    parent = list(range(len(ordered)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            # 以输入顺序靠前者为根
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    first_of_key: Dict[str, int] = {}
+    for index, key in enumerate(keys):
+        if key:
+            union(first_of_key.setdefault(key, index), index)
+    for left_name, right_name in merges or ():
+        left, right = positions.get((left_name or '').strip()), positions.get((right_name or '').strip())
+        if left is not None and right is not None:
+            union(left, right)
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(len(ordered)):
+        clusters.setdefault(find(index), []).append(index)
+
+    matches: List[AliasMatch] = []
+    canonical_of: Dict[int, int] = {}
+    for members in clusters.values():
+        # 规范名：优先带完整组织形式后缀的名称，其次按输入顺序
+        canonical = next((i for i in members if _is_full_name(ordered[i])), members[0])
+        for index in members:
+            canonical_of[index] = canonical
+    for index, name in enumerate(ordered):
+        canonical = canonical_of[index]
+        matches.append(AliasMatch(
+            alias_name=name,
+            match_key=keys[index],
+            canonical_name=ordered[canonical],
+            score=round(similarity(keys[index], keys[canonical]), 4),
+        ))
+    return matches
+
+
+def find_review_pairs(names: Iterable[str], threshold: float = DEFAULT_DEDUP_THRESHOLD,
+                      prefix_length: int = 4, max_block_size: int = 200) -> List[ReviewPair]:
+    """
+    分桶查找疑似同一企业的名称对（匹配键不同但相似度达到阈值），供人工确认
+
+    只比较落入同一桶的匹配键；超过 max_block_size 的前缀/LSH 桶（如大量“青岛”开头的企业）不做两两比较
+
+    Args:
+        names: 企业名称
+        threshold: 相似度阈值
+        prefix_length: 前缀分桶长度
+        max_block_size: 前缀/LSH 桶的最大比较规模
+
+    Returns:
+        候选对，每对匹配键只出现一次（取各匹配键首次出现的名称），按相似度从高到低
+    """
+    representatives: Dict[str, str] = {}
+    for name in _unique_names(names):
+        key = normalize_company_key(name)
+        if key:
+            representatives.setdefault(key, name)
+    keys = list(representatives)
+
+    blocks: Dict[Tuple, List[int]] = {}
+    for index, key in enumerate(keys):
+        for block_key in blocking_keys(key, prefix_length)[1:]:
+            blocks.setdefault(block_key, []).append(index)
+
+    compared: Set[Tuple[int, int]] = set()
+    pairs: List[ReviewPair] = []
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > max_block_size:
+            continue
+        for position, left in enumerate(members):
+            for right in members[position + 1:]:
+                if (left, right) in compared:
+                    continue
+                compared.add((left, right))
+                if is_similar(keys[left], keys[right], threshold):
+                    pairs.append(ReviewPair(representatives[keys[left]], representatives[keys[right]],
+                                            round(similarity(keys[left], keys[right]), 4)))
+    pairs.sort(key=lambda pair: -pair.score)
+    return pairs
@@ -0,0 +1,309 @@
+"""
+行政区划地名库
+基于内置省/市/区县数据构建内存最长匹配自动机，从任意地址或名称片段中
+识别行政区划，并按 区县 -> 地级市 -> 省 的层级关系补全归属。
+纯本地计算，结果确定，不发起任何网络请求。
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .gazetteer_data import ADMIN_DIVISIONS, EXTRA_ALIASES
+
+LEVEL_PROVINCE = 'province'
+LEVEL_CITY = 'city'
+LEVEL_DISTRICT = 'district'
+
+# 简称后紧跟这些字时多为路名/街道名（如“中山路”“香港中路”“延安三路”），不视为地名
+STREET_SUFFIX_CHARS = frozenset('路街道巷弄里')
+STREET_INFIX_CHARS = frozenset('东西南北中一二三四五六七八九')
+
+# 区县简称若为常用词，容易误匹配，不生成简称
+DISTRICT_ALIAS_EXCLUDE = frozenset([
+    '和平', '长寿', '河北', '河东', '河西', '南开', '江北', '南岸', '朝阳', '天桥',
+    '泰山', '牡丹', '宝山', '金山', '普陀', '河口', '东港', '东城', '西城',
+])
+
+
+@dataclass(frozen=True)
+class AdminRegion:
+    """行政区划条目"""
+    name: str
+    level: str
+    province: str
+    city: Optional[str] = None
+
+    @property
+    def district(self) -> Optional[str]:
+        return self.name if self.level == LEVEL_DISTRICT else None
+
+
+@dataclass(frozen=True)
+class GazetteerMatch:
+    """文本中的一次地名命中"""
+    text: str
+    start: int
+    end: int
+    regions: Tuple[AdminRegion, ...]
+    is_alias: bool
+
+
+def _province_aliases(name: str) -> List[str]:
+    """省级简称：去掉“省”或直辖市的“市”"""
+    if len(name) >= 3 and name[-1] in '省市':
+        return [name[:-1]]
+    return []
+
+
+def _city_aliases(name: str) -> List[str]:
+    """地级简称：去掉“市”“地区”“盟”“林区”后缀"""
+    for suffix in ('地区', '林区', '市', '盟'):
+        if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+            return [name[:-len(suffix)]]
+    return []
+
+
+def _district_aliases(name: str) -> List[str]:
+    """区县简称：去掉“区”“县”“市”后缀，跳过常用词与“市X区”"""
+    for suffix in ('新区', '区', '县', '市'):
+        if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+            stem = name[:-len(suffix)]
+            if stem.startswith('市') or stem in DISTRICT_ALIAS_EXCLUDE:
+                return []
+            return [stem]
+    return []
+
+
+class Gazetteer:
+    """行政区划地名库（最长匹配）"""
+
+    # 同一名称命中多个层级时的优先顺序：全称优先，其次省 > 市 > 区县
+    _LEVEL_ORDER = {LEVEL_PROVINCE: 0, LEVEL_CITY: 1, LEVEL_DISTRICT: 2}
+
+    def __init__(self, divisions: Dict[str, Dict[str, Iterable[str]]],
+                 extra_aliases: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        初始化地名库
+
+        Args:
+            divisions: {省级名称: {地级名称: [区县名称, ...]}}
+            extra_aliases: {全称: [简称, ...]}，补充无法按规则推导的简称
+        """
+        extra_aliases = extra_aliases or {}
+        self._full: Dict[str, List[AdminRegion]] = {}
+        self._alias: Dict[str, List[AdminRegion]] = {}
+
+        for province, cities in divisions.items():
+            self._add(province, AdminRegion(province, LEVEL_PROVINCE, province),
+                      _province_aliases(province), extra_aliases)
+            for city, districts in (cities or {}).items():
+                self._add(city, AdminRegion(city, LEVEL_CITY, province, city),
+                          _city_aliases(city), extra_aliases)
+                for district in districts or []:
+                    self._add(district, AdminRegion(district, LEVEL_DISTRICT, province, city),
+                              _district_aliases(district), extra_aliases)
+
+        # 全称与简称重名时以全称为准
+        for name in list(self._alias):
+            if name in self._full:
+                del self._alias[name]
+
+        for table in (self._full, self._alias):
+            for regions in table.values():
+                regions.sort(key=lambda r: self._LEVEL_ORDER[r.level])
+
+        # 首字索引：首字 -> 可能的名称长度（降序），实现逐位置最长匹配
+        lengths: Dict[str, set] = {}
+        for name in list(self._full) + list(self._alias):
+            lengths.setdefault(name[0], set()).add(len(name))
+        self._lengths_by_first = {ch: sorted(ls, reverse=True) for ch, ls in lengths.items()}
+
+        # 同一地址常被多次解析（省/市/区分别提取），按实例缓存解析结果
+        self._resolve_cached = lru_cache(maxsize=4096)(self._resolve)
+
+    def _add(self, name: str, region: AdminRegion, aliases: List[str],
+             extra_aliases: Dict[str, Iterable[str]]) -> None:
+        self._full.setdefault(name, []).append(region)
+        for alias in list(aliases) + list(extra_aliases.get(name, [])):
+            if alias and alias != name:
+                self._alias.setdefault(alias, []).append(region)
+
+    @classmethod
+    def from_json(cls, path: str) -> 'Gazetteer':
+        """
+        从JSON文件加载地名库
+
+        Args:
+            path: JSON路径，结构同 ADMIN_DIVISIONS
+
+        Returns:
+            地名库实例
+        """
+        with open(path, encoding='utf-8') as f:
+            divisions = json.load(f)
+        return cls(divisions, EXTRA_ALIASES)
+
+    def __len__(self) -> int:
+        return sum(len(regions) for regions in self._full.values())
+
+    def lookup(self, name: str) -> List[AdminRegion]:
+        """
+        按名称（全称或简称）精确查找行政区划
+
+        Args:
+            name: 地名
+
+        Returns:
+            匹配的行政区划列表（可能跨层级或重名）
+        """
+        name = (name or '').strip()
+        return list(self._full.get(name) or self._alias.get(name) or [])
+
+    def find_all(self, text: str) -> List[GazetteerMatch]:
+        """
+        从左到右扫描文本，返回互不重叠的最长地名命中
+
+        Args:
+            text: 地址或名称片段
+
+        Returns:
+            命中列表（按出现顺序）
+        """
+        if not text or not isinstance(text, str):
+            return []
+
+        matches = []
+        n = len(text)
+        i = 0
+        while i < n:
+            hit = None
+            for length in self._lengths_by_first.get(text[i], ()):
+                if i + length > n:
+                    continue
+                candidate = text[i:i + length]
+                regions = self._full.get(candidate)
+                if regions:
+                    hit = GazetteerMatch(candidate, i, i + length, tuple(regions), False)
+                    break
+                regions = self._alias.get(candidate)
+                if regions and not self._is_street_name(text, i + length):
+                    hit = GazetteerMatch(candidate, i, i + length, tuple(regions), True)
+                    break
+            if hit:
+                matches.append(hit)
+                i = hit.end
+            else:
+                i += 1
+        return matches
+
+    @staticmethod
+    def _is_street_name(text: str, end: int) -> bool:
+        """简称之后是否紧跟路名后缀"""
+        following = text[end:end + 2]
+        if not following:
+            return False
+        if following[0] in STREET_SUFFIX_CHARS:
+            return True
+        return len(following) == 2 and following[0] in STREET_INFIX_CHARS and following[1] in STREET_SUFFIX_CHARS
+
+    def resolve(self, text: str) -> Dict[str, Optional[str]]:
+        """
+        解析文本中的省、市、区县，并按层级关系互相补全
+
+        区县命中后向上补全所属地级市与省；同名区县（如“市中区”）结合文中出现的
+        市/省消歧，无法消歧时只保留能确定的层级。
+
+        Args:
+            text: 地址或名称片段
+
+        Returns:
+            {'province': ..., 'city': ..., 'district': ...}，未识别的层级为None
+        """
+        if not text or not isinstance(text, str):
+            return {'province': None, 'city': None, 'district': None}
+        return dict(self._resolve_cached(text))
+
+    def _resolve(self, text: str) -> Dict[str, Optional[str]]:
+        result: Dict[str, Optional[str]] = {'province': None, 'city': None, 'district': None}
+        matches = self.find_all(text)
+        if not matches:
+            return result
+
+        provinces: List[AdminRegion] = []
+        cities: List[Tuple[AdminRegion, bool]] = []
+        district_groups: List[List[AdminRegion]] = []
+        full_province_names = set()
+        # 全称命中排在简称命中之前，同类按出现顺序
+        for match in sorted(matches, key=lambda m: (m.is_alias, m.start)):
+            group = []
+            for region in match.regions:
+                if region.level == LEVEL_PROVINCE:
+                    provinces.append(region)
+                    if not match.is_alias:
+                        full_province_names.add(region.province)
+                elif region.level == LEVEL_CITY:
+                    cities.append((region, match.is_alias))
+                else:
+                    group.append(region)
+            if group:
+                district_groups.append(group)
+
+        # 省份简称只约束同为简称命中的城市，避免“香港中路”之类干扰“青岛市”全称
+        province_names = full_province_names
+        if not province_names and (not cities or cities[0][1]):
+            province_names = {p.province for p in provinces}
+        if province_names:
+            cities = [c for c in cities if c[0].province in province_names] or cities
+
+        city = cities[0][0] if cities else None
+        district = None
+        for group in district_groups:
+            if city:
+                candidates = [d for d in group if d.city == city.city]
+            elif province_names:
+                candidates = [d for d in group if d.province in province_names] or group
+            else:
+                candidates = group
+            if candidates:
+                district = candidates
+                break
+
+        if district:
+            result['district'] = district[0].name
+            parent_cities = {d.city for d in district}
+            parent_provinces = {d.province for d in district}
+            if city is None and len(parent_cities) == 1:
+                result['city'] = district[0].city
+            if len(parent_provinces) == 1:
+                result['province'] = district[0].province
+        if city:
+            result['city'] = city.city
+            result['province'] = city.province
+        if result['province'] is None and provinces:
+            result['province'] = provinces[0].province
+        return result
+
+
+_default_gazetteer: Optional[Gazetteer] = None
+_default_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """
+    获取全局地名库（首次调用时构建）
+
+    设置环境变量 GAZETTEER_DATA_PATH 时从该JSON加载，否则使用内置数据。
+
+    Returns:
+        地名库实例
+    """
+    global _default_gazetteer
+    if _default_gazetteer is None:
+        with _default_lock:
+            if _default_gazetteer is None:
+                path = os.getenv('GAZETTEER_DATA_PATH')
+                _default_gazetteer = Gazetteer.from_json(path) if path else Gazetteer(ADMIN_DIVISIONS, EXTRA_ALIASES)
+    return _default_gazetteer
@@ -0,0 +1,231 @@
+"""
+内置行政区划数据
+覆盖全部省级行政区与地级行政区；山东省及四个直辖市细化到区县级。
+如需全国区县全量数据，可通过 GAZETTEER_DATA_PATH 指定同结构的JSON文件：
+{"省级名称": {"地级名称": ["区县名称", ...]}}
+"""
+
+# 省级 -> 地级 -> 区县（列表为空表示暂未收录该市的区县）
+ADMIN_DIVISIONS = {
+    "北京市": {
+        "北京市": [
+            "东城区", "西城区", "朝阳区", "丰台区", "石景山区", "海淀区", "门头沟区", "房山区",
+            "通州区", "顺义区", "昌平区", "大兴区", "怀柔区", "平谷区", "密云区", "延庆区",
+        ],
+    },
+    "天津市": {
+        "天津市": [
+            "和平区", "河东区", "河西区", "南开区", "河北区", "红桥区", "东丽区", "西青区",
+            "津南区", "北辰区", "武清区", "宝坻区", "滨海新区", "宁河区", "静海区", "蓟州区",
+        ],
+    },
+    "上海市": {
+        "上海市": [
+            "黄浦区", "徐汇区", "长宁区", "静安区", "普陀区", "虹口区", "杨浦区", "闵行区",
+            "宝山区", "嘉定区", "浦东新区", "金山区", "松江区", "青浦区", "奉贤区", "崇明区",
+        ],
+    },
+    "重庆市": {
+        "重庆市": [
+            "万州区", "涪陵区", "渝中区", "大渡口区", "江北区", "沙坪坝区", "九龙坡区", "南岸区",
+            "北碚区", "綦江区", "大足区", "渝北区", "巴南区", "黔江区", "长寿区", "江津区",
+            "合川区", "永川区", "南川区", "璧山区", "铜梁区", "潼南区", "荣昌区", "开州区",
+            "梁平区", "武隆区", "城口县", "丰都县", "垫江县", "忠县", "云阳县", "奉节县",
+            "巫山县", "巫溪县", "石柱土家族自治县", "秀山土家族苗族自治县",
+            "酉阳土家族苗族自治县", "彭水苗族土家族自治县",
+        ],
+    },
+    "山东省": {
+        "济南市": [
+            "历下区", "市中区", "槐荫区", "天桥区", "历城区", "长清区", "章丘区", "济阳区",
+            "莱芜区", "钢城区", "平阴县", "商河县",
+        ],
+        "青岛市": [
+            "市南区", "市北区", "黄岛区", "崂山区", "李沧区", "城阳区", "即墨区",
+            "胶州市", "平度市", "莱西市",
+        ],
+        "淄博市": ["淄川区", "张店区", "博山区", "临淄区", "周村区", "桓台县", "高青县", "沂源县"],
+        "枣庄市": ["市中区", "薛城区", "峄城区", "台儿庄区", "山亭区", "滕州市"],
+        "东营市": ["东营区", "河口区", "垦利区", "利津县", "广饶县"],
+        "烟台市": [
+            "芝罘区", "福山区", "牟平区", "莱山区", "蓬莱区", "龙口市", "莱阳市", "莱州市",
+            "招远市", "栖霞市", "海阳市",
+        ],
+        "潍坊市": [
+            "潍城区", "寒亭区", "坊子区", "奎文区", "临朐县", "昌乐县", "青州市", "诸城市",
+            "寿光市", "安丘市", "高密市", "昌邑市",
+        ],
+        "济宁市": [
+            "任城区", "兖州区", "微山县", "鱼台县", "金乡县", "嘉祥县", "汶上县", "泗水县",
+            "梁山县", "曲阜市", "邹城市",
+        ],
+        "泰安市": ["泰山区", "岱岳区", "宁阳县", "东平县", "新泰市", "肥城市"],
+        "威海市": ["环翠区", "文登区", "荣成市", "乳山市"],
+        "日照市": ["东港区", "岚山区", "五莲县", "莒县"],
+        "临沂市": [
+            "兰山区", "罗庄区", "河东区", "沂南县", "郯城县", "沂水县", "兰陵县", "费县",
+            "平邑县", "莒南县", "蒙阴县", "临沭县",
+        ],
+        "德州市": [
+            "德城区", "陵城区", "宁津县", "庆云县", "临邑县", "齐河县", "平原县", "夏津县",
+            "武城县", "乐陵市", "禹城市",
+        ],
+        "聊城市": ["东昌府区", "茌平区", "阳谷县", "莘县", "东阿县", "冠县", "高唐县", "临清市"],
+        "滨州市": ["滨城区", "沾化区", "惠民县", "阳信县", "无棣县", "博兴县", "邹平市"],
+        "菏泽市": ["牡丹区", "定陶区", "曹县", "单县", "成武县", "巨野县", "郓城县", "鄄城县", "东明县"],
+    },
+    "河北省": {c: [] for c in [
+        "石家庄市", "唐山市", "秦皇岛市", "邯郸市", "邢台市", "保定市", "张家口市", "承德市",
+        "沧州市", "廊坊市", "衡水市",
+    ]},
+    "山西省": {c: [] for c in [
+        "太原市", "大同市", "阳泉市", "长治市", "晋城市", "朔州市", "晋中市", "运城市",
+        "忻州市", "临汾市", "吕梁市",
+    ]},
+    "内蒙古自治区": {c: [] for c in [
+        "呼和浩特市", "包头市", "乌海市", "赤峰市", "通辽市", "鄂尔多斯市", "呼伦贝尔市",
+        "巴彦淖尔市", "乌兰察布市", "兴安盟", "锡林郭勒盟", "阿拉善盟",
+    ]},
+    "辽宁省": {c: [] for c in [
+        "沈阳市", "大连市", "鞍山市", "抚顺市", "本溪市", "丹东市", "锦州市", "营口市",
+        "阜新市", "辽阳市", "盘锦市", "铁岭市", "朝阳市", "葫芦岛市",
+    ]},
+    "吉林省": {c: [] for c in [
+        "长春市", "吉林市", "四平市", "辽源市", "通化市", "白山市", "松原市", "白城市",
+        "延边朝鲜族自治州",
+    ]},
+    "黑龙江省": {c: [] for c in [
+        "哈尔滨市", "齐齐哈尔市", "鸡西市", "鹤岗市", "双鸭山市", "大庆市", "伊春市",
+        "佳木斯市", "七台河市", "牡丹江市", "黑河市", "绥化市", "大兴安岭地区",
+    ]},
+    "江苏省": {c: [] for c in [
+        "南京市", "无锡市", "徐州市", "常州市", "苏州市", "南通市", "连云港市", "淮安市",
+        "盐城市", "扬州市", "镇江市", "泰州市", "宿迁市",
+    ]},
+    "浙江省": {c: [] for c in [
+        "杭州市", "宁波市", "温州市", "嘉兴市", "湖州市", "绍兴市", "金华市", "衢州市",
+        "舟山市", "台州市", "丽水市",
+    ]},
+    "安徽省": {c: [] for c in [
+        "合肥市", "芜湖市", "蚌埠市", "淮南市", "马鞍山市", "淮北市", "铜陵市", "安庆市",
+        "黄山市", "滁州市", "阜阳市", "宿州市", "六安市", "亳州市", "池州市", "宣城市",
+    ]},
+    "福建省": {c: [] for c in [
+        "福州市", "厦门市", "莆田市", "三明市", "泉州市", "漳州市", "南平市", "龙岩市", "宁德市",
+    ]},
+    "江西省": {c: [] for c in [
+        "南昌市", "景德镇市", "萍乡市", "九江市", "新余市", "鹰潭市", "赣州市", "吉安市",
+        "宜春市", "抚州市", "上饶市",
+    ]},
+    "河南省": {c: [] for c in [
+        "郑州市", "开封市", "洛阳市", "平顶山市", "安阳市", "鹤壁市", "新乡市", "焦作市",
+        "濮阳市", "许昌市", "漯河市", "三门峡市", "南阳市", "商丘市", "信阳市", "周口市",
+        "驻马店市", "济源市",
+    ]},
+    "湖北省": {c: [] for c in [
+        "武汉市", "黄石市", "十堰市", "宜昌市", "襄阳市", "鄂州市", "荆门市", "孝感市",
+        "荆州市", "黄冈市", "咸宁市", "随州市", "恩施土家族苗族自治州", "仙桃市", "潜江市",
+        "天门市", "神农架林区",
+    ]},
+    "湖南省": {c: [] for c in [
+        "长沙市", "株洲市", "湘潭市", "衡阳市", "邵阳市", "岳阳市", "常德市", "张家界市",
+        "益阳市", "郴州市", "永州市", "怀化市", "娄底市", "湘西土家族苗族自治州",
+    ]},
+    "广东省": {c: [] for c in [
+        "广州市", "韶关市", "深圳市", "珠海市", "汕头市", "佛山市", "江门市", "湛江市",
+        "茂名市", "肇庆市", "惠州市", "梅州市", "汕尾市", "河源市", "阳江市", "清远市",
+        "东莞市", "中山市", "潮州市", "揭阳市", "云浮市",
+    ]},
+    "广西壮族自治区": {c: [] for c in [
+        "南宁市", "柳州市", "桂林市", "梧州市", "北海市", "防城港市", "钦州市", "贵港市",
+        "玉林市", "百色市", "贺州市", "河池市", "来宾市", "崇左市",
+    ]},
+    "海南省": {c: [] for c in [
+        "海口市", "三亚市", "三沙市", "儋州市", "五指山市", "琼海市", "文昌市", "万宁市",
+        "东方市",
+    ]},
+    "四川省": {c: [] for c in [
+        "成都市", "自贡市", "攀枝花市", "泸州市", "德阳市", "绵阳市", "广元市", "遂宁市",
+        "内江市", "乐山市", "南充市", "眉山市", "宜宾市", "广安市", "达州市", "雅安市",
+        "巴中市", "资阳市", "阿坝藏族羌族自治州", "甘孜藏族自治州", "凉山彝族自治州",
+    ]},
+    "贵州省": {c: [] for c in [
+        "贵阳市", "六盘水市", "遵义市", "安顺市", "毕节市", "铜仁市",
+        "黔西南布依族苗族自治州", "黔东南苗族侗族自治州", "黔南布依族苗族自治州",
+    ]},
+    "云南省": {c: [] for c in [
+        "昆明市", "曲靖市", "玉溪市", "保山市", "昭通市", "丽江市", "普洱市", "临沧市",
+        "楚雄彝族自治州", "红河哈尼族彝族自治州", "文山壮族苗族自治州", "西双版纳傣族自治州",
+        "大理白族自治州", "德宏傣族景颇族自治州", "怒江傈僳族自治州", "迪庆藏族自治州",
+    ]},
+    "西藏自治区": {c: [] for c in [
+        "拉萨市", "日喀则市", "昌都市", "林芝市", "山南市", "那曲市", "阿里地区",
+    ]},
+    "陕西省": {c: [] for c in [
+        "西安市", "铜川市", "宝鸡市", "咸阳市", "渭南市", "延安市", "汉中市", "榆林市",
+        "安康市", "商洛市",
+    ]},
+    "甘肃省": {c: [] for c in [
+        "兰州市", "嘉峪关市", "金昌市", "白银市", "天水市", "武威市", "张掖市", "平凉市",
+        "酒泉市", "庆阳市", "定西市", "陇南市", "临夏回族自治州", "甘南藏族自治州",
+    ]},
+    "青海省": {c: [] for c in [
+        "西宁市", "海东市", "海北藏族自治州", "黄南藏族自治州", "海南藏族自治州",
+        "果洛藏族自治州", "玉树藏族自治州", "海西蒙古族藏族自治州",
+    ]},
+    "宁夏回族自治区": {c: [] for c in [
+        "银川市", "石嘴山市", "吴忠市", "固原市", "中卫市",
+    ]},
+    "新疆维吾尔自治区": {c: [] for c in [
+        "乌鲁木齐市", "克拉玛依市", "吐鲁番市", "哈密市", "昌吉回族自治州",
+        "博尔塔拉蒙古自治州", "巴音郭楞蒙古自治州", "阿克苏地区", "克孜勒苏柯尔克孜自治州",
+        "喀什地区", "和田地区", "伊犁哈萨克自治州", "塔城地区", "阿勒泰地区", "石河子市",
+        "阿拉尔市", "图木舒克市", "五家渠市", "北屯市", "铁门关市", "双河市", "可克达拉市",
+        "昆玉市", "胡杨河市", "新星市", "白杨市",
+    ]},
+    "台湾省": {c: [] for c in [
+        "台北市", "新北市", "桃园市", "台中市", "台南市", "高雄市", "基隆市", "新竹市", "嘉义市",
+    ]},
+    "香港特别行政区": {"香港特别行政区": []},
+    "澳门特别行政区": {"澳门特别行政区": []},
+}
+
+# 无法按后缀规则推导的简称
+EXTRA_ALIASES = {
+    "内蒙古自治区": ["内蒙古"],
+    "广西壮族自治区": ["广西"],
+    "西藏自治区": ["西藏"],
+    "宁夏回族自治区": ["宁夏"],
+    "新疆维吾尔自治区": ["新疆"],
+    "香港特别行政区": ["香港"],
+    "澳门特别行政区": ["澳门"],
+    "延边朝鲜族自治州": ["延边"],
+    "恩施土家族苗族自治州": ["恩施"],
+    "湘西土家族苗族自治州": ["湘西"],
+    "阿坝藏族羌族自治州": ["阿坝"],
+    "甘孜藏族自治州": ["甘孜"],
+    "凉山彝族自治州": ["凉山"],
+    "黔西南布依族苗族自治州": ["黔西南"],
+    "黔东南苗族侗族自治州": ["黔东南"],
+    "黔南布依族苗族自治州": ["黔南"],
+    "楚雄彝族自治州": ["楚雄"],
+    "红河哈尼族彝族自治州": ["红河"],
+    "文山壮族苗族自治州": ["文山"],
+    "西双版纳傣族自治州": ["西双版纳"],
+    "大理白族自治州": ["大理"],
+    "德宏傣族景颇族自治州": ["德宏"],
+    "怒江傈僳族自治州": ["怒江"],
+    "迪庆藏族自治州": ["迪庆"],
+    "临夏回族自治州": ["临夏"],
+    "甘南藏族自治州": ["甘南"],
+    "海北藏族自治州": ["海北"],
+    "黄南藏族自治州": ["黄南"],
+    "果洛藏族自治州": ["果洛"],
+    "玉树藏族自治州": ["玉树"],
+    "海西蒙古族藏族自治州": ["海西"],
+    "昌吉回族自治州": ["昌吉"],
+    "博尔塔拉蒙古自治州": ["博尔塔拉", "博州"],
+    "巴音郭楞蒙古自治州": ["巴音郭楞", "巴州"],
+    "克孜勒苏柯尔克孜自治州": ["克孜勒苏", "克州"],
+    "伊犁哈萨克自治州": ["伊犁"],
+}
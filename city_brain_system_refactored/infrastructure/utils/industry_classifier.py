@@ -0,0 +1,636 @@
+"""
+本地行业分类器
+基于自有标注数据（QD_industry、enterprise_QD.industry、CRM客户行业、IPG客户trade，
+以及 data/processed 下的客户/商机CSV）训练的企业名称 -> 行业分类模型：
+关键词规则优先，其余使用字符n-gram多项式朴素贝叶斯，按矩阵批量打分并给出置信度。
+
+本地判定默认关闭：只有用数据库标注训练、标签映射到 QD_industry 行业名称，
+且在留出集上标定出达到目标准确率的置信度阈值的模型才会启用；
+启用后置信度不低于该阈值的名称直接返回本地结果，其余仍走联网搜索 + LLM 判断。
+
+用法：
+    python -m infrastructure.utils.industry_classifier --from-db --evaluate
+"""
+import argparse
+import csv
+import logging
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_TRAINING_DATA_DIR = os.path.join(os.path.dirname(PROJECT_DIR), 'data', 'processed')
+
+# 尝试导入配置，优先使用 settings，失败再回退到 simple_settings，最后默认
+try:
+    from config.settings import get_settings
+    _app = get_settings().app
+    DEFAULT_MODEL_PATH = _app.industry_model_path
+    DEFAULT_TARGET_ACCURACY = _app.industry_target_accuracy
+    DEFAULT_LABEL_MAP_PATH = _app.industry_label_map_path
+except Exception:
+    try:
+        from config.simple_settings import get_simple_config
+        _app = get_simple_config().app
+        DEFAULT_MODEL_PATH = _app.industry_model_path
+        DEFAULT_TARGET_ACCURACY = _app.industry_target_accuracy
+        DEFAULT_LABEL_MAP_PATH = _app.industry_label_map_path
+    except Exception:
+        DEFAULT_MODEL_PATH = 'data/industry_classifier.npz'
+        DEFAULT_TARGET_ACCURACY = 0.95
+        DEFAULT_LABEL_MAP_PATH = 'data/industry_label_map.csv'
+
+if not os.path.isabs(DEFAULT_MODEL_PATH):
+    DEFAULT_MODEL_PATH = os.path.join(PROJECT_DIR, DEFAULT_MODEL_PATH)
+if not os.path.isabs(DEFAULT_LABEL_MAP_PATH):
+    DEFAULT_LABEL_MAP_PATH = os.path.join(PROJECT_DIR, DEFAULT_LABEL_MAP_PATH)
+
+# 阈值标定：候选阈值与留出集上至少需要的被接受样本数
+CALIBRATION_THRESHOLDS: Tuple[float, ...] = tuple(round(0.5 + 0.01 * i, 2) for i in range(50))
+CALIBRATION_MIN_SUPPORT = 30
+
+# 高确定性的关键词规则：(关键词, 行业)，命中即返回，置信度1.0
+KEYWORD_RULES: Tuple[Tuple[str, str], ...] = (
+    ('啤酒', '食品饮料制造业'),
+)
+
+# CSV训练数据：(文件名, 名称列, 行业列)
+CSV_SOURCES: Tuple[Tuple[str, str, str], ...] = (
+    ('aishu_customers.csv', 'customer_name', 'industry'),
+    ('aishu_opportunities.csv', 'customer_name', 'industry'),
+    ('ipg_opportunities.csv', 'customer_name', 'industry_major'),
+)
+
+_IGNORED_LABELS = frozenset(['', '其他', '其它', '未知', '未知行业', '无', 'nan', 'None'])
+_LABEL_SPLIT_PATTERN = re.compile(r'[,，、;；|]')
+_BRACKET_PATTERN = re.compile(r'[(（][^)）]*[)）]')
+_LEGAL_SUFFIX_PATTERN = re.compile(
+    r'(股份有限公司|有限责任公司|有限公司|股份公司|集团公司|总公司|分公司|公司|集团|有限)$'
+)
+_NON_WORD_PATTERN = re.compile(r'[\s\W_]+', re.UNICODE)
+
+
+@dataclass
+class IndustryPrediction:
+    """行业预测结果"""
+    industry: str
+    confidence: float
+    source: str  # keyword / model
+
+
+def normalize_label(raw: Optional[str]) -> Optional[str]:
+    """
+    规范化行业标注：多值时取第一个有效值，忽略“其他”等无信息标注
+
+    Args:
+        raw: 原始行业字段
+
+    Returns:
+        行业名称或None
+    """
+    if raw is None:
+        return None
+    for part in _LABEL_SPLIT_PATTERN.split(str(raw)):
+        label = part.strip()
+        if label not in _IGNORED_LABELS:
+            return label
+    return None
+
+
+def company_core_text(name: str) -> str:
+    """
+    提取用于行业分类的名称主体：去掉括号内容、法律形式后缀与行政区划
+
+    Args:
+        name: 企业名称
+
+    Returns:
+        名称主体
+    """
+    text = _BRACKET_PATTERN.sub('', (name or '').strip())
+    text = _NON_WORD_PATTERN.sub('', text)
+    previous = None
+    while previous != text:
+        previous = text
+        text = _LEGAL_SUFFIX_PATTERN.sub('', text)
+
+    from .gazetteer import get_gazetteer
+    matches = get_gazetteer().find_all(text)
+    if matches:
+        kept, last = [], 0
+        for match in matches:
+            kept.append(text[last:match.start])
+            last = match.end
+        kept.append(text[last:])
+        stripped = ''.join(kept)
+        # 名称几乎全为地名时保留原文
+        if len(stripped) >= 2:
+            text = stripped
+    return text
+
+
+def name_features(name: str, ngram_range: Tuple[int, int] = (2, 3)) -> List[str]:
+    """
+    生成字符n-gram特征（去重）
+
+    Args:
+        name: 企业名称
+        ngram_range: n-gram长度范围（闭区间）
+
+    Returns:
+        特征列表
+    """
+    text = company_core_text(name)
+    low, high = ngram_range
+    features = []
+    seen = set()
+    for n in range(low, high + 1):
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if gram not in seen:
+                seen.add(gram)
+                features.append(gram)
+    return features
+
+
+class IndustryClassifier:
+    """企业名称行业分类器（关键词规则 + 字符n-gram朴素贝叶斯）"""
+
+    def __init__(self, alpha: float = 0.5, ngram_range: Tuple[int, int] = (2, 3),
+                 keyword_rules: Optional[Sequence[Tuple[str, str]]] = None):
+        """
+        初始化分类器
+
+        Args:
+            alpha: 拉普拉斯平滑系数
+            ngram_range: 字符n-gram长度范围
+            keyword_rules: 关键词规则，默认使用 KEYWORD_RULES
+        """
+        self.alpha = alpha
+        self.ngram_range = tuple(ngram_range)
+        self.keyword_rules = tuple(KEYWORD_RULES if keyword_rules is None else keyword_rules)
+        self.labels: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        # (特征数 + 1, 类别数)，最后一行为全零行，用于批量打分时占位
+        self._weights = np.zeros((1, 0), dtype=np.float32)
+        self._class_log_prior = np.zeros(0, dtype=np.float32)
+        # 标定后的本地判定阈值；None 表示未达到目标准确率或未按 QD_industry 训练，不启用本地判定
+        self.min_confidence: Optional[float] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return bool(self.labels)
+
+    def fit(self, samples: Iterable[Tuple[str, str]], min_label_count: int = 2,
+            taxonomy: Optional[Iterable[str]] = None,
+            label_map: Optional[Dict[str, str]] = None) -> 'IndustryClassifier':
+        """
+        训练模型
+
+        Args:
+            samples: (企业名称, 行业) 样本
+            min_label_count: 样本数少于该值的行业不参与训练
+            taxonomy: 目标行业名称（QD_industry）；给出时映射后不在其中的标注丢弃
+            label_map: 外部行业标注 -> 目标行业名称
+
+        Returns:
+            分类器自身
+        """
+        targets = set(taxonomy) if taxonomy is not None else None
+        label_map = label_map or {}
+        cleaned = []
+        for name, raw_label in samples:
+            label = normalize_label(raw_label)
+            label = label_map.get(label, label)
+            if name and label and (targets is None or label in targets):
+                cleaned.append((str(name).strip(), label))
+
+        label_counts = Counter(label for _, label in cleaned)
+        self.labels = sorted(label for label, count in label_counts.items() if count >= min_label_count)
+        label_index = {label: i for i, label in enumerate(self.labels)}
+
+        self.vocabulary = {}
+        rows, cols = [], []
+        doc_labels = []
+        for name, label in cleaned:
+            if label not in label_index:
+                continue
+            doc = len(doc_labels)
+            doc_labels.append(label_index[label])
+            for gram in name_features(name, self.ngram_range):
+                rows.append(doc)
+                cols.append(self.vocabulary.setdefault(gram, len(self.vocabulary)))
+
+        n_classes, n_features = len(self.labels), len(self.vocabulary)
+        if not n_classes:
+            self._weights = np.zeros((1, 0), dtype=np.float32)
+            self._class_log_prior = np.zeros(0, dtype=np.float32)
+            return self
+
+        doc_labels_arr = np.asarray(doc_labels, dtype=np.int64)
+        counts = np.zeros((n_features, n_classes), dtype=np.float64)
+        np.add.at(counts, (np.asarray(cols, dtype=np.int64), doc_labels_arr[np.asarray(rows, dtype=np.int64)]), 1.0)
+
+        smoothed = counts + self.alpha
+        feature_log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=0, keepdims=True))
+        self._weights = np.vstack([feature_log_prob, np.zeros((1, n_classes))]).astype(np.float32)
+
+        class_counts = np.bincount(doc_labels_arr, minlength=n_classes).astype(np.float64)
+        self._class_log_prior = (np.log(class_counts) - np.log(class_counts.sum())).astype(np.float32)
+
+        logger.info(f"行业分类模型训练完成: 样本 {len(doc_labels)}，行业 {n_classes}，特征 {n_features}")
+        return self
+
+    def _match_keyword(self, name: str) -> Optional[IndustryPrediction]:
+        for keyword, industry in self.keyword_rules:
+            if keyword in name:
+                return IndustryPrediction(industry, 1.0, 'keyword')
+        return None
+
+    def predict(self, name: str) -> Optional[IndustryPrediction]:
+        """
+        预测单个企业的行业
+
+        Args:
+            name: 企业名称
+
+        Returns:
+            预测结果；名称为空、模型未训练且未命中关键词时返回None
+        """
+        return self.predict_many([name])[0]
+
+    def predict_many(self, names: Sequence[str]) -> List[Optional[IndustryPrediction]]:
+        """
+        批量预测：所有名称的特征索引拼接后一次性查表求和
+
+        Args:
+            names: 企业名称列表
+
+        Returns:
+            与输入等长的预测结果列表
+        """
+        results: List[Optional[IndustryPrediction]] = [None] * len(names)
+        pending, indices, offsets = [], [], []
+        pad = self._weights.shape[0] - 1
+        for i, name in enumerate(names):
+            if not name:
+                continue
+            keyword_hit = self._match_keyword(name)
+            if keyword_hit:
+                results[i] = keyword_hit
+                continue
+            if not self.is_trained:
+                continue
+            known = [self.vocabulary[g] for g in name_features(name, self.ngram_range) if g in self.vocabulary]
+            if not known:
+                continue
+            pending.append(i)
+            offsets.append(len(indices))
+            indices.extend(known)
+            indices.append(pad)
+
+        if not pending:
+            return results
+
+        offsets_arr = np.asarray(offsets)
+        scores = np.add.reduceat(self._weights[np.asarray(indices)], offsets_arr, axis=0)
+        # n-gram之间高度相关，按特征数开方缩放似然，避免置信度随名称长度虚高
+        feature_counts = np.diff(np.append(offsets_arr, len(indices))) - 1
+        scores /= np.sqrt(feature_counts)[:, None]
+        scores += self._class_log_prior
+        scores -= scores.max(axis=1, keepdims=True)
+        probs = np.exp(scores)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        for row, i in enumerate(pending):
+            results[i] = IndustryPrediction(self.labels[best[row]], round(float(probs[row, best[row]]), 4), 'model')
+        return results
+
+    def save(self, path: str) -> None:
+        """
+        保存模型（npz）
+
+        Args:
+            path: 文件路径
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        vocab = sorted(self.vocabulary, key=self.vocabulary.get)
+        np.savez_compressed(
+            path,
+            labels=np.asarray(self.labels, dtype=str),
+            vocabulary=np.asarray(vocab, dtype=str),
+            weights=self._weights,
+            class_log_prior=self._class_log_prior,
+            alpha=np.asarray(self.alpha),
+            ngram_range=np.asarray(self.ngram_range),
+            min_confidence=np.asarray(np.nan if self.min_confidence is None else self.min_confidence),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'IndustryClassifier':
+        """
+        加载模型
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            分类器
+        """
+        with np.load(path, allow_pickle=False) as data:
+            classifier = cls(alpha=float(data['alpha']), ngram_range=tuple(int(n) for n in data['ngram_range']))
+            classifier.labels = [str(label) for label in data['labels']]
+            classifier.vocabulary = {str(gram): i for i, gram in enumerate(data['vocabulary'])}
+            classifier._weights = data['weights'].astype(np.float32)
+            classifier._class_log_prior = data['class_log_prior'].astype(np.float32)
+            if 'min_confidence' in data.files and not np.isnan(data['min_confidence']):
+                classifier.min_confidence = float(data['min_confidence'])
+        return classifier
+
+
+def load_samples_from_csv(data_dir: str = DEFAULT_TRAINING_DATA_DIR) -> List[Tuple[str, str]]:
+    """
+    从 data/processed 的客户/商机CSV读取训练样本
+
+    Args:
+        data_dir: CSV目录
+
+    Returns:
+        (企业名称, 行业) 列表
+    """
+    samples = []
+    for filename, name_column, label_column in CSV_SOURCES:
+        path = os.path.join(data_dir, filename)
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                name, label = row.get(name_column), row.get(label_column)
+                if name and label:
+                    samples.append((name, label))
+    return samples
+
+
+def load_samples_from_db() -> List[Tuple[str, str]]:
+    """
+    从各业务库读取训练样本：QD_industry（链主/客户企业）、enterprise_QD、CRM客户、IPG客户
+
+    Returns:
+        (企业名称, 行业) 列表；单个数据源不可用时跳过
+    """
+    loaders = []
+    try:
+        from infrastructure.database.repositories.industry_repository import IndustryRepository
+        loaders.append(('QD_industry', lambda: IndustryRepository().find_labelled_enterprises()))
+    except Exception as e:
+        logger.warning(f"QD_industry 数据源不可用: {e}")
+    try:
+        from infrastructure.database.repositories.enterprise_qd_repository import EnterpriseQDRepository
+        loaders.append(('enterprise_QD', lambda: EnterpriseQDRepository().find_industry_labels()))
+    except Exception as e:
+        logger.warning(f"enterprise_QD 数据源不可用: {e}")
+    try:
+        from infrastructure.database.repositories.crm_sync_repository import CRMSyncRepository
+        loaders.append(('CRM', lambda: CRMSyncRepository().find_industry_labels()))
+    except Exception as e:
+        logger.warning(f"CRM 数据源不可用: {e}")
+    try:
+        from infrastructure.database.repositories.opportunities_repository import OpportunitiesRepository
+        loaders.append(('IPG', lambda: OpportunitiesRepository().find_ipg_trade_labels()))
+    except Exception as e:
+        logger.warning(f"IPG 数据源不可用: {e}")
+
+    samples = []
+    for source, loader in loaders:
+        try:
+            rows = loader() or []
+        except Exception as e:
+            logger.warning(f"读取 {source} 行业标注失败: {e}")
+            continue
+        samples.extend((row.get('name'), row.get('industry')) for row in rows if row.get('name'))
+        logger.info(f"{source} 行业标注样本: {len(rows)}")
+    return samples
+
+
+def load_qd_taxonomy() -> List[str]:
+    """QD_industry 中的全部行业名称（本地分类的目标标签体系）"""
+    from infrastructure.database.repositories.industry_repository import IndustryRepository
+    return [industry.industry_name for industry in IndustryRepository().find_all() if industry.industry_name]
+
+
+def load_label_map(path: str = DEFAULT_LABEL_MAP_PATH) -> Dict[str, str]:
+    """
+    读取外部行业标注到 QD_industry 行业名称的映射表
+
+    Args:
+        path: CSV文件，列为 source_label, qd_industry
+
+    Returns:
+        {外部标注: QD_industry行业名称}；文件不存在时为空
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding='utf-8', newline='') as f:
+        return {row['source_label'].strip(): row['qd_industry'].strip() for row in csv.DictReader(f)
+                if row.get('source_label') and row.get('qd_industry')}
+
+
+_default_classifier: Optional[IndustryClassifier] = None
+_default_lock = threading.Lock()
+
+
+def get_industry_classifier() -> IndustryClassifier:
+    """
+    获取全局行业分类器
+
+    加载已训练的模型文件；不存在或加载失败时仅使用关键词规则。
+    不在请求中用CSV现场训练：未标定的模型输出不会被采用，训练只会拖慢首个请求
+
+    Returns:
+        分类器实例
+    """
+    global _default_classifier
+    if _default_classifier is None:
+        with _default_lock:
+            if _default_classifier is None:
+                classifier = None
+                if os.path.isfile(DEFAULT_MODEL_PATH):
+                    try:
+                        classifier = IndustryClassifier.load(DEFAULT_MODEL_PATH)
+                    except Exception as e:
+                        logger.error(f"加载行业分类模型失败: {e}")
+                _default_classifier = classifier or IndustryClassifier()
+    return _default_classifier
+
+
+def classify_industry(company_name: str) -> Optional[IndustryPrediction]:
+    """
+    使用全局分类器预测企业行业
+
+    Args:
+        company_name: 企业名称
+
+    Returns:
+        预测结果或None
+    """
+    try:
+        return get_industry_classifier().predict(company_name)
+    except Exception as e:
+        logger.error(f"本地行业分类失败: {e}")
+        return None
+
+
+def local_industry(company_name: str) -> Optional[str]:
+    """
+    本地判定的行业：关键词规则命中直接返回；模型预测仅在已标定阈值、
+    预测为模型内的 QD_industry 行业且置信度达到阈值时返回
+
+    Args:
+        company_name: 企业名称
+
+    Returns:
+        行业名称；未命中关键词且模型未标定或置信度不足时为None，调用方改走联网 + LLM
+    """
+    prediction = classify_industry(company_name)
+    if prediction is None:
+        return None
+    if prediction.source == 'keyword':
+        return prediction.industry
+    try:
+        classifier = get_industry_classifier()
+    except Exception as e:
+        logger.error(f"加载本地行业分类器失败: {e}")
+        return None
+    if classifier.min_confidence is None:
+        return None
+    if prediction.confidence >= classifier.min_confidence and prediction.industry in classifier.labels:
+        return prediction.industry
+    return None
+
+
+def _holdout(samples: Sequence[Tuple[str, str]], test_ratio: float, **fit_options):
+    """按样本序号确定性划分训练/测试集，返回 [(预测, 真实标签), ...]"""
+    label_map = fit_options.get('label_map') or {}
+    step = max(2, int(round(1 / test_ratio)))
+    train = [s for i, s in enumerate(samples) if i % step]
+    classifier = IndustryClassifier().fit(train, **fit_options)
+    test = []
+    for i, (name, raw_label) in enumerate(samples):
+        label = normalize_label(raw_label)
+        label = label_map.get(label, label)
+        if not i % step and label and label in classifier.labels:
+            test.append((name, label))
+    predictions = classifier.predict_many([name for name, _ in test])
+    return [(prediction, label) for prediction, (_, label) in zip(predictions, test)]
+
+
+def _threshold_stats(pairs, threshold: float) -> Tuple[int, int]:
+    accepted = [(p, label) for p, label in pairs if p and p.confidence >= threshold]
+    return len(accepted), sum(1 for p, label in accepted if p.industry == label)
+
+
+def evaluate(samples: Sequence[Tuple[str, str]], test_ratio: float = 0.2,
+             thresholds: Sequence[float] = (0.0, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9),
+             **fit_options) -> Dict[str, Dict[str, float]]:
+    """
+    留出法评估：按阈值统计覆盖率与准确率
+
+    Args:
+        samples: (企业名称, 行业) 样本
+        test_ratio: 测试集比例（按样本序号确定性划分）
+        thresholds: 置信度阈值
+        **fit_options: 传给 fit 的 taxonomy / label_map
+
+    Returns:
+        {阈值: {'coverage': ..., 'accuracy': ...}}
+    """
+    pairs = _holdout(samples, test_ratio, **fit_options)
+    report = {}
+    for threshold in thresholds:
+        accepted, correct = _threshold_stats(pairs, threshold)
+        report[f"{threshold:.2f}"] = {
+            'coverage': round(accepted / len(pairs), 3) if pairs else 0.0,
+            'accuracy': round(correct / accepted, 3) if accepted else 0.0,
+        }
+    return report
+
+
+def calibrate_threshold(samples: Sequence[Tuple[str, str]], target_accuracy: float = DEFAULT_TARGET_ACCURACY,
+                        test_ratio: float = 0.2, min_support: int = CALIBRATION_MIN_SUPPORT,
+                        **fit_options) -> Optional[float]:
+    """
+    在留出集上标定本地判定阈值：被接受样本的准确率不低于目标值的最低置信度
+
+    Args:
+        samples: (企业名称, 行业) 样本
+        target_accuracy: 目标准确率
+        test_ratio: 测试集比例
+        min_support: 阈值之上至少需要的留出样本数，样本过少时准确率不可信
+        **fit_options: 传给 fit 的 taxonomy / label_map
+
+    Returns:
+        阈值；任何候选阈值都达不到目标时为None（不启用本地判定）
+    """
+    pairs = _holdout(samples, test_ratio, **fit_options)
+    for threshold in CALIBRATION_THRESHOLDS:
+        accepted, correct = _threshold_stats(pairs, threshold)
+        if accepted < min_support:
+            return None
+        if correct / accepted >= target_accuracy:
+            return threshold
+    return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='训练本地行业分类模型')
+    parser.add_argument('--data-dir', default=DEFAULT_TRAINING_DATA_DIR, help='CSV训练数据目录')
+    parser.add_argument('--from-db', action='store_true',
+                        help='从业务数据库读取行业标注，并以 QD_industry 行业名称为目标标签（启用本地判定的前提）')
+    parser.add_argument('--label-map', default=DEFAULT_LABEL_MAP_PATH, help='外部行业标注到QD_industry的映射表')
+    parser.add_argument('--target-accuracy', type=float, default=DEFAULT_TARGET_ACCURACY, help='本地判定的目标准确率')
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH, help='模型输出路径')
+    parser.add_argument('--evaluate', action='store_true', help='输出留出集评估结果')
+    args = parser.parse_args(argv)
+
+    samples = load_samples_from_csv(args.data_dir)
+    fit_options: Dict[str, object] = {}
+    if args.from_db:
+        samples.extend(load_samples_from_db())
+        try:
+            fit_options = {'taxonomy': load_qd_taxonomy(), 'label_map': load_label_map(args.label_map)}
+        except Exception as e:
+            print(f"❌ 读取 QD_industry 行业失败: {e}")
+            return 1
+    if not samples:
+        print("❌ 未读取到训练样本")
+        return 1
+
+    if args.evaluate:
+        print(f"{'阈值':<8}{'覆盖率':>10}{'准确率':>10}")
+        for threshold, stats in evaluate(samples, **fit_options).items():
+            print(f"{threshold:<8}{stats['coverage']:>10.1%}{stats['accuracy']:>10.1%}")
+
+    classifier = IndustryClassifier().fit(samples, **fit_options)
+    if fit_options:
+        classifier.min_confidence = calibrate_threshold(samples, args.target_accuracy, **fit_options)
+    if classifier.min_confidence is None:
+        print(f"⚠️ 未达到目标准确率 {args.target_accuracy:.0%}（或未使用 --from-db），本地判定保持关闭")
+    else:
+        print(f"本地判定阈值: {classifier.min_confidence:.2f}（目标准确率 {args.target_accuracy:.0%}）")
+    classifier.save(args.output)
+    print(f"✅ 模型已保存: {args.output}（样本 {len(samples)}，行业 {len(classifier.labels)}，特征 {len(classifier.vocabulary)}）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, PROJECT_DIR)
+    sys.exit(main())
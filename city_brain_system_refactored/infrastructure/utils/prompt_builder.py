@@ -0,0 +1,288 @@
+"""
+提示词证据构建工具
+从搜索结果中筛选、去重（URL与近似文本）并按token预算截断证据，
+避免将原始JSON、图片与元数据整体塞入LLM提示词
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Sequence, Set
+from urllib.parse import urlsplit
+
+# 尝试导入配置，优先使用 settings，失败再回退到 simple_settings，最后默认
+try:
+    from config.settings import get_settings
+    DEFAULT_EVIDENCE_TOKEN_BUDGET = get_settings().llm_api.prompt_evidence_token_budget
+except Exception:
+    try:
+        from config.simple_settings import get_simple_config
+        DEFAULT_EVIDENCE_TOKEN_BUDGET = get_simple_config().llm_api.prompt_evidence_token_budget
+    except Exception:
+        DEFAULT_EVIDENCE_TOKEN_BUDGET = 1500
+
+DEFAULT_ITEM_TOKEN_LIMIT = 200
+DEFAULT_MAX_ITEMS = 8
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]')
+_WORD_PATTERN = re.compile(r'[A-Za-z0-9_]+')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_NORMALIZE_PATTERN = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    本地粗略估算token数（无需加载分词器）
+
+    中文字符及全角标点按每字1个token计，英文/数字按每词约1.3个token计，
+    其余符号按每4个字符1个token计；估算偏保守，用于预算控制
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的token数
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    words = _WORD_PATTERN.findall(text)
+    word_chars = sum(len(w) for w in words)
+    others = len(text) - cjk - word_chars - text.count(' ')
+    return cjk + int(len(words) * 1.3 + 0.5) + max(0, others) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int, ellipsis: str = '...') -> str:
+    """
+    将文本截断到指定token预算以内
+
+    Args:
+        text: 文本
+        max_tokens: 最大token数
+        ellipsis: 截断后追加的省略号
+
+    Returns:
+        截断后的文本
+    """
+    if max_tokens <= 0 or not text:
+        return ''
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # 二分查找满足预算的最长前缀
+    low, high = 0, len(text)
+    budget = max(0, max_tokens - estimate_tokens(ellipsis))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + ellipsis if low else ''
+
+
+@dataclass
+class Evidence:
+    """单条搜索证据"""
+    title: str = ''
+    snippet: str = ''
+    url: str = ''
+
+    def render(self, index: int) -> str:
+        """格式化为带编号的提示词片段"""
+        lines = [f"{index}. 标题: {self.title}"]
+        if self.snippet:
+            lines.append(f"   内容: {self.snippet}")
+        if self.url:
+            lines.append(f"   来源: {self.url}")
+        return "\n".join(lines)
+
+
+def _clean(text: Any) -> str:
+    """去除多余空白"""
+    if not isinstance(text, str):
+        return ''
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def extract_evidence(search_data: Any) -> List[Evidence]:
+    """
+    将各种格式的搜索结果统一为证据列表
+
+    Args:
+        search_data: 博查API返回的 data（dict含webPages）、结果列表或纯文本
+
+    Returns:
+        证据列表（仅保留标题、摘要与链接）
+    """
+    items: List[Evidence] = []
+    if isinstance(search_data, dict):
+        if 'webPages' in search_data:
+            pages = (search_data.get('webPages') or {}).get('value') or []
+        else:
+            pages = search_data.get('value') or search_data.get('results') or []
+        for page in pages:
+            if isinstance(page, dict):
+                items.append(Evidence(
+                    title=_clean(page.get('name') or page.get('title')),
+                    snippet=_clean(page.get('summary') or page.get('snippet')),
+                    url=_clean(page.get('url') or page.get('link'))
+                ))
+    elif isinstance(search_data, list):
+        for page in search_data:
+            if isinstance(page, dict):
+                items.append(Evidence(
+                    title=_clean(page.get('title') or page.get('name')),
+                    snippet=_clean(page.get('snippet') or page.get('summary') or page.get('content')),
+                    url=_clean(page.get('url') or page.get('link'))
+                ))
+    elif isinstance(search_data, str) and search_data.strip():
+        items.append(Evidence(snippet=_clean(search_data)))
+    return [item for item in items if item.title or item.snippet]
+
+
+def _normalize_url(url: str) -> str:
+    """规范化URL用于去重（忽略协议、www前缀、查询参数与末尾斜杠）"""
+    if not url or url == '#':
+        return ''
+    parts = urlsplit(url.lower())
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def _shingles(text: str, size: int = 3) -> Set[str]:
+    """生成字符n-gram集合，用于近似重复检测"""
+    normalized = _NORMALIZE_PATTERN.sub('', text.lower())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    """计算Jaccard相似度"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class PromptEvidenceBuilder:
+    """按token预算构建提示词证据"""
+
+    def __init__(self,
+                 token_budget: int = DEFAULT_EVIDENCE_TOKEN_BUDGET,
+                 item_token_limit: int = DEFAULT_ITEM_TOKEN_LIMIT,
+                 max_items: int = DEFAULT_MAX_ITEMS,
+                 similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD):
+        """
+        初始化构建器
+
+        Args:
+            token_budget: 证据部分总token预算
+            item_token_limit: 单条摘要的token上限
+            max_items: 最多保留的证据条数
+            similarity_threshold: 文本近似重复判定阈值（Jaccard）
+        """
+        self.token_budget = max(0, int(token_budget))
+        self.item_token_limit = max(1, int(item_token_limit))
+        self.max_items = max(1, int(max_items))
+        self.similarity_threshold = similarity_threshold
+
+    def select(self,
+               evidence: Iterable[Evidence],
+               keywords: Optional[Sequence[str]] = None) -> List[Evidence]:
+        """
+        筛选、去重并截断证据
+
+        Args:
+            evidence: 候选证据（按相关性排序）
+            keywords: 可选关键词，命中的证据优先保留
+
+        Returns:
+            满足预算的证据列表
+        """
+        candidates = list(evidence)
+        if keywords:
+            # 稳定排序：命中关键词的证据排在前面，保持原有相关性顺序
+            candidates.sort(key=lambda e: not any(k in f"{e.title} {e.snippet}" for k in keywords))
+
+        selected: List[Evidence] = []
+        seen_urls: Set[str] = set()
+        seen_shingles: List[Set[str]] = []
+        used_tokens = 0
+
+        for item in candidates:
+            if len(selected) >= self.max_items:
+                break
+
+            url_key = _normalize_url(item.url)
+            if url_key and url_key in seen_urls:
+                continue
+
+            shingles = _shingles(f"{item.title} {item.snippet}")
+            if any(_jaccard(shingles, other) >= self.similarity_threshold for other in seen_shingles):
+                continue
+
+            trimmed = Evidence(
+                title=truncate_to_tokens(item.title, 40),
+                snippet=truncate_to_tokens(item.snippet, self.item_token_limit),
+                url=item.url
+            )
+            cost = estimate_tokens(trimmed.render(len(selected) + 1))
+            remaining = self.token_budget - used_tokens
+            if cost > remaining:
+                # 预算不足时尝试进一步截断摘要，仍放不下则停止
+                overhead = cost - estimate_tokens(trimmed.snippet)
+                if remaining - overhead < 20:
+                    break
+                trimmed.snippet = truncate_to_tokens(trimmed.snippet, remaining - overhead)
+                cost = estimate_tokens(trimmed.render(len(selected) + 1))
+
+            if url_key:
+                seen_urls.add(url_key)
+            seen_shingles.append(shingles)
+            selected.append(trimmed)
+            used_tokens += cost
+
+        return selected
+
+    def build(self,
+              search_data: Any,
+              keywords: Optional[Sequence[str]] = None,
+              empty_text: str = '暂无相关搜索结果') -> str:
+        """
+        由原始搜索结果直接生成证据文本
+
+        Args:
+            search_data: 搜索结果 data
+            keywords: 可选优先关键词
+            empty_text: 无证据时返回的文本
+
+        Returns:
+            带编号的证据文本
+        """
+        return self.render(self.select(extract_evidence(search_data), keywords), empty_text)
+
+    @staticmethod
+    def render(evidence: Sequence[Evidence], empty_text: str = '暂无相关搜索结果') -> str:
+        """将证据列表格式化为提示词文本"""
+        if not evidence:
+            return empty_text
+        return "\n\n".join(item.render(i) for i, item in enumerate(evidence, 1))
+
+
+def build_evidence_text(search_data: Any,
+                        token_budget: int = DEFAULT_EVIDENCE_TOKEN_BUDGET,
+                        keywords: Optional[Sequence[str]] = None,
+                        **kwargs) -> str:
+    """
+    便捷函数：按预算将搜索结果压缩为提示词证据文本
+
+    Args:
+        search_data: 搜索结果 data
+        token_budget: 证据token预算
+        keywords: 可选优先关键词
+        **kwargs: 传给 PromptEvidenceBuilder 的其他参数
+
+    Returns:
+        证据文本
+    """
+    return PromptEvidenceBuilder(token_budget=token_budget, **kwargs).build(search_data, keywords)
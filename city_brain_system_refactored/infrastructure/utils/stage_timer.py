@@ -0,0 +1,92 @@
+"""
+请求分阶段计时工具
+记录单个请求内各处理阶段的耗时，并以 Server-Timing 响应头输出，供压测统计各阶段延迟
+"""
+import time
+from typing import Any, List, Tuple
+
+
+class StageTimer:
+    """请求内分阶段计时器"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self._stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> float:
+        """
+        记录从上一次标记到现在的阶段耗时
+
+        Args:
+            stage: 阶段名称（仅字母、数字、下划线）
+
+        Returns:
+            本阶段耗时（毫秒）
+        """
+        now = time.perf_counter()
+        duration = (now - self._last) * 1000
+        self._last = now
+        self._stages.append((stage, duration))
+        return duration
+
+    @property
+    def stages(self) -> List[Tuple[str, float]]:
+        """已记录的阶段及耗时（毫秒）"""
+        return list(self._stages)
+
+    def total_ms(self) -> float:
+        """自创建起的总耗时（毫秒）"""
+        return (time.perf_counter() - self._start) * 1000
+
+    def to_server_timing(self) -> str:
+        """
+        格式化为 Server-Timing 头
+
+        Returns:
+            形如 "extract;dur=1.2, local;dur=35.0, total;dur=36.4" 的字符串
+        """
+        parts = [f"{name};dur={duration:.1f}" for name, duration in self._stages]
+        parts.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(parts)
+
+
+def get_stage_timer(request: Any) -> StageTimer:
+    """
+    获取（或创建）绑定在请求上的阶段计时器
+
+    Args:
+        request: Starlette/FastAPI 请求对象
+
+    Returns:
+        计时器实例
+    """
+    timer = getattr(request.state, "stage_timer", None)
+    if timer is None:
+        timer = StageTimer()
+        request.state.stage_timer = timer
+    return timer
+
+
+def parse_server_timing(header: str) -> dict:
+    """
+    解析 Server-Timing 头
+
+    Args:
+        header: 响应头值
+
+    Returns:
+        {阶段名: 耗时毫秒}
+    """
+    result = {}
+    for part in (header or "").split(","):
+        fields = [f.strip() for f in part.split(";")]
+        if not fields or not fields[0]:
+            continue
+        for item in fields[1:]:
+            if item.startswith("dur="):
+                try:
+                    result[fields[0]] = float(item[4:])
+                except ValueError:
+                    pass
+    return result
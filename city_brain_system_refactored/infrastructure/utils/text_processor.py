@@ -3,7 +3,14 @@
 重构自原有的 utils/text_extractor.py，增强文本提取和处理功能
 """
 import re
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+
+# 名称提取结果的缓存容量
+_EXTRACT_CACHE_SIZE = 4096
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_BRACKET_TABLE = str.maketrans({'（': '(', '）': ')'})
 
 
 class CompanyNameExtractor:
@@ -17,10 +24,17 @@ class CompanyNameExtractor:
             r'((?:阿里巴巴|腾讯|百度|京东|华为|小米|美团|滴滴|字节跳动)[\u4e00-\u9fa5]{0,10}(?:股份有限公司|有限责任公司|有限公司|股份公司|集团有限公司|集团股份有限公司|集团公司|公司|集团))'
         ]
         
+        # 知名品牌名称（不带后缀，被认为是不完整的）
+        self.known_brands = [
+            '青岛啤酒', '茅台', '五粮液', '中国平安', '招商银行', '工商银行', '建设银行', '中国银行', '农业银行',
+            '中国石油', '中国石化', '中国移动', '中国联通', '中国电信', '格力电器', '美的集团', '海尔智家', '比亚迪',
+            '长城汽车', '吉利汽车', '万科', '恒大', '碧桂园', '中国建筑', '中国中铁', '中国铁建'
+        ]
+        
         # 不完整的公司名称模式（简称或品牌名）
         self.incomplete_patterns = [
             # 知名品牌名称（不带后缀，被认为是不完整的）
-            r'(青岛啤酒|茅台|五粮液|中国平安|招商银行|工商银行|建设银行|中国银行|农业银行|中国石油|中国石化|中国移动|中国联通|中国电信|格力电器|美的集团|海尔智家|比亚迪|长城汽车|吉利汽车|万科|恒大|碧桂园|中国建筑|中国中铁|中国铁建)',
+            r'(' + '|'.join(self.known_brands) + r')',
             # 通用中文企业名称（2-10个汉字，不带公司后缀）
             r'([\u4e00-\u9fa5]{2,10})'
         ]
@@ -31,12 +45,47 @@ class CompanyNameExtractor:
             '谢谢', '你好', '公司', '企业', '集团', '分析', '报告', '数据'
         ]
         
-        # 完整公司名称后缀
+        # 完整公司名称后缀（顺序即正则多选的优先级）
         self.complete_suffixes = [
             '股份有限公司', '有限责任公司', '有限公司', '股份公司', '集团有限公司', 
             '集团股份有限公司', '集团公司', '公司', '集团', '企业', '厂', '店', 
             '中心', '协会', '学会'
         ]
+        
+        # 预编译正则，避免每次调用重复查找/编译
+        self._compiled_patterns = [re.compile(p) for p in self.complete_patterns + self.incomplete_patterns]
+        self._complete_regex = self._compiled_patterns[0]
+        self._brand_regex = self._compiled_patterns[len(self.complete_patterns)]
+        self._short_name_regex = self._compiled_patterns[-1]
+        self._exclude_set = frozenset(self.exclude_words)
+        self._suffix_tuple = tuple(self.complete_suffixes)
+        # 后缀末字：文本中不含任一末字时不可能匹配完整名称，可跳过回溯代价最高的正则
+        self._suffix_tail_chars = tuple(sorted({suffix[-1] for suffix in self.complete_suffixes}))
+        
+        # 同一请求内会对相同字符串多次提取/标准化，按实例缓存结果
+        self._analyze_cached = lru_cache(maxsize=_EXTRACT_CACHE_SIZE)(self._analyze)
+        self._normalize_cached = lru_cache(maxsize=_EXTRACT_CACHE_SIZE)(self._normalize)
+    
+    def _analyze(self, text: str) -> Optional[Tuple[str, bool, float]]:
+        """
+        单遍提取名称、完整性与置信度（结果被缓存，返回不可变元组）
+        
+        complete_patterns[1]（知名品牌+后缀）匹配到的文本必然也被 complete_patterns[0] 匹配，
+        因此只需执行第一个完整模式
+        """
+        if any(char in text for char in self._suffix_tail_chars):
+            match = self._complete_regex.search(text)
+            if match:
+                return match.group(1), True, 0.9
+        
+        match = self._brand_regex.search(text)
+        if match:
+            return match.group(1), False, 0.7
+        
+        match = self._short_name_regex.search(text)
+        if match and match.group(1) not in self._exclude_set:
+            return match.group(1), False, 0.5
+        return None
     
     def extract_company_name(self, text: str) -> Optional[Dict[str, Any]]:
         """
@@ -52,40 +101,15 @@ class CompanyNameExtractor:
         if not text or not isinstance(text, str):
             return None
         
-        # 先尝试匹配完整的公司名称
-        for pattern in self.complete_patterns:
-            match = re.search(pattern, text)
-            if match:
-                return {
-                    'name': match.group(1),
-                    'is_complete': True,
-                    'confidence': 0.9
-                }
-        
-        # 如果没有找到完整名称，尝试匹配简称或品牌名
-        for i, pattern in enumerate(self.incomplete_patterns):
-            match = re.search(pattern, text)
-            if match:
-                company_name = match.group(1)
-                
-                # 如果是通用模式匹配的，需要进一步验证
-                if i == len(self.incomplete_patterns) - 1:  # 最后一个是通用模式
-                    if company_name in self.exclude_words:
-                        continue
-                    
-                    return {
-                        'name': company_name,
-                        'is_complete': False,
-                        'confidence': 0.5
-                    }
-                else:
-                    return {
-                        'name': company_name,
-                        'is_complete': False,
-                        'confidence': 0.7
-                    }
-        
-        return None
+        result = self._analyze_cached(text)
+        if result is None:
+            return None
+        name, is_complete, confidence = result
+        return {
+            'name': name,
+            'is_complete': is_complete,
+            'confidence': confidence
+        }
     
     def is_complete_company_name(self, company_name: str) -> bool:
         """
@@ -100,11 +124,12 @@ class CompanyNameExtractor:
         if not company_name:
             return False
         
-        for suffix in self.complete_suffixes:
-            if company_name.endswith(suffix):
-                return True
-        
-        return False
+        return company_name.endswith(self._suffix_tuple)
+    
+    def _normalize(self, company_name: str) -> str:
+        """标准化实现（结果被缓存）"""
+        # 去除首尾及多余的空格，统一括号格式
+        return _WHITESPACE_PATTERN.sub('', company_name.strip()).translate(_BRACKET_TABLE)
     
     def normalize_company_name(self, company_name: str) -> str:
         """
@@ -119,16 +144,7 @@ class CompanyNameExtractor:
         if not company_name:
             return ""
         
-        # 去除首尾空格
-        normalized = company_name.strip()
-        
-        # 去除多余的空格
-        normalized = re.sub(r'\s+', '', normalized)
-        
-        # 统一括号格式
-        normalized = normalized.replace('（', '(').replace('）', ')')
-        
-        return normalized
+        return self._normalize_cached(company_name)
     
     def extract_multiple_companies(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -142,11 +158,9 @@ class CompanyNameExtractor:
         """
         companies = []
         
-        # 使用所有模式进行匹配
-        all_patterns = self.complete_patterns + self.incomplete_patterns
-        
-        for pattern in all_patterns:
-            matches = re.finditer(pattern, text)
+        # 使用所有模式进行匹配（预编译）
+        for pattern in self._compiled_patterns:
+            matches = pattern.finditer(text)
             for match in matches:
                 company_name = match.group(1)
                 
@@ -282,6 +296,7 @@ def extract_company_info_from_search_results(search_results: Dict[str, Any]) ->
 def get_company_industry(company_name: str, address: str = None) -> Optional[str]:
     """
     获取企业行业信息的主函数
+    关键词规则命中或本地模型已标定且置信度达标时直接返回，否则联网搜索并由LLM判断
     
     Args:
         company_name: 企业名称
@@ -291,27 +306,27 @@ def get_company_industry(company_name: str, address: str = None) -> Optional[str
         企业行业信息，如果获取失败返回None
     """
     try:
-        # 首先尝试从公司名称直接推断
-        if '啤酒' in company_name:
-            return '食品饮料制造业'
+        # 首先使用本地行业分类器（关键词规则始终启用；模型仅在已按 QD_industry 标定阈值时启用）
+        from infrastructure.utils.industry_classifier import local_industry
+        
+        industry = local_industry(company_name)
+        if industry:
+            return industry
         
-        # 如果无法直接推断，进行联网搜索
+        # 本地判定未启用或置信度不足，进行联网搜索
         from infrastructure.external import search_web, generate_summary
         
         search_query = f"{company_name} 行业 主营业务"
         search_results = search_web(search_query)
         
         if search_results and 'data' in search_results:
-            web_pages = search_results['data'].get('webPages', {})
-            if 'value' in web_pages and web_pages['value']:
-                # 提取前几个搜索结果的内容
-                content_parts = []
-                for result in web_pages['value'][:3]:
-                    title = result.get('name', '')
-                    snippet = result.get('snippet', '')
-                    content_parts.append(f"{title} {snippet}")
-                
-                combined_content = " ".join(content_parts)
+            from infrastructure.utils.prompt_builder import PromptEvidenceBuilder, extract_evidence
+            
+            # 行业判断只需少量证据，使用较小预算
+            builder = PromptEvidenceBuilder(token_budget=400, item_token_limit=120, max_items=3)
+            evidence = builder.select(extract_evidence(search_results['data']))
+            if evidence:
+                combined_content = builder.render(evidence)
                 
                 # 使用LLM分析行业信息
                 prompt = f"""
@@ -61,6 +61,24 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️  外部服务检查异常: {str(e)}")
 
+    try:
+        # 启动批量补全任务的后台工作协程（恢复上次未完成的条目）
+        from api.v1.dependencies import get_batch_job_service
+        get_batch_job_service().ensure_started()
+        logger.info("✅ 批量任务工作协程已启动")
+    except Exception as e:
+        logger.warning(f"⚠️  批量任务工作协程启动异常: {str(e)}")
+
+    try:
+        # 启动缓存增量刷新调度（预算为0时不启动）
+        from api.v1.dependencies import get_refresh_scheduler
+        refresh_scheduler = get_refresh_scheduler()
+        refresh_scheduler.start()
+        if refresh_scheduler.enabled:
+            logger.info(f"✅ 缓存增量刷新已启动: 每小时预算 {refresh_scheduler.budget.per_hour} 次外部调用")
+    except Exception as e:
+        logger.warning(f"⚠️  缓存增量刷新启动异常: {str(e)}")
+
     logger.info("✅ 应用启动完成，准备接收请求")
 
     yield  # 应用运行期间
@@ -68,6 +86,19 @@ async def lifespan(app: FastAPI):
     # 关闭时的操作
     logger.info("🛑 应用正在关闭...")
 
+    try:
+        # 停止批量任务工作协程，处理中的条目下次启动时重新入队
+        from api.v1.dependencies import get_batch_job_service
+        await get_batch_job_service().stop()
+    except Exception as e:
+        logger.warning(f"⚠️  停止批量任务工作协程时出错: {str(e)}")
+
+    try:
+        from api.v1.dependencies import get_refresh_scheduler
+        await get_refresh_scheduler().stop()
+    except Exception as e:
+        logger.warning(f"⚠️  停止缓存增量刷新时出错: {str(e)}")
+
     try:
         # 关闭数据库连接池
         from infrastructure.database.connection import close_all_connections
@@ -158,6 +189,11 @@ async def add_request_id(request: Request, call_next):
     response = await call_next(request)
     response.headers["X-Request-ID"] = request_id
 
+    # 输出分阶段耗时（供压测统计），仅在接口记录了阶段时添加
+    stage_timer = getattr(request.state, "stage_timer", None)
+    if stage_timer is not None:
+        response.headers["Server-Timing"] = stage_timer.to_server_timing()
+
     return response
 
 
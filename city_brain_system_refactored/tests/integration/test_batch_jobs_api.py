@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+import httpx
+from httpx import ASGITransport
+
+# 仅使用 asyncio 后端，避免 trio 依赖
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+try:
+    from main import app
+    from api.v1.dependencies import get_batch_job_service
+    from domain.services.batch_job_service import BatchJobService
+    from infrastructure.database.repositories.batch_job_repository import BatchJobRepository
+except Exception:
+    app = None
+
+
+class DummyEnterpriseService:
+    def process_company_info(self, text):
+        return {"status": "success", "data": {"company_name": text, "details": {"region": "青岛市"}}}
+
+
+@pytest.mark.skipif(app is None, reason="FastAPI app 未找到")
+@pytest.mark.anyio
+async def test_batch_job_lifecycle(anyio_backend):
+    service = BatchJobService(BatchJobRepository(":memory:"), DummyEnterpriseService, poll_interval=0.01)
+    app.dependency_overrides[get_batch_job_service] = lambda: service
+    try:
+        transport = ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/api/v1/company/batch", json={"companies": []})
+            assert resp.status_code == 400
+
+            files = {"file": ("list.csv", "企业名称\n青岛啤酒\n海尔集团\n".encode("utf-8"), "text/csv")}
+            resp = await client.post("/api/v1/company/batch", files=files)
+            assert resp.status_code == 202
+            job_id = resp.json()["data"]["job_id"]
+            assert resp.json()["data"]["total"] == 2
+
+            for _ in range(200):
+                status = (await client.get(f"/api/v1/company/batch/{job_id}")).json()["data"]["status"]
+                if status == "completed":
+                    break
+                await asyncio.sleep(0.01)
+            assert status == "completed"
+
+            results = (await client.get(f"/api/v1/company/batch/{job_id}/results")).json()["data"]["items"]
+            assert [item["input_text"] for item in results] == ["青岛啤酒", "海尔集团"]
+
+            resp = await client.get(f"/api/v1/company/batch/{job_id}/download", params={"format": "ndjson"})
+            assert resp.headers["content-type"].startswith("application/x-ndjson")
+            assert len(resp.text.strip().splitlines()) == 2
+
+            resp = await client.post(f"/api/v1/company/batch/{job_id}/cancel")
+            assert resp.status_code == 409
+            assert (await client.get("/api/v1/company/batch/missing")).status_code == 404
+    finally:
+        await service.stop()
+        app.dependency_overrides.pop(get_batch_job_service, None)
@@ -102,4 +102,66 @@ async def test_process_company_progressive(anyio_backend, monkeypatch):
         assert resp.status_code in (200, 202, 422)
         if resp.status_code in (200, 202):
             data = resp.json()
-            assert "message" in data or "basic_info" in data
\ No newline at end of file
+            assert "message" in data or "basic_info" in data
+
+
+def _override_stream_dependencies(stream):
+    if api_dependencies:
+        import logging
+        api_dependencies.logger = logging.getLogger("api.v1.dependencies")
+    if get_request_logger:
+        from fastapi import Request
+
+        def _noop_logger(request: Request):
+            return NoOpRequestLogger(request)
+
+        app.dependency_overrides[get_request_logger] = _noop_logger
+
+    from domain.services.analysis_service import AnalysisService
+
+    class DummyAnalysisService(AnalysisService):
+        def stream_comprehensive_company_analysis(self, enhanced_data, news_data):
+            return stream()
+
+    if get_analysis_service:
+        app.dependency_overrides[get_analysis_service] = lambda: DummyAnalysisService()
+
+
+@pytest.mark.skipif(app is None, reason="FastAPI app 未找到")
+@pytest.mark.anyio
+async def test_stream_company_analysis(anyio_backend, monkeypatch):
+    def stream():
+        yield "第一段"
+        yield "第二段"
+
+    _override_stream_dependencies(stream)
+    transport = ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        resp = await client.post("/api/v1/company/analysis/stream",
+                                 json={"company_name": "示例公司", "details": {"industry": "制造业"}})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        body = resp.text
+        assert "event: meta" in body
+        assert '"delta": "第一段"' in body
+        assert '"delta": "第二段"' in body
+        assert "event: done" in body
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.skipif(app is None, reason="FastAPI app 未找到")
+@pytest.mark.anyio
+async def test_stream_company_analysis_reports_midstream_failure(anyio_backend, monkeypatch):
+    def stream():
+        yield "第一段"
+        raise ConnectionError("LLM连接中断")
+
+    _override_stream_dependencies(stream)
+    transport = ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        resp = await client.post("/api/v1/company/analysis/stream", json={"company_name": "示例公司"})
+        body = resp.text
+        assert '"delta": "第一段"' in body
+        assert "event: error" in body
+        assert "event: done" not in body
+    app.dependency_overrides.clear()
@@ -0,0 +1,74 @@
+import pytest
+
+from benchmarks.fake_services import (
+    FakeCorpus,
+    FakeServiceConfig,
+    FaultProfile,
+    LatencyProfile,
+    create_fake_bocha_app,
+    create_fake_llm_app,
+    run_in_background,
+)
+from infrastructure.external.bocha_client import BochaAIClient
+from infrastructure.external.circuit_breaker import CircuitBreaker
+from infrastructure.external.llm_client import LLMClient
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return FakeCorpus.from_data_dir()
+
+
+@pytest.fixture(scope="module")
+def fake_urls(corpus):
+    config = FakeServiceConfig(latency=LatencyProfile("fixed", 0.0), stream_chunk_interval=0, seed=1)
+    bocha_server, bocha_url = run_in_background(create_fake_bocha_app(config, corpus))
+    llm_server, llm_url = run_in_background(create_fake_llm_app(config, corpus))
+    yield bocha_url, llm_url
+    bocha_server.should_exit = True
+    llm_server.should_exit = True
+
+
+def test_latency_profile_lognormal_tail():
+    import random
+    profile = LatencyProfile("lognormal", median=0.1, p99=1.0)
+    rng = random.Random(0)
+    samples = sorted(profile.sample(rng) for _ in range(5000))
+    assert 0.08 < samples[2500] < 0.12
+    assert 0.7 < samples[int(5000 * 0.99)] < 1.4
+
+
+def test_bocha_client_against_fake(fake_urls, corpus):
+    name = corpus.companies[0]["name"]
+    client = BochaAIClient(api_key="dummy", base_url=f"{fake_urls[0]}/v1/web-search",
+                           circuit_breaker=CircuitBreaker("fake_bocha"))
+    result = client.search(f"{name} 营收", count=5)
+    assert result.success is True
+    pages = result.data["data"]["webPages"]["value"]
+    assert len(pages) == 5
+    assert name in pages[0]["snippet"]
+
+
+def test_llm_client_against_fake(fake_urls):
+    client = LLMClient(api_key="dummy", base_url=fake_urls[1], circuit_breaker=CircuitBreaker("fake_llm"))
+    resp = client.simple_chat('请从以下内容中提取"青岛啤酒股份有限公司"的所属行业')
+    assert resp.success is True
+    assert resp.usage["total_tokens"] > 0
+
+    streamed = "".join(client.stream_chat(["请分析企业营收"]))
+    assert "营收" in streamed
+
+
+def test_fault_injection_returns_429(corpus):
+    config = FakeServiceConfig(latency=LatencyProfile("fixed", 0.0), faults=FaultProfile(rate_limit_rate=1.0))
+    app = create_fake_bocha_app(config, corpus)
+    server, url = run_in_background(app)
+    try:
+        client = BochaAIClient(api_key="dummy", base_url=f"{url}/v1/web-search", max_retries=0,
+                               circuit_breaker=CircuitBreaker("fake_bocha_429"))
+        result = client.search("测试")
+        assert result.success is False
+        assert "请求频率过高" in result.error_message
+        assert app.state.stats.snapshot()["rate_limited"] == 1
+    finally:
+        server.should_exit = True
@@ -0,0 +1,86 @@
+import pytest
+import httpx
+from httpx import ASGITransport
+
+from benchmarks.load_test import SCENARIOS, percentile, run_scenario, summarize
+from infrastructure.utils.stage_timer import StageTimer, parse_server_timing
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+try:
+    from main import app
+    from api.v1.dependencies import get_request_logger, RequestLogger, get_enterprise_service
+except Exception:
+    app = None
+
+
+def test_percentile_interpolates():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([], 95) is None
+
+
+def test_summarize_counts_errors_and_stages():
+    samples = [
+        {"latency_ms": 10.0, "status": 200, "ok": True, "stages": {"local": 4.0}},
+        {"latency_ms": 30.0, "status": 500, "ok": False, "stages": {}},
+    ]
+    result = summarize(samples, wall_seconds=1.0)
+    assert result["rps"] == 2.0
+    assert result["error_rate"] == 0.5
+    assert result["status_codes"] == {"200": 1, "500": 1}
+    assert result["stages_ms"]["local"]["count"] == 1
+
+
+def test_server_timing_roundtrip():
+    timer = StageTimer()
+    timer.mark("extract")
+    timer.mark("local")
+    parsed = parse_server_timing(timer.to_server_timing())
+    assert set(parsed) == {"extract", "local", "total"}
+
+
+@pytest.mark.skipif(app is None, reason="FastAPI app 未找到")
+@pytest.mark.anyio
+async def test_progressive_scenario_reports_stage_timings(anyio_backend, monkeypatch):
+    from fastapi import Request
+    import infrastructure.utils.text_processor as text_processor
+
+    class NoOpRequestLogger(RequestLogger):
+        def log_request_start(self): return None
+        def log_request_end(self, status_code: int = 200): return None
+
+    def _noop_logger(request: Request):
+        return NoOpRequestLogger(request)
+
+    class DummySearchService:
+        def extract_company_name_from_input(self, text):
+            return {"status": "success", "name": text}
+
+    class DummyEnterpriseService:
+        search_service = DummySearchService()
+
+        def search_local_database(self, name):
+            return {"found": False, "data": None}
+
+    monkeypatch.setattr(text_processor, "get_company_industry", lambda *args, **kwargs: "制造业")
+    app.dependency_overrides[get_request_logger] = _noop_logger
+    app.dependency_overrides[get_enterprise_service] = lambda: DummyEnterpriseService()
+    try:
+        scenario = SCENARIOS["progressive"]
+        original_build = scenario.build
+        scenario = type(scenario)(scenario.method, scenario.path,
+                                  lambda name: {"json": {**original_build(name)["json"], "enable_network": False}})
+        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            result = await run_scenario(client, scenario, ["示例科技有限公司"], concurrency=2, total_requests=4)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert result["requests"] == 4
+    assert result["errors"] == 0
+    assert {"extract", "local", "network", "total"} <= set(result["stages_ms"])
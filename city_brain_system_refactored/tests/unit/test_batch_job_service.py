@@ -0,0 +1,152 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from domain.services.batch_job_service import BatchJobService, parse_batch_csv
+from infrastructure.database.repositories.batch_job_repository import BatchJobRepository
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeEnterpriseService:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def process_company_info(self, text):
+        self.calls.append(text)
+        if text == "坏数据":
+            return {"status": "error", "message": "无法识别企业名称"}
+        if text == "异常":
+            raise RuntimeError("boom")
+        return {"status": "success", "data": {"company_name": text, "details": {"industry": "测试"}}}
+
+
+def _service(repository, calls, concurrency=2, lease_seconds=60):
+    return BatchJobService(repository, lambda: FakeEnterpriseService(calls),
+                           concurrency=concurrency, poll_interval=0.01, lease_seconds=lease_seconds)
+
+
+async def _wait_finished(service, job_id, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        job = service.get_job(job_id)
+        if job["status"] in ("completed", "cancelled"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("批量任务未在预期时间内完成")
+
+
+def test_parse_batch_csv_header_and_plain_column():
+    assert parse_batch_csv("\ufeff序号,企业名称\n1,青岛啤酒\n2, 海尔集团 \n3,\n") == ["青岛啤酒", "海尔集团"]
+    assert parse_batch_csv("青岛啤酒\n海尔集团\n") == ["青岛啤酒", "海尔集团"]
+    assert parse_batch_csv("") == []
+
+
+def test_submit_rejects_empty_list():
+    service = _service(BatchJobRepository(":memory:"), [])
+    with pytest.raises(ValueError):
+        service.submit(["", "  "])
+
+
+@pytest.mark.anyio
+async def test_batch_job_processes_items_and_exports(anyio_backend):
+    calls = []
+    service = _service(BatchJobRepository(":memory:"), calls)
+    try:
+        job = service.submit(["青岛啤酒", "坏数据", "异常", "海尔集团"])
+        assert job["total"] == 4
+
+        job = await _wait_finished(service, job["job_id"])
+        assert job["status"] == "completed"
+        assert job["counts"]["success"] == 2 and job["counts"]["error"] == 2
+        assert job["progress"] == 1.0
+        assert sorted(calls) == sorted(["青岛啤酒", "坏数据", "异常", "海尔集团"])
+
+        errors = service.list_results(job["job_id"], status="error")
+        assert [item["error"] for item in errors] == ["无法识别企业名称", "boom"]
+
+        lines = [json.loads(line) for line in service.export_ndjson(job["job_id"])]
+        assert [line["idx"] for line in lines] == [0, 1, 2, 3]
+        assert lines[0]["result"]["company_name"] == "青岛啤酒"
+
+        csv_text = "".join(service.export_csv(job["job_id"]))
+        assert csv_text.startswith("\ufeffidx,input_text,status,company_name")
+        assert "0,青岛啤酒,success,青岛啤酒" in csv_text
+    finally:
+        await service.stop()
+
+
+@pytest.mark.anyio
+async def test_cancel_and_resume_after_restart(anyio_backend, tmp_path):
+    db_path = str(tmp_path / "queue.sqlite3")
+    repository = BatchJobRepository(db_path)
+    job_id = repository.create_job(["甲公司", "乙公司", "丙公司"])
+    cancelled_id = repository.create_job(["丁公司"])
+    # 模拟进程中途退出：一个条目停留在处理中
+    assert repository.claim_next_item()["input_text"] == "甲公司"
+    assert repository.cancel_job(cancelled_id)
+    repository.close()
+    await asyncio.sleep(0.1)
+
+    calls = []
+    service = _service(BatchJobRepository(db_path), calls, concurrency=1, lease_seconds=0.05)
+    try:
+        service.ensure_started()
+        job = await _wait_finished(service, job_id)
+        assert job["counts"]["success"] == 3
+        assert calls == ["甲公司", "乙公司", "丙公司"]
+        assert service.get_job(cancelled_id)["counts"]["cancelled"] == 1
+        assert not service.cancel(job_id)
+    finally:
+        await service.stop()
+
+
+@pytest.mark.anyio
+async def test_items_leased_by_a_live_worker_are_not_requeued(anyio_backend, tmp_path):
+    db_path = str(tmp_path / "queue.sqlite3")
+    other_worker = BatchJobRepository(db_path)
+    job_id = other_worker.create_job(["甲公司", "乙公司"])
+    # 另一个工作进程正在处理第一条
+    assert other_worker.claim_next_item()["idx"] == 0
+
+    calls = []
+    service = _service(BatchJobRepository(db_path), calls, concurrency=1, lease_seconds=0.2)
+    try:
+        service.ensure_started()
+        for _ in range(3):
+            await asyncio.sleep(0.05)
+            other_worker.heartbeat_item(job_id, 0)
+        assert calls == ["乙公司"]
+        assert service.get_job(job_id)["counts"]["running"] == 1
+
+        # 心跳停止（进程退出）后租约过期，条目重新入队
+        job = await _wait_finished(service, job_id)
+        assert calls == ["乙公司", "甲公司"]
+        assert job["counts"]["success"] == 2
+    finally:
+        await service.stop()
+        other_worker.close()
+
+
+@pytest.mark.anyio
+async def test_heartbeat_keeps_long_items_leased_and_stop_releases_them(anyio_backend):
+    repository = BatchJobRepository(":memory:")
+    job_id = repository.create_job(["慢公司"])
+
+    class SlowEnterpriseService:
+        def process_company_info(self, text):
+            time.sleep(0.3)
+            return {"status": "success", "data": {"company_name": text}}
+
+    service = BatchJobService(repository, SlowEnterpriseService, concurrency=1,
+                              poll_interval=0.01, lease_seconds=0.1)
+    service.ensure_started()
+    await asyncio.sleep(0.2)
+    assert repository.requeue_expired_items(0.1) == 0
+    await service.stop()
+    assert service.get_job(job_id)["counts"]["pending"] == 1
@@ -0,0 +1,129 @@
+import time
+
+import pytest
+import requests
+
+from infrastructure.external.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from infrastructure.external.bocha_client import BochaAIClient
+from infrastructure.external.llm_client import LLMClient
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.is_open()
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_failure_reopens():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow_request() is True
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+
+class FailingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        raise requests.exceptions.ConnectionError("down")
+
+    def close(self):
+        pass
+
+
+def test_bocha_client_fails_fast_when_open():
+    breaker = CircuitBreaker("bocha_test", failure_threshold=2, recovery_timeout=60)
+    client = BochaAIClient(api_key="dummy", base_url="http://dummy", max_retries=3,
+                           retry_delay=0, circuit_breaker=breaker)
+    client.session = FailingSession()
+
+    first = client.search("测试")
+    assert first.success is False
+    assert client.session.calls == 2
+    assert breaker.is_open()
+
+    start = time.time()
+    second = client.search("测试")
+    assert second.success is False
+    assert second.status_code == 503
+    assert client.session.calls == 2
+    assert time.time() - start < 0.1
+
+
+def test_llm_client_fails_fast_when_open():
+    breaker = CircuitBreaker("llm_test", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+    client = LLMClient(api_key="dummy", base_url="http://dummy", circuit_breaker=breaker)
+    client.session = FailingSession()
+
+    resp = client.simple_chat("你好")
+    assert resp.success is False
+    assert client.session.calls == 0
+
+
+def test_probe_slot_released_on_unexpected_error():
+    breaker = CircuitBreaker("llm_probe_test", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    class BrokenSession(FailingSession):
+        def post(self, *args, **kwargs):
+            self.calls += 1
+            raise ValueError("unexpected")
+
+    client = LLMClient(api_key="dummy", base_url="http://dummy", circuit_breaker=breaker)
+    client.session = BrokenSession()
+    assert client.simple_chat("你好").success is False
+
+    # 意外异常未记录结果，探测名额已归还，下一次请求仍可探测
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+
+
+def test_release_probe_is_noop_after_outcome_recorded():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    probe = breaker.before_call()
+    assert probe is True
+
+    breaker.record_failure()
+    breaker.release_probe(probe)
+    assert breaker.state == CircuitState.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
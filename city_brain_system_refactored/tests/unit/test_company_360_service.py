@@ -0,0 +1,160 @@
+import time
+
+import pytest
+
+from domain.services.company_360_service import Company360Service, Company360Source, default_360_sources
+from domain.services.company_identity_service import CompanyIdentity
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeIdentityService:
+    def __init__(self, identity=None):
+        self.identity = identity
+        self.calls = 0
+
+    def resolve(self, name):
+        self.calls += 1
+        return self.identity
+
+
+def _slow(result, delay=0.2):
+    def fetch(name, identity, limit):
+        time.sleep(delay)
+        return result
+    return fetch
+
+
+@pytest.mark.anyio
+async def test_build_queries_sources_concurrently_with_one_identity_resolution():
+    identity = CompanyIdentity(8, "海信集团控股股份有限公司", {"ipg": ["海信集团"]})
+    identity_service = FakeIdentityService(identity)
+    seen = {}
+
+    def ipg(name, identity, limit):
+        seen["keys"], seen["limit"] = identity.keys_for("ipg"), limit
+        time.sleep(0.2)
+        return [{"client_name": "海信集团"}]
+
+    service = Company360Service(identity_service, [
+        Company360Source("ipg_clients", ipg),
+        Company360Source("enterprise_qd", _slow({"name": "海信集团控股股份有限公司"})),
+        Company360Source("work_orders", _slow([])),
+    ], source_timeout=2)
+
+    started = time.perf_counter()
+    document = await service.build("海信集团", limit=5)
+
+    assert time.perf_counter() - started < 0.5
+    assert identity_service.calls == 1
+    assert seen == {"keys": ["海信集团"], "limit": 5}
+    assert document["identity"]["canonical_id"] == 8
+    assert document["sources"]["ipg_clients"]["count"] == 1
+    assert document["sources"]["enterprise_qd"]["status"] == "ok"
+    assert document["sources"]["work_orders"]["status"] == "empty"
+    assert all(entry["latency_ms"] >= 150 for entry in document["sources"].values())
+    assert document["summary"] == {"found": ["ipg_clients", "enterprise_qd"], "failed": [], "total_count": 2}
+
+
+@pytest.mark.anyio
+async def test_slow_or_failing_source_does_not_block_the_others():
+    def broken(name, identity, limit):
+        raise ConnectionError("Task_sync_new unavailable")
+
+    service = Company360Service(FakeIdentityService(), [
+        Company360Source("as_opportunities", _slow([{"id": 1}], delay=0.01)),
+        Company360Source("crm", _slow({"name": "甲公司"}, delay=1.0), timeout=0.1),
+        Company360Source("work_orders", broken),
+    ], source_timeout=2)
+
+    started = time.perf_counter()
+    document = await service.build("甲公司")
+
+    assert time.perf_counter() - started < 0.5
+    assert document["identity"]["status"] == "unresolved"
+    assert document["sources"]["as_opportunities"]["status"] == "ok"
+    assert document["sources"]["crm"]["status"] == "timeout"
+    assert document["sources"]["work_orders"] == {
+        "status": "error", "latency_ms": document["sources"]["work_orders"]["latency_ms"], "count": 0,
+        "data": None, "error": "Task_sync_new unavailable",
+    }
+    assert document["summary"]["failed"] == ["crm", "work_orders"]
+
+
+@pytest.mark.anyio
+async def test_include_limits_queried_sources():
+    calls = []
+
+    def fetch(name, identity, limit):
+        calls.append(name)
+        return None
+
+    service = Company360Service(FakeIdentityService(), [
+        Company360Source("local", fetch), Company360Source("profile", fetch),
+    ])
+    document = await service.build("甲公司", include=["profile", "unknown"])
+
+    assert list(document["sources"]) == ["profile"]
+    assert calls == ["甲公司"]
+
+
+def test_local_source_prefers_the_queried_name_over_the_canonical_name():
+    class FakeCustomerRepository:
+        def __init__(self, rows):
+            self.rows = rows
+            self.calls = []
+
+        def find_by_name(self, name):
+            self.calls.append(name)
+            return self.rows.get(name)
+
+    class Row(dict):
+        def to_dict(self):
+            return dict(self)
+
+    identity = CompanyIdentity(3, "临沂市兰山区人民医院", {})
+    customers = FakeCustomerRepository({"临沂市兰山区人民法院": Row(name="临沂市兰山区人民法院"),
+                                        "临沂市兰山区人民医院": Row(name="临沂市兰山区人民医院")})
+    local = default_360_sources(customers, None, None, None, None, None)[0]
+
+    assert local.fetch("临沂市兰山区人民法院", identity, 10) == {"name": "临沂市兰山区人民法院"}
+    assert customers.calls == ["临沂市兰山区人民法院"]
+    assert local.fetch("兰山区人民医院", identity, 10) == {"name": "临沂市兰山区人民医院"}
+
+
+def test_crm_and_enterprise_qd_try_equality_lookups_before_like():
+    class FakeRepository:
+        def __init__(self, rows):
+            self.rows = rows
+            self.calls = []
+
+        def lookup(self, name, fuzzy=True):
+            self.calls.append(("name", name, fuzzy))
+            if name in self.rows:
+                return self.rows[name]
+            return next((row for key, row in self.rows.items() if name in key), None) if fuzzy else None
+
+        def lookup_many(self, names):
+            self.calls.append(("keys", list(names)))
+            return next((self.rows[n] for n in names if n in self.rows), None)
+
+        find_by_name = find_customer_by_name = lookup
+        find_by_names = find_customer_by_names = lookup_many
+
+    class Row(dict):
+        def to_dict(self):
+            return dict(self)
+
+    identity = CompanyIdentity(5, "海尔集团公司", {"crm": ["海尔集团有限公司"], "enterprise_qd": []})
+    crm_repo = FakeRepository({"海尔集团有限公司": Row(name="海尔集团有限公司")})
+    qd_repo = FakeRepository({"青岛海尔集团智能家电": Row(name="青岛海尔集团智能家电")})
+    sources = {s.name: s for s in default_360_sources(None, qd_repo, crm_repo, None, None, None)}
+
+    assert sources["crm"].fetch("海尔集团", identity, 10) == {"name": "海尔集团有限公司"}
+    assert crm_repo.calls == [("name", "海尔集团", False), ("keys", ["海尔集团有限公司"])]
+
+    assert sources["enterprise_qd"].fetch("海尔集团", identity, 10) == {"name": "青岛海尔集团智能家电"}
+    assert qd_repo.calls == [("name", "海尔集团", False), ("keys", []), ("name", "海尔集团", True)]
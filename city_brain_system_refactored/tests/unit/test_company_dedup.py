@@ -0,0 +1,145 @@
+import random
+
+from domain.services.company_dedup_service import CompanyDedupService
+from infrastructure.utils.company_dedup import dedupe_names, find_review_pairs, normalize_company_key
+
+
+class FakeNameRepository:
+    def __init__(self, names):
+        self.rows = [{"id": index + 1, "name": name} for index, name in enumerate(names)]
+
+    def find_names_after(self, after_id, page_size):
+        return [row for row in self.rows if row["id"] > after_id][:page_size]
+
+
+class FakeAliasRepository:
+    def __init__(self, rows=None):
+        self.rows = {row["alias_name"]: row for row in rows or []}
+        self.written = []
+        self.review = {}
+
+    def iter_aliases(self):
+        return iter(list(self.rows.values()))
+
+    def upsert_aliases(self, entries):
+        self.written.extend(entries)
+        for alias_name, match_key, canonical_id, canonical_name, score, source in entries:
+            self.rows[alias_name] = {"alias_name": alias_name, "match_key": match_key, "canonical_id": canonical_id,
+                                     "canonical_name": canonical_name, "score": score, "source": source}
+        return len(entries)
+
+    def add_review_pairs(self, pairs):
+        for left, right, score in pairs:
+            self.review.setdefault(tuple(sorted((left, right))), "pending")
+        return len(pairs)
+
+    def find_approved_pairs(self):
+        return [pair for pair, status in self.review.items() if status == "approved"]
+
+    def find_by_match_key(self, match_key):
+        for row in self.rows.values():
+            if row["match_key"] == match_key:
+                return {"canonical_id": row["canonical_id"], "canonical_name": row["canonical_name"]}
+        return None
+
+
+def test_normalize_company_key_strips_width_punctuation_and_legal_suffixes():
+    assert normalize_company_key("青岛ＡＢＣ科技股份有限公司") == "青岛abc科技"
+    assert normalize_company_key("青岛ABC科技（有限公司）") == "青岛abc科技"
+    assert normalize_company_key("海信集团控股股份有限公司") == "海信"
+    # 分公司是独立主体，不剥离
+    assert normalize_company_key("青岛啤酒股份有限公司黄岛分公司").endswith("分公司")
+    assert normalize_company_key("") == ""
+
+
+def test_dedupe_names_merges_only_equal_keys_and_prefers_full_legal_name():
+    matches = {m.alias_name: m for m in dedupe_names([
+        "海信集团", "海信集团控股股份有限公司", "中车青岛四方机车车辆股份有限公司", "中车青岛四放机车车辆有限公司",
+        "青岛港国际股份有限公司", "青岛港国际（股份）有限公司",
+    ])}
+
+    assert matches["海信集团"].canonical_name == "海信集团控股股份有限公司"
+    assert matches["青岛港国际（股份）有限公司"].canonical_name == "青岛港国际股份有限公司"
+    # 错一个字的名称只作为候选对，不自动合并
+    assert matches["中车青岛四放机车车辆有限公司"].canonical_name == "中车青岛四放机车车辆有限公司"
+
+    merged = dedupe_names(["中车青岛四方机车车辆股份有限公司", "中车青岛四放机车车辆有限公司"],
+                          merges=[("中车青岛四放机车车辆有限公司", "中车青岛四方机车车辆股份有限公司")])
+    assert merged[1].canonical_name == "中车青岛四方机车车辆股份有限公司"
+    assert merged[1].score < 1.0
+
+
+def test_review_pairs_exclude_different_places_ordinals_and_institutions():
+    distinct = [
+        ("临沂市兰山区人民法院", "临沂市兰山区人民医院"),
+        ("单县自然资源和规划局", "冠县自然资源和规划局"),
+        ("曹县自然资源和规划局", "冠县自然资源和规划局"),
+        ("国家税务总局青州市税务局", "国家税务总局德州市税务局"),
+        ("山东省青岛第十六中学", "山东省青岛第六十六中学"),
+        ("泰山学院", "泰山医学院"),
+        ("莒县人民医院", "莒南县人民医院"),
+        ("中国重汽集团济宁商用车有限公司", "中国重汽集团济南商用车有限公司"),
+        ("聊城市第四人民医院", "聊城市第二人民医院"),
+        ("山东中烟工业有限责任公司滕州卷烟厂", "山东中烟工业有限责任公司青州卷烟厂"),
+        ("青岛市市北区城市建设投资有限公司", "青岛市市南区城市建设投资有限公司"),
+        ("青岛港国际第2码头有限公司", "青岛港国际第3码头有限公司"),
+    ]
+    for left, right in distinct:
+        matches = dedupe_names([left, right])
+        assert matches[0].canonical_name != matches[1].canonical_name, (left, right)
+        assert find_review_pairs([left, right]) == [], (left, right)
+
+    pairs = find_review_pairs(["中车青岛四方机车车辆股份有限公司", "中车青岛四放机车车辆有限公司",
+                               "烟台市公安局", "烟台公安局"])
+    assert {(p.left_name, p.right_name) for p in pairs} == {
+        ("中车青岛四方机车车辆股份有限公司", "中车青岛四放机车车辆有限公司"), ("烟台市公安局", "烟台公安局"),
+    }
+
+
+def test_review_pairs_scale_with_blocking():
+    rng = random.Random(7)
+    pool = "海信青岛港城电子机械化工能源科技材料智能装备食品医药纺织汽车船舶航空物流信息软件生物环保建设农业"
+    names = list(dict.fromkeys("".join(rng.sample(pool, 8)) + "有限公司" for _ in range(3000)))
+    typo = names[42][:5] + "甲" + names[42][5:]
+
+    assert len({m.canonical_name for m in dedupe_names(names + [names[42][:-4] + "股份有限公司"])}) == len(names)
+    pairs = find_review_pairs(names + [typo])
+    assert (names[42], typo) in {(p.left_name, p.right_name) for p in pairs}
+
+
+def test_run_assigns_stable_ids_and_writes_only_changes():
+    aliases = FakeAliasRepository([{
+        "alias_name": "海尔集团公司", "match_key": "海尔", "canonical_id": 7,
+        "canonical_name": "海尔集团公司", "score": 1.0, "source": "chain_leader",
+    }])
+    service = CompanyDedupService(aliases, {
+        "chain_leader": FakeNameRepository(["海尔集团公司", "海信集团控股股份有限公司"]),
+        "customer": FakeNameRepository(["海尔集团", "海信集团"]),
+    }, page_size=1)
+
+    stats = service.run()
+    assert stats == {"names": 4, "clusters": 2, "new_clusters": 1, "written": 3, "review": 0}
+    assert aliases.rows["海尔集团"]["canonical_id"] == 7
+    assert aliases.rows["海信集团"]["canonical_id"] == 8
+    assert aliases.rows["海信集团"]["source"] == "customer"
+
+    assert service.run()["written"] == 0
+    assert service.resolve("海信集团控股有限公司") == {"canonical_id": 8, "canonical_name": "海信集团控股股份有限公司"}
+
+
+def test_run_queues_look_alikes_and_merges_them_once_approved():
+    aliases = FakeAliasRepository()
+    service = CompanyDedupService(aliases, {
+        "chain_leader": FakeNameRepository(["中车青岛四方机车车辆股份有限公司"]),
+        "customer": FakeNameRepository(["中车青岛四放机车车辆有限公司", "临沂市兰山区人民法院", "临沂市兰山区人民医院"]),
+    })
+
+    assert service.run()["review"] == 1
+    assert aliases.rows["中车青岛四放机车车辆有限公司"]["canonical_id"] != \
+        aliases.rows["中车青岛四方机车车辆股份有限公司"]["canonical_id"]
+
+    aliases.review[("中车青岛四放机车车辆有限公司", "中车青岛四方机车车辆股份有限公司")] = "approved"
+    assert service.run()["review"] == 0
+    assert aliases.rows["中车青岛四放机车车辆有限公司"]["canonical_id"] == \
+        aliases.rows["中车青岛四方机车车辆股份有限公司"]["canonical_id"]
+    assert aliases.rows["临沂市兰山区人民法院"]["canonical_id"] != aliases.rows["临沂市兰山区人民医院"]["canonical_id"]
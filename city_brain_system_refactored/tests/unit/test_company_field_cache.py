@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timedelta
+
+from domain.services.company_field_cache import NEGATIVE_TTL_DAYS, CompanyFieldCache
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+class FakeCacheRepository:
+    def __init__(self, fields=None):
+        self.fields = fields or {}
+        self.written = []
+
+    def get_cache_fields(self, company_name):
+        return self.fields
+
+    def upsert_cache_fields(self, company_name, entries):
+        self.written.extend(entries)
+        return len(entries)
+
+
+def _row(value, fresh=True, source="web_search"):
+    return {"value": None if value is None else json.dumps(value, ensure_ascii=False),
+            "source": source, "confidence": 0.6, "fresh": fresh}
+
+
+def _final(**details):
+    return {"details": dict(details), "news": {"summary": "暂无最新商业资讯", "references": []}, "summary": ""}
+
+
+def test_load_skips_expired_fields_and_keeps_negative_entries():
+    repo = FakeCacheRepository({
+        "industry": _row("制造业"),
+        "revenue": _row("2024年营收10亿", fresh=False),
+        "ranking": _row(None),
+    })
+    fresh = CompanyFieldCache(repo, clock=lambda: NOW).load("甲公司")
+
+    assert fresh["industry"]["value"] == "制造业"
+    assert "revenue" not in fresh
+    assert fresh["ranking"]["value"] is None
+
+
+def test_load_falls_back_to_legacy_payload_by_field_ttl():
+    payload = _final(industry="制造业", address="杭州市", revenue_info="暂无营收信息")
+    cache_row = {"payload": json.dumps(payload, ensure_ascii=False), "cached_at": NOW - timedelta(days=10)}
+    fresh = CompanyFieldCache(FakeCacheRepository(), clock=lambda: NOW).load("甲公司", cache_row)
+
+    assert fresh["industry"] == {"value": "制造业", "source": "legacy_cache", "confidence": None}
+    assert "address" in fresh
+    # 占位值不视为新鲜；新闻TTL（3天）已过
+    assert "revenue" not in fresh
+    assert "news" not in fresh
+
+
+def test_apply_fills_only_missing_values_unless_overwrite():
+    fresh = {"industry": {"value": "制造业"}, "address": {"value": "杭州市"}, "ranking": {"value": None}}
+    final_data = _final(industry="", address="本地地址", company_status="暂无排名信息")
+
+    CompanyFieldCache.apply(final_data, fresh)
+    assert final_data["details"]["industry"] == "制造业"
+    assert final_data["details"]["address"] == "本地地址"
+    assert final_data["details"]["company_status"] == "暂无排名信息"
+
+    CompanyFieldCache.apply(final_data, fresh, overwrite=True)
+    assert final_data["details"]["address"] == "杭州市"
+
+
+def test_store_writes_computed_fields_with_negative_ttl_for_placeholders():
+    repo = FakeCacheRepository()
+    final_data = _final(industry="制造业", revenue_info="暂无营收信息")
+
+    written = CompanyFieldCache(repo).store("甲公司", final_data, {
+        "industry": ("local_db", 1.0),
+        "revenue": ("revenue_service", None),
+    })
+
+    assert written == 2
+    assert repo.written[0] == ("industry", json.dumps("制造业", ensure_ascii=False), "local_db", 1.0, 180)
+    assert repo.written[1] == ("revenue", None, "revenue_service", None, NEGATIVE_TTL_DAYS)
+
+
+def test_is_complete_and_needs():
+    fresh = {name: {"value": "x"} for name in ("industry", "address", "region", "revenue", "ranking")}
+    assert not CompanyFieldCache.is_complete(fresh)
+    assert CompanyFieldCache.needs(fresh, "revenue", "news")
+
+    fresh["news"] = {"value": None}
+    assert CompanyFieldCache.is_complete(fresh)
+    assert not CompanyFieldCache.needs(fresh, "revenue", "news")
+
+
+def test_searched_fields_that_stay_empty_are_negatively_cached_and_complete_the_entry():
+    repo = FakeCacheRepository()
+    final_data = _final(industry="制造业", address="", district_name="", revenue_info="暂无营收信息",
+                        company_status="暂无排名信息")
+    # 联网搜索过的字段无论是否有结果都记录来源
+    sources = {name: ("web_search", None) for name in ("address", "region")}
+    sources.update(industry=("industry_inference", None), revenue=("revenue_service", None),
+                   ranking=("ranking_service", None), news=("news_service", None))
+
+    CompanyFieldCache(repo).store("甲公司", final_data, sources)
+
+    ttl = {name: ttl_days for name, _, _, _, ttl_days in repo.written}
+    assert ttl["address"] == ttl["region"] == NEGATIVE_TTL_DAYS
+    fields = {name: {"value": value, "source": source, "confidence": confidence, "fresh": True}
+              for name, value, source, confidence, _ in repo.written}
+    fresh = CompanyFieldCache(FakeCacheRepository(fields)).load("甲公司")
+    assert fresh["address"]["value"] is None
+    assert CompanyFieldCache.is_complete(fresh)
@@ -0,0 +1,127 @@
+from domain.services.company_identity_service import CompanyIdentityService
+
+
+class FakeAliasRepository:
+    def __init__(self, rows=None):
+        self.rows = {row["alias_name"]: row for row in rows or []}
+        self.review = []
+
+    def iter_aliases(self):
+        return iter(list(self.rows.values()))
+
+    def upsert_aliases(self, entries):
+        for alias_name, match_key, canonical_id, canonical_name, score, source in entries:
+            self.rows[alias_name] = {"alias_name": alias_name, "match_key": match_key, "canonical_id": canonical_id,
+                                     "canonical_name": canonical_name, "score": score, "source": source}
+        return len(entries)
+
+    def add_review_pairs(self, pairs):
+        self.review.extend(pairs)
+        return len(pairs)
+
+    def find_by_match_key(self, match_key):
+        rows = [row for row in self.rows.values() if row["match_key"] == match_key]
+        if not rows:
+            return None
+        best = max(rows, key=lambda row: row["score"])
+        return {"canonical_id": best["canonical_id"], "canonical_name": best["canonical_name"]}
+
+
+class FakeIdentityRepository:
+    def __init__(self):
+        self.rows = {}
+        self.upserts = 0
+
+    def iter_identities(self):
+        return iter([{"source": s, "source_key": k, "canonical_id": c} for (s, k), c in self.rows.items()])
+
+    def upsert_identities(self, entries):
+        self.upserts += len(entries)
+        for source, key, canonical_id in entries:
+            self.rows[(source, key)] = canonical_id
+        return len(entries)
+
+    def delete_identities(self, source, keys):
+        for key in keys:
+            self.rows.pop((source, key), None)
+        return len(keys)
+
+    def find_source_keys(self, canonical_id):
+        keys = {}
+        for (source, key), cid in self.rows.items():
+            if cid == canonical_id:
+                keys.setdefault(source, []).append(key)
+        return keys
+
+
+def _alias(name, key, canonical_id, canonical_name=None):
+    return {"alias_name": name, "match_key": key, "canonical_id": canonical_id,
+            "canonical_name": canonical_name or name, "score": 1.0, "source": "chain_leader"}
+
+
+def test_refresh_maps_every_source_key_to_one_canonical_id():
+    aliases = FakeAliasRepository([_alias("海尔集团公司", "海尔", 3)])
+    identities = FakeIdentityRepository()
+    names = {
+        "customer": ["海尔集团公司"],
+        "ipg": ["海尔集团", "中车青岛四方机车车辆股份有限公司"],
+        "as": ["中车青岛四放机车车辆有限公司"],
+        "work_order": ["海尔集团有限公司 "],
+    }
+    service = CompanyIdentityService(aliases, identities, {s: (lambda v=v: iter(v)) for s, v in names.items()})
+
+    report = service.refresh()
+
+    assert report["ipg"] == {"scanned": 2, "added": 2, "updated": 0, "removed": 0}
+    assert identities.rows[("ipg", "海尔集团")] == 3
+    assert identities.rows[("work_order", "海尔集团有限公司 ")] == 3
+    # 新企业分配新ID；错字变体不自动归并，登记为待确认名称对
+    assert identities.rows[("ipg", "中车青岛四方机车车辆股份有限公司")] == 4
+    assert identities.rows[("as", "中车青岛四放机车车辆有限公司")] == 5
+    assert [pair[:2] for pair in aliases.review] == [("中车青岛四方机车车辆股份有限公司", "中车青岛四放机车车辆有限公司")]
+
+    identity = service.resolve("海尔集团股份有限公司")
+    assert identity.canonical_id == 3
+    assert identity.keys_for("ipg") == ["海尔集团"]
+    assert identity.keys_for("crm") == []
+
+
+def test_refresh_is_incremental_and_skips_failed_sources():
+    aliases = FakeAliasRepository([_alias("海尔集团公司", "海尔", 3)])
+    identities = FakeIdentityRepository()
+    ipg_names = ["海尔集团", "海信集团控股股份有限公司"]
+
+    def broken():
+        raise ConnectionError("feishu_crm unavailable")
+
+    service = CompanyIdentityService(aliases, identities, {"ipg": lambda: iter(ipg_names), "as": broken})
+    service.refresh()
+    identities.rows[("as", "海尔集团")] = 3
+    upserts = identities.upserts
+
+    ipg_names.remove("海信集团控股股份有限公司")
+    report = service.refresh()
+
+    assert report["ipg"] == {"scanned": 1, "added": 0, "updated": 0, "removed": 1}
+    assert "as" not in report
+    assert identities.upserts == upserts
+    assert ("ipg", "海信集团控股股份有限公司") not in identities.rows
+    assert identities.rows[("as", "海尔集团")] == 3
+
+
+def test_refresh_follows_canonical_id_changes_and_resolve_handles_errors():
+    aliases = FakeAliasRepository([_alias("海尔集团公司", "海尔", 3)])
+    identities = FakeIdentityRepository()
+    service = CompanyIdentityService(aliases, identities, {"crm": lambda: iter(["海尔集团公司"])})
+    service.refresh()
+
+    # 去重服务合并簇后规范ID变化
+    aliases.rows["海尔集团公司"]["canonical_id"] = 1
+    assert service.refresh()["crm"]["updated"] == 1
+    assert identities.rows[("crm", "海尔集团公司")] == 1
+
+    class Broken:
+        def find_by_match_key(self, match_key):
+            raise RuntimeError("table missing")
+
+    assert CompanyIdentityService(Broken(), identities).resolve("海尔集团") is None
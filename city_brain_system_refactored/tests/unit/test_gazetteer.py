@@ -0,0 +1,51 @@
+from infrastructure.utils.address_processor import AddressExtractor
+from infrastructure.utils.gazetteer import Gazetteer, get_gazetteer
+
+
+def test_resolve_full_address_without_duplicate_suffix():
+    gazetteer = get_gazetteer()
+    assert gazetteer.resolve("山东省青岛市市北区辽宁路1号") == {
+        "province": "山东省", "city": "青岛市", "district": "市北区"}
+
+
+def test_resolve_district_fills_city_and_province():
+    gazetteer = get_gazetteer()
+    assert gazetteer.resolve("黄岛区") == {"province": "山东省", "city": "青岛市", "district": "黄岛区"}
+    assert gazetteer.resolve("莱西市") == {"province": "山东省", "city": "青岛市", "district": "莱西市"}
+    assert gazetteer.resolve("上海市浦东新区") == {"province": "上海市", "city": "上海市", "district": "浦东新区"}
+
+
+def test_ambiguous_district_disambiguated_by_city():
+    gazetteer = get_gazetteer()
+    assert gazetteer.resolve("济南市市中区")["city"] == "济南市"
+    assert gazetteer.resolve("枣庄市市中区")["city"] == "枣庄市"
+    # 无上下文时只保留能确定的层级
+    assert gazetteer.resolve("市中区") == {"province": "山东省", "city": None, "district": "市中区"}
+    assert gazetteer.resolve("北京市朝阳区")["city"] == "北京市"
+    assert gazetteer.resolve("辽宁省朝阳市")["city"] == "朝阳市"
+
+
+def test_aliases_in_company_names_and_street_names():
+    gazetteer = get_gazetteer()
+    assert gazetteer.resolve("青岛海尔股份有限公司")["city"] == "青岛市"
+    assert gazetteer.resolve("广西南宁")["province"] == "广西壮族自治区"
+    assert gazetteer.resolve("中山路1号") == {"province": None, "city": None, "district": None}
+    assert gazetteer.resolve("") == {"province": None, "city": None, "district": None}
+
+
+def test_custom_divisions_and_lookup():
+    gazetteer = Gazetteer({"测试省": {"样例市": ["甲乙区"]}})
+    assert gazetteer.resolve("甲乙区")["province"] == "测试省"
+    assert [r.level for r in gazetteer.lookup("样例")] == ["city"]
+
+
+def test_address_extractor_uses_gazetteer_with_regex_fallback():
+    extractor = AddressExtractor()
+    assert extractor.extract_city_from_address("青岛市市南区香港中路") == "青岛市"
+    assert extractor.extract_city_from_address("市南区南京路100号") == "青岛市"
+    assert extractor.parse_address_components("山东省潍坊市寿光市圣城街") == {
+        "province": "山东省", "city": "潍坊市", "district": "寿光市",
+        "full_address": "山东省潍坊市寿光市圣城街"}
+    # 地名库未收录的区县仍由正则兜底
+    assert extractor.extract_district_from_address("江苏省苏州市吴中区") == "吴中区"
+    assert extractor.resolve_region("黄岛区")["city"] == "青岛市"
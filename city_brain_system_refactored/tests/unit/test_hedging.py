@@ -0,0 +1,174 @@
+import threading
+import time
+
+from infrastructure.external.hedging import HedgePolicy, run_hedged
+
+
+def _warm(policy, latency, n):
+    for _ in range(n):
+        policy.record_latency(latency)
+
+
+def test_no_hedge_delay_without_samples():
+    policy = HedgePolicy("test", min_samples=5)
+    _warm(policy, 0.1, 4)
+    assert policy.hedge_delay() is None
+    policy.record_latency(0.1)
+    assert policy.hedge_delay() == 0.1
+
+
+def test_budget_limits_hedge_ratio():
+    policy = HedgePolicy("test", budget_ratio=0.05)
+    granted = 0
+    for _ in range(200):
+        policy.record_request()
+        if policy.try_acquire_hedge():
+            granted += 1
+    assert granted == 10
+    assert policy.get_stats()["hedge_ratio"] <= 0.05
+
+
+class EventScope:
+    """测试用取消范围：abort() 唤醒范围内等待的调用"""
+    scopes = []
+
+    def __init__(self):
+        self.aborted = threading.Event()
+        self.thread = None
+        EventScope.scopes.append(self)
+
+    def __enter__(self):
+        self.thread = threading.current_thread()
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def abort(self):
+        self.aborted.set()
+
+
+def _scoped_call(primary_seconds, hedge_result="hedge"):
+    """主请求（调用方线程）阻塞 primary_seconds 或被中止；对冲请求立即返回"""
+    caller = threading.current_thread()
+
+    def call():
+        if threading.current_thread() is caller:
+            if EventScope.scopes[0].aborted.wait(primary_seconds):
+                raise ConnectionAbortedError("aborted")
+            return "primary"
+        time.sleep(0.02)
+        return hedge_result
+    return call
+
+
+def test_slow_primary_is_hedged_and_aborted():
+    EventScope.scopes = []
+    policy = HedgePolicy("test", min_samples=1, budget_ratio=1.0)
+    _warm(policy, 0.02, 10)
+
+    start = time.time()
+    assert run_hedged(_scoped_call(5.0), policy, time.time, cancel_scope=EventScope) == "hedge"
+    assert time.time() - start < 0.3
+    primary, hedge = EventScope.scopes
+    assert primary.aborted.is_set() and not hedge.aborted.is_set()
+    assert primary.thread is threading.current_thread() and hedge.thread is not primary.thread
+    assert policy.get_stats()["hedge_wins"] == 1
+
+
+def test_primary_win_aborts_hedge_and_discards_late_result():
+    EventScope.scopes = []
+    policy = HedgePolicy("test", min_samples=1, budget_ratio=1.0)
+    _warm(policy, 0.02, 10)
+    discarded = []
+
+    def call():
+        if threading.current_thread().name.startswith("hedge"):
+            time.sleep(0.1)
+            return "hedge"
+        time.sleep(0.05)
+        return "primary"
+
+    assert run_hedged(call, policy, time.time, cancel_scope=EventScope, discard=discarded.append) == "primary"
+    assert EventScope.scopes[1].aborted.is_set()
+    time.sleep(0.15)
+    assert discarded == ["hedge"]
+    assert policy.get_stats()["hedge_wins"] == 0
+
+
+def test_fast_primary_not_hedged():
+    policy = HedgePolicy("test", min_samples=1, budget_ratio=1.0)
+    _warm(policy, 0.5, 10)
+    assert run_hedged(lambda: "ok", policy, time.time) == "ok"
+    assert policy.get_stats()["total_hedges"] == 0
+
+
+def test_saturated_pool_does_not_delay_the_primary(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from infrastructure.external import hedging
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(hedging, "_hedge_executor", executor)
+    policy = HedgePolicy("test", min_samples=1, budget_ratio=1.0)
+    _warm(policy, 0.05, 10)
+
+    # 线程池被其他请求占满
+    executor.submit(time.sleep, 0.5)
+    caller = threading.current_thread()
+    start = time.time()
+    assert run_hedged(lambda: time.sleep(0.01) or threading.current_thread() is caller, policy, time.time) is True
+    assert time.time() - start < 0.1
+    assert policy.get_stats()["total_hedges"] == 0
+    executor.shutdown(wait=False)
+
+
+def test_cold_start_runs_in_caller_thread():
+    policy = HedgePolicy("test", min_samples=5)
+    caller = threading.current_thread()
+    assert run_hedged(lambda: threading.current_thread() is caller, policy, time.time) is True
+    assert policy.get_stats()["samples"] == 1
+
+
+def test_bocha_hedge_win_aborts_the_primary_connection():
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from infrastructure.external.bocha_client import BochaAIClient
+
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            requests_seen.append(1)
+            if len(requests_seen) == 1:
+                time.sleep(1.0)
+            body = json.dumps({"code": 200, "data": {}}).encode()
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    policy = HedgePolicy("bocha_test", min_samples=1, budget_ratio=1.0)
+    _warm(policy, 0.05, 10)
+    client = BochaAIClient(api_key="dummy", base_url=f"http://127.0.0.1:{server.server_port}/",
+                           timeout=5, hedging_enabled=True, hedge_policy=policy)
+    try:
+        start = time.time()
+        response = client._post({"query": "测试"})
+        assert response.status_code == 200
+        assert time.time() - start < 0.5
+        assert policy.get_stats()["hedge_wins"] == 1
+    finally:
+        client.session.close()
+        server.shutdown()
+        server.server_close()
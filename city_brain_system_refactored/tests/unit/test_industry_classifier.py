@@ -0,0 +1,130 @@
+import infrastructure.external as external
+from infrastructure.utils import industry_classifier, text_processor
+from infrastructure.utils.industry_classifier import IndustryClassifier, IndustryPrediction, normalize_label
+
+SAMPLES = [
+    ("青岛第一人民医院", "医疗"), ("济南市中心医院", "医疗"), ("潍坊市人民医院", "医疗"),
+    ("烟台毓璜顶医院", "医疗"), ("青岛大学附属医院", "医疗"),
+    ("青岛重工机械有限公司", "机械/重工"), ("潍坊精密机械制造有限公司", "机械/重工"),
+    ("山东重型机械股份有限公司", "机械/重工"), ("济南机床机械有限公司", "机械/重工"),
+    ("青岛农商银行", "金融"), ("日照银行股份有限公司", "金融"), ("齐鲁银行", "金融"),
+    ("孤例公司", "其他"),
+]
+
+
+def test_normalize_label_takes_first_informative_value():
+    assert normalize_label("其他, 机械/重工") == "机械/重工"
+    assert normalize_label("公共事业，医院") == "公共事业"
+    assert normalize_label("其他") is None
+    assert normalize_label(None) is None
+
+
+def test_predicts_trained_industries_with_confidence():
+    classifier = IndustryClassifier().fit(SAMPLES)
+    assert classifier.labels == ["医疗", "机械/重工", "金融"]
+
+    prediction = classifier.predict("临沂市妇幼保健医院")
+    assert prediction.industry == "医疗" and prediction.source == "model"
+    assert 0 < prediction.confidence <= 1
+    assert classifier.predict("淄博机械设备有限公司").industry == "机械/重工"
+    # 没有任何已知特征时不给出预测
+    assert classifier.predict("ZZZ") is None
+
+
+def test_keyword_rules_and_batch_alignment():
+    classifier = IndustryClassifier().fit(SAMPLES)
+    results = classifier.predict_many(["青岛啤酒股份有限公司", "", "威海商业银行", "ZZZ"])
+    assert results[0] == IndustryPrediction("食品饮料制造业", 1.0, "keyword")
+    assert results[1] is None
+    assert results[2].industry == "金融"
+    assert results[3] is None
+    # 未训练时仅关键词规则生效
+    assert IndustryClassifier().predict("青岛啤酒").industry == "食品饮料制造业"
+    assert IndustryClassifier().predict("青岛重工") is None
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    classifier = IndustryClassifier().fit(SAMPLES)
+    path = str(tmp_path / "model.npz")
+    classifier.save(path)
+    loaded = IndustryClassifier.load(path)
+    assert loaded.labels == classifier.labels
+    assert loaded.predict("东营市人民医院") == classifier.predict("东营市人民医院")
+
+
+def test_fit_maps_labels_to_taxonomy_and_roundtrips_calibrated_threshold(tmp_path):
+    classifier = IndustryClassifier().fit(SAMPLES, taxonomy=["医疗卫生", "高端装备"],
+                                          label_map={"医疗": "医疗卫生", "机械/重工": "高端装备"})
+    assert classifier.labels == ["医疗卫生", "高端装备"]
+    assert classifier.min_confidence is None
+
+    classifier.min_confidence = 0.83
+    path = str(tmp_path / "model.npz")
+    classifier.save(path)
+    assert IndustryClassifier.load(path).min_confidence == 0.83
+
+
+def test_calibrate_threshold_requires_target_accuracy_and_support():
+    samples = [(f"{city}第{i}人民医院", "医疗") for i in range(40) for city in ("青岛", "济南")]
+    samples += [(f"{city}第{i}农商银行", "金融") for i in range(40) for city in ("青岛", "济南")]
+    threshold = industry_classifier.calibrate_threshold(samples, target_accuracy=0.95, min_support=10)
+    assert threshold is not None and 0.5 <= threshold < 1
+
+    # 留出样本不足或达不到目标准确率时不启用
+    assert industry_classifier.calibrate_threshold(samples, target_accuracy=0.95, min_support=1000) is None
+    noisy = [(name, "医疗" if i % 2 else "金融") for i, (name, _) in enumerate(samples)]
+    assert industry_classifier.calibrate_threshold(noisy, target_accuracy=0.95, min_support=10) is None
+
+
+def test_get_company_industry_uses_local_answer_only_when_gate_is_calibrated(monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("不应联网")
+
+    classifier = IndustryClassifier().fit(SAMPLES)
+    monkeypatch.setattr(industry_classifier, "get_industry_classifier", lambda: classifier)
+    monkeypatch.setattr(industry_classifier, "classify_industry",
+                        lambda name: IndustryPrediction("金融", 0.95, "model"))
+
+    # 未标定阈值（默认）时即使置信度很高也走联网路径
+    calls = []
+    monkeypatch.setattr(external, "search_web", lambda query: calls.append(query) or None)
+    assert text_processor.get_company_industry("某某银行") is None
+    assert calls == ["某某银行 行业 主营业务"]
+
+    classifier.min_confidence = 0.9
+    monkeypatch.setattr(external, "search_web", _fail)
+    assert text_processor.get_company_industry("某某银行") == "金融"
+
+    # 置信度低于标定阈值时走联网路径
+    calls.clear()
+    monkeypatch.setattr(external, "search_web", lambda query: calls.append(query) or None)
+    monkeypatch.setattr(industry_classifier, "classify_industry",
+                        lambda name: IndustryPrediction("金融", 0.8, "model"))
+    assert text_processor.get_company_industry("某某银行") is None
+    assert calls == ["某某银行 行业 主营业务"]
+
+
+def test_keyword_rules_answer_locally_without_a_calibrated_model(monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("不应联网")
+
+    classifier = IndustryClassifier()
+    assert classifier.min_confidence is None
+    monkeypatch.setattr(industry_classifier, "get_industry_classifier", lambda: classifier)
+    monkeypatch.setattr(external, "search_web", _fail)
+
+    assert industry_classifier.local_industry("青岛啤酒股份有限公司") == "食品饮料制造业"
+    assert text_processor.get_company_industry("青岛啤酒股份有限公司") == "食品饮料制造业"
+
+
+def test_default_classifier_is_keyword_only_without_a_model_file(monkeypatch, tmp_path):
+    def _fail(*args, **kwargs):
+        raise AssertionError("不应现场训练")
+
+    monkeypatch.setattr(industry_classifier, "DEFAULT_MODEL_PATH", str(tmp_path / "missing.npz"))
+    monkeypatch.setattr(industry_classifier, "load_samples_from_csv", _fail)
+    monkeypatch.setattr(industry_classifier, "_default_classifier", None)
+
+    classifier = industry_classifier.get_industry_classifier()
+    assert not classifier.is_trained
+    assert classifier.predict("青岛啤酒股份有限公司").source == "keyword"
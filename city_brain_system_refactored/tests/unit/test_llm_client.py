@@ -40,4 +40,76 @@ def test_chat_accepts_chatmessage_objects():
     ]
     resp = client.chat(messages=msgs, max_tokens=64)
     assert resp.success is True
-    assert isinstance(resp.usage, dict)
\ No newline at end of file
+    assert isinstance(resp.usage, dict)
+
+
+class StreamingResponseStub:
+    status_code = 200
+
+    def __init__(self, lines):
+        self._lines = lines
+        self.closed = False
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingSession:
+    def __init__(self, lines):
+        self.response = StreamingResponseStub(lines)
+        self.kwargs = None
+
+    def post(self, *args, **kwargs):
+        self.kwargs = kwargs
+        return self.response
+
+    def close(self):
+        pass
+
+
+def test_stream_chat_yields_sse_deltas():
+    lines = [
+        b'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        b'',
+        'data: {"choices": [{"delta": {"content": "企业"}}]}'.encode('utf-8'),
+        b': keep-alive',
+        'data: {"choices": [{"delta": {"content": "分析"}}]}'.encode('utf-8'),
+        b'data: [DONE]',
+        b'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+    ]
+    client = LLMClient(api_key="dummy", base_url="http://dummy")
+    client.session = StreamingSession(lines)
+
+    chunks = list(client.stream_chat(["你好"]))
+    assert chunks == ["企业", "分析"]
+    assert client.session.kwargs["stream"] is True
+    assert client.session.kwargs["json"]["stream"] is True
+    assert client.session.response.closed is True
+
+
+def test_analysis_stream_raises_after_partial_output(monkeypatch):
+    from domain.services.analysis_service import AnalysisService
+    from infrastructure.external import llm_client
+
+    def broken_stream(self, messages, **kwargs):
+        yield "第一段"
+        raise ConnectionError("LLM连接中断")
+
+    def silent_failure(self, messages, **kwargs):
+        raise ConnectionError("LLM不可用")
+        yield
+
+    service = AnalysisService()
+    monkeypatch.setattr(llm_client.LLMClient, "stream_chat", broken_stream)
+    stream = service.stream_comprehensive_company_analysis({"customer_name": "示例公司"}, {})
+    assert next(stream) == "第一段"
+    with pytest.raises(ConnectionError):
+        next(stream)
+
+    # 尚未输出时仍回退为完整的备用分析
+    monkeypatch.setattr(llm_client.LLMClient, "stream_chat", silent_failure)
+    chunks = list(service.stream_comprehensive_company_analysis({"customer_name": "示例公司"}, {}))
+    assert len(chunks) == 1 and "示例公司" in chunks[0]
@@ -0,0 +1,23 @@
+from benchmarks.micro_benchmarks import compare_results, load_corpus, run
+
+
+def test_corpus_built_from_processed_data():
+    corpus = load_corpus(limit=20)
+    assert len(corpus.names) == 20
+    assert corpus.payloads and "webPages" in corpus.payloads[0]["data"]
+    assert len(corpus.content_payloads) == len(corpus.payloads)
+
+
+def test_run_reports_throughput_and_allocations():
+    report = run(limit=10, min_time=0.001, repeat=1)
+    assert "extract_company_name" in report["benchmarks"]
+    for result in report["benchmarks"].values():
+        assert result["ops_per_sec"] > 0
+        assert result["alloc_bytes_per_op"] >= 0
+
+
+def test_compare_flags_throughput_drop():
+    baseline = {"benchmarks": {"a": {"ops_per_sec": 1000.0}, "b": {"ops_per_sec": 1000.0}}}
+    current = {"benchmarks": {"a": {"ops_per_sec": 700.0}, "b": {"ops_per_sec": 950.0}}}
+    regressions = compare_results(current, baseline, threshold=0.15)
+    assert len(regressions) == 1 and regressions[0].startswith("a:")
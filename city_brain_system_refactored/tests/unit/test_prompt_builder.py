@@ -0,0 +1,55 @@
+from infrastructure.utils.prompt_builder import (
+    Evidence,
+    PromptEvidenceBuilder,
+    build_evidence_text,
+    estimate_tokens,
+    extract_evidence,
+    truncate_to_tokens,
+)
+
+
+def test_estimate_tokens_counts_cjk_and_words():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("青岛啤酒") == 4
+    assert estimate_tokens("revenue growth") >= 2
+
+
+def test_truncate_to_tokens_respects_budget():
+    text = "营业收入" * 100
+    truncated = truncate_to_tokens(text, 50)
+    assert estimate_tokens(truncated) <= 50
+    assert truncated.endswith("...")
+    assert truncate_to_tokens("短文本", 50) == "短文本"
+
+
+def test_extract_evidence_drops_raw_metadata():
+    data = {
+        "_type": "SearchResponse",
+        "images": {"value": [{"contentUrl": "https://img.example.com/1.jpg"}]},
+        "webPages": {"value": [
+            {"name": "标题", "snippet": "摘要", "url": "https://a.com/1", "datePublished": "2024-01-01"}
+        ]},
+    }
+    evidence = extract_evidence(data)
+    assert evidence == [Evidence(title="标题", snippet="摘要", url="https://a.com/1")]
+    assert "img.example.com" not in build_evidence_text(data)
+
+
+def test_select_deduplicates_urls_and_near_duplicate_text():
+    evidence = [
+        Evidence("青岛啤酒发布年报", "2023年营业收入339亿元，同比增长5%", "https://www.a.com/news/1/"),
+        Evidence("转载", "其他内容", "http://a.com/news/1"),
+        Evidence("青岛啤酒发布年报", "2023年营业收入339亿元，同比增长5%。", "https://b.com/2"),
+        Evidence("新品上市", "推出新款精酿产品", "https://c.com/3"),
+    ]
+    selected = PromptEvidenceBuilder(token_budget=1000).select(evidence)
+    assert [e.url for e in selected] == ["https://www.a.com/news/1/", "https://c.com/3"]
+
+
+def test_select_stays_within_budget_and_prefers_keywords():
+    evidence = [Evidence(f"新闻{i}", "无关内容" * 80, f"https://x.com/{i}") for i in range(10)]
+    evidence.append(Evidence("签约", "签署战略合作订单", "https://y.com/order"))
+    builder = PromptEvidenceBuilder(token_budget=300, item_token_limit=100)
+    selected = builder.select(evidence, keywords=["订单"])
+    assert selected[0].url == "https://y.com/order"
+    assert estimate_tokens(builder.render(selected)) <= 300 + len(selected) * 2
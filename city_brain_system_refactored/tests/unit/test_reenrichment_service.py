@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+from domain.services.reenrichment_service import ReenrichmentCheckpoint, ReenrichmentService, parse_stop_at
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeSourceRepository:
+    def __init__(self, names):
+        self.rows = [{"id": i + 1, "name": name} for i, name in enumerate(names)]
+
+    def find_names_after(self, after_id, page_size):
+        return [row for row in self.rows if row["id"] > after_id][:page_size]
+
+
+class FakeCacheRepository:
+    def __init__(self, fresh=()):
+        self.fresh = set(fresh)
+        self.writes = []
+
+    def find_fresh_names(self, names, min_valid_days):
+        return self.fresh & set(names)
+
+    def bulk_upsert_cache(self, entries, ttl_days):
+        self.writes.append([name for name, _ in entries])
+        self.fresh.update(name for name, _ in entries)
+        return len(entries)
+
+
+class FakeEnterpriseService:
+    calls = []
+
+    def process_company_info(self, name):
+        FakeEnterpriseService.calls.append(name)
+        if name == "失败公司":
+            return {"status": "error", "message": "无结果"}
+        return {"status": "success", "data": {"company_name": name, "details": {}}}
+
+
+def _service(tmp_path, repositories, cache, **kwargs):
+    FakeEnterpriseService.calls = []
+    options = dict(concurrency=2, rate_limit=0, page_size=2, flush_size=2, normalize_name=str.strip)
+    options.update(kwargs)
+    return ReenrichmentService(repositories, cache, FakeEnterpriseService,
+                               ReenrichmentCheckpoint(str(tmp_path / "checkpoint.json")), **options)
+
+
+@pytest.mark.anyio
+async def test_skips_fresh_cache_and_batches_writes(anyio_backend, tmp_path):
+    repositories = {
+        "customer": FakeSourceRepository(["甲公司", "乙公司", "甲公司", "失败公司", "丙公司"]),
+        "chain_leader": FakeSourceRepository(["丁公司"]),
+    }
+    cache = FakeCacheRepository(fresh={"乙公司"})
+    report = await _service(tmp_path, repositories, cache).run()
+
+    # 第二页的“甲公司”已在第一页写入缓存，视为新鲜
+    assert report["customer"] == {"scanned": 5, "skipped_fresh": 2, "enriched": 2, "failed": 1, "written": 2}
+    assert report["chain_leader"]["enriched"] == 1
+    assert sorted(FakeEnterpriseService.calls) == sorted(["甲公司", "失败公司", "丙公司", "丁公司"])
+    # 每页结束时落库，写入按批提交
+    assert cache.writes == [["甲公司"], ["丙公司"], ["丁公司"]]
+
+
+@pytest.mark.anyio
+async def test_resumes_from_checkpoint(anyio_backend, tmp_path):
+    repositories = {"customer": FakeSourceRepository(["A1", "A2", "A3", "A4", "A5"])}
+    cache = FakeCacheRepository()
+
+    first = await _service(tmp_path, repositories, cache).run(["customer"], limit=2)
+    assert first["customer"]["enriched"] == 2
+    assert ReenrichmentCheckpoint(str(tmp_path / "checkpoint.json")).last_id("customer") == 2
+
+    await _service(tmp_path, repositories, cache).run(["customer"])
+    assert FakeEnterpriseService.calls == ["A3", "A4", "A5"]
+    checkpoint = ReenrichmentCheckpoint(str(tmp_path / "checkpoint.json"))
+    assert checkpoint.is_finished("customer") and checkpoint.last_id("customer") == 5
+
+    # 已完成的数据源不会重复处理，reset 后从头开始
+    assert await _service(tmp_path, repositories, cache).run(["customer"]) == {}
+    checkpoint.reset()
+    assert checkpoint.last_id("customer") == 0
+
+
+def test_parse_stop_at_rolls_over_to_next_day():
+    now = datetime(2025, 1, 1, 23, 0)
+    assert parse_stop_at("06:00", now) == datetime(2025, 1, 2, 6, 0)
+    assert parse_stop_at("23:30", now) == datetime(2025, 1, 1, 23, 30)
+    assert parse_stop_at(None) is None
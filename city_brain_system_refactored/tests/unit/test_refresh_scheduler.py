@@ -0,0 +1,98 @@
+import json
+from datetime import datetime, timedelta
+
+from domain.services.refresh_scheduler import HourlyBudget, RefreshField, RefreshScheduler
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+class FakeCacheRepository:
+    def __init__(self, candidates, payloads):
+        self.candidates = candidates
+        self.payloads = payloads
+        self.updates = []
+
+    def find_refresh_candidates(self, limit):
+        return self.candidates[:limit]
+
+    def get_valid_cache(self, company_name):
+        payload = self.payloads.get(company_name)
+        return {"payload": json.dumps(payload)} if payload is not None else None
+
+    def update_cache_field(self, company_name, field_name, payload_json, **kwargs):
+        self.payloads[company_name] = json.loads(payload_json)
+        self.updates.append((company_name, field_name))
+        return True
+
+
+def _fields(calls):
+    def fetch(name):
+        return lambda company, payload: calls.append((company, name)) or f"{name}-新值"
+    return [
+        RefreshField("revenue", ("details", "revenue_info"), timedelta(days=90), 2, fetch("revenue")),
+        RefreshField("news", ("news",), timedelta(days=3), 1, fetch("news")),
+    ]
+
+
+def _candidate(name, cached_days_ago, hits, fields=None):
+    return {"company_name": name, "cached_at": NOW - timedelta(days=cached_days_ago),
+            "hit_count": hits, "fields": fields or {}}
+
+
+def test_plan_orders_by_staleness_times_popularity():
+    scheduler = RefreshScheduler(FakeCacheRepository([], {}), fields=_fields([]), clock=lambda: NOW)
+    plan = scheduler.plan([
+        _candidate("冷门", 10, 0),
+        _candidate("热门", 4, 100),
+        # 新闻刚单独刷新过，只剩营收未到期
+        _candidate("刚刷新", 100, 50, fields={"news": NOW - timedelta(hours=1)}),
+    ])
+    assert [(name, field.name) for _, name, field in plan] == [
+        ("热门", "news"), ("刚刷新", "revenue"), ("冷门", "news")]
+
+
+def test_run_once_respects_hourly_budget_and_updates_fields():
+    calls = []
+    repository = FakeCacheRepository(
+        [_candidate("甲", 100, 10), _candidate("乙", 5, 1)],
+        {"甲": {"details": {"revenue_info": "旧营收"}, "news": {}}, "乙": {"details": {}}},
+    )
+    scheduler = RefreshScheduler(repository, fields=_fields(calls), hourly_budget=3, clock=lambda: NOW)
+
+    stats = scheduler.run_once()
+    # 预算3：甲.news(1) + 甲.revenue(2) 用尽，乙.news 推迟
+    assert stats == {"candidates": 2, "planned": 3, "refreshed": 2, "failed": 0, "deferred": 1}
+    assert repository.payloads["甲"]["details"]["revenue_info"] == "revenue-新值"
+    assert repository.payloads["甲"]["news"] == "news-新值"
+    assert scheduler.budget.remaining() == 0
+    assert scheduler.run_once()["refreshed"] == 0
+
+
+def test_placeholder_does_not_overwrite_existing_value():
+    field = RefreshField("revenue", ("details", "revenue_info"), timedelta(days=1), 1,
+                         lambda company, payload: "暂无营收数据")
+    repository = FakeCacheRepository([_candidate("甲", 5, 0)], {"甲": {"details": {"revenue_info": "约10亿元"}}})
+    scheduler = RefreshScheduler(repository, fields=[field], hourly_budget=10, clock=lambda: NOW)
+    assert scheduler.run_once()["refreshed"] == 1
+    assert repository.payloads["甲"]["details"]["revenue_info"] == "约10亿元"
+    assert repository.updates == [("甲", "revenue")]
+
+
+def test_hourly_budget_window_slides():
+    now = [0.0]
+    budget = HourlyBudget(5, clock=lambda: now[0])
+    assert budget.try_consume(3) and not budget.try_consume(3) and budget.try_consume(2)
+    now[0] = 3600.0
+    assert budget.remaining() == 5
+    assert not RefreshScheduler(FakeCacheRepository([], {}), fields=[], hourly_budget=10).enabled
+
+
+def test_background_refresh_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("REFRESH_HOURLY_BUDGET", raising=False)
+    from config.simple_settings import AppSettings
+
+    assert AppSettings().refresh_hourly_budget == 0
+    scheduler = RefreshScheduler(FakeCacheRepository([], {}), fields=_fields([]), hourly_budget=0)
+    assert not scheduler.enabled
+    scheduler.start()
+    assert scheduler._task is None
@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from infrastructure.external.service_manager import (
+    BatchSearchStats,
+    ExternalServiceManager,
+    ServiceResult,
+    ServiceType,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class SlowSearchManager(ExternalServiceManager):
+    """按名称决定耗时的搜索桩：名称形如 "企业:秒数"，"坏" 开头返回失败"""
+
+    def __init__(self, **kwargs):
+        super().__init__(bocha_client=object(), llm_client=object(), **kwargs)
+        self.started = []
+        self.lock = threading.Lock()
+
+    def search_enterprise_info(self, request):
+        name = request.enterprise_name
+        with self.lock:
+            self.started.append(name)
+        time.sleep(float(name.split(":")[1]) if ":" in name else 0.01)
+        if name.startswith("坏"):
+            return ServiceResult.error_result(ServiceType.SEARCH, "失败", 0.01)
+        return ServiceResult.success_result(ServiceType.SEARCH, {"name": name}, 0.01)
+
+
+def _lazy_names(consumed, names):
+    for name in names:
+        consumed.append(name)
+        yield name
+
+
+def test_streams_results_and_bounds_submission_window():
+    manager = SlowSearchManager(max_workers=2, default_timeout=5)
+    consumed = []
+    stats = BatchSearchStats()
+    stream = manager.iter_batch_search_enterprises(_lazy_names(consumed, [f"企业{i}" for i in range(20)]),
+                                                   stats=stats)
+    first_name, first_result = next(stream)
+    # 首个结果返回时只读取了窗口内的名称
+    assert first_result.success and len(consumed) <= 3
+    rest = list(stream)
+    assert len(rest) == 19 and stats.succeeded == 20
+    assert stats.to_dict()["completed"] == 20
+    manager.executor.shutdown()
+
+
+def test_item_timeout_and_failures():
+    manager = SlowSearchManager(max_workers=3, default_timeout=5)
+    stats = BatchSearchStats()
+    results = dict(manager.iter_batch_search_enterprises(["慢:1.0", "快", "坏数据"], item_timeout=0.2, stats=stats))
+    assert not results["慢:1.0"].success and "超时" in results["慢:1.0"].error_message
+    assert results["快"].success and not results["坏数据"].success
+    assert (stats.succeeded, stats.failed, stats.timed_out) == (1, 1, 1)
+    manager.executor.shutdown()
+
+
+def test_timed_out_window_keeps_reading_remaining_names():
+    manager = SlowSearchManager(max_workers=2, default_timeout=5)
+    stats = BatchSearchStats()
+    names = ["慢:1.0", "慢2:1.0", "甲", "乙", "丙"]
+    results = dict(manager.iter_batch_search_enterprises(names, item_timeout=0.2, stats=stats))
+    assert set(results) == set(names)
+    assert all(results[name].success for name in ("甲", "乙", "丙"))
+    assert (stats.succeeded, stats.timed_out, stats.cancelled) == (3, 2, 0)
+    assert set(manager.batch_search_enterprises(names, item_timeout=0.2)) == set(names)
+    manager.executor.shutdown()
+
+
+def test_closing_stream_cancels_pending_work():
+    manager = SlowSearchManager(max_workers=1, default_timeout=5)
+    consumed = []
+    stats = BatchSearchStats()
+    stream = manager.iter_batch_search_enterprises(_lazy_names(consumed, [f"企业{i}:0.05" for i in range(50)]),
+                                                   window=3, stats=stats)
+    next(stream)
+    stream.close()
+    time.sleep(0.2)
+    assert len(consumed) <= 4
+    assert len(manager.started) <= 3
+    assert stats.cancelled >= 1
+    manager.executor.shutdown()
+
+
+def test_cancel_event_stops_iteration():
+    manager = SlowSearchManager(max_workers=1, default_timeout=5)
+    cancel = threading.Event()
+    stats = BatchSearchStats()
+    received = []
+    for name, _ in manager.iter_batch_search_enterprises([f"企业{i}:0.05" for i in range(20)],
+                                                         cancel_event=cancel, stats=stats):
+        received.append(name)
+        cancel.set()
+    assert len(received) == 1 and stats.cancelled >= 1
+    manager.executor.shutdown()
+
+
+def test_batch_search_enterprises_keeps_dict_api():
+    manager = SlowSearchManager(max_workers=2)
+    results = manager.batch_search_enterprises(["甲", "乙", "坏"])
+    assert set(results) == {"甲", "乙", "坏"} and not results["坏"].success
+    manager.executor.shutdown()
+
+
+@pytest.mark.anyio
+async def test_async_iterator_yields_as_completed(anyio_backend):
+    manager = SlowSearchManager(max_workers=2, default_timeout=5)
+    stats = BatchSearchStats()
+    names = []
+    async for name, result in manager.aiter_batch_search_enterprises(
+            ["慢:0.2", "快", "超时:1.0"], item_timeout=0.5, stats=stats):
+        names.append(name)
+    assert names[0] == "快" and set(names) == {"慢:0.2", "快", "超时:1.0"}
+    assert stats.timed_out == 1 and stats.succeeded == 2
+    manager.executor.shutdown()
+
+
+@pytest.mark.anyio
+async def test_async_iterator_continues_after_window_times_out(anyio_backend):
+    manager = SlowSearchManager(max_workers=2, default_timeout=5)
+    names = []
+    async for name, _ in manager.aiter_batch_search_enterprises(["慢:0.6", "慢2:0.6", "甲", "乙"], item_timeout=0.2):
+        names.append(name)
+    assert sorted(names) == sorted(["慢:0.6", "慢2:0.6", "甲", "乙"])
+    manager.executor.shutdown()
@@ -0,0 +1,38 @@
+from infrastructure.utils.text_processor import CompanyNameExtractor
+
+
+def test_extract_prefers_complete_name():
+    extractor = CompanyNameExtractor()
+    result = extractor.extract_company_name("青岛啤酒股份有限公司的信息")
+    assert result == {"name": "青岛啤酒股份有限公司", "is_complete": True, "confidence": 0.9}
+
+
+def test_extract_brand_and_short_name():
+    extractor = CompanyNameExtractor()
+    assert extractor.extract_company_name("茅台怎么样")["confidence"] == 0.7
+    assert extractor.extract_company_name("ab 海信视像 cd") == {"name": "海信视像", "is_complete": False, "confidence": 0.5}
+    assert extractor.extract_company_name("查询") is None
+    assert extractor.extract_company_name("") is None
+
+
+def test_brand_with_suffix_matches_complete_pattern():
+    extractor = CompanyNameExtractor()
+    result = extractor.extract_company_name("阿里巴巴网络技术有限公司")
+    assert result["name"] == "阿里巴巴网络技术有限公司"
+    assert result["is_complete"] is True
+
+
+def test_is_complete_and_normalize():
+    extractor = CompanyNameExtractor()
+    assert extractor.is_complete_company_name("潍柴动力股份有限公司") is True
+    assert extractor.is_complete_company_name("潍柴动力") is False
+    assert extractor.normalize_company_name(" 华为 技术（深圳） ") == "华为技术(深圳)"
+
+
+def test_repeated_inputs_are_memoized_and_results_not_shared():
+    extractor = CompanyNameExtractor()
+    first = extractor.extract_company_name("青岛啤酒股份有限公司")
+    first["name"] = "changed"
+    second = extractor.extract_company_name("青岛啤酒股份有限公司")
+    assert second["name"] == "青岛啤酒股份有限公司"
+    assert extractor._analyze_cached.cache_info().hits >= 1
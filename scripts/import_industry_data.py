@@ -1,15 +1,36 @@
-"""Import industry brain and chain leader data from Excel into City_Brain_DB."""
+"""Import industry brain and chain leader data from the files under data/ into City_Brain_DB.
+
+Every entry in SOURCES pairs a file with a loader; leader lists in txt, csv,
+xlsx, docx and doc form go through format adapters picked by file suffix.
+Sources are parsed in parallel worker processes and merged before import.
+"""
 from __future__ import annotations
 
+import argparse
 import math
+import os
 import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from xml.etree import ElementTree
 
 import mysql.connector
 import pandas as pd
 
+from prepare_data_for_import import CHUNK_SIZE, read_excel_chunks
+
+# Company-name dedup is shared with the application so imports and runtime
+# lookups agree on which names are the same company.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "city_brain_system_refactored"))
+from infrastructure.utils.company_dedup import dedupe_names  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Data models
 # ---------------------------------------------------------------------------
@@ -33,6 +54,7 @@ class LeaderRecord:
     districts: Set[str] = field(default_factory=set)
     brains: Set[str] = field(default_factory=set)
     statuses: Set[str] = field(default_factory=set)
+    sources: Set[str] = field(default_factory=set)
 
     def primary_city(self) -> Optional[str]:
         return next(iter(self.cities), None)
@@ -144,122 +166,426 @@ BASELINE_FILE = DATA_DIR / "产业大脑信息baseline.xlsx"
 QINGDAO_FILE = DATA_DIR / "产业大脑与链主企业-青岛.xlsx"
 
 
-def load_baseline() -> List[BrainRecord]:
-    df = pd.read_excel(BASELINE_FILE, sheet_name="产业大脑", header=4)
-    df = df.rename(columns={"Unnamed: 5": "区县"})
-    for col in ("地区", "区县", "时间", "产业大脑", "行业"):
-        df[col] = df[col].ffill()
+def read_filled_chunks(
+    path: Path,
+    sheet_name: str,
+    header: int,
+    rename: Dict[str, str],
+    fill_columns: Tuple[str, ...],
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Stream a sheet in row batches, forward-filling merged-cell columns across batches."""
+    last_values: Dict[str, object] = {}
+    for df in read_excel_chunks(path, chunk_size, sheet_name=sheet_name, header=header):
+        df = df.rename(columns=rename)
+        for col in fill_columns:
+            values = df[col].ffill()
+            if col in last_values:
+                values = values.where(values.notna(), last_values[col])
+            filled = values.dropna()
+            if not filled.empty:
+                last_values[col] = filled.iloc[-1]
+            df[col] = values
+        yield df
+
+
+def load_baseline(path: Path = BASELINE_FILE, chunk_size: int = CHUNK_SIZE) -> List[BrainRecord]:
+    chunks = read_filled_chunks(
+        path,
+        sheet_name="产业大脑",
+        header=4,
+        rename={"Unnamed: 5": "区县"},
+        fill_columns=("地区", "区县", "时间", "产业大脑", "行业"),
+        chunk_size=chunk_size,
+    )
     records: Dict[Tuple[str, str, str], BrainRecord] = {}
-    for _, row in df.iterrows():
-        city = normalize_city(row.get("地区"))
-        district = normalize_district(row.get("区县"))
-        brain_name = normalize_text(row.get("产业大脑"))
-        industry = normalize_text(row.get("行业"))
-        year = parse_year(row.get("时间"))
-        if not (city and district and brain_name and industry):
-            continue
-        key = (brain_name, city, district)
-        record = records.get(key)
-        if record is None:
-            record = BrainRecord(
-                brain_name=brain_name,
-                city=city,
-                district=district,
-                year=year,
-                industry_name=industry,
-                sources={"baseline"},
-            )
-            records[key] = record
-        else:
-            record.sources.add("baseline")
-            if record.year is None and year is not None:
-                record.year = year
+    for df in chunks:
+        for _, row in df.iterrows():
+            city = normalize_city(row.get("地区"))
+            district = normalize_district(row.get("区县"))
+            brain_name = normalize_text(row.get("产业大脑"))
+            industry = normalize_text(row.get("行业"))
+            year = parse_year(row.get("时间"))
+            if not (city and district and brain_name and industry):
+                continue
+            key = (brain_name, city, district)
+            record = records.get(key)
+            if record is None:
+                record = BrainRecord(
+                    brain_name=brain_name,
+                    city=city,
+                    district=district,
+                    year=year,
+                    industry_name=industry,
+                    sources={"baseline"},
+                )
+                records[key] = record
+            else:
+                record.sources.add("baseline")
+                if record.year is None and year is not None:
+                    record.year = year
     return list(records.values())
 
 
-def load_qingdao() -> Tuple[List[BrainRecord], Dict[str, LeaderRecord]]:
-    df = pd.read_excel(QINGDAO_FILE, sheet_name="产业大脑和链主企业名单")
-    df = df.rename(columns={"行业分类": "行业"})
-    for col in ("城市", "区域", "时间", "产业大脑", "行业", "链主企业", "备注"):
-        df[col] = df[col].ffill()
+def load_qingdao(
+    path: Path = QINGDAO_FILE, chunk_size: int = CHUNK_SIZE
+) -> Tuple[List[BrainRecord], Dict[str, LeaderRecord]]:
+    chunks = read_filled_chunks(
+        path,
+        sheet_name="产业大脑和链主企业名单",
+        header=0,
+        rename={"行业分类": "行业"},
+        fill_columns=("城市", "区域", "时间", "产业大脑", "行业", "链主企业", "备注"),
+        chunk_size=chunk_size,
+    )
 
     brain_records: Dict[Tuple[str, str, str], BrainRecord] = {}
     leader_records: Dict[str, LeaderRecord] = {}
 
-    for _, row in df.iterrows():
-        city = normalize_city(row.get("城市"))
-        district = normalize_district(row.get("区域"))
-        brain_name = normalize_text(row.get("产业大脑"))
-        industry = normalize_text(row.get("行业"))
-        year = parse_year(row.get("时间"))
-        if not (city and district and brain_name and industry):
-            continue
-        key = (brain_name, city, district)
-        record = brain_records.get(key)
-        if record is None:
-            record = BrainRecord(
-                brain_name=brain_name,
-                city=city,
-                district=district,
-                year=year,
-                industry_name=industry,
-                sources={"qingdao"},
-            )
-            brain_records[key] = record
-        else:
-            record.sources.add("qingdao")
-            if record.year is None and year is not None:
-                record.year = year
-
-        leader_name = normalize_text(row.get("链主企业"))
-        if leader_name and not is_placeholder_leader(leader_name):
-            record.chain_leaders.add(leader_name)
-            leader = leader_records.get(leader_name)
-            if leader is None:
-                leader = LeaderRecord(name=leader_name)
-                leader_records[leader_name] = leader
-            leader.cities.add(city)
-            leader.districts.add(district)
-            leader.industries.add(industry)
-            leader.brains.add(brain_name)
-            remark = normalize_text(row.get("备注"))
-            if remark:
-                leader.statuses.add(remark)
+    for df in chunks:
+        for _, row in df.iterrows():
+            city = normalize_city(row.get("城市"))
+            district = normalize_district(row.get("区域"))
+            brain_name = normalize_text(row.get("产业大脑"))
+            industry = normalize_text(row.get("行业"))
+            year = parse_year(row.get("时间"))
+            if not (city and district and brain_name and industry):
+                continue
+            key = (brain_name, city, district)
+            record = brain_records.get(key)
+            if record is None:
+                record = BrainRecord(
+                    brain_name=brain_name,
+                    city=city,
+                    district=district,
+                    year=year,
+                    industry_name=industry,
+                    sources={"qingdao"},
+                )
+                brain_records[key] = record
+            else:
+                record.sources.add("qingdao")
+                if record.year is None and year is not None:
+                    record.year = year
+
+            leader_name = normalize_text(row.get("链主企业"))
+            if leader_name and not is_placeholder_leader(leader_name):
+                record.chain_leaders.add(leader_name)
+                leader = leader_records.get(leader_name)
+                if leader is None:
+                    leader = LeaderRecord(name=leader_name, sources={"qingdao"})
+                    leader_records[leader_name] = leader
+                leader.cities.add(city)
+                leader.districts.add(district)
+                leader.industries.add(industry)
+                leader.brains.add(brain_name)
+                remark = normalize_text(row.get("备注"))
+                if remark:
+                    leader.statuses.add(remark)
     return list(brain_records.values()), leader_records
 
 
-def merge_brain_records(baseline: Iterable[BrainRecord], qingdao: Iterable[BrainRecord]) -> Dict[Tuple[str, str, str], BrainRecord]:
+def merge_brain_records(*groups: Iterable[BrainRecord]) -> Dict[Tuple[str, str, str], BrainRecord]:
+    """Merge brains by (name, city, district); earlier groups win on conflicting fields."""
     merged: Dict[Tuple[str, str, str], BrainRecord] = {}
-    for record in baseline:
-        key = (record.brain_name, record.city, record.district)
-        merged[key] = record
-    for record in qingdao:
-        key = (record.brain_name, record.city, record.district)
-        existing = merged.get(key)
-        if existing is None:
-            merged[key] = record
-        else:
-            existing.sources.update(record.sources)
-            existing.chain_leaders.update(record.chain_leaders)
-            if existing.year is None and record.year is not None:
-                existing.year = record.year
-            if not existing.industry_name and record.industry_name:
-                existing.industry_name = record.industry_name
+    for group in groups:
+        for record in group:
+            key = (record.brain_name, record.city, record.district)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = record
+            else:
+                existing.sources.update(record.sources)
+                existing.chain_leaders.update(record.chain_leaders)
+                if existing.year is None and record.year is not None:
+                    existing.year = record.year
+                if not existing.industry_name and record.industry_name:
+                    existing.industry_name = record.industry_name
+    return merged
+
+
+def merge_leader_records(*groups: Dict[str, LeaderRecord]) -> Dict[str, LeaderRecord]:
+    merged: Dict[str, LeaderRecord] = {}
+    for group in groups:
+        for name, leader in group.items():
+            existing = merged.get(name)
+            if existing is None:
+                merged[name] = leader
+            else:
+                existing.industries.update(leader.industries)
+                existing.cities.update(leader.cities)
+                existing.districts.update(leader.districts)
+                existing.brains.update(leader.brains)
+                existing.statuses.update(leader.statuses)
+                existing.sources.update(leader.sources)
     return merged
 
 
 # ---------------------------------------------------------------------------
-# Database helpers
+# Source adapters
 # ---------------------------------------------------------------------------
 
+class SourceUnavailable(RuntimeError):
+    """A source file exists but cannot be read in this environment."""
+
+
 @dataclass
-class DatabaseContext:
-    connection: mysql.connector.MySQLConnection
-    area_cache: Dict[Tuple[str, str], int]
-    industry_cache: Dict[str, int]
-    brain_cache: Dict[Tuple[str, int], int]
-    leader_cache: Dict[str, int]
-    relation_cache: Set[Tuple[int, int]]
+class SourceResult:
+    name: str
+    brains: List[BrainRecord] = field(default_factory=list)
+    leaders: Dict[str, LeaderRecord] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class IngestSource:
+    name: str
+    filename: str
+    loader: Callable[["IngestSource", int], SourceResult]
+    city: Optional[str] = None
+
+    @property
+    def path(self) -> Path:
+        return DATA_DIR / self.filename
+
+
+# A table is a list of rows, a row a list of cells, a cell the list of its paragraphs
+Table = List[List[List[str]]]
+
+NAME_SEPARATORS = re.compile(r"[、，,；;/\s]+")
+CHAIN_HEADERS = ("产业链", "名称", "行业", "产业")
+LEADER_HEADER = "链主"
+
+
+def split_names(text: str) -> List[str]:
+    """Split a cell or line into names; a bracketed part ("中国长城 （山东）") stays with its name."""
+    names: List[str] = []
+    for part in NAME_SEPARATORS.split(text):
+        if not part:
+            continue
+        if names and part[0] in "（(":
+            names[-1] += part
+        else:
+            names.append(part)
+    return names
+
+
+def split_chain_line(names: List[str]) -> Tuple[List[str], List[str]]:
+    """Split a "chain name name ..." line into its chains and companies.
+
+    Bare words right after the chain that occur inside a later name on the
+    line are sub-chains, not companies: in "机器人 机床 山东豪迈数控机床有限公司"
+    "机床" is a second chain of 山东豪迈, not a leader of its own.
+    """
+    chains, companies = names[:1], names[1:]
+    while len(companies) > 1 and any(companies[0] in name for name in companies[1:]):
+        chains.append(companies.pop(0))
+    return chains, companies
+
+
+def text_entries(path: Path) -> Iterator[Tuple[Optional[str], str]]:
+    """(chain, names) pairs from a plain-text list.
+
+    The first line is the title. Blocks are separated by blank lines; a block
+    line holding several names starts with its chain ("化工 甲公司 乙公司",
+    see split_chain_line), otherwise the block's first line is the chain heading and the following
+    lines are one company each. Lines in the title block have no chain.
+    """
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+    blocks: List[List[str]] = [[]]
+    for line in lines:
+        if line.strip():
+            blocks[-1].append(line.strip())
+        elif blocks[-1]:
+            blocks.append([])
+    for index, block in enumerate(blocks):
+        chain: Optional[str] = None
+        singles = []
+        for position, line in enumerate(block):
+            if index == 0 and position == 0:
+                continue
+            names = split_names(line)
+            if len(names) > 1:
+                chains, companies = split_chain_line(names)
+                for chain in chains:
+                    yield chain, " ".join(companies)
+            else:
+                singles.append(line)
+        if singles and index > 0:
+            chain, singles = singles[0], singles[1:]
+        for line in singles:
+            yield chain, line
+
+
+def table_entries(tables: Iterable[Table]) -> Iterator[Tuple[Optional[str], str]]:
+    """(chain, names) pairs from tables with a header row naming a chain column and a chain-leader column.
+
+    Rows above the header (titles) are ignored.
+    """
+    for table in tables:
+        leader_column = chain_column = None
+        for row in table:
+            cells = ["".join(cell).strip() for cell in row]
+            if leader_column is None:
+                leader = next((i for i, cell in enumerate(cells) if LEADER_HEADER in cell), None)
+                chain_column = next(
+                    (i for header in CHAIN_HEADERS for i, cell in enumerate(cells) if header in cell and i != leader),
+                    None,
+                )
+                if leader is not None and chain_column is not None:
+                    leader_column = leader
+                continue
+            if leader_column < len(row):
+                yield cells[chain_column] if chain_column < len(cells) else None, "\n".join(row[leader_column])
+
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def docx_tables(path: Path) -> List[Table]:
+    """Tables of a .docx document, read straight from its XML."""
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+
+    def paragraphs(cell) -> List[str]:
+        texts = ["".join(node.text or "" for node in p.iter(f"{WORD_NAMESPACE}t")) for p in cell.iter(f"{WORD_NAMESPACE}p")]
+        return [text.strip() for text in texts if text.strip()]
+
+    return [
+        [[paragraphs(cell) for cell in row.findall(f"{WORD_NAMESPACE}tc")] for row in table.iter(f"{WORD_NAMESPACE}tr")]
+        for table in root.iter(f"{WORD_NAMESPACE}tbl")
+    ]
+
+
+def docx_entries(path: Path) -> Iterator[Tuple[Optional[str], str]]:
+    return table_entries(docx_tables(path))
+
+
+def doc_entries(path: Path) -> Iterator[Tuple[Optional[str], str]]:
+    """Legacy .doc files are converted to .docx with LibreOffice first."""
+    office = shutil.which("soffice") or shutil.which("libreoffice")
+    if office is None:
+        raise SourceUnavailable(f"{path.name}: converting .doc needs LibreOffice (soffice) on PATH")
+    with tempfile.TemporaryDirectory() as workdir:
+        # A private profile lets several workers convert at the same time
+        subprocess.run(
+            [office, f"-env:UserInstallation=file://{workdir}/profile", "--headless",
+             "--convert-to", "docx", "--outdir", workdir, str(path)],
+            check=True, capture_output=True, timeout=300,
+        )
+        return list(docx_entries(Path(workdir) / f"{path.stem}.docx"))
+
+
+def csv_entries(path: Path) -> Iterator[Tuple[Optional[str], str]]:
+    frame = pd.read_csv(path, header=None, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return table_entries([[[[value] for value in row] for row in frame.itertuples(index=False)]])
+
+
+def xlsx_entries(path: Path) -> Iterator[Tuple[Optional[str], str]]:
+    def rows() -> Iterator[List[List[str]]]:
+        for index, frame in enumerate(read_excel_chunks(path)):
+            if index == 0:
+                yield [[str(column)] for column in frame.columns]
+            for row in frame.itertuples(index=False):
+                yield [[] if value is None else [str(value)] for value in row]
+
+    return table_entries([list(rows())])
+
+
+# File suffix -> reader of (chain, names) pairs; register new formats here
+ENTRY_READERS: Dict[str, Callable[[Path], Iterable[Tuple[Optional[str], str]]]] = {
+    ".txt": text_entries,
+    ".csv": csv_entries,
+    ".xlsx": xlsx_entries,
+    ".docx": docx_entries,
+    ".doc": doc_entries,
+}
+
+
+def load_leader_list(source: IngestSource, chunk_size: int = CHUNK_SIZE) -> SourceResult:
+    """A city's chain-leader list in any format of ENTRY_READERS."""
+    reader = ENTRY_READERS.get(source.path.suffix.lower())
+    if reader is None:
+        raise SourceUnavailable(f"{source.filename}: no adapter for {source.path.suffix} files")
+    result = SourceResult(source.name)
+    for chain, names in reader(source.path):
+        chain = normalize_text(chain)
+        for name in split_names(names):
+            if is_placeholder_leader(name):
+                continue
+            leader = result.leaders.setdefault(name, LeaderRecord(name=name))
+            leader.sources.add(source.name)
+            if source.city:
+                leader.cities.add(source.city)
+            if chain:
+                leader.industries.add(chain)
+    return result
+
+
+def load_baseline_source(source: IngestSource, chunk_size: int = CHUNK_SIZE) -> SourceResult:
+    return SourceResult(source.name, brains=load_baseline(source.path, chunk_size))
+
+
+def load_qingdao_source(source: IngestSource, chunk_size: int = CHUNK_SIZE) -> SourceResult:
+    brains, leaders = load_qingdao(source.path, chunk_size)
+    return SourceResult(source.name, brains=brains, leaders=leaders)
+
+
+# Brain sheets first: earlier sources win when merged records disagree
+SOURCES: List[IngestSource] = [
+    IngestSource("baseline", BASELINE_FILE.name, load_baseline_source),
+    IngestSource("qingdao", QINGDAO_FILE.name, load_qingdao_source),
+    IngestSource("zaozhuang", "枣庄高新区链主企业名单.txt", load_leader_list, city="枣庄市"),
+    IngestSource("weifang", "潍坊链主—龙头企业名单.txt", load_leader_list, city="潍坊市"),
+    IngestSource("yantai", "烟台16个重点产业链主要情况.docx", load_leader_list, city="烟台市"),
+    IngestSource("zibo", "3.淄博市19条产业链名单.doc", load_leader_list, city="淄博市"),
+]
+
+
+def run_source(source: IngestSource, chunk_size: int = CHUNK_SIZE) -> SourceResult:
+    return source.loader(source, chunk_size)
+
+
+def ingest_sources(
+    sources: List[IngestSource], workers: int = 0, chunk_size: int = CHUNK_SIZE
+) -> List[SourceResult]:
+    """Parse sources in parallel processes; missing or unreadable files are reported and skipped.
+
+    Results keep the order of ``sources``.
+    """
+    available = []
+    for source in sources:
+        if source.path.exists():
+            available.append(source)
+        else:
+            print(f"Skipped {source.name}: {source.path} not found")
+    workers = workers or min(len(available), os.cpu_count() or 1)
+    if workers <= 1:
+        outcomes = []
+        for source in available:
+            try:
+                outcomes.append(run_source(source, chunk_size))
+            except SourceUnavailable as exc:
+                outcomes.append(exc)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_source, source, chunk_size) for source in available]
+            outcomes = [future.exception() or future.result() for future in futures]
+    results = []
+    for source, outcome in zip(available, outcomes):
+        if isinstance(outcome, SourceUnavailable):
+            print(f"Skipped {source.name}: {outcome}")
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results.append(outcome)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Database helpers
+# ---------------------------------------------------------------------------
+
+BATCH_SIZE = 500
 
 
 def connect_database() -> mysql.connector.MySQLConnection:
@@ -273,101 +599,210 @@ def connect_database() -> mysql.connector.MySQLConnection:
     )
 
 
-def load_caches(cursor) -> Tuple[Dict[Tuple[str, str], int], Dict[str, int], Dict[Tuple[str, int], int], Dict[str, int], Set[Tuple[int, int]]]:
+def fetch_area_ids(cursor) -> Dict[Tuple[str, str], int]:
     cursor.execute("SELECT area_id, city_name, district_name FROM QD_area")
-    area_cache = {(row[1], row[2]): row[0] for row in cursor.fetchall()}
+    return {(row[1], row[2]): row[0] for row in cursor.fetchall()}
 
+
+def fetch_industry_ids(cursor) -> Dict[str, int]:
     cursor.execute("SELECT industry_id, industry_name FROM QD_industry")
-    industry_cache = {row[1]: row[0] for row in cursor.fetchall()}
+    return {row[1]: row[0] for row in cursor.fetchall()}
+
 
+def fetch_brain_ids(cursor) -> Dict[Tuple[str, int], int]:
     cursor.execute("SELECT brain_id, brain_name, area_id FROM QD_industry_brain")
-    brain_cache = {(row[1], row[2]): row[0] for row in cursor.fetchall()}
+    return {(row[1], row[2]): row[0] for row in cursor.fetchall()}
+
 
+def fetch_leader_ids(cursor) -> Dict[str, int]:
     cursor.execute("SELECT enterprise_id, enterprise_name FROM QD_enterprise_chain_leader")
-    leader_cache = {row[1]: row[0] for row in cursor.fetchall()}
+    return {row[1]: row[0] for row in cursor.fetchall()}
 
+
+def fetch_relations(cursor) -> Set[Tuple[int, int]]:
     cursor.execute("SELECT brain_id, industry_id FROM QD_brain_industry_rel")
-    relation_cache = {(row[0], row[1]) for row in cursor.fetchall()}
+    return {(row[0], row[1]) for row in cursor.fetchall()}
 
-    return area_cache, industry_cache, brain_cache, leader_cache, relation_cache
 
+def insert_batches(cursor, sql: str, rows: List[tuple], batch_size: int = BATCH_SIZE) -> int:
+    """Insert rows with one executemany (a multi-row VALUES statement) per batch."""
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(sql, rows[start:start + batch_size])
+    return len(rows)
 
-def get_or_create_area(ctx: DatabaseContext, cursor, city: str, district: str) -> Tuple[int, bool]:
-    key = (city, district)
-    area_id = ctx.area_cache.get(key)
-    if area_id is not None:
-        return area_id, False
-    cursor.execute(
-        "INSERT INTO QD_area (city_name, district_name) VALUES (%s, %s)",
-        (city, district),
-    )
-    area_id = cursor.lastrowid
-    ctx.area_cache[key] = area_id
-    return area_id, True
-
-
-def get_or_create_industry(ctx: DatabaseContext, cursor, industry_name: str) -> Tuple[int, bool]:
-    industry_name = industry_name.strip()
-    industry_id = ctx.industry_cache.get(industry_name)
-    if industry_id is not None:
-        return industry_id, False
-    industry_type = infer_industry_type(industry_name)
-    cursor.execute(
-        "INSERT INTO QD_industry (industry_name, industry_type) VALUES (%s, %s)",
-        (industry_name, industry_type),
-    )
-    industry_id = cursor.lastrowid
-    ctx.industry_cache[industry_name] = industry_id
-    return industry_id, True
 
-
-def get_or_create_brain(ctx: DatabaseContext, cursor, record: BrainRecord, area_id: int) -> Tuple[int, bool]:
-    key = (record.brain_name, area_id)
-    brain_id = ctx.brain_cache.get(key)
-    if brain_id is not None:
-        return brain_id, False
+def brain_remark(record: BrainRecord) -> str:
     remark_parts = [f"来源: {','.join(sorted(record.sources))}"]
     if record.chain_leaders:
         leaders = "、".join(sorted(record.chain_leaders))
         remark_parts.append("链主企业: " + leaders)
-    remark = "；".join(remark_parts)
-    cursor.execute(
-        "INSERT INTO QD_industry_brain (brain_name, area_id, build_year, brain_remark) VALUES (%s, %s, %s, %s)",
-        (record.brain_name, area_id, record.year, remark),
-    )
-    brain_id = cursor.lastrowid
-    ctx.brain_cache[key] = brain_id
-    return brain_id, True
+    return "；".join(remark_parts)
+
+
+def leader_area_key(leader: LeaderRecord) -> Optional[Tuple[str, str]]:
+    primary_city = leader.primary_city()
+    primary_district = leader.primary_district()
+    if primary_city and primary_district:
+        return primary_city, primary_district
+    return None
+
 
+def leader_industry_name(leader: LeaderRecord) -> str:
+    return (leader.primary_industry() or "未分类").strip()
 
-def ensure_brain_industry_relation(ctx: DatabaseContext, cursor, brain_id: int, industry_id: int) -> bool:
-    key = (brain_id, industry_id)
-    if key in ctx.relation_cache:
-        return False
-    cursor.execute(
+
+def fetch_alias_names(cursor) -> Dict[str, str]:
+    """Map every known company alias to its canonical name (empty before the first dedup run)."""
+    try:
+        cursor.execute("SELECT alias_name, canonical_name FROM QD_company_alias")
+    except mysql.connector.Error:
+        return {}
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def fold_leader_records(
+    leaders: Iterable[LeaderRecord],
+    existing_names: Iterable[str],
+    aliases: Optional[Dict[str, str]] = None,
+) -> Tuple[List[LeaderRecord], int]:
+    """Rename incoming leaders that are spelling variants of a known company.
+
+    A name maps to an existing leader when the alias table says so, or when
+    both normalize to the same match key (width, punctuation and legal-form
+    suffix only). Fuzzy look-alikes are never folded here; they go through the
+    review queue of the dedup service. Incoming variants of the same new
+    company collapse onto the cluster's canonical name.
+
+    Returns:
+        (merged leader records, number of incoming names that were renamed)
+    """
+    leaders = list(leaders)
+    aliases = aliases or {}
+    existing = list(dict.fromkeys(existing_names))
+    existing_set = set(existing)
+    targets: Dict[str, str] = {}
+    for leader in leaders:
+        canonical = aliases.get(leader.name)
+        if canonical in existing_set:
+            targets[leader.name] = canonical
+
+    pending = [leader.name for leader in leaders if leader.name not in targets]
+    clusters: Dict[str, List[str]] = {}
+    for match in dedupe_names(existing + pending):
+        clusters.setdefault(match.canonical_name, []).append(match.alias_name)
+    for canonical_name, members in clusters.items():
+        # Prefer the spelling that is already stored so the row is not duplicated
+        target = next((name for name in members if name in existing_set), canonical_name)
+        for name in members:
+            targets.setdefault(name, target)
+
+    folded = 0
+    for leader in leaders:
+        target = targets.get(leader.name, leader.name)
+        if target != leader.name:
+            folded += 1
+            leader.name = target
+    merged = merge_leader_records(*({leader.name: leader} for leader in leaders))
+    return list(merged.values()), folded
+
+
+def import_records(
+    cursor,
+    brains: Iterable[BrainRecord],
+    leaders: Iterable[LeaderRecord],
+    batch_size: int = BATCH_SIZE,
+    fold_aliases: bool = True,
+) -> Dict[str, int]:
+    """Resolve all natural keys in memory and bulk-insert what is missing.
+
+    Dimensions are inserted first (areas, industries), their ids re-read in one
+    query each, then brains, brain-industry relations and chain leaders. Leader
+    names that are known aliases or same-key variants of a stored leader are
+    folded onto it first (fold_aliases=False disables this).
+
+    Returns:
+        Number of new rows per table
+    """
+    brains = list(brains)
+    leaders = list(leaders)
+    counts: Dict[str, int] = {"folded": 0}
+
+    area_ids = fetch_area_ids(cursor)
+    needed_areas = [(record.city, record.district) for record in brains]
+    needed_areas += [key for key in map(leader_area_key, leaders) if key]
+    missing_areas = [key for key in dict.fromkeys(needed_areas) if key not in area_ids]
+    counts["areas"] = insert_batches(
+        cursor, "INSERT INTO QD_area (city_name, district_name) VALUES (%s, %s)", missing_areas, batch_size
+    )
+    if missing_areas:
+        area_ids = fetch_area_ids(cursor)
+
+    industry_ids = fetch_industry_ids(cursor)
+    needed_industries = [record.industry_name.strip() for record in brains]
+    needed_industries += [leader_industry_name(leader) for leader in leaders]
+    missing_industries = [name for name in dict.fromkeys(needed_industries) if name not in industry_ids]
+    counts["industries"] = insert_batches(
+        cursor,
+        "INSERT INTO QD_industry (industry_name, industry_type) VALUES (%s, %s)",
+        [(name, infer_industry_type(name)) for name in missing_industries],
+        batch_size,
+    )
+    if missing_industries:
+        industry_ids = fetch_industry_ids(cursor)
+
+    brain_ids = fetch_brain_ids(cursor)
+    missing_brains = {}
+    for record in brains:
+        key = (record.brain_name, area_ids[(record.city, record.district)])
+        if key not in brain_ids and key not in missing_brains:
+            missing_brains[key] = (record.brain_name, key[1], record.year, brain_remark(record))
+    counts["brains"] = insert_batches(
+        cursor,
+        "INSERT INTO QD_industry_brain (brain_name, area_id, build_year, brain_remark) VALUES (%s, %s, %s, %s)",
+        list(missing_brains.values()),
+        batch_size,
+    )
+    if missing_brains:
+        brain_ids = fetch_brain_ids(cursor)
+
+    relations = fetch_relations(cursor)
+    needed_relations = [
+        (brain_ids[(record.brain_name, area_ids[(record.city, record.district)])],
+         industry_ids[record.industry_name.strip()])
+        for record in brains
+    ]
+    missing_relations = [key for key in dict.fromkeys(needed_relations) if key not in relations]
+    counts["relations"] = insert_batches(
+        cursor,
         "INSERT INTO QD_brain_industry_rel (brain_id, industry_id) VALUES (%s, %s)",
-        (brain_id, industry_id),
+        missing_relations,
+        batch_size,
     )
-    ctx.relation_cache.add(key)
-    return True
-
-
-def get_or_create_leader(ctx: DatabaseContext, cursor, leader: LeaderRecord, area_id: Optional[int], industry_id: Optional[int]) -> Tuple[int, bool]:
-    leader_id = ctx.leader_cache.get(leader.name)
-    if leader_id is not None:
-        return leader_id, False
-    cursor.execute(
-        "INSERT INTO QD_enterprise_chain_leader (enterprise_name, industry_id, area_id, enterprise_remark) VALUES (%s, %s, %s, %s)",
-        (
-            leader.name,
-            industry_id,
-            area_id,
-            leader.remark(),
-        ),
+
+    leader_ids = fetch_leader_ids(cursor)
+    if fold_aliases:
+        leaders, counts["folded"] = fold_leader_records(leaders, leader_ids, fetch_alias_names(cursor))
+    missing_leaders = []
+    for leader in leaders:
+        if leader.name in leader_ids:
+            continue
+        area_key = leader_area_key(leader)
+        missing_leaders.append(
+            (
+                leader.name,
+                industry_ids[leader_industry_name(leader)],
+                area_ids[area_key] if area_key else None,
+                leader.remark(),
+            )
+        )
+    counts["leaders"] = insert_batches(
+        cursor,
+        "INSERT INTO QD_enterprise_chain_leader (enterprise_name, industry_id, area_id, enterprise_remark) "
+        "VALUES (%s, %s, %s, %s)",
+        missing_leaders,
+        batch_size,
     )
-    leader_id = cursor.lastrowid
-    ctx.leader_cache[leader.name] = leader_id
-    return leader_id, True
+    return counts
 
 
 # ---------------------------------------------------------------------------
@@ -375,13 +810,23 @@ def get_or_create_leader(ctx: DatabaseContext, cursor, leader: LeaderRecord, are
 # ---------------------------------------------------------------------------
 
 def main() -> None:
-    print("Loading Excel data...")
-    baseline_records = load_baseline()
-    qingdao_records, leader_records = load_qingdao()
-    merged_brains = merge_brain_records(baseline_records, qingdao_records)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=0, help="parser processes (default: one per source, up to the CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Excel rows read per batch")
+    parser.add_argument(
+        "--no-fold",
+        action="store_true",
+        help="insert leader names as given instead of folding alias/same-key variants onto stored leaders",
+    )
+    args = parser.parse_args()
+
+    print("Loading source files...")
+    results = ingest_sources(SOURCES, args.workers, args.chunk_size)
+    for result in results:
+        print(f"{result.name}: {len(result.brains)} brains, {len(result.leaders)} leaders")
+    merged_brains = merge_brain_records(*(result.brains for result in results))
+    leader_records = merge_leader_records(*(result.leaders for result in results))
 
-    print(f"Baseline brains: {len(baseline_records)}")
-    print(f"Qingdao brains: {len(qingdao_records)}")
     print(f"Merged brains: {len(merged_brains)}")
     print(f"Leader records: {len(leader_records)}")
 
@@ -389,48 +834,18 @@ def main() -> None:
     connection.autocommit = False
     cursor = connection.cursor()
     try:
-        area_cache, industry_cache, brain_cache, leader_cache, relation_cache = load_caches(cursor)
-        ctx = DatabaseContext(connection, area_cache, industry_cache, brain_cache, leader_cache, relation_cache)
-
-        new_areas = new_industries = new_brains = new_relations = new_leaders = 0
-
-        for record in merged_brains.values():
-            area_id, created_area = get_or_create_area(ctx, cursor, record.city, record.district)
-            if created_area:
-                new_areas += 1
-            industry_id, created_industry = get_or_create_industry(ctx, cursor, record.industry_name)
-            if created_industry:
-                new_industries += 1
-            brain_id, created_brain = get_or_create_brain(ctx, cursor, record, area_id)
-            if created_brain:
-                new_brains += 1
-            if ensure_brain_industry_relation(ctx, cursor, brain_id, industry_id):
-                new_relations += 1
-
-        for leader in leader_records.values():
-            primary_city = leader.primary_city()
-            primary_district = leader.primary_district()
-            area_id = None
-            if primary_city and primary_district:
-                area_id, created_area = get_or_create_area(ctx, cursor, primary_city, primary_district)
-                if created_area:
-                    new_areas += 1
-            industry_name = leader.primary_industry() or "未分类"
-            industry_id, created_industry = get_or_create_industry(ctx, cursor, industry_name)
-            if created_industry:
-                new_industries += 1
-            _, created_leader = get_or_create_leader(ctx, cursor, leader, area_id, industry_id)
-            if created_leader:
-                new_leaders += 1
-
+        counts = import_records(
+            cursor, merged_brains.values(), leader_records.values(), fold_aliases=not args.no_fold
+        )
         connection.commit()
 
         print("Import completed")
-        print(f"New areas inserted: {new_areas}")
-        print(f"New industries inserted: {new_industries}")
-        print(f"New brains inserted: {new_brains}")
-        print(f"New brain-industry relations inserted: {new_relations}")
-        print(f"New chain leaders inserted: {new_leaders}")
+        print(f"New areas inserted: {counts['areas']}")
+        print(f"New industries inserted: {counts['industries']}")
+        print(f"New brains inserted: {counts['brains']}")
+        print(f"New brain-industry relations inserted: {counts['relations']}")
+        print(f"Leader name variants folded: {counts['folded']}")
+        print(f"New chain leaders inserted: {counts['leaders']}")
     except Exception:
         connection.rollback()
         raise
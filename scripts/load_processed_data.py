@@ -1,17 +1,38 @@
-"""Load processed CSVs into the staging schema defined in scripts/staging_schema.sql."""
+"""Load processed CSVs into the staging schema defined in scripts/staging_schema.sql.
+
+The default bulk mode streams each CSV through PostgreSQL COPY in batches and
+loads tables without foreign keys between them in parallel; ``--mode insert``
+keeps the portable ``DataFrame.to_sql`` path.
+
+``--incremental`` skips the truncate: CSVs whose checksum matches the import
+manifest are skipped, and for the rest only rows whose content hash changed
+are upserted while rows that disappeared are soft-deleted (``deleted_at``).
+
+When ``prepare_data_for_import.py --parquet`` produced typed Parquet files
+they are read instead of the CSVs (memory-mapped, in row-group batches), so
+numeric, boolean and timestamp columns and the row hash need no re-parsing.
+"""
 from __future__ import annotations
 
+import argparse
+import importlib.util
+import io
 import os
 import sys
-from decimal import Decimal
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import create_engine, text
 
+from prepare_data_for_import import file_fingerprint, hash_columns
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 PROCESSED_DIR = BASE_DIR / "data" / "processed"
+CHUNK_SIZE = 50000
 
 Converter = Callable[[pd.Series], pd.Series]
 
@@ -21,21 +42,15 @@ def ensure_inputs() -> None:
         raise FileNotFoundError(f"Processed directory not found: {PROCESSED_DIR}")
 
 
+BOOL_VALUES = {
+    **{value: True for value in ("true", "1", "t", "yes", "y")},
+    **{value: False for value in ("false", "0", "f", "no", "n")},
+}
+
+
 def to_bool(series: pd.Series) -> pd.Series:
-    truthy = {"true", "1", "t", "yes", "y"}
-    falsy = {"false", "0", "f", "no", "n"}
-    def convert(value: object) -> object:
-        if pd.isna(value):
-            return None
-        if isinstance(value, bool):
-            return value
-        text = str(value).strip().lower()
-        if text in truthy:
-            return True
-        if text in falsy:
-            return False
-        return None
-    return series.apply(convert)
+    result = series.astype(str).str.strip().str.lower().map(BOOL_VALUES)
+    return result.astype(object).where(result.notna() & series.notna(), None)
 
 
 def to_int(series: pd.Series) -> pd.Series:
@@ -43,17 +58,10 @@ def to_int(series: pd.Series) -> pd.Series:
 
 
 def to_decimal_series(series: pd.Series) -> pd.Series:
-    def convert(value: object) -> object:
-        if pd.isna(value):
-            return None
-        text = str(value).strip()
-        if not text:
-            return None
-        try:
-            return Decimal(text)
-        except Exception:  # noqa: BLE001
-            return None
-    return series.apply(convert)
+    """Keep the exact decimal text of finite numbers so NUMERIC columns get no float rounding."""
+    text = series.astype(str).str.strip()
+    numbers = pd.to_numeric(text.where(series.notna()), errors="coerce")
+    return text.where(np.isfinite(numbers.to_numpy(dtype=float)), None).astype(object)
 
 
 def to_timestamp(series: pd.Series) -> pd.Series:
@@ -141,6 +149,50 @@ LOAD_CONFIG: List[Tuple[str, str, Dict[str, Converter]]] = [
 ]
 
 
+# Child table -> parent table it references; parents are loaded first
+LOAD_DEPENDENCIES: Dict[str, str] = {
+    "aishu_customer_business_types": "aishu_customers",
+    "aishu_opportunity_budgets": "aishu_opportunities",
+    "ipg_opportunity_statuses": "ipg_opportunities",
+    "ipg_opportunity_ipg_points": "ipg_opportunities",
+    "order_categories": "orders",
+}
+
+
+# Natural key of each table used to diff incoming rows (primary key without ingested_at)
+CDC_KEYS: Dict[str, Tuple[str, ...]] = {
+    "aishu_customers": ("customer_id",),
+    "aishu_customer_business_types": ("customer_id", "business_type"),
+    "ipg_customers": ("customer_id",),
+    "aishu_opportunities": ("opportunity_id",),
+    "aishu_opportunity_budgets": ("opportunity_id", "budget_amount"),
+    "ipg_opportunities": ("opportunity_id",),
+    "ipg_opportunity_statuses": ("opportunity_id", "status"),
+    "ipg_opportunity_ipg_points": ("opportunity_id", "ipg_point"),
+    "orders": ("order_id",),
+    "order_categories": ("order_id", "category"),
+}
+
+# Tables whose primary key includes ingested_at need a unique index on the natural key for upserts
+CDC_KEY_INDEX_TABLES = (
+    "aishu_opportunity_budgets",
+    "ipg_opportunity_statuses",
+    "ipg_opportunity_ipg_points",
+    "order_categories",
+)
+
+MANIFEST_DDL = """
+CREATE TABLE IF NOT EXISTS staging.import_manifest (
+    source_file TEXT PRIMARY KEY,
+    mtime DOUBLE PRECISION NOT NULL,
+    size BIGINT NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    row_count BIGINT,
+    imported_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+
 TRUNCATE_ORDER = [
     "order_categories",
     "orders",
@@ -158,44 +210,368 @@ TRUNCATE_ORDER = [
 def normalize_empty_strings(df: pd.DataFrame) -> pd.DataFrame:
     for column in df.columns:
         if df[column].dtype == object:
-            df[column] = df[column].apply(
-                lambda value: value.strip() if isinstance(value, str) else value
-            )
-            df[column] = df[column].replace({"": None, "nan": None, "NaN": None})
+            stripped = df[column].str.strip()
+            df[column] = stripped.where(~stripped.isin(["", "nan", "NaN"]), None)
     return df
 
 
-def load_dataframe(engine, table: str, csv_name: str, conversions: Dict[str, Converter]) -> None:
-    path = PROCESSED_DIR / csv_name
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def resolve_source(csv_name: str, input_format: str = "auto") -> Path:
+    """Processed file to load: the Parquet copy when requested, or in auto mode when it is current."""
+    csv_path = PROCESSED_DIR / csv_name
+    parquet_path = csv_path.with_suffix(".parquet")
+    if input_format == "parquet":
+        path = parquet_path
+    elif input_format == "csv":
+        path = csv_path
+    else:
+        current = parquet_path.exists() and (
+            not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+        )
+        path = parquet_path if current and parquet_available() else csv_path
     if not path.exists():
         raise FileNotFoundError(f"Missing processed file: {path}")
-    df = pd.read_csv(path, dtype=str, keep_default_na=False)
-    df = normalize_empty_strings(df)
-    for column, converter in conversions.items():
-        if column in df.columns:
-            df[column] = converter(df[column])
-    df.to_sql(table, engine, schema="staging", if_exists="append", index=False, method="multi")
+    return path
+
+
+def iter_parquet_chunks(
+    path: Path, conversions: Dict[str, Converter], chunk_size: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Stream a typed Parquet file; only its string columns still go through ``conversions``."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path, memory_map=True)
+    typed = {field.name for field in parquet.schema_arrow if not pa.types.is_string(field.type)}
+    for batch in parquet.iter_batches(batch_size=chunk_size):
+        # Nullable integers stay integers instead of becoming floats
+        df = batch.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        for column, converter in conversions.items():
+            if column in df.columns and column not in typed:
+                df[column] = converter(df[column])
+        yield df
+
+
+def iter_converted_chunks(
+    path: Path, conversions: Dict[str, Converter], chunk_size: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        yield from iter_parquet_chunks(path, conversions, chunk_size)
+        return
+    for df in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size):
+        df = normalize_empty_strings(df)
+        # Content hash of the row as prepared; ingested_at changes on every run and is excluded
+        df["row_hash"] = hash_columns(df, [column for column in df.columns if column != "ingested_at"])
+        for column, converter in conversions.items():
+            if column in df.columns:
+                df[column] = converter(df[column])
+        yield df
+
+
+def load_dataframe(
+    engine, table: str, path: Path, conversions: Dict[str, Converter], chunk_size: int = CHUNK_SIZE
+) -> Dict[str, int]:
+    rows = 0
+    for df in iter_converted_chunks(path, conversions, chunk_size):
+        df.to_sql(table, engine, schema="staging", if_exists="append", index=False, method="multi")
+        rows += len(df)
+    return {"rows": rows}
+
+
+def copy_frame(cursor, table: str, df: pd.DataFrame) -> None:
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    columns = ", ".join(f'"{column}"' for column in df.columns)
+    cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def read_manifest(cursor, source_file: str) -> Optional[Dict[str, object]]:
+    cursor.execute(
+        "SELECT mtime, size, checksum FROM staging.import_manifest WHERE source_file = %s", (source_file,)
+    )
+    row = cursor.fetchone()
+    return {"mtime": row[0], "size": row[1], "sha256": row[2]} if row else None
+
+
+def record_manifest(cursor, source_file: str, fingerprint: Dict[str, object], row_count: Optional[int]) -> None:
+    cursor.execute(
+        """
+        INSERT INTO staging.import_manifest (source_file, mtime, size, checksum, row_count, imported_at)
+        VALUES (%s, %s, %s, %s, %s, now())
+        ON CONFLICT (source_file) DO UPDATE SET
+            mtime = EXCLUDED.mtime, size = EXCLUDED.size, checksum = EXCLUDED.checksum,
+            row_count = COALESCE(EXCLUDED.row_count, staging.import_manifest.row_count),
+            imported_at = EXCLUDED.imported_at
+        """,
+        (source_file, fingerprint["mtime"], fingerprint["size"], fingerprint["sha256"], row_count),
+    )
+
+
+def copy_dataframe(
+    engine, table: str, path: Path, conversions: Dict[str, Converter], chunk_size: int = CHUNK_SIZE
+) -> Dict[str, int]:
+    """Stream a processed file into staging through COPY FROM STDIN, one transaction per table."""
+    fingerprint = file_fingerprint(path)
+    connection = engine.raw_connection()
+    rows = 0
+    try:
+        cursor = connection.cursor()
+        for df in iter_converted_chunks(path, conversions, chunk_size):
+            copy_frame(cursor, f"staging.{table}", df)
+            rows += len(df)
+        record_manifest(cursor, path.name, fingerprint, rows)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return {"rows": rows}
+
+
+def key_index(df: pd.DataFrame, keys: Tuple[str, ...]) -> pd.Index:
+    if len(keys) == 1:
+        return pd.Index(df[keys[0]].astype(str))
+    return pd.MultiIndex.from_frame(df[list(keys)].astype(str))
+
+
+def diff_chunk(
+    existing: pd.DataFrame, existing_index: pd.Index, df: pd.DataFrame, keys: Tuple[str, ...]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Match a batch against stored rows by key.
+
+    Returns (positions of matched stored rows or -1, new-row mask, changed-row mask);
+    a soft-deleted row that reappears counts as changed.
+    """
+    positions = existing_index.get_indexer(key_index(df, keys))
+    known = positions >= 0
+    changed = np.zeros(len(df), dtype=bool)
+    matched = positions[known]
+    changed[known] = (
+        existing["row_hash"].to_numpy()[matched] != df["row_hash"].to_numpy()[known]
+    ) | existing["deleted"].to_numpy(dtype=bool)[matched]
+    return positions, ~known, changed
+
+
+def incremental_dataframe(
+    engine, table: str, path: Path, conversions: Dict[str, Converter], chunk_size: int = CHUNK_SIZE
+) -> Dict[str, int]:
+    """Apply only the inserts, updates and soft-deletes between a processed file and its staging table.
+
+    Changed rows are staged in a temporary table and upserted with one
+    INSERT ... ON CONFLICT; rows no longer present get ``deleted_at`` set.
+    Only row-level locks are taken.
+    """
+    keys = CDC_KEYS[table]
+    counts = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        previous = read_manifest(cursor, path.name)
+        fingerprint = file_fingerprint(path, previous)
+        if previous and fingerprint["sha256"] == previous["sha256"]:
+            if fingerprint["mtime"] != previous["mtime"]:
+                record_manifest(cursor, path.name, fingerprint, None)
+            connection.commit()
+            counts["skipped"] = 1
+            return counts
+
+        key_columns = ", ".join(f"{key}::text" for key in keys)
+        cursor.execute(f"SELECT {key_columns}, row_hash, deleted_at IS NOT NULL FROM staging.{table}")
+        existing = pd.DataFrame(cursor.fetchall(), columns=[*keys, "row_hash", "deleted"])
+        existing_index = key_index(existing, keys)
+        seen = np.zeros(len(existing), dtype=bool)
+
+        cursor.execute(f"CREATE TEMP TABLE cdc_incoming (LIKE staging.{table}) ON COMMIT DROP")
+        columns: List[str] = []
+        for df in iter_converted_chunks(path, conversions, chunk_size):
+            columns = list(df.columns)
+            positions, new, changed = diff_chunk(existing, existing_index, df, keys)
+            seen[positions[positions >= 0]] = True
+            counts["rows"] += len(df)
+            counts["inserted"] += int(new.sum())
+            counts["updated"] += int(changed.sum())
+            counts["unchanged"] += int((~new & ~changed).sum())
+            if (new | changed).any():
+                copy_frame(cursor, "cdc_incoming", df[new | changed])
+
+        key_list = ", ".join(keys)
+        if columns and counts["inserted"] + counts["updated"]:
+            column_list = ", ".join(columns)
+            updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column not in keys)
+            cursor.execute(
+                f"""
+                INSERT INTO staging.{table} ({column_list})
+                SELECT DISTINCT ON ({key_list}) {column_list} FROM cdc_incoming ORDER BY {key_list}
+                ON CONFLICT ({key_list}) DO UPDATE SET {updates}, deleted_at = NULL
+                """
+            )
+
+        gone = existing.loc[~seen & ~existing["deleted"].to_numpy(dtype=bool), list(keys)]
+        if not gone.empty:
+            cursor.execute(
+                f"CREATE TEMP TABLE cdc_gone ON COMMIT DROP AS SELECT {key_list} FROM staging.{table} WITH NO DATA"
+            )
+            copy_frame(cursor, "cdc_gone", gone)
+            match = " AND ".join(f"t.{key} = g.{key}" for key in keys)
+            cursor.execute(
+                f"UPDATE staging.{table} AS t SET deleted_at = now() FROM cdc_gone AS g "
+                f"WHERE {match} AND t.deleted_at IS NULL"
+            )
+            counts["deleted"] = cursor.rowcount
+
+        record_manifest(cursor, path.name, fingerprint, counts["rows"])
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return counts
+
+
+def ensure_cdc_schema(engine) -> None:
+    """Add the row_hash/deleted_at columns, natural-key indexes and manifest table when missing.
+
+    Existing objects are checked first so a routine run takes no ALTER TABLE locks.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(MANIFEST_DDL))
+        present = {
+            (row[0], row[1])
+            for row in conn.execute(
+                text(
+                    "SELECT table_name, column_name FROM information_schema.columns "
+                    "WHERE table_schema = 'staging' AND column_name IN ('row_hash', 'deleted_at')"
+                )
+            )
+        }
+        indexes = {
+            row[0]
+            for row in conn.execute(text("SELECT indexname FROM pg_indexes WHERE schemaname = 'staging'"))
+        }
+        for table, keys in CDC_KEYS.items():
+            if (table, "row_hash") not in present:
+                conn.execute(text(f"ALTER TABLE staging.{table} ADD COLUMN IF NOT EXISTS row_hash CHAR(32)"))
+            if (table, "deleted_at") not in present:
+                conn.execute(text(f"ALTER TABLE staging.{table} ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ"))
+            if table in CDC_KEY_INDEX_TABLES and f"{table}_cdc_key" not in indexes:
+                conn.execute(
+                    text(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_cdc_key ON staging.{table} ({', '.join(keys)})")
+                )
+
+
+def load_levels() -> List[List[Tuple[str, str, Dict[str, Converter]]]]:
+    """Group LOAD_CONFIG so every table is loaded after the table it references."""
+    levels: List[List[Tuple[str, str, Dict[str, Converter]]]] = []
+    depth: Dict[str, int] = {}
+    for entry in LOAD_CONFIG:
+        table = entry[0]
+        parent = LOAD_DEPENDENCIES.get(table)
+        depth[table] = depth[parent] + 1 if parent else 0
+        while len(levels) <= depth[table]:
+            levels.append([])
+        levels[depth[table]].append(entry)
+    return levels
+
+
+def load_tables(
+    engine, loader: Callable[..., Dict[str, int]], workers: int, chunk_size: int, input_format: str = "auto"
+) -> None:
+    def timed_load(table: str, csv_name: str, converters: Dict[str, Converter]) -> Tuple[Dict[str, int], float]:
+        started = time.perf_counter()
+        result = loader(engine, table, resolve_source(csv_name, input_format), converters, chunk_size)
+        return result, time.perf_counter() - started
+
+    for level in load_levels():
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                pool.submit(timed_load, table, csv_name, converters): table
+                for table, csv_name, converters in level
+            }
+            for future in as_completed(futures):
+                result, elapsed = future.result()
+                table = futures[future]
+                if result.get("skipped"):
+                    print(f"Skipped staging.{table}: unchanged since last import")
+                    continue
+                rows = result["rows"]
+                rate = rows / elapsed if elapsed > 0 else float("inf")
+                details = ", ".join(f"{key} {value}" for key, value in result.items() if key != "rows")
+                suffix = f"; {details}" if details else ""
+                print(f"Loaded staging.{table}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s){suffix}")
 
 
 def truncate_tables(engine) -> None:
     with engine.begin() as conn:
         for table in TRUNCATE_ORDER:
             conn.execute(text(f"TRUNCATE TABLE staging.{table} RESTART IDENTITY CASCADE"))
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("TRUNCATE TABLE staging.import_manifest"))
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode",
+        choices=("bulk", "insert"),
+        default="bulk",
+        help="bulk: COPY (PostgreSQL + psycopg2); insert: DataFrame.to_sql",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="apply only changed rows (PostgreSQL + psycopg2) instead of truncating and reloading",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="tables loaded in parallel")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per batch")
+    parser.add_argument(
+        "--input-format",
+        choices=("auto", "csv", "parquet"),
+        default="auto",
+        help="auto: the Parquet file when it is at least as new as the CSV and pyarrow is installed",
+    )
+    args = parser.parse_args()
+
     ensure_inputs()
+    if args.input_format == "parquet" and not parquet_available():
+        print("--input-format parquet needs pyarrow.", file=sys.stderr)
+        sys.exit(1)
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         print("DATABASE_URL is not set. Export it before running this script.", file=sys.stderr)
         sys.exit(1)
 
     engine = create_engine(database_url)
-    truncate_tables(engine)
+    has_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+    if engine.dialect.name == "postgresql":
+        ensure_cdc_schema(engine)
+
+    if args.incremental:
+        if not has_copy:
+            print("Incremental mode needs postgresql+psycopg2.", file=sys.stderr)
+            sys.exit(1)
+        loader = incremental_dataframe
+    else:
+        loader = load_dataframe
+        if args.mode == "bulk":
+            if has_copy:
+                loader = copy_dataframe
+            else:
+                print(
+                    f"Bulk mode needs postgresql+psycopg2, got {engine.dialect.name}+{engine.dialect.driver}; "
+                    "falling back to insert mode.",
+                    file=sys.stderr,
+                )
+        truncate_tables(engine)
 
-    for table, csv_name, converters in LOAD_CONFIG:
-        load_dataframe(engine, table, csv_name, converters)
-        print(f"Loaded staging.{table}")
+    started = time.perf_counter()
+    load_tables(engine, loader, args.workers, args.chunk_size, args.input_format)
+    print(f"Staging reload finished in {time.perf_counter() - started:.2f}s")
 
 
 if __name__ == "__main__":
@@ -1,19 +1,38 @@
-"""Normalize Excel data for database import."""
+"""Normalize Excel data for database import.
+
+Workbooks are streamed in fixed-size row batches and every output CSV is
+appended batch by batch, so memory stays flat regardless of file size.
+``--parquet`` additionally writes a typed Parquet copy of every output.
+"""
 from __future__ import annotations
 
+import argparse
 import hashlib
-import re
+import json
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 OUTPUT_DIR = DATA_DIR / "processed"
+CHUNK_SIZE = 5000
+MANIFEST_NAME = "import_manifest.json"
+
+# Strings pandas.read_excel treats as missing by default
+EXCEL_NA_VALUES = frozenset(
+    {
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+        "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+        "n/a", "nan", "null",
+    }
+)
 
 
 def clean_text(value: object) -> Optional[str]:
@@ -24,32 +43,174 @@ def clean_text(value: object) -> Optional[str]:
     return text or None
 
 
-def normalize_phone(value: object) -> Optional[str]:
-    text = clean_text(value)
-    if not text:
-        return None
-    primary_matches = re.findall(r"(?:\d{2,}(?:[-]\d+)*)", text)
-    fallback_matches = re.findall(r"\d+", text) if not primary_matches else []
-    candidates = primary_matches or fallback_matches
-    combined: List[str] = []
-    for match in candidates:
-        digits = re.sub(r"[^0-9+]", "", match)
-        digits = digits.replace("-", "").replace("—", "").replace("–", "")
-        if not digits:
-            continue
-        if combined and len(digits) <= 3 and len(combined[-1]) >= 7:
-            combined[-1] = combined[-1] + digits
-        else:
-            combined.append(digits)
-    if not combined:
-        return None
-    unique_numbers = list(dict.fromkeys(combined))
-    return "|".join(unique_numbers)
+PHONE_PATTERN = r"(?:\d{2,}(?:[-]\d+)*)"
 
 
-def generate_md5(*parts: object) -> str:
-    joined = "|".join(clean_text(p) or "" for p in parts)
-    return hashlib.md5(joined.encode("utf-8")).hexdigest()
+def _convert_cell(cell) -> object:
+    """Convert an openpyxl cell the way pandas.read_excel does."""
+    value = cell.value
+    if value is None or cell.data_type == "e":
+        return None
+    if cell.data_type == "n" and not isinstance(value, bool) and value == int(value):
+        return int(value)
+    if isinstance(value, str) and value in EXCEL_NA_VALUES:
+        return None
+    return value
+
+
+def _header_names(values: List[object], width: int) -> List[str]:
+    """Column names like pandas: 'Unnamed: i' for blanks, '.N' suffixes for duplicates."""
+    names: List[str] = []
+    counts: Dict[str, int] = {}
+    for index in range(width):
+        value = values[index] if index < len(values) else None
+        name = f"Unnamed: {index}" if value is None else str(value)
+        if name in counts:
+            counts[name] += 1
+            name = f"{name}.{counts[name]}"
+        else:
+            counts[name] = 0
+        names.append(name)
+    return names
+
+
+def _trimmed_len(values: List[object]) -> int:
+    length = len(values)
+    while length and values[length - 1] is None:
+        length -= 1
+    return length
+
+
+def read_excel_chunks(
+    source: Union[str, Path],
+    chunk_size: int = CHUNK_SIZE,
+    sheet_name: Optional[str] = None,
+    header: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """Stream a worksheet as DataFrames of at most ``chunk_size`` rows.
+
+    Uses openpyxl's read-only mode so only the current batch is held in
+    memory. Cells are converted like pandas.read_excel (integral numbers as
+    int, error cells and default NA strings as missing) but columns keep
+    object dtype, so values never depend on what other batches contain.
+    Interior blank rows are kept and trailing ones dropped, as in pandas.
+    The column count is fixed by the header row and the first batch; cells
+    beyond it are ignored. At least one (possibly empty) frame is yielded.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook[sheet_name] if sheet_name is not None else workbook.worksheets[0]
+        sheet.reset_dimensions()
+        rows = sheet.rows
+        for _ in range(header):
+            next(rows, None)
+        header_values = [_convert_cell(cell) for cell in next(rows, ())]
+        columns: Optional[List[str]] = None
+        batch: List[List[object]] = []
+        blank_rows: List[List[object]] = []
+        emitted = False
+
+        def to_frame(records: List[List[object]]) -> pd.DataFrame:
+            nonlocal columns
+            if columns is None:
+                width = max([len(record) for record in records] + [_trimmed_len(header_values)])
+                columns = _header_names(header_values, width)
+            width = len(columns)
+            padded = [record[:width] + [None] * (width - len(record)) for record in records]
+            return pd.DataFrame(padded, columns=columns, dtype=object)
+
+        for row in rows:
+            values = [_convert_cell(cell) for cell in row]
+            values = values[: _trimmed_len(values)]
+            if not values:
+                blank_rows.append(values)
+                continue
+            batch.extend(blank_rows)
+            blank_rows = []
+            batch.append(values)
+            if len(batch) >= chunk_size:
+                yield to_frame(batch)
+                batch = []
+                emitted = True
+        if batch or not emitted:
+            yield to_frame(batch)
+    finally:
+        workbook.close()
+
+
+def clean_text_column(series: pd.Series) -> pd.Series:
+    """Column-wise clean_text: stripped strings, None for blanks and NaN."""
+    text = series.astype(str).str.strip()
+    return text.where(series.notna() & text.ne(""), None).astype(object)
+
+
+def join_groups(keys: pd.Series, values: pd.Series, sep: str) -> pd.Series:
+    """Join string values per key in order of appearance, indexed by key.
+
+    Values are spread into one column per position and concatenated column by
+    column, avoiding a Python-level call per group.
+    """
+    frame = pd.DataFrame(
+        {
+            "key": np.asarray(keys),
+            "position": values.groupby(np.asarray(keys)).cumcount().to_numpy(),
+            "value": values.to_numpy(),
+        }
+    )
+    if frame.empty:
+        return pd.Series(dtype=object)
+    wide = frame.pivot(index="key", columns="position", values="value")
+    joined = wide[0]
+    for position in wide.columns[1:]:
+        part = wide[position]
+        joined = joined.where(part.isna(), joined + sep + part)
+    return joined
+
+
+def normalize_phone_column(series: pd.Series) -> pd.Series:
+    """Extract phone numbers per cell and join the unique ones with '|'.
+
+    Short fragments (<= 3 digits) following a full number (>= 7 digits) are
+    treated as extensions and appended to it.
+    """
+    text = clean_text_column(series).reset_index(drop=True).dropna()
+    primary = text.str.findall(PHONE_PATTERN)
+    matches = primary.where(primary.str.len() > 0, text.str.findall(r"\d+"))
+    segments = matches.explode().dropna().str.replace(r"[^0-9+]", "", regex=True)
+    segments = segments[segments.ne("")]
+
+    frame = pd.DataFrame({"row": segments.index, "digits": segments.to_numpy()})
+    short = frame["digits"].str.len().le(3)
+    first = frame["row"].ne(frame["row"].shift())
+    block = (~short | first).cumsum()
+    head_is_full = frame.groupby(block)["digits"].transform("first").str.len().ge(7)
+    attach = short & ~first & head_is_full
+    number_id = (~attach).cumsum()
+    numbers = pd.DataFrame(
+        {
+            "row": frame["row"].groupby(number_id).first(),
+            "digits": join_groups(number_id, frame["digits"], ""),
+        }
+    ).drop_duplicates()
+    joined = join_groups(numbers["row"], numbers["digits"], "|")
+
+    result = pd.Series(None, index=range(len(series)), dtype=object)
+    result[joined.index] = joined.to_numpy()
+    result.index = series.index
+    return result
+
+
+def hash_columns(frame: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """MD5 over the '|'-joined cleaned values of ``columns`` for every row."""
+    joined = clean_text_column(frame[columns[0]]).fillna("")
+    for column in columns[1:]:
+        joined = joined.str.cat(clean_text_column(frame[column]).fillna(""), sep="|")
+    return pd.Series(
+        [hashlib.md5(value.encode("utf-8")).hexdigest() for value in joined],
+        index=frame.index,
+    )
 
 
 def to_decimal(value: object) -> Optional[Decimal]:
@@ -62,37 +223,52 @@ def to_decimal(value: object) -> Optional[Decimal]:
         return None
 
 
-def to_int(value: object) -> Optional[int]:
-    decimal_value = to_decimal(value)
-    if decimal_value is None:
-        return None
-    try:
-        return int(decimal_value)
-    except (ValueError, OverflowError):
-        return None
+def to_int_column(series: pd.Series) -> pd.Series:
+    """Column-wise integer parsing (truncating), <NA> for invalid values."""
+    numbers = pd.to_numeric(clean_text_column(series), errors="coerce")
+    return np.trunc(numbers.where(np.isfinite(numbers))).astype("Int64")
 
 
-def parse_decimal_list(value: object) -> List[Decimal]:
-    text = clean_text(value)
-    if not text:
-        return []
-    parts: Iterable[str] = (segment.strip() for segment in text.split(","))
-    decimals: List[Decimal] = []
-    for part in parts:
-        if not part:
-            continue
-        decimal_value = to_decimal(part)
-        if decimal_value is None:
-            continue
-        decimals.append(decimal_value)
-    return decimals
-
-
-def split_multi_values(value: object) -> List[str]:
-    text = clean_text(value)
-    if not text:
-        return []
-    return [segment.strip() for segment in text.split(",") if segment.strip()]
+def format_decimal_column(series: pd.Series) -> pd.Series:
+    """Parse decimals and format them with two decimals, None when invalid."""
+    amounts = clean_text_column(series).map(to_decimal, na_action="ignore")
+    return amounts.map("{:.2f}".format, na_action="ignore").astype(object)
+
+
+def explode_multi_values(
+    keys: pd.Series, values: pd.Series, key_name: str, value_name: str, ingested_at: str
+) -> pd.DataFrame:
+    """Split comma separated cells into one child row per value."""
+    parts = clean_text_column(values).str.split(",").explode().str.strip()
+    parts = parts[parts.notna() & parts.ne("")]
+    return pd.DataFrame(
+        {
+            key_name: keys.loc[parts.index].to_numpy(),
+            value_name: parts.to_numpy(),
+            "ingested_at": ingested_at,
+        }
+    )
+
+
+def explode_decimal_list(
+    keys: pd.Series, values: pd.Series, key_name: str, value_name: str, ingested_at: str
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """Split comma separated amounts into child rows and per-row totals.
+
+    Returns the child frame and the formatted total for every row (NaN when a
+    cell holds no valid amount).
+    """
+    parts = clean_text_column(values).str.split(",").explode()
+    amounts = parts.map(to_decimal, na_action="ignore").dropna()
+    children = pd.DataFrame(
+        {
+            key_name: keys.loc[amounts.index].to_numpy(),
+            value_name: amounts.map("{:.2f}".format).to_numpy(),
+            "ingested_at": ingested_at,
+        }
+    )
+    totals = amounts.groupby(level=0).sum().map("{:.2f}".format)
+    return children, totals.reindex(values.index)
 
 
 @dataclass
@@ -101,28 +277,165 @@ class ExportedFrame:
     frame: pd.DataFrame
 
 
+# Arrow type of each typed output column in the Parquet intermediate; all other columns are strings
+PARQUET_COLUMN_TYPES: Dict[str, str] = {
+    "is_serviced": "bool",
+    "users_purchased": "int",
+    "budget_total": "decimal",
+    "budget_amount": "decimal",
+    "ipg_point_total": "decimal",
+    "ipg_point": "decimal",
+    "order_amount": "decimal",
+    "ingested_at": "timestamp",
+}
+
+
+def to_arrow_table(frame: pd.DataFrame):
+    """Typed Arrow table of an exported frame plus its content hash (``row_hash``, as the loader computes it)."""
+    import pyarrow as pa
+
+    arrow_types = {
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "decimal": pa.decimal128(18, 2),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    arrays = []
+    fields = []
+    for column in frame.columns:
+        kind = PARQUET_COLUMN_TYPES.get(column, "string")
+        values = frame[column]
+        if kind == "bool":
+            values = values.astype(object).where(values.notna(), None)
+        elif kind == "int":
+            values = pd.to_numeric(values, errors="coerce").astype("Int64")
+        elif kind == "decimal":
+            values = clean_text_column(values).map(Decimal, na_action="ignore")
+        elif kind == "timestamp":
+            values = pd.to_datetime(values, utc=True)
+        else:
+            values = clean_text_column(values)
+        arrays.append(pa.array(values, type=arrow_types[kind], from_pandas=True))
+        fields.append(pa.field(column, arrow_types[kind]))
+    hashed = [column for column in frame.columns if column != "ingested_at"]
+    arrays.append(pa.array(hash_columns(frame, hashed) if len(frame) else [], type=pa.string()))
+    fields.append(pa.field("row_hash", pa.string()))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
 class DataExporter:
-    def __init__(self) -> None:
+    """Append exported frames batch by batch, dropping duplicate rows across batches.
+
+    Duplicates are tracked as 64-bit row hashes, so memory grows by 8 bytes
+    per distinct output row instead of holding the rows themselves. With
+    ``parquet=True`` every output is also written as a typed Parquet file
+    (one row group per batch) next to the CSV.
+    """
+
+    def __init__(self, parquet: bool = False) -> None:
         self.ingested_at = (
             datetime.now(timezone.utc)
             .replace(microsecond=0)
             .isoformat()
             .replace("+00:00", "Z")
         )
+        self.formats: Tuple[str, ...] = ("csv", "parquet") if parquet else ("csv",)
+        self._seen: Dict[str, Set[int]] = {}
+        self._parquet_writers: Dict[str, object] = {}
         OUTPUT_DIR.mkdir(exist_ok=True)
 
+    @property
+    def written(self) -> List[str]:
+        """Names of the outputs written so far in this run."""
+        return list(self._seen)
+
     def export(self, frames: Iterable[ExportedFrame]) -> None:
         for exported in frames:
             path = OUTPUT_DIR / f"{exported.name}.csv"
-            frame = exported.frame.copy()
+            first_batch = exported.name not in self._seen
+            seen = self._seen.setdefault(exported.name, set())
+            frame = exported.frame
             if not frame.empty:
-                frame = frame.drop_duplicates()
-            frame.to_csv(path, index=False)
-
-
-def process_aishu_customers(exporter: DataExporter) -> None:
-    source = DATA_DIR / "爱数客户_去重填充.xlsx"
-    raw = pd.read_excel(source)
+                hashes = pd.util.hash_pandas_object(frame, index=False)
+                keep = ~hashes.duplicated() & ~hashes.isin(seen)
+                frame = frame[keep.to_numpy()]
+                seen.update(hashes[keep].tolist())
+            frame.to_csv(path, mode="w" if first_batch else "a", header=first_batch, index=False)
+            if "parquet" in self.formats:
+                self._write_parquet(exported.name, frame)
+
+    def _write_parquet(self, name: str, frame: pd.DataFrame) -> None:
+        import pyarrow.parquet as pq
+
+        table = to_arrow_table(frame)
+        writer = self._parquet_writers.get(name)
+        if writer is None:
+            writer = pq.ParquetWriter(OUTPUT_DIR / f"{name}.parquet", table.schema, compression="zstd")
+            self._parquet_writers[name] = writer
+        if table.num_rows:
+            writer.write_table(table)
+
+    def close(self) -> None:
+        """Finish the Parquet files (their footer is written on close)."""
+        for writer in self._parquet_writers.values():
+            writer.close()
+        self._parquet_writers.clear()
+
+
+def file_fingerprint(path: Path, previous: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    """mtime, size and SHA-256 of a file; the checksum is reused when mtime and size match ``previous``."""
+    stat = path.stat()
+    if previous and previous.get("mtime") == stat.st_mtime and previous.get("size") == stat.st_size:
+        return dict(previous)
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": digest.hexdigest()}
+
+
+class SourceManifest:
+    """Per-workbook import manifest (mtime + checksum + produced outputs) stored as JSON."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            self.entries: Dict[str, Dict[str, object]] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def unchanged(self, source: Path, formats: Iterable[str] = ("csv",)) -> Optional[Dict[str, object]]:
+        """Return the current fingerprint if the workbook and all its outputs are unchanged, else None."""
+        previous = self.entries.get(source.name)
+        if not previous:
+            return None
+        fingerprint = file_fingerprint(source, previous)
+        if fingerprint["sha256"] != previous.get("sha256"):
+            return None
+        outputs = previous.get("outputs") or []
+        if not all((self.path.parent / f"{name}.{fmt}").exists() for name in outputs for fmt in formats):
+            return None
+        return fingerprint
+
+    def record(self, source: Path, outputs: List[str]) -> None:
+        self.entries[source.name] = {**file_fingerprint(source), "outputs": outputs}
+        self._save()
+
+    def touch(self, source: Path, fingerprint: Dict[str, object]) -> None:
+        """Remember a new mtime for a workbook whose content did not change."""
+        entry = self.entries[source.name]
+        if entry.get("mtime") != fingerprint["mtime"]:
+            entry.update(fingerprint)
+            self._save()
+
+    def _save(self) -> None:
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self.entries, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+
+def prepare_aishu_customers(raw: pd.DataFrame, ingested_at: str) -> List[ExportedFrame]:
     raw = raw.drop(columns=[col for col in raw.columns if col.startswith("Unnamed")])
 
     rename_map = {
@@ -141,64 +454,47 @@ def process_aishu_customers(exporter: DataExporter) -> None:
     df = raw.rename(columns=rename_map)
     for column in df.columns:
         if column not in {"is_serviced", "contact_phone"}:
-            df[column] = df[column].apply(clean_text)
-    df["contact_phone"] = df["contact_phone"].apply(normalize_phone)
+            df[column] = clean_text_column(df[column])
+    df["contact_phone"] = normalize_phone_column(df["contact_phone"])
     df["is_serviced"] = df["is_serviced"].map({"是": True, "否": False})
-    df["customer_id"] = df.apply(
-        lambda row: generate_md5(row["customer_name"], row["region"]), axis=1
-    )
+    df["customer_id"] = hash_columns(df, ["customer_name", "region"])
     df["source_system"] = "AISHU"
-    df["ingested_at"] = exporter.ingested_at
-
-    business_types = []
-    for _, row in df.iterrows():
-        customer_id = row["customer_id"]
-        for entry in split_multi_values(row.get("business_type_raw")):
-            business_types.append(
-                {
-                    "customer_id": customer_id,
-                    "business_type": entry,
-                    "ingested_at": exporter.ingested_at,
-                }
-            )
-    df = df.drop(columns=["business_type_raw"])
+    df["ingested_at"] = ingested_at
 
-    exporter.export(
-        [
-            ExportedFrame(
-                name="aishu_customers",
-                frame=df[
-                    [
-                        "customer_id",
-                        "customer_name",
-                        "is_serviced",
-                        "region",
-                        "industry",
-                        "contact_name",
-                        "contact_phone",
-                        "contact_title",
-                        "product",
-                        "followup_needs",
-                        "followup_status",
-                        "source_system",
-                        "ingested_at",
-                    ]
-                ],
-            ),
-            ExportedFrame(
-                name="aishu_customer_business_types",
-                frame=pd.DataFrame(
-                    business_types,
-                    columns=["customer_id", "business_type", "ingested_at"],
-                ),
-            ),
-        ]
+    business_types = explode_multi_values(
+        df["customer_id"], df["business_type_raw"], "customer_id", "business_type", ingested_at
     )
+    df = df.drop(columns=["business_type_raw"])
 
+    return [
+        ExportedFrame(
+            name="aishu_customers",
+            frame=df[
+                [
+                    "customer_id",
+                    "customer_name",
+                    "is_serviced",
+                    "region",
+                    "industry",
+                    "contact_name",
+                    "contact_phone",
+                    "contact_title",
+                    "product",
+                    "followup_needs",
+                    "followup_status",
+                    "source_system",
+                    "ingested_at",
+                ]
+            ],
+        ),
+        ExportedFrame(
+            name="aishu_customer_business_types",
+            frame=business_types,
+        ),
+    ]
 
-def process_ipg_customers(exporter: DataExporter) -> None:
-    source = DATA_DIR / "IPG客户_去重填充.xlsx"
-    raw = pd.read_excel(source)
+
+def prepare_ipg_customers(raw: pd.DataFrame, ingested_at: str) -> List[ExportedFrame]:
     raw = raw.drop(columns=[col for col in raw.columns if col.startswith("Unnamed")])
 
     rename_map = {
@@ -216,45 +512,38 @@ def process_ipg_customers(exporter: DataExporter) -> None:
     df = raw.rename(columns=rename_map)
     for column in df.columns:
         if column not in {"users_purchased", "contact_phone"}:
-            df[column] = df[column].apply(clean_text)
-    df["contact_phone"] = df["contact_phone"].apply(normalize_phone)
-    df["users_purchased"] = df["users_purchased"].apply(to_int)
-    df["users_purchased"] = df["users_purchased"].astype("Int64")
-    df["customer_id"] = df.apply(
-        lambda row: generate_md5(row["customer_name"], row["region"]), axis=1
-    )
+            df[column] = clean_text_column(df[column])
+    df["contact_phone"] = normalize_phone_column(df["contact_phone"])
+    df["users_purchased"] = to_int_column(df["users_purchased"])
+    df["customer_id"] = hash_columns(df, ["customer_name", "region"])
     df["source_system"] = "IPG"
-    df["ingested_at"] = exporter.ingested_at
-
-    exporter.export(
-        [
-            ExportedFrame(
-                name="ipg_customers",
-                frame=df[
-                    [
-                        "customer_id",
-                        "customer_name",
-                        "region",
-                        "project_status",
-                        "product",
-                        "users_purchased",
-                        "purchase_details",
-                        "contact_name",
-                        "contact_phone",
-                        "deployment_env",
-                        "followup_notes",
-                        "source_system",
-                        "ingested_at",
-                    ]
-                ],
-            )
-        ]
-    )
+    df["ingested_at"] = ingested_at
+
+    return [
+        ExportedFrame(
+            name="ipg_customers",
+            frame=df[
+                [
+                    "customer_id",
+                    "customer_name",
+                    "region",
+                    "project_status",
+                    "product",
+                    "users_purchased",
+                    "purchase_details",
+                    "contact_name",
+                    "contact_phone",
+                    "deployment_env",
+                    "followup_notes",
+                    "source_system",
+                    "ingested_at",
+                ]
+            ],
+        )
+    ]
 
 
-def process_aishu_opportunities(exporter: DataExporter) -> None:
-    source = DATA_DIR / "爱数商机_去重填充.xlsx"
-    raw = pd.read_excel(source)
+def prepare_aishu_opportunities(raw: pd.DataFrame, ingested_at: str) -> List[ExportedFrame]:
 
     rename_map = {
         "客户名称": "customer_name",
@@ -270,70 +559,45 @@ def process_aishu_opportunities(exporter: DataExporter) -> None:
     df = raw.rename(columns=rename_map)
     for column in df.columns:
         if column not in {"budget_raw"}:
-            df[column] = df[column].apply(clean_text)
+            df[column] = clean_text_column(df[column])
 
-    df["opportunity_id"] = df.apply(
-        lambda row: generate_md5(row["customer_name"], row["address"], row["product"]),
-        axis=1,
-    )
+    df["opportunity_id"] = hash_columns(df, ["customer_name", "address", "product"])
     df["source_system"] = "AISHU"
-    df["ingested_at"] = exporter.ingested_at
-
-    budget_rows = []
-    totals = []
-    for _, row in df.iterrows():
-        amounts = parse_decimal_list(row.get("budget_raw"))
-        if not amounts:
-            totals.append(None)
-        else:
-            for amount in amounts:
-                budget_rows.append(
-                    {
-                        "opportunity_id": row["opportunity_id"],
-                        "budget_amount": f"{amount:.2f}",
-                        "ingested_at": exporter.ingested_at,
-                    }
-                )
-            total = sum(amounts)
-            totals.append(f"{total:.2f}")
-    df["budget_total"] = totals
-    df = df.drop(columns=["budget_raw"])
+    df["ingested_at"] = ingested_at
 
-    exporter.export(
-        [
-            ExportedFrame(
-                name="aishu_opportunities",
-                frame=df[
-                    [
-                        "opportunity_id",
-                        "customer_name",
-                        "address",
-                        "region",
-                        "industry",
-                        "product",
-                        "budget_total",
-                        "needs",
-                        "related_project",
-                        "related_customer",
-                        "source_system",
-                        "ingested_at",
-                    ]
-                ],
-            ),
-            ExportedFrame(
-                name="aishu_opportunity_budgets",
-                frame=pd.DataFrame(
-                    budget_rows,
-                    columns=["opportunity_id", "budget_amount", "ingested_at"],
-                ),
-            ),
-        ]
+    budget_rows, df["budget_total"] = explode_decimal_list(
+        df["opportunity_id"], df["budget_raw"], "opportunity_id", "budget_amount", ingested_at
     )
+    df = df.drop(columns=["budget_raw"])
+
+    return [
+        ExportedFrame(
+            name="aishu_opportunities",
+            frame=df[
+                [
+                    "opportunity_id",
+                    "customer_name",
+                    "address",
+                    "region",
+                    "industry",
+                    "product",
+                    "budget_total",
+                    "needs",
+                    "related_project",
+                    "related_customer",
+                    "source_system",
+                    "ingested_at",
+                ]
+            ],
+        ),
+        ExportedFrame(
+            name="aishu_opportunity_budgets",
+            frame=budget_rows,
+        ),
+    ]
 
 
-def process_ipg_opportunities(exporter: DataExporter) -> None:
-    source = DATA_DIR / "IPG商机_去重填充.xlsx"
-    raw = pd.read_excel(source)
+def prepare_ipg_opportunities(raw: pd.DataFrame, ingested_at: str) -> List[ExportedFrame]:
     raw = raw.drop(columns=[col for col in raw.columns if col.startswith("Unnamed")])
 
     rename_map = {
@@ -352,95 +616,58 @@ def process_ipg_opportunities(exporter: DataExporter) -> None:
     df = raw.rename(columns=rename_map)
     for column in df.columns:
         if column not in {"ipg_points_raw", "status_raw", "confidence_raw"}:
-            df[column] = df[column].apply(clean_text)
-    df["contact_phone"] = df["contact_phone"].apply(normalize_phone)
-    df["opportunity_id"] = df.apply(
-        lambda row: generate_md5(row["customer_name"], row["address"], row["product_sold"]),
-        axis=1,
-    )
+            df[column] = clean_text_column(df[column])
+    df["contact_phone"] = normalize_phone_column(df["contact_phone"])
+    df["opportunity_id"] = hash_columns(df, ["customer_name", "address", "product_sold"])
     df["source_system"] = "IPG"
-    df["ingested_at"] = exporter.ingested_at
+    df["ingested_at"] = ingested_at
 
     # Confidence mapping
     confidence_map = {"高": "high", "中": "medium", "低": "low"}
-    df["confidence_level"] = df["confidence_raw"].apply(
-        lambda value: confidence_map.get(clean_text(value))
-    )
+    df["confidence_level"] = clean_text_column(df["confidence_raw"]).map(confidence_map)
 
-    status_rows = []
-    for _, row in df.iterrows():
-        for status in split_multi_values(row.get("status_raw")):
-            status_rows.append(
-                {
-                    "opportunity_id": row["opportunity_id"],
-                    "status": status,
-                    "ingested_at": exporter.ingested_at,
-                }
-            )
-
-    point_rows = []
-    totals = []
-    for _, row in df.iterrows():
-        points = parse_decimal_list(row.get("ipg_points_raw"))
-        if not points:
-            totals.append(None)
-        else:
-            for point in points:
-                point_rows.append(
-                    {
-                        "opportunity_id": row["opportunity_id"],
-                        "ipg_point": f"{point:.2f}",
-                        "ingested_at": exporter.ingested_at,
-                    }
-                )
-            totals.append(f"{sum(points):.2f}")
-    df["ipg_point_total"] = totals
+    status_rows = explode_multi_values(
+        df["opportunity_id"], df["status_raw"], "opportunity_id", "status", ingested_at
+    )
+    point_rows, df["ipg_point_total"] = explode_decimal_list(
+        df["opportunity_id"], df["ipg_points_raw"], "opportunity_id", "ipg_point", ingested_at
+    )
 
     df = df.drop(columns=["status_raw", "ipg_points_raw", "confidence_raw"])
 
-    exporter.export(
-        [
-            ExportedFrame(
-                name="ipg_opportunities",
-                frame=df[
-                    [
-                        "opportunity_id",
-                        "customer_name",
-                        "industry_major",
-                        "industry_minor",
-                        "region",
-                        "address",
-                        "contact_name",
-                        "contact_phone",
-                        "product_sold",
-                        "confidence_level",
-                        "ipg_point_total",
-                        "source_system",
-                        "ingested_at",
-                    ]
-                ],
-            ),
-            ExportedFrame(
-                name="ipg_opportunity_statuses",
-                frame=pd.DataFrame(
-                    status_rows,
-                    columns=["opportunity_id", "status", "ingested_at"],
-                ),
-            ),
-            ExportedFrame(
-                name="ipg_opportunity_ipg_points",
-                frame=pd.DataFrame(
-                    point_rows,
-                    columns=["opportunity_id", "ipg_point", "ingested_at"],
-                ),
-            ),
-        ]
-    )
+    return [
+        ExportedFrame(
+            name="ipg_opportunities",
+            frame=df[
+                [
+                    "opportunity_id",
+                    "customer_name",
+                    "industry_major",
+                    "industry_minor",
+                    "region",
+                    "address",
+                    "contact_name",
+                    "contact_phone",
+                    "product_sold",
+                    "confidence_level",
+                    "ipg_point_total",
+                    "source_system",
+                    "ingested_at",
+                ]
+            ],
+        ),
+        ExportedFrame(
+            name="ipg_opportunity_statuses",
+            frame=status_rows,
+        ),
+        ExportedFrame(
+            name="ipg_opportunity_ipg_points",
+            frame=point_rows,
+        ),
+    ]
 
 
-def process_orders(exporter: DataExporter) -> None:
-    source = DATA_DIR / "项目订单_去重填充.xlsx"
-    raw = pd.read_excel(source)
+def prepare_orders(raw: pd.DataFrame, ingested_at: str) -> List[ExportedFrame]:
 
     rename_map = {
         "客户名称": "customer_name",
@@ -454,73 +681,103 @@ def process_orders(exporter: DataExporter) -> None:
     df = raw.rename(columns=rename_map)
     for column in df.columns:
         if column not in {"amount_raw", "category_raw"}:
-            df[column] = df[column].apply(clean_text)
+            df[column] = clean_text_column(df[column])
 
-    df["order_id"] = df.apply(
-        lambda row: generate_md5(
-            row["customer_name"], row["product"], row["amount_raw"], row["sales_rep"]
-        ),
-        axis=1,
-    )
+    df["order_id"] = hash_columns(df, ["customer_name", "product", "amount_raw", "sales_rep"])
     df["source_system"] = "MIXED"
-    df["ingested_at"] = exporter.ingested_at
-
-    amounts = []
-    for _, row in df.iterrows():
-        decimal_value = to_decimal(row.get("amount_raw"))
-        amounts.append(f"{decimal_value:.2f}" if decimal_value is not None else None)
-    df["order_amount"] = amounts
-
-    category_rows = []
-    for _, row in df.iterrows():
-        for category in split_multi_values(row.get("category_raw")):
-            category_rows.append(
-                {
-                    "order_id": row["order_id"],
-                    "category": category,
-                    "ingested_at": exporter.ingested_at,
-                }
-            )
+    df["ingested_at"] = ingested_at
+
+    df["order_amount"] = format_decimal_column(df["amount_raw"])
+    category_rows = explode_multi_values(
+        df["order_id"], df["category_raw"], "order_id", "category", ingested_at
+    )
 
     df = df.drop(columns=["amount_raw", "category_raw"])
 
-    exporter.export(
-        [
-            ExportedFrame(
-                name="orders",
-                frame=df[
-                    [
-                        "order_id",
-                        "customer_name",
-                        "brand",
-                        "sales_rep",
-                        "product",
-                        "order_amount",
-                        "customer_location",
-                        "source_system",
-                        "ingested_at",
-                    ]
-                ],
-            ),
-            ExportedFrame(
-                name="order_categories",
-                frame=pd.DataFrame(
-                    category_rows,
-                    columns=["order_id", "category", "ingested_at"],
-                ),
-            ),
-        ]
-    )
+    return [
+        ExportedFrame(
+            name="orders",
+            frame=df[
+                [
+                    "order_id",
+                    "customer_name",
+                    "brand",
+                    "sales_rep",
+                    "product",
+                    "order_amount",
+                    "customer_location",
+                    "source_system",
+                    "ingested_at",
+                ]
+            ],
+        ),
+        ExportedFrame(
+            name="order_categories",
+            frame=category_rows,
+        ),
+    ]
+
+
+# (workbook under DATA_DIR, batch transform)
+SOURCES: List[Tuple[str, Callable[[pd.DataFrame, str], List[ExportedFrame]]]] = [
+    ("爱数客户_去重填充.xlsx", prepare_aishu_customers),
+    ("IPG客户_去重填充.xlsx", prepare_ipg_customers),
+    ("爱数商机_去重填充.xlsx", prepare_aishu_opportunities),
+    ("IPG商机_去重填充.xlsx", prepare_ipg_opportunities),
+    ("项目订单_去重填充.xlsx", prepare_orders),
+]
+
+
+def process_source(
+    exporter: DataExporter,
+    manifest: SourceManifest,
+    filename: str,
+    prepare: Callable[[pd.DataFrame, str], List[ExportedFrame]],
+    chunk_size: int = CHUNK_SIZE,
+    force: bool = False,
+) -> bool:
+    """Transform one workbook batch by batch unless the manifest shows it unchanged.
+
+    Returns whether the workbook was processed.
+    """
+    source = DATA_DIR / filename
+    fingerprint = manifest.unchanged(source, exporter.formats)
+    if fingerprint is None or force:
+        written_before = set(exporter.written)
+        for raw in read_excel_chunks(source, chunk_size):
+            exporter.export(prepare(raw, exporter.ingested_at))
+        outputs = sorted(set(exporter.written) - written_before)
+        manifest.record(source, outputs)
+        return True
+    manifest.touch(source, fingerprint)
+    return False
 
 
 def main() -> None:
-    exporter = DataExporter()
-    process_aishu_customers(exporter)
-    process_ipg_customers(exporter)
-    process_aishu_opportunities(exporter)
-    process_ipg_opportunities(exporter)
-    process_orders(exporter)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="rows read and written per batch"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="reprocess workbooks even if the manifest shows them unchanged"
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="also write typed Parquet files (requires pyarrow) for load_processed_data.py",
+    )
+    args = parser.parse_args()
 
+    exporter = DataExporter(parquet=args.parquet)
+    manifest = SourceManifest(OUTPUT_DIR / MANIFEST_NAME)
+    try:
+        for filename, prepare in SOURCES:
+            if process_source(exporter, manifest, filename, prepare, args.chunk_size, args.force):
+                print(f"Prepared {filename}")
+            else:
+                print(f"Skipped {filename} (unchanged since last run)")
+    finally:
+        exporter.close()
 
 if __name__ == "__main__":
     main()
@@ -15,13 +15,17 @@ CREATE TABLE IF NOT EXISTS staging.aishu_customers (
     followup_needs TEXT,
     followup_status TEXT,
     source_system TEXT NOT NULL,
-    ingested_at TIMESTAMPTZ NOT NULL
+    ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ
 );
 
 CREATE TABLE IF NOT EXISTS staging.aishu_customer_business_types (
     customer_id CHAR(32) NOT NULL REFERENCES staging.aishu_customers(customer_id),
     business_type TEXT NOT NULL,
     ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ,
     PRIMARY KEY (customer_id, business_type)
 );
 
@@ -38,7 +42,9 @@ CREATE TABLE IF NOT EXISTS staging.ipg_customers (
     deployment_env TEXT,
     followup_notes TEXT,
     source_system TEXT NOT NULL,
-    ingested_at TIMESTAMPTZ NOT NULL
+    ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ
 );
 
 CREATE TABLE IF NOT EXISTS staging.aishu_opportunities (
@@ -53,13 +59,17 @@ CREATE TABLE IF NOT EXISTS staging.aishu_opportunities (
     related_project TEXT,
     related_customer TEXT,
     source_system TEXT NOT NULL,
-    ingested_at TIMESTAMPTZ NOT NULL
+    ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ
 );
 
 CREATE TABLE IF NOT EXISTS staging.aishu_opportunity_budgets (
     opportunity_id CHAR(32) NOT NULL REFERENCES staging.aishu_opportunities(opportunity_id),
     budget_amount NUMERIC(18,2) NOT NULL,
     ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ,
     PRIMARY KEY (opportunity_id, budget_amount, ingested_at)
 );
 
@@ -76,13 +86,17 @@ CREATE TABLE IF NOT EXISTS staging.ipg_opportunities (
     confidence_level TEXT,
     ipg_point_total NUMERIC(18,2),
     source_system TEXT NOT NULL,
-    ingested_at TIMESTAMPTZ NOT NULL
+    ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ
 );
 
 CREATE TABLE IF NOT EXISTS staging.ipg_opportunity_statuses (
     opportunity_id CHAR(32) NOT NULL REFERENCES staging.ipg_opportunities(opportunity_id),
     status TEXT NOT NULL,
     ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ,
     PRIMARY KEY (opportunity_id, status, ingested_at)
 );
 
@@ -90,6 +104,8 @@ CREATE TABLE IF NOT EXISTS staging.ipg_opportunity_ipg_points (
     opportunity_id CHAR(32) NOT NULL REFERENCES staging.ipg_opportunities(opportunity_id),
     ipg_point NUMERIC(18,2) NOT NULL,
     ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ,
     PRIMARY KEY (opportunity_id, ipg_point, ingested_at)
 );
 
@@ -102,14 +118,34 @@ CREATE TABLE IF NOT EXISTS staging.orders (
     order_amount NUMERIC(18,2),
     customer_location TEXT,
     source_system TEXT NOT NULL,
-    ingested_at TIMESTAMPTZ NOT NULL
+    ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ
 );
 
 CREATE TABLE IF NOT EXISTS staging.order_categories (
     order_id CHAR(32) NOT NULL REFERENCES staging.orders(order_id),
     category TEXT NOT NULL,
     ingested_at TIMESTAMPTZ NOT NULL,
+    row_hash CHAR(32),
+    deleted_at TIMESTAMPTZ,
     PRIMARY KEY (order_id, category, ingested_at)
 );
 
+-- Natural keys for incremental (change-data-capture) loads where the primary key includes ingested_at
+CREATE UNIQUE INDEX IF NOT EXISTS aishu_opportunity_budgets_cdc_key ON staging.aishu_opportunity_budgets (opportunity_id, budget_amount);
+CREATE UNIQUE INDEX IF NOT EXISTS ipg_opportunity_statuses_cdc_key ON staging.ipg_opportunity_statuses (opportunity_id, status);
+CREATE UNIQUE INDEX IF NOT EXISTS ipg_opportunity_ipg_points_cdc_key ON staging.ipg_opportunity_ipg_points (opportunity_id, ipg_point);
+CREATE UNIQUE INDEX IF NOT EXISTS order_categories_cdc_key ON staging.order_categories (order_id, category);
+
+-- One row per processed CSV: fingerprint of the last imported version
+CREATE TABLE IF NOT EXISTS staging.import_manifest (
+    source_file TEXT PRIMARY KEY,
+    mtime DOUBLE PRECISION NOT NULL,
+    size BIGINT NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    row_count BIGINT,
+    imported_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
 COMMIT;